@@ -1,8 +1,9 @@
 from django.contrib import admin
+from app.common.admin import EliminacionSuaveAdminMixin
 from .models import Articulos
 
 @admin.register(Articulos)
-class ArticulosAdmin(admin.ModelAdmin):
+class ArticulosAdmin(EliminacionSuaveAdminMixin, admin.ModelAdmin):
     """
     Configuración del admin para gestionar artículos.
     Solo administradores pueden crear/editar artículos.
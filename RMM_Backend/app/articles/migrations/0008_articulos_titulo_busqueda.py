@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 20:48
+
+from django.db import migrations, models
+from unidecode import unidecode
+
+
+def normalizar_busqueda(texto):
+    # Copia de app.common.filters.normalizar_busqueda al momento de la migración
+    return " ".join(unidecode(texto or "").lower().split())
+
+
+def rellenar_titulo_busqueda(apps, schema_editor):
+    Articulos = apps.get_model('articles', 'Articulos')
+    articulos = list(Articulos.objects.only('id', 'titulo_articulo'))
+    for articulo in articulos:
+        articulo.titulo_busqueda = normalizar_busqueda(articulo.titulo_articulo)[:200]
+    Articulos.objects.bulk_update(articulos, ['titulo_busqueda'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0007_alter_articulos_banner_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articulos',
+            name='titulo_busqueda',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=200, verbose_name='Título normalizado'),
+        ),
+        migrations.RunPython(rellenar_titulo_busqueda, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:05
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0008_articulos_titulo_busqueda'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articulos',
+            name='actualizado_en',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Actualizado en'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0009_articulos_actualizado_en'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articulos',
+            index=models.Index(fields=['fecha_publicacion', 'id'], name='articles_ar_fecha_p_ef8568_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0010_articulos_articles_ar_fecha_p_ef8568_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comentarioarticulo',
+            name='articles_co_articul_56094e_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comentarioarticulo',
+            index=models.Index(fields=['articulo', 'parent', 'creado_en'], name='articles_co_articul_9f72eb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comentarioarticulo',
+            index=models.Index(fields=['parent', 'creado_en'], name='articles_co_parent__973056_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='likearticulo',
+            index=models.Index(fields=['usuario', 'creado_en'], name='articles_li_usuario_2a093f_idx'),
+        ),
+    ]
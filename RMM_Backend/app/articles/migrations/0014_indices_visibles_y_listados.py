@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0013_eliminacion_suave'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='articulos',
+            name='articles_ar_fecha_p_ef8568_idx',
+        ),
+        migrations.AddIndex(
+            model_name='articulos',
+            index=models.Index(condition=models.Q(('eliminado_en__isnull', True)), fields=['fecha_publicacion', 'id'], name='articulos_feed_visibles'),
+        ),
+        migrations.AddIndex(
+            model_name='comentarioarticulo',
+            index=models.Index(fields=['articulo', 'creado_en'], name='articles_co_articul_1298a4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comentarioarticulo',
+            index=models.Index(fields=['creado_en'], name='articles_co_creado__126f39_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='likearticulo',
+            index=models.Index(fields=['articulo', 'creado_en'], name='articles_li_articul_3db9ae_idx'),
+        ),
+    ]
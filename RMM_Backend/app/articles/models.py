@@ -1,7 +1,10 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from ckeditor.fields import RichTextField
 from django.core.exceptions import ValidationError
+from app.common.filters import normalizar_busqueda
+from app.common.models import VisiblesManager
 
 User = settings.AUTH_USER_MODEL
 
@@ -11,11 +14,41 @@ class Articulos(models.Model):
     imagen_principal = models.ImageField("Imagen", upload_to="RMM/Articulos-ImagenPrincipal/", null=True, blank=True)
     banner = models.ImageField("Banner", upload_to="RMM/Articulos-Banner/", null=True, blank=True)
     fecha_publicacion = models.DateField("Fecha de publicación" , null=True, blank=True)
+    # Título sin acentos y en minúsculas, para buscar por subcadena sin normalizar cada fila (ver save())
+    titulo_busqueda = models.CharField(
+        "Título normalizado", max_length=200, blank=True, editable=False, db_index=True
+    )
+    # Último cambio del artículo o de sus comentarios/likes (ver app/common/signals.py)
+    actualizado_en = models.DateTimeField("Actualizado en", auto_now=True)
+    # Comentarios y likes movidos al archivo frío, con sus conteos (ver app/common/archivado.py)
+    interacciones_archivadas = models.BooleanField("Interacciones archivadas", default=False, editable=False)
+    comentarios_archivados = models.PositiveIntegerField("Comentarios archivados", default=0, editable=False)
+    likes_archivados = models.PositiveIntegerField("Likes archivados", default=0, editable=False)
+    # Eliminado y oculto; sus comentarios y likes esperan la purga (ver app/common/eliminacion.py)
+    eliminado_en = models.DateTimeField("Eliminado en", null=True, blank=True, editable=False)
+
+    objects = VisiblesManager()
+    todos = models.Manager()  # Incluye los eliminados
 
     class Meta:
         ordering = ["-fecha_publicacion"]
         verbose_name = "Artículo"
         verbose_name_plural = "Artículos"
+        indexes = [
+            # Paginación por cursor del feed (ver app/common/pagination.py), solo
+            # de los visibles: VisiblesManager siempre filtra eliminado_en IS NULL
+            models.Index(
+                fields=["fecha_publicacion", "id"], condition=Q(eliminado_en__isnull=True),
+                name="articulos_feed_visibles",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.titulo_busqueda = normalizar_busqueda(self.titulo_articulo)[:200]
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "titulo_articulo" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "titulo_busqueda"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.titulo_articulo
@@ -40,8 +73,13 @@ class ComentarioArticulo(models.Model):
     class Meta:
         ordering = ["-creado_en"]
         indexes = [
-            models.Index(fields=["articulo", "parent"]),
+            # Comentarios principales por fecha y respuestas por fecha (ver asesor_indices)
+            models.Index(fields=["articulo", "parent", "creado_en"]),
             models.Index(fields=["articulo", "nivel"]),
+            models.Index(fields=["parent", "creado_en"]),
+            # Hilo completo por fecha y listado general (más recientes primero)
+            models.Index(fields=["articulo", "creado_en"]),
+            models.Index(fields=["creado_en"]),
         ]
 
     def clean(self):
@@ -74,6 +112,12 @@ class LikeArticulo(models.Model):
 
     class Meta:
         unique_together = ("articulo", "usuario")
+        indexes = [
+            # Actividad reciente de cada usuario
+            models.Index(fields=["usuario", "creado_en"]),
+            # Lista de likes del objeto por fecha (likes_list)
+            models.Index(fields=["articulo", "creado_en"]),
+        ]
         verbose_name = "Like de Artículo"
         verbose_name_plural = "Likes de Artículos"
 
@@ -1,7 +1,20 @@
 # app/articles/pagination.py
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
 
-class ArticulosPagination(PageNumberPagination):
+from app.common.pagination import KeysetPagination
+
+class ArticulosPagination(KeysetPagination):
     page_size = 6                 # 6 artículos por página
     page_size_query_param = "page_size"
     max_page_size = 20
+
+
+class ArticuloPickerPagination(CursorPagination):
+    """
+    Paginación por cursor (keyset) para el selector de artículos: cada página
+    es un `WHERE id < cursor ORDER BY id DESC LIMIT n`, sin OFFSET ni COUNT.
+    """
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 50
+    ordering = "-id"
@@ -1,6 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Articulos, ComentarioArticulo, LikeArticulo
+from app.common.archivado import comentarios_de
+from app.common.queries import armar_arbol, generar_extracto
+from app.common.serializers import (
+    SparseFieldsetMixin, FragmentCacheMixin, FragmentCacheListSerializer, ArbolComentariosListSerializer
+)
 
 User = get_user_model()
 
@@ -42,7 +47,7 @@ class LikeArticuloSerializer(serializers.ModelSerializer):
         read_only_fields = ["usuario", "creado_en"]
 
 
-class ComentarioArticuloSerializer(serializers.ModelSerializer):
+class ComentarioArticuloSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
 
     autor = AutorArticuloSerializer(read_only=True)
     respuestas = serializers.SerializerMethodField()
@@ -57,10 +62,12 @@ class ComentarioArticuloSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ComentarioArticulo
+        list_serializer_class = ArbolComentariosListSerializer
         fields = [
             "id", "articulo", "autor", "contenido", "parent" , "nivel", "creado_en", "respuestas"    
         ]
         read_only_fields = ["autor", "nivel", "creado_en", "respuestas"]
+        field_dependencies = {"respuestas": []}
 
     def validate_parent(self, value):
         if value and value.nivel >= ComentarioArticulo.MAX_DEPTH:
@@ -68,9 +75,12 @@ class ComentarioArticuloSerializer(serializers.ModelSerializer):
         return value
 
     def get_respuestas(self, obj):
-        """Traer respuestas en forma anidada"""
+        """Traer respuestas en forma anidada (árbol cargado por ArbolComentariosListSerializer)"""
+        respuestas = getattr(obj, "respuestas_cargadas", None)
+        if respuestas is None:
+            respuestas = obj.respuestas.all()
         return ComentarioArticuloSerializer(
-            obj.respuestas.all().order_by("-creado_en"), 
+            respuestas,
             many=True, 
             context=self.context
         ).data
@@ -80,7 +90,21 @@ class ComentarioArticuloSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ArticuloSerializer(serializers.ModelSerializer):
+def serializar_comentarios(articulo, context):
+    """
+    Árbol de comentarios de un artículo (detalle y `?expand=comentarios` del
+    listado): los principales con sus respuestas anidadas.
+    """
+    # Todos los comentarios en una consulta (o del prefetch `comentarios_cargados`)
+    comentarios = getattr(articulo, "comentarios_cargados", None)
+    if articulo.interacciones_archivadas:
+        comentarios = comentarios_de(articulo)  # Archivo frío (ver app/common/archivado.py)
+    elif comentarios is None:
+        comentarios = list(articulo.comentarios.select_related("autor"))
+    return ComentarioArticuloSerializer(armar_arbol(comentarios), many=True, context=context).data
+
+
+class ArticuloSerializer(FragmentCacheMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer para artículos con sistema de likes.
     """
@@ -89,20 +113,90 @@ class ArticuloSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Articulos
+        list_serializer_class = FragmentCacheListSerializer
         fields = [
             "id", "titulo_articulo", "contenido", "imagen_principal", "banner", "fecha_publicacion",
             "comentarios", "likes_count"
         ]
+        field_dependencies = {"comentarios": ["interacciones_archivadas"], "likes_count": ["likes_archivados"]}
 
     def get_comentarios(self, obj):
         """Solo comentarios principales (sin parent), con sus respuestas anidadas"""
-        comentarios_principales = obj.comentarios.filter(parent__isnull=True)
-        return ComentarioArticuloSerializer(
-            comentarios_principales, 
-            many=True, 
-            context=self.context
-        ).data
+        return serializar_comentarios(obj, self.context)
+
+    def get_likes_count(self, obj):
+        """Cantidad total de 'me gusta' (anotada por la vista o contada aparte)"""
+        likes_count = getattr(obj, "likes_count", None)
+        if likes_count is None:
+            likes_count = obj.likes.count() + obj.likes_archivados
+        return likes_count
+
+
+class ArticuloRelacionadoSerializer(serializers.ModelSerializer):
+    """
+    Representación compacta de un artículo embebido en otro recurso
+    (por ejemplo, los artículos relacionados de una noticia).
+
+    Sin `contenido` ni comentarios. `likes_count` se toma de la anotación
+    del Prefetch de la vista; si no viene anotado se cuenta aparte.
+    """
+    likes_count = serializers.SerializerMethodField()
+
+    # Columnas que necesita esta representación (para usar con only())
+    COLUMNAS = ["id", "titulo_articulo", "imagen_principal", "banner", "fecha_publicacion", "likes_archivados"]
+
+    class Meta:
+        model = Articulos
+        fields = ["id", "titulo_articulo", "imagen_principal", "banner", "fecha_publicacion", "likes_count"]
 
     def get_likes_count(self, obj):
-        """Cantidad total de 'me gusta'"""
-        return obj.likes.count()
+        likes_count = getattr(obj, "likes_count", None)
+        if likes_count is None:
+            likes_count = obj.likes.count() + obj.likes_archivados
+        return likes_count
+
+
+class ArticuloPickerSerializer(serializers.ModelSerializer):
+    """Lo mínimo para el selector de artículos del editor de noticias."""
+
+    COLUMNAS = ["id", "titulo_articulo", "fecha_publicacion"]
+
+    class Meta:
+        model = Articulos
+        fields = ["id", "titulo_articulo", "fecha_publicacion"]
+
+
+class ArticuloListSerializer(FragmentCacheMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Representación resumida de artículos para los listados.
+
+    No incluye el HTML completo de `contenido` ni el árbol de comentarios:
+    trae un extracto en texto plano y los conteos anotados por el queryset
+    (ver `ArticuloViewSet.get_queryset`). El detalle usa `ArticuloSerializer`.
+
+    Ambos se pueden pedir con `?expand=contenido,comentarios`.
+    """
+    extracto = serializers.SerializerMethodField()
+    comentarios_count = serializers.IntegerField(read_only=True)
+    likes_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Articulos
+        list_serializer_class = FragmentCacheListSerializer
+        fields = [
+            "id", "titulo_articulo", "extracto", "imagen_principal", "banner", "fecha_publicacion",
+            "comentarios_count", "likes_count"
+        ]
+        expandable_fields = {
+            "contenido": lambda: serializers.CharField(read_only=True),
+            "comentarios": lambda: serializers.SerializerMethodField(),
+        }
+        field_dependencies = {
+            "extracto": [], "comentarios_count": [], "likes_count": [], "comentarios": ["interacciones_archivadas"],
+        }
+
+    def get_extracto(self, obj):
+        return generar_extracto(getattr(obj, "inicio_contenido", ""))
+
+    def get_comentarios(self, obj):
+        return serializar_comentarios(obj, self.context)
@@ -1,3 +1,33 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from app.common.testing import PRESUPUESTOS, PresupuestoConsultasMixin, crear_articulo, crear_usuario
+
+from .models import ComentarioArticulo
+from .serializers import ComentarioArticuloSerializer
+
+
+class ArticulosPresupuestoTests(PresupuestoConsultasMixin, TestCase):
+    presupuestos = PRESUPUESTOS['articles']
+
+
+class ArbolComentariosTests(TestCase):
+    """Respuestas anidadas de `ArbolComentariosListSerializer`."""
+
+    def test_carga_solo_el_subarbol_un_nivel_por_consulta(self):
+        articulo = crear_articulo()
+        autor = crear_usuario()
+        raiz, otra = [
+            ComentarioArticulo.objects.create(articulo=articulo, autor=autor, contenido=f"Raíz {i}") for i in range(2)
+        ]
+        respuesta = ComentarioArticulo.objects.create(articulo=articulo, autor=autor, parent=raiz, contenido="R1")
+        ComentarioArticulo.objects.create(articulo=articulo, autor=autor, parent=otra, contenido="Ajena")
+
+        with CaptureQueriesContext(connection) as consultas:
+            datos = ComentarioArticuloSerializer([raiz], many=True).data
+
+        self.assertEqual([hijo["id"] for hijo in datos[0]["respuestas"]], [respuesta.pk])
+        self.assertEqual(datos[0]["respuestas"][0]["respuestas"], [])
+        self.assertEqual(len(consultas), 2)  # Nivel 1 y nivel 2 (vacío)
+        self.assertFalse(any('"articulo_id" IN' in consulta["sql"] for consulta in consultas.captured_queries))
@@ -5,11 +5,20 @@ from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import Articulos, ComentarioArticulo, LikeArticulo
-from .serializers import ArticuloSerializer, ComentarioArticuloSerializer, LikeArticuloSerializer
+from .serializers import ArticuloSerializer, ArticuloListSerializer, ComentarioArticuloSerializer, LikeArticuloSerializer
 from .pagination import ArticulosPagination
 from drf_spectacular.utils import extend_schema
-from app.common.filters import AccentInsensitiveSearchFilter
+from app.common.archivo import resumen as resumen_archivo
+from app.common.filters import AccentInsensitiveSearchFilter, ArchivoFechaFilter
 from app.common.permissions import CanManageContent, CanComment, CanLike
+from app.common.escritor import escritura_serializada
+from app.common.mixins import (
+    AnonymousCacheMixin, CDNCacheMixin, ConditionalGetMixin, EliminacionSuaveMixin, EscrituraSerializadaMixin,
+    FragmentCacheViewMixin, HiloArchivadoMixin, SparseFieldsetViewMixin,
+)
+from app.common.archivado import likes_de, principales_de, restaurar
+from app.common.queries import contar_interacciones, inicio_contenido, prefetch_comentarios
+from app.common.serializers import ArchivoAnioSerializer
 
 # ----------------------------
 # 📌 PERMISOS PERSONALIZADOS
@@ -22,7 +31,10 @@ from app.common.permissions import CanManageContent, CanComment, CanLike
     tags=["Artículos - listar"],
     description="Endpoints para consultar artículos con paginación y búsqueda (solo lectura)."
 )
-class ArticuloViewSet(viewsets.ModelViewSet):
+class ArticuloViewSet(
+    AnonymousCacheMixin, CDNCacheMixin, ConditionalGetMixin, EliminacionSuaveMixin, FragmentCacheViewMixin,
+    SparseFieldsetViewMixin, viewsets.ModelViewSet,
+):
     """
     ViewSet SOLO DE LECTURA para listar y ver detalles de artículos.
     
@@ -35,7 +47,19 @@ class ArticuloViewSet(viewsets.ModelViewSet):
       - Buscar "tecnologia" encontrará "tecnología" y "tecnologia"
       - Buscar "minería" encontrará "mineria" y "minería"
     - 📄 Paginación: 6 artículos por página (?page=1, ?page_size=10)
+      o por cursor sin COUNT(*): ?pagination=cursor y luego el `next` (?cursor=...)
     - 👁️ Solo lectura: GET /list/ y GET /detail/ disponibles
+    - 📋 El listado usa una representación resumida (extracto, conteos de
+      comentarios y likes, sin árbol de comentarios); el detalle trae todo
+    - 🧩 Campos a medida: ?fields=id,titulo_articulo y ?expand=contenido,comentarios
+    - 🔁 GET condicional: ETag / Last-Modified; con If-None-Match vigente responde 304
+    - ⚡ Caché de respuestas anónimas del listado (RESPONSE_CACHE_ENABLED)
+    - 🌐 CDN: Cache-Control y CDN-Tag por acción (CDN_CACHE_HEADERS_ENABLED)
+    - 🗓️ Archivo por fechas: GET archivo/ (conteos por año y mes) y ?year=2025&month=10
+    - 🧊 Archivo frío: los comentarios y likes de contenido antiguo se leen de
+      ahí (conteos incluidos) y vuelven a las tablas al comentar o dar like
+    - 🗑️ DELETE (admin) oculta al instante; comentarios y likes se purgan
+      después, en lotes (ver app/common/eliminacion.py)
     
     Ejemplos de uso:
     - GET /api/v1/articles/?search=tecnologia (encuentra "tecnología")
@@ -47,16 +71,62 @@ class ArticuloViewSet(viewsets.ModelViewSet):
     serializer_class = ArticuloSerializer
     permission_classes = [CanManageContent]  # Lectura: Todos | Escritura: Admin/Superusuario
     pagination_class = ArticulosPagination
+
+    # Caché de respuestas anónimas (ver AnonymousCacheMixin)
+    response_cache_actions = ('list',)
+    response_cache_tags = ('articles.Articulos', 'articles.ComentarioArticulo', 'articles.LikeArticulo')
     
     # Configuración de filtros y búsqueda (con soporte para búsqueda sin acentos)
-    filter_backends = [AccentInsensitiveSearchFilter]
+    filter_backends = [AccentInsensitiveSearchFilter, ArchivoFechaFilter]
     search_fields = ['titulo_articulo', 'contenido']
+    archive_date_field = 'fecha_publicacion'
+
+    # Caché en el CDN (ver CDNCacheMixin)
+    cdn_policies = {'list': 'listado', 'retrieve': 'detalle', 'archivo': 'listado'}
+    cdn_content = 'articles.Articulos'
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ArticuloListSerializer
+        return ArticuloSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method in ('GET', 'HEAD') and self.field_requested('comentarios'):
+            # Todos los comentarios de la página en una consulta; el árbol se arma en memoria
+            queryset = queryset.prefetch_related(
+                prefetch_comentarios(ComentarioArticulo.objects.select_related('autor'))
+            )
+        if self.action == 'list':
+            # Listado: sin el HTML completo y con conteos calculados en la misma consulta.
+            # Solo se anota lo que la respuesta va a incluir (?fields= / ?expand=)
+            if not self.field_requested('contenido'):
+                queryset = queryset.defer('contenido')
+            if self.field_requested('extracto'):
+                queryset = queryset.annotate(inicio_contenido=inicio_contenido())
+            if self.field_requested('comentarios_count'):
+                queryset = queryset.annotate(
+                    comentarios_count=contar_interacciones(ComentarioArticulo, 'articulo', 'comentarios_archivados')
+                )
+            if self.field_requested('likes_count'):
+                queryset = queryset.annotate(likes_count=contar_interacciones(LikeArticulo, 'articulo', 'likes_archivados'))
+        return queryset
+
+    @extend_schema(
+        summary="Archivo por fechas",
+        description="Cantidad de artículos publicados por año y mes, desde la tabla de resumen.",
+        responses=ArchivoAnioSerializer(many=True),
+    )
+    @action(detail=False, methods=['get'])
+    def archivo(self, request):
+        return Response(resumen_archivo('articles.Articulos'))
 
     @extend_schema(
         tags=["Artículos - Reacciones"],
         description="Dar o quitar 'me gusta' a un artículo."
     )
     @action(detail=True, methods=["post"], permission_classes=[CanLike])
+    @escritura_serializada
     def toggle_like(self, request, pk=None):
         """
         Acción para dar o quitar 'like' a un artículo completo.
@@ -77,6 +147,8 @@ class ArticuloViewSet(viewsets.ModelViewSet):
         """
         articulo = get_object_or_404(Articulos, pk=pk)
         user = request.user
+        # Si sus likes están en el archivo frío, vuelven a las tablas antes de leerlos
+        restaurar(articulo)
         
         # Obtener la acción solicitada
         action = request.data.get('action', None)
@@ -196,7 +268,10 @@ class ArticuloViewSet(viewsets.ModelViewSet):
         articulo = get_object_or_404(Articulos, pk=pk)
         
         # Obtener todos los likes del artículo
-        likes = LikeArticulo.objects.filter(articulo=articulo).select_related('usuario').order_by('-creado_en')
+        if articulo.interacciones_archivadas:
+            likes = likes_de(articulo)  # Archivo frío (ver app/common/archivado.py)
+        else:
+            likes = LikeArticulo.objects.filter(articulo=articulo).select_related('usuario').order_by('-creado_en')
         
         # Serializar la información de los usuarios
         from .serializers import LikeArticuloSerializer
@@ -207,8 +282,11 @@ class ArticuloViewSet(viewsets.ModelViewSet):
         user_info = None
         
         if request.user.is_authenticated:
-            user_like = LikeArticulo.objects.filter(articulo=articulo, usuario=request.user).first()
-            user_liked = bool(user_like)
+            if articulo.interacciones_archivadas:
+                user_liked = any(like.usuario_id == request.user.id for like in likes)
+            else:
+                user_like = LikeArticulo.objects.filter(articulo=articulo, usuario=request.user).first()
+                user_liked = bool(user_like)
             user_info = {
                 "id": request.user.id,
                 "email": request.user.email,
@@ -221,12 +299,12 @@ class ArticuloViewSet(viewsets.ModelViewSet):
                 "articulo": {
                     "id": articulo.id,
                     "titulo": articulo.titulo_articulo,
-                    "likes_count": likes.count()
+                    "likes_count": len(likes)
                 },
                 "likes_list": likes_data,
                 "current_user": user_info,
                 "user_liked": user_liked,
-                "total_likes": likes.count()
+                "total_likes": len(likes)
             },
             status=status.HTTP_200_OK
         )
@@ -248,16 +326,20 @@ class ArticuloViewSet(viewsets.ModelViewSet):
         """
         articulo = get_object_or_404(Articulos, pk=pk)
         
-        # Obtener comentarios principales del artículo
-        comentarios = ComentarioArticulo.objects.filter(
-            articulo=articulo, 
-            parent__isnull=True
-        ).select_related('autor').order_by('-creado_en')
-        
-        # Aplicar búsqueda si se proporciona
         search = request.query_params.get('search')
-        if search:
-            comentarios = comentarios.filter(contenido__icontains=search)
+        if articulo.interacciones_archivadas:
+            # Hilo en el archivo frío (ver app/common/archivado.py)
+            comentarios = principales_de(articulo, search)
+        else:
+            # Obtener comentarios principales del artículo
+            comentarios = ComentarioArticulo.objects.filter(
+                articulo=articulo, 
+                parent__isnull=True
+            ).select_related('autor').order_by('-creado_en')
+        
+            # Aplicar búsqueda si se proporciona
+            if search:
+                comentarios = comentarios.filter(contenido__icontains=search)
         
         # Aplicar paginación
         paginator = ArticulosPagination()
@@ -280,7 +362,9 @@ class ArticuloViewSet(viewsets.ModelViewSet):
     tags=["Artículos - Comentarios"],
     description="Endpoints para consultar y crear comentarios con paginación y búsqueda."
 )
-class ComentarioArticuloViewSet(viewsets.ModelViewSet):
+class ComentarioArticuloViewSet(
+    HiloArchivadoMixin, EscrituraSerializadaMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet,
+):
     """
     ViewSet para listar, crear, actualizar y eliminar comentarios de artículos.
     
@@ -296,6 +380,8 @@ class ComentarioArticuloViewSet(viewsets.ModelViewSet):
     - 🔍 Búsqueda: ?search=término (busca en el contenido del comentario)
     - 📄 Paginación: usa la configuración global de settings (5 comentarios por página)
     - 🎯 Filtro por artículo: ?articulo=1 (REQUERIDO para filtrar por artículo específico)
+    - 🧊 Artículos antiguos: sus comentarios pueden estar en el archivo frío; se
+      leen de ahí y se restauran al comentar (ver app/common/archivado.py)
     
     Ejemplos de uso:
     - GET /api/v1/articles/comentarios/?articulo=1 - Comentarios principales del artículo 1
@@ -329,13 +415,16 @@ class ComentarioArticuloViewSet(viewsets.ModelViewSet):
     filterset_fields = ['articulo', 'parent']
     search_fields = ['contenido']
 
+    # Hilos en el archivo frío (ver HiloArchivadoMixin)
+    campo_contenido = 'articulo'
+
     def get_queryset(self):
-        qs = ComentarioArticulo.objects.all().select_related('autor', 'articulo').prefetch_related(
-            'respuestas__autor', 
-            'respuestas__respuestas__autor',
-            'respuestas__respuestas__respuestas__autor',
-            'respuestas__respuestas__respuestas__respuestas__autor'
-        ).order_by('-creado_en')
+        # Las respuestas anidadas se cargan una consulta por nivel (ArbolComentariosListSerializer)
+        # Sin los comentarios de artículos eliminados que esperan su purga
+        qs = (
+            ComentarioArticulo.objects.filter(articulo__eliminado_en__isnull=True)
+            .select_related('autor', 'articulo').order_by('-creado_en')
+        )
 
         articulo_id = self.request.query_params.get('articulo')
         if articulo_id:
@@ -353,8 +442,11 @@ class ComentarioArticuloViewSet(viewsets.ModelViewSet):
     )
     @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
     def children(self, request, pk=None):
-        comentario = get_object_or_404(ComentarioArticulo, pk=pk)
-        hijos = comentario.respuestas.all().select_related('autor')
+        comentario = self.get_object()
+        # Un comentario del archivo frío ya trae su árbol (ver HiloArchivadoMixin)
+        hijos = getattr(comentario, 'respuestas_cargadas', None)
+        if hijos is None:
+            hijos = comentario.respuestas.all().select_related('autor')
         
         paginator = ArticulosPagination()
         page = paginator.paginate_queryset(hijos, request, view=self)
@@ -1,8 +1,9 @@
 from django.contrib import admin
+from app.common.admin import EliminacionSuaveAdminMixin
 from .models import Blog, LikeBlog
 
 @admin.register(Blog)
-class BlogAdmin(admin.ModelAdmin):
+class BlogAdmin(EliminacionSuaveAdminMixin, admin.ModelAdmin):
     """
     Configuración del admin para gestionar blogs.
     Solo administradores pueden crear/editar blogs.
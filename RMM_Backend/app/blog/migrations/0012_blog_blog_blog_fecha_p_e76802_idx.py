@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0010_articulos_articles_ar_fecha_p_ef8568_idx'),
+        ('blog', '0011_blog_actualizado_en'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['fecha_publicacion', 'id'], name='blog_blog_fecha_p_e76802_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_blog_blog_blog_fecha_p_e76802_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comentarioblog',
+            name='blog_coment_blog_id_b3eb8b_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comentarioblog',
+            index=models.Index(fields=['blog', 'parent', 'creado_en'], name='blog_coment_blog_id_cdde0d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comentarioblog',
+            index=models.Index(fields=['parent', 'creado_en'], name='blog_coment_parent__e57fa7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='likeblog',
+            index=models.Index(fields=['usuario', 'creado_en'], name='blog_likebl_usuario_28a9e5_idx'),
+        ),
+    ]
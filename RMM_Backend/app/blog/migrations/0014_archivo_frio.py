@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_indices_comentarios_likes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='comentarios_archivados',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Comentarios archivados'),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='interacciones_archivadas',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Interacciones archivadas'),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='likes_archivados',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Likes archivados'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_archivo_frio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='eliminado_en',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Eliminado en'),
+        ),
+    ]
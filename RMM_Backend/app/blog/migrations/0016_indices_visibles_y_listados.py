@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0014_indices_visibles_y_listados'),
+        ('blog', '0015_eliminacion_suave'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='blog',
+            name='blog_blog_fecha_p_e76802_idx',
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(condition=models.Q(('eliminado_en__isnull', True)), fields=['fecha_publicacion', 'id'], name='noticias_feed_visibles'),
+        ),
+        migrations.AddIndex(
+            model_name='comentarioblog',
+            index=models.Index(fields=['blog', 'creado_en'], name='blog_coment_blog_id_7afa69_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comentarioblog',
+            index=models.Index(fields=['creado_en'], name='blog_coment_creado__44dfd5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='likeblog',
+            index=models.Index(fields=['blog', 'creado_en'], name='blog_likebl_blog_id_563f22_idx'),
+        ),
+    ]
@@ -1,8 +1,10 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from ckeditor.fields import RichTextField
 from django.utils.text import slugify
 from app.articles.models import Articulos
+from app.common.models import VisiblesManager
 
 User = settings.AUTH_USER_MODEL
 
@@ -14,11 +16,30 @@ class Blog(models.Model):
     banner = models.ImageField("Banner", upload_to="RMM/Noticias-Banner/", null=True, blank=True)
     fecha_publicacion = models.DateField("Fecha de publicación" , null=True, blank=True)
     articulos = models.ManyToManyField("articles.Articulos", blank=True, related_name="blogs")
+    # Último cambio de la noticia, sus comentarios/likes o sus artículos (ver app/common/signals.py)
+    actualizado_en = models.DateTimeField("Actualizado en", auto_now=True)
+    # Comentarios y likes movidos al archivo frío, con sus conteos (ver app/common/archivado.py)
+    interacciones_archivadas = models.BooleanField("Interacciones archivadas", default=False, editable=False)
+    comentarios_archivados = models.PositiveIntegerField("Comentarios archivados", default=0, editable=False)
+    likes_archivados = models.PositiveIntegerField("Likes archivados", default=0, editable=False)
+    # Eliminado y oculto; sus comentarios y likes esperan la purga (ver app/common/eliminacion.py)
+    eliminado_en = models.DateTimeField("Eliminado en", null=True, blank=True, editable=False)
+
+    objects = VisiblesManager()
+    todos = models.Manager()  # Incluye los eliminados
 
     class Meta:
         ordering = ["-fecha_publicacion"]
         verbose_name = "Noticia"
         verbose_name_plural = "Noticias"
+        indexes = [
+            # Paginación por cursor del feed (ver app/common/pagination.py), solo
+            # de los visibles: VisiblesManager siempre filtra eliminado_en IS NULL
+            models.Index(
+                fields=["fecha_publicacion", "id"], condition=Q(eliminado_en__isnull=True),
+                name="noticias_feed_visibles",
+            ),
+        ]
 
     def __str__(self):
         return self.titulo_blog
@@ -47,8 +68,13 @@ class ComentarioBlog(models.Model):
     class Meta:
         ordering = ["-creado_en"]
         indexes = [
-            models.Index(fields=["blog", "parent"]),
+            # Comentarios principales por fecha y respuestas por fecha (ver asesor_indices)
+            models.Index(fields=["blog", "parent", "creado_en"]),
             models.Index(fields=["blog", "nivel"]),
+            models.Index(fields=["parent", "creado_en"]),
+            # Hilo completo por fecha y listado general (más recientes primero)
+            models.Index(fields=["blog", "creado_en"]),
+            models.Index(fields=["creado_en"]),
         ]
 
     def clean(self):
@@ -81,6 +107,12 @@ class LikeBlog(models.Model):
 
     class Meta:
         unique_together = ("blog", "usuario")
+        indexes = [
+            # Actividad reciente de cada usuario
+            models.Index(fields=["usuario", "creado_en"]),
+            # Lista de likes del objeto por fecha (likes_list)
+            models.Index(fields=["blog", "creado_en"]),
+        ]
         verbose_name = "Like de Blog"
         verbose_name_plural = "Likes de Blogs"
 
@@ -1,7 +1,7 @@
 # app/magazine/pagination.py
-from rest_framework.pagination import PageNumberPagination
+from app.common.pagination import KeysetPagination
 
-class BlogPagination(PageNumberPagination):
+class BlogPagination(KeysetPagination):
     page_size = 6            # 5 por página
     page_size_query_param = "page_size"
     max_page_size = 20
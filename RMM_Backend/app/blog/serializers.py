@@ -1,7 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Blog, ComentarioBlog, LikeBlog
-from app.articles.serializers import ArticuloSerializer
+from app.articles.serializers import ArticuloRelacionadoSerializer
+from app.common.archivado import comentarios_de
+from app.common.queries import armar_arbol, generar_extracto
+from app.common.serializers import (
+    SparseFieldsetMixin, FragmentCacheMixin, FragmentCacheListSerializer, ArbolComentariosListSerializer
+)
 
 User = get_user_model()
 
@@ -41,7 +46,7 @@ class LikeBlogSerializer(serializers.ModelSerializer):
         read_only_fields = ["usuario", "creado_en"]
 
 
-class ComentarioBlogSerializer(serializers.ModelSerializer):
+class ComentarioBlogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     
     autor = AutorBlogSerializer(read_only=True)
     respuestas = serializers.SerializerMethodField()
@@ -58,10 +63,12 @@ class ComentarioBlogSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ComentarioBlog
+        list_serializer_class = ArbolComentariosListSerializer
         fields = [
             "id", "blog", "autor", "contenido", "parent", "nivel", "creado_en", "respuestas"
         ]
         read_only_fields = ["autor", "nivel", "creado_en", "respuestas"]
+        field_dependencies = {"respuestas": []}
 
     def validate_parent(self, value):
         if value and value.nivel >= ComentarioBlog.MAX_DEPTH:
@@ -69,9 +76,12 @@ class ComentarioBlogSerializer(serializers.ModelSerializer):
         return value
 
     def get_respuestas(self, obj):
-        # Se optimiza para evitar N+1 queries usando prefetch_related en view
+        # Árbol cargado por nivel por ArbolComentariosListSerializer (evita N+1)
+        respuestas = getattr(obj, "respuestas_cargadas", None)
+        if respuestas is None:
+            respuestas = obj.respuestas.all()
         return ComentarioBlogSerializer(
-            obj.respuestas.all().order_by("-creado_en"),
+            respuestas,
             many=True,
             context=self.context
         ).data
@@ -81,10 +91,65 @@ class ComentarioBlogSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class BlogSerializer(serializers.ModelSerializer):
+def serializar_comentarios(blog, context):
+    """
+    Árbol de comentarios de una noticia (detalle y `?expand=comentarios` del
+    listado): los principales con sus respuestas anidadas.
+    """
+    # Todos los comentarios en una consulta (o del prefetch `comentarios_cargados`)
+    comentarios = getattr(blog, "comentarios_cargados", None)
+    if blog.interacciones_archivadas:
+        comentarios = comentarios_de(blog)  # Archivo frío (ver app/common/archivado.py)
+    elif comentarios is None:
+        comentarios = list(blog.comentarios.select_related("autor"))
+    return ComentarioBlogSerializer(armar_arbol(comentarios), many=True, context=context).data
+
+
+class BlogListSerializer(FragmentCacheMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Representación resumida de noticias para los listados.
+
+    Sin el HTML completo de `contenido` ni el árbol de comentarios de la
+    noticia: extracto en texto plano y conteos anotados por el queryset
+    (ver `BlogViewSet.get_queryset`). El detalle usa `BlogSerializer`.
+
+    Ambos se pueden pedir con `?expand=contenido,comentarios`.
+    """
+    extracto = serializers.SerializerMethodField()
+    comentarios_count = serializers.IntegerField(read_only=True)
+    likes_count = serializers.IntegerField(read_only=True)
+    articulos = ArticuloRelacionadoSerializer(many=True, read_only=True)
+
+    # Incluye la de los artículos embebidos (anotada por BlogViewSet.get_queryset)
+    fragment_version_field = "version"
+
+    class Meta:
+        model = Blog
+        list_serializer_class = FragmentCacheListSerializer
+        fields = [
+            "id", "titulo_blog", "extracto", "imagen_principal", "banner", "fecha_publicacion",
+            "comentarios_count", "likes_count", "articulos"
+        ]
+        expandable_fields = {
+            "contenido": lambda: serializers.CharField(read_only=True),
+            "comentarios": lambda: serializers.SerializerMethodField(),
+        }
+        field_dependencies = {
+            "extracto": [], "comentarios_count": [], "likes_count": [], "comentarios": ["interacciones_archivadas"],
+        }
+
+    def get_extracto(self, obj):
+        return generar_extracto(getattr(obj, "inicio_contenido", ""))
+
+    def get_comentarios(self, obj):
+        return serializar_comentarios(obj, self.context)
+
+
+class BlogSerializer(FragmentCacheMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     comentarios = serializers.SerializerMethodField()
     likes_count = serializers.SerializerMethodField()
-    articulos = ArticuloSerializer(many=True, read_only=True)
+    # Representación compacta: el artículo completo está en /articles/articulos/{id}/
+    articulos = ArticuloRelacionadoSerializer(many=True, read_only=True)
     articulos_ids = serializers.ListField(
         child=serializers.IntegerField(),
         write_only=True,
@@ -92,23 +157,23 @@ class BlogSerializer(serializers.ModelSerializer):
         help_text="Lista de IDs de artículos a asociar con este blog"
     )
 
+    # Incluye la de los artículos embebidos (anotada por BlogViewSet.get_queryset)
+    fragment_version_field = "version"
+
     class Meta:
         model = Blog
+        list_serializer_class = FragmentCacheListSerializer
         fields = [
             "id", "titulo_blog", "contenido", "imagen_principal", "banner", "fecha_publicacion",
             "comentarios", "likes_count", "articulos", "articulos_ids"
         ]
+        field_dependencies = {"comentarios": ["interacciones_archivadas"], "likes_count": ["likes_archivados"]}
 
     def get_comentarios(self, obj):
-        comentarios_principales = obj.comentarios.filter(parent__isnull=True)
-        return ComentarioBlogSerializer(
-            comentarios_principales,
-            many=True,
-            context=self.context
-        ).data
+        return serializar_comentarios(obj, self.context)
 
     def get_likes_count(self, obj):
-        return obj.likes.count()
+        return obj.likes.count() + obj.likes_archivados
 
     def create(self, validated_data):
         # Extraer los IDs de artículos
@@ -1,3 +1,97 @@
-from django.test import TestCase
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from app.articles.models import Articulos, LikeArticulo
+from app.common.testing import PRESUPUESTOS, PresupuestoConsultasMixin, crear_articulo, crear_usuario
+
+from .models import Blog
+
+
+class NoticiasPresupuestoTests(PresupuestoConsultasMixin, TestCase):
+    presupuestos = PRESUPUESTOS['blog']
+
+
+@override_settings(FRAGMENT_CACHE_ENABLED=True)
+class FragmentoNoticiaTests(TestCase):
+    """El fragmento en caché de la noticia se renueva cuando cambian sus artículos o el M2M."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.articulo = crear_articulo("Original")
+        cls.otro = crear_articulo("Otro", fecha_publicacion="2025-01-02")
+        cls.blog = Blog.objects.create(titulo_blog="Noticia", fecha_publicacion="2025-01-03")
+        cls.blog.articulos.add(cls.articulo)
+        cls.lector = crear_usuario()
+
+    def setUp(self):
+        caches["default"].clear()
+        self.client = APIClient()
+
+    def detalle_noticia(self):
+        return self.client.get(f"/api/v1/noticias/noticias/{self.blog.pk}/").json()
+
+    def test_cambios_del_articulo_y_del_m2m_renuevan_la_noticia(self):
+        self.assertEqual([articulo["titulo_articulo"] for articulo in self.detalle_noticia()["articulos"]], ["Original"])
+
+        articulo = Articulos.objects.get(pk=self.articulo.pk)
+        articulo.titulo_articulo = "Editado"
+        articulo.save()
+        self.assertEqual([articulo["titulo_articulo"] for articulo in self.detalle_noticia()["articulos"]], ["Editado"])
+
+        LikeArticulo.objects.create(articulo=self.articulo, usuario=self.lector)
+        self.assertEqual(self.detalle_noticia()["articulos"][0]["likes_count"], 1)
+
+        self.blog.articulos.add(self.otro)
+        self.assertCountEqual([articulo["id"] for articulo in self.detalle_noticia()["articulos"]], [self.articulo.pk, self.otro.pk])
+        self.blog.articulos.remove(self.articulo)
+        self.assertEqual([articulo["id"] for articulo in self.detalle_noticia()["articulos"]], [self.otro.pk])
+
+
+class VersionNoticiasTests(TestCase):
+    """Versión de las noticias con los artículos embebidos (`version_de`)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.articulo = crear_articulo()
+        cls.noticia = Blog.objects.create(titulo_blog="Noticia", fecha_publicacion="2025-01-02")
+        cls.noticia.articulos.add(cls.articulo)
+        cls.lector = crear_usuario()
+
+    def test_like_en_un_articulo_embebido_cambia_el_etag_sin_tocar_la_noticia(self):
+        client = APIClient()
+        urls = ["/api/v1/noticias/noticias/", f"/api/v1/noticias/noticias/{self.noticia.pk}/"]
+        etags = [client.get(url).headers["ETag"] for url in urls]
+        marca = Blog.objects.get(pk=self.noticia.pk).actualizado_en
+
+        LikeArticulo.objects.create(articulo=self.articulo, usuario=self.lector)
+
+        self.assertEqual(Blog.objects.get(pk=self.noticia.pk).actualizado_en, marca)
+        for url, etag in zip(urls, etags):
+            with self.subTest(url=url):
+                respuesta = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(respuesta.status_code, 200)
+                self.assertNotEqual(respuesta.headers["ETag"], etag)
+
+
+class ArticulosPickerTests(TestCase):
+    """Búsqueda del selector de artículos (`articulos_picker`)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.noticia = Blog.objects.create(titulo_blog="Noticia", fecha_publicacion="2025-01-02")
+        for titulo in ("Minería en Perú", "Perú: nuevas concesiones", "Exploración en Chile"):
+            crear_articulo(titulo)
+        cls.admin = crear_usuario("admin", is_staff=True)
+
+    def buscar(self, texto):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        respuesta = client.get(f"/api/v1/noticias/noticias/{self.noticia.pk}/articulos_picker/", {"search": texto})
+        self.assertEqual(respuesta.status_code, 200)
+        return sorted(articulo["titulo_articulo"] for articulo in respuesta.data["results"])
+
+    def test_busca_en_cualquier_parte_del_titulo(self):
+        self.assertEqual(self.buscar("peru"), ["Minería en Perú", "Perú: nuevas concesiones"])
+        self.assertEqual(self.buscar("PERU mineria"), ["Minería en Perú"])
+        self.assertEqual(self.buscar("exploracion chile"), ["Exploración en Chile"])
@@ -1,16 +1,31 @@
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import Blog, ComentarioBlog, LikeBlog
-from .serializers import BlogSerializer, ComentarioBlogSerializer, LikeBlogSerializer
+from .serializers import BlogSerializer, BlogListSerializer, ComentarioBlogSerializer, LikeBlogSerializer
 from .pagination import BlogPagination
-from drf_spectacular.utils import extend_schema
-from app.articles.serializers import ArticuloSerializer
-from app.common.filters import AccentInsensitiveSearchFilter
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from app.articles.models import Articulos, ComentarioArticulo, LikeArticulo
+from app.articles.pagination import ArticuloPickerPagination
+from app.articles.serializers import ArticuloSerializer, ArticuloRelacionadoSerializer, ArticuloPickerSerializer
+from app.common.filters import normalizar_busqueda
+from app.common.archivo import resumen as resumen_archivo
+from app.common.filters import AccentInsensitiveSearchFilter, ArchivoFechaFilter
 from app.common.permissions import CanManageContent, CanComment, CanLike
+from app.common.escritor import escritura_serializada
+from app.common.mixins import (
+    AnonymousCacheMixin, CDNCacheMixin, ConditionalGetMixin, EliminacionSuaveMixin, EscrituraSerializadaMixin,
+    FragmentCacheViewMixin, HiloArchivadoMixin, SparseFieldsetViewMixin,
+)
+from app.common.archivado import likes_de, principales_de, restaurar
+from app.common.queries import contar_interacciones, inicio_contenido, prefetch_comentarios
+from app.common.serializers import ArchivoAnioSerializer
+from app.common.signals import version_de
 
 # ----------------------------
 # 📌 PERMISOS PERSONALIZADOS
@@ -23,7 +38,10 @@ from app.common.permissions import CanManageContent, CanComment, CanLike
     tags=["Blogs - listar"],
     description="Endpoints para consultar blogs con paginación y búsqueda (solo lectura)."
 )
-class BlogViewSet(viewsets.ModelViewSet):
+class BlogViewSet(
+    AnonymousCacheMixin, CDNCacheMixin, ConditionalGetMixin, EliminacionSuaveMixin, FragmentCacheViewMixin,
+    SparseFieldsetViewMixin, viewsets.ModelViewSet,
+):
     """
     ViewSet SOLO DE LECTURA para listar y ver detalles de blogs.
 
@@ -36,8 +54,22 @@ class BlogViewSet(viewsets.ModelViewSet):
       - Buscar "noticia" encontrará "noticia" y "noticias"
       - Buscar "tecnología" encontrará "tecnologia" y "tecnología"
     - 📄 Paginación: 5 blogs por página (?page=1, ?page_size=10)
+      o por cursor sin COUNT(*): ?pagination=cursor y luego el `next` (?cursor=...)
     - 👁️ Solo lectura: GET /list/ y GET /detail/ disponibles
     - 📌 Cada blog incluye su categoría, artículos relacionados, comentarios y likes
+    - 📰 Los artículos relacionados vienen en forma compacta (sin contenido ni
+      comentarios) y se cargan con una sola consulta para toda la página
+    - 📋 El listado usa una representación resumida (extracto, conteos de
+      comentarios y likes, sin árbol de comentarios); el detalle trae todo
+    - 🧩 Campos a medida: ?fields=id,titulo_blog y ?expand=contenido,comentarios
+    - 🔁 GET condicional: ETag / Last-Modified; con If-None-Match vigente responde 304
+    - ⚡ Caché de respuestas anónimas del listado (RESPONSE_CACHE_ENABLED)
+    - 🌐 CDN: Cache-Control y CDN-Tag por acción (CDN_CACHE_HEADERS_ENABLED)
+    - 🗓️ Archivo por fechas: GET archivo/ (conteos por año y mes) y ?year=2025&month=10
+    - 🧊 Archivo frío: los comentarios y likes de contenido antiguo se leen de
+      ahí (conteos incluidos) y vuelven a las tablas al comentar o dar like
+    - 🗑️ DELETE (admin) oculta al instante; comentarios y likes se purgan
+      después, en lotes (ver app/common/eliminacion.py)
 
     Ejemplos de uso:
     - GET /api/v1/blog/?search=django
@@ -50,15 +82,79 @@ class BlogViewSet(viewsets.ModelViewSet):
     permission_classes = [CanManageContent]  # Lectura: Todos | Escritura: Admin/Superusuario
     pagination_class = BlogPagination
 
+    # Caché de respuestas anónimas (ver AnonymousCacheMixin)
+    response_cache_actions = ('list',)
+    response_cache_tags = (
+        'blog.Blog', 'blog.ComentarioBlog', 'blog.LikeBlog',
+        'articles.Articulos', 'articles.LikeArticulo',  # Artículos relacionados embebidos
+    )
+
+    # Caché en el CDN (ver CDNCacheMixin)
+    cdn_policies = {'list': 'listado', 'retrieve': 'detalle', 'archivo': 'listado'}
+    cdn_content = 'blog.Blog'
+    cdn_tag_fields = {'articulos': 'articles.Articulos'}
+
+    # GET condicional y caché de fragmentos: la versión incluye la de los
+    # artículos embebidos (ver app/common/signals.py)
+    conditional_version_field = 'version'
+
     # Configuración de búsqueda (con soporte para búsqueda sin acentos)
-    filter_backends = [AccentInsensitiveSearchFilter]
+    filter_backends = [AccentInsensitiveSearchFilter, ArchivoFechaFilter]
     search_fields = ['titulo_blog', 'contenido']
+    archive_date_field = 'fecha_publicacion'
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return BlogListSerializer
+        return BlogSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method in ('GET', 'HEAD'):
+            queryset = queryset.annotate(version=version_de('blog.Blog'))
+        if self.request.method in ('GET', 'HEAD') and self.field_requested('articulos'):
+            # Todos los artículos relacionados de la página en una consulta, con likes anotados
+            queryset = queryset.prefetch_related(Prefetch(
+                'articulos',
+                queryset=Articulos.objects.only(*ArticuloRelacionadoSerializer.COLUMNAS).annotate(
+                    likes_count=contar_interacciones(LikeArticulo, 'articulo', 'likes_archivados')
+                ),
+            ))
+        if self.request.method in ('GET', 'HEAD') and self.field_requested('comentarios'):
+            # Todos los comentarios de la página en una consulta; el árbol se arma en memoria
+            queryset = queryset.prefetch_related(
+                prefetch_comentarios(ComentarioBlog.objects.select_related('autor'))
+            )
+        if self.action == 'list':
+            # Listado: sin el HTML completo y con conteos calculados en la misma consulta.
+            # Solo se anota lo que la respuesta va a incluir (?fields= / ?expand=)
+            if not self.field_requested('contenido'):
+                queryset = queryset.defer('contenido')
+            if self.field_requested('extracto'):
+                queryset = queryset.annotate(inicio_contenido=inicio_contenido())
+            if self.field_requested('comentarios_count'):
+                queryset = queryset.annotate(
+                    comentarios_count=contar_interacciones(ComentarioBlog, 'blog', 'comentarios_archivados')
+                )
+            if self.field_requested('likes_count'):
+                queryset = queryset.annotate(likes_count=contar_interacciones(LikeBlog, 'blog', 'likes_archivados'))
+        return queryset
+
+    @extend_schema(
+        summary="Archivo por fechas",
+        description="Cantidad de noticias publicadas por año y mes, desde la tabla de resumen.",
+        responses=ArchivoAnioSerializer(many=True),
+    )
+    @action(detail=False, methods=['get'])
+    def archivo(self, request):
+        return Response(resumen_archivo('blog.Blog'))
 
     @extend_schema(
         tags=["Blogs - Reacciones"],
         description="Dar o quitar 'me gusta' a un blog."
     )
     @action(detail=True, methods=["post"], permission_classes=[CanLike])
+    @escritura_serializada
     def toggle_like(self, request, pk=None):
         """
         Acción para dar o quitar 'like' a un blog completo.
@@ -79,6 +175,8 @@ class BlogViewSet(viewsets.ModelViewSet):
         """
         blog = get_object_or_404(Blog, pk=pk)
         user = request.user
+        # Si sus likes están en el archivo frío, vuelven a las tablas antes de leerlos
+        restaurar(blog)
         
         # Obtener la acción solicitada
         action = request.data.get('action', None)
@@ -195,7 +293,10 @@ class BlogViewSet(viewsets.ModelViewSet):
         blog = get_object_or_404(Blog, pk=pk)
         
         # Obtener todos los likes del blog
-        likes = LikeBlog.objects.filter(blog=blog).select_related('usuario').order_by('-creado_en')
+        if blog.interacciones_archivadas:
+            likes = likes_de(blog)  # Archivo frío (ver app/common/archivado.py)
+        else:
+            likes = LikeBlog.objects.filter(blog=blog).select_related('usuario').order_by('-creado_en')
         
         # Serializar la información de los usuarios
         from .serializers import LikeBlogSerializer
@@ -206,8 +307,11 @@ class BlogViewSet(viewsets.ModelViewSet):
         user_info = None
         
         if request.user.is_authenticated:
-            user_like = LikeBlog.objects.filter(blog=blog, usuario=request.user).first()
-            user_liked = bool(user_like)
+            if blog.interacciones_archivadas:
+                user_liked = any(like.usuario_id == request.user.id for like in likes)
+            else:
+                user_like = LikeBlog.objects.filter(blog=blog, usuario=request.user).first()
+                user_liked = bool(user_like)
             user_info = {
                 "id": request.user.id,
                 "email": request.user.email,
@@ -220,16 +324,24 @@ class BlogViewSet(viewsets.ModelViewSet):
                 "blog": {
                     "id": blog.id,
                     "titulo": blog.titulo_blog,
-                    "likes_count": likes.count()
+                    "likes_count": len(likes)
                 },
                 "likes_list": likes_data,
                 "current_user": user_info,
                 "user_liked": user_liked,
-                "total_likes": likes.count()
+                "total_likes": len(likes)
             },
             status=status.HTTP_200_OK
         )
 
+    def articulos_completos(self, articulos):
+        """Artículos listos para `ArticuloSerializer`: likes anotados y comentarios en una consulta."""
+        return articulos.annotate(
+            likes_count=contar_interacciones(LikeArticulo, 'articulo', 'likes_archivados')
+        ).prefetch_related(
+            prefetch_comentarios(ComentarioArticulo.objects.select_related('autor'))
+        )
+
     @extend_schema(
         tags=["Blogs - Artículos"],
         description="Lista todos los artículos relacionados con un blog específico."
@@ -241,7 +353,7 @@ class BlogViewSet(viewsets.ModelViewSet):
         (También están disponibles directamente en el GET del blog).
         """
         blog = get_object_or_404(Blog, pk=pk)
-        articulos = blog.articulos.all()
+        articulos = self.articulos_completos(blog.articulos.all())
         serializer = ArticuloSerializer(articulos, many=True, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -313,7 +425,9 @@ class BlogViewSet(viewsets.ModelViewSet):
 
     @extend_schema(
         tags=["Blogs - Artículos"],
-        description="Obtiene artículos disponibles y elegidos para un blog específico."
+        description="Obtiene artículos disponibles y elegidos para un blog específico. "
+                    "Obsoleto: serializa todos los artículos completos; usar `articulos_picker`.",
+        deprecated=True,
     )
     @action(detail=True, methods=["get"], permission_classes=[permissions.IsAdminUser])
     def articulos_management(self, request, pk=None):
@@ -328,10 +442,10 @@ class BlogViewSet(viewsets.ModelViewSet):
         
         # Obtener todos los artículos
         from app.articles.models import Articulos
-        todos_los_articulos = Articulos.objects.all().order_by('-fecha_publicacion')
+        todos_los_articulos = self.articulos_completos(Articulos.objects.all().order_by('-fecha_publicacion'))
         
         # Obtener artículos ya asociados al blog
-        articulos_elegidos = blog.articulos.all().order_by('-fecha_publicacion')
+        articulos_elegidos = self.articulos_completos(blog.articulos.all().order_by('-fecha_publicacion'))
         
         # Serializar los artículos
         articulos_disponibles_serializer = ArticuloSerializer(todos_los_articulos, many=True, context={"request": request})
@@ -353,6 +467,50 @@ class BlogViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK
         )
 
+    @extend_schema(
+        tags=["Blogs - Artículos"],
+        description="Selector liviano de artículos para un blog: búsqueda sin acentos, "
+                    "paginación por cursor y los IDs ya elegidos como lista.",
+        parameters=[
+            OpenApiParameter("search", OpenApiTypes.STR, description="Texto a buscar en el título (ignora acentos)"),
+            OpenApiParameter("cursor", OpenApiTypes.STR, description="Cursor devuelto en `next` / `previous`"),
+            OpenApiParameter("page_size", OpenApiTypes.INT, description="Artículos por página (máx. 50)"),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=True, methods=["get"], permission_classes=[permissions.IsAdminUser])
+    def articulos_picker(self, request, pk=None):
+        """
+        Endpoint para el selector de artículos del editor de noticias.
+
+        - 🔎 ?search= busca cada término en cualquier parte del título normalizado
+          (sin acentos ni mayúsculas: "peru" encuentra "Minería en Perú")
+        - 📄 Paginación por cursor: ?cursor=<valor de next/previous>
+        - ✅ `articulos_elegidos_ids` trae los IDs asociados al blog como lista plana
+
+        Respuesta:
+            {"blog": {...}, "articulos_elegidos_ids": [..], "next": ..., "previous": ..., "results": [...]}
+        """
+        blog = get_object_or_404(Blog.objects.only("id", "titulo_blog"), pk=pk)
+
+        articulos = Articulos.objects.only(*ArticuloPickerSerializer.COLUMNAS)
+        for termino in normalizar_busqueda(request.query_params.get("search", "")).split():
+            articulos = articulos.filter(titulo_busqueda__contains=termino)
+
+        paginator = ArticuloPickerPagination()
+        pagina = paginator.paginate_queryset(articulos, request, view=self)
+        respuesta = paginator.get_paginated_response(ArticuloPickerSerializer(pagina, many=True).data)
+
+        respuesta.data = {
+            "blog": {"id": blog.id, "titulo_blog": blog.titulo_blog},
+            "articulos_elegidos_ids": list(
+                blog.articulos.through.objects.filter(blog_id=blog.id)
+                .order_by("articulos_id").values_list("articulos_id", flat=True)
+            ),
+            **respuesta.data,
+        }
+        return respuesta
+
 
 
 
@@ -378,16 +536,20 @@ class BlogViewSet(viewsets.ModelViewSet):
         """
         blog = get_object_or_404(Blog, pk=pk)
         
-        # Obtener comentarios principales del blog
-        comentarios = ComentarioBlog.objects.filter(
-            blog=blog, 
-            parent__isnull=True
-        ).select_related('autor').order_by('-creado_en')
-        
-        # Aplicar búsqueda si se proporciona
         search = request.query_params.get('search')
-        if search:
-            comentarios = comentarios.filter(contenido__icontains=search)
+        if blog.interacciones_archivadas:
+            # Hilo en el archivo frío (ver app/common/archivado.py)
+            comentarios = principales_de(blog, search)
+        else:
+            # Obtener comentarios principales del blog
+            comentarios = ComentarioBlog.objects.filter(
+                blog=blog, 
+                parent__isnull=True
+            ).select_related('autor').order_by('-creado_en')
+        
+            # Aplicar búsqueda si se proporciona
+            if search:
+                comentarios = comentarios.filter(contenido__icontains=search)
         
         # Aplicar paginación
         paginator = BlogPagination()
@@ -407,17 +569,25 @@ class BlogViewSet(viewsets.ModelViewSet):
 # COMENTARIOS
 # ==========================
 @extend_schema(tags=["Blogs - Comentarios"], description="CRUD de comentarios (todos los niveles) con búsqueda sin acentos.")
-class ComentarioBlogViewSet(viewsets.ModelViewSet):
+class ComentarioBlogViewSet(
+    HiloArchivadoMixin, EscrituraSerializadaMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet,
+):
     serializer_class = ComentarioBlogSerializer
     permission_classes = [CanComment]  # Lectura: Todos | Comentar: Autenticados | Editar: Autor o Admin
     filter_backends = [DjangoFilterBackend, AccentInsensitiveSearchFilter]
     filterset_fields = ['blog', 'parent']
     search_fields = ['contenido']
 
+    # Hilos en el archivo frío (ver HiloArchivadoMixin)
+    campo_contenido = 'blog'
+
     def get_queryset(self):
-        qs = ComentarioBlog.objects.all().select_related('autor', 'blog').prefetch_related(
-            'respuestas__autor', 'respuestas__respuestas__autor'
-        ).order_by('-creado_en')
+        # Las respuestas anidadas se cargan una consulta por nivel (ArbolComentariosListSerializer)
+        # Sin los comentarios de noticias eliminadas que esperan su purga
+        qs = (
+            ComentarioBlog.objects.filter(blog__eliminado_en__isnull=True)
+            .select_related('autor', 'blog').order_by('-creado_en')
+        )
 
         blog_id = self.request.query_params.get('blog')
         if blog_id:
@@ -430,8 +600,11 @@ class ComentarioBlogViewSet(viewsets.ModelViewSet):
     @extend_schema(tags=["Blogs - Comentarios"], description="Lista paginada de respuestas directas de un comentario (1 nivel).")
     @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
     def children(self, request, pk=None):
-        comentario = get_object_or_404(ComentarioBlog, pk=pk)
-        hijos = comentario.respuestas.all().select_related('autor')
+        comentario = self.get_object()
+        # Un comentario del archivo frío ya trae su árbol (ver HiloArchivadoMixin)
+        hijos = getattr(comentario, 'respuestas_cargadas', None)
+        if hijos is None:
+            hijos = comentario.respuestas.all().select_related('autor')
 
         paginator = BlogPagination()
         page = paginator.paginate_queryset(hijos, request, view=self)
@@ -1,3 +1,51 @@
 from django.contrib import admin
 
-# Register your models here.
+from .eliminacion import eliminar, reintentar
+from .models import ArchivoMensual, EliminacionPendiente, PurgaCDN
+
+
+class EliminacionSuaveAdminMixin:
+    """
+    Eliminación en dos fases desde el admin (ver app/common/eliminacion.py).
+
+    La confirmación no recorre la cascada (justo lo que se quiere evitar en
+    la petición): lista solo los objetos elegidos. El avance de la purga se
+    ve en Eliminaciones pendientes.
+    """
+
+    def get_deleted_objects(self, objs, request):
+        objetos = list(objs)
+        return [str(objeto) for objeto in objetos], {self.opts.verbose_name_plural: len(objetos)}, set(), []
+
+    def delete_model(self, request, obj):
+        eliminar(obj)
+
+    def delete_queryset(self, request, queryset):
+        for objeto in queryset:
+            eliminar(objeto)
+
+
+@admin.register(PurgaCDN)
+class PurgaCDNAdmin(admin.ModelAdmin):
+    list_display = ('etiqueta', 'creado_en', 'procesado_en', 'intentos')
+    list_filter = ('procesado_en',)
+    search_fields = ('etiqueta',)
+
+
+@admin.register(ArchivoMensual)
+class ArchivoMensualAdmin(admin.ModelAdmin):
+    list_display = ('contenido', 'anio', 'mes', 'total')
+    list_filter = ('contenido', 'anio')
+
+
+@admin.register(EliminacionPendiente)
+class EliminacionPendienteAdmin(admin.ModelAdmin):
+    list_display = ('contenido', 'objeto_id', 'solicitado_en', 'iniciado_en', 'terminado_en', 'filas_borradas', 'intentos')
+    list_filter = ('contenido', 'terminado_en')
+    readonly_fields = ('error',)
+    actions = ('reintentar_purga',)
+
+    @admin.action(description='Reintentar la purga de las seleccionadas')
+    def reintentar_purga(self, request, queryset):
+        reactivadas = reintentar(queryset)
+        self.message_user(request, f'Eliminaciones reactivadas: {reactivadas}')
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.common'
+
+    def ready(self):
+        from . import archivo, cache, cdn, exportacion, likes, signals, sqlite
+        sqlite.conectar_senales()
+        likes.conectar_senales()
+        signals.conectar_senales()
+        cache.conectar_senales()
+        cdn.conectar_senales()
+        exportacion.conectar_senales()
+        archivo.conectar_senales()
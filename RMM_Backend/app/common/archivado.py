@@ -0,0 +1,360 @@
+"""
+Archivo frío de comentarios y likes de contenidos antiguos.
+
+Las tablas de comentarios y likes crecen sin límite, pero solo se leen las
+del contenido reciente. `archivar()` mueve los comentarios y likes de los
+artículos y noticias publicados antes del horizonte, y sin interacciones
+desde entonces, a `ComentarioArchivado` y `LikeArchivado`: tablas compactas
+sin FK al contenido, con el id original de cada fila.
+
+Se archiva el hilo completo de cada objeto, que queda marcado con
+`interacciones_archivadas` y guarda sus conteos (`comentarios_archivados`,
+`likes_archivados`). Un objeto tiene sus interacciones en las tablas
+normales o en el archivo, nunca repartidas:
+
+- Lectura: los endpoints consultan el archivo solo si la marca está puesta
+  (`comentarios_de`, `likes_de`); los conteos suman el contador del objeto
+  (ver `queries.contar_interacciones`).
+- Escritura: antes de comentar o dar like en un hilo archivado se restaura
+  (`restaurar`), con los mismos ids y fechas.
+
+Mover filas no cambia la representación en la API, así que ni archivar ni
+restaurar emiten señales ni tocan `actualizado_en`.
+
+Lo usa el comando `archivar_interacciones`.
+"""
+
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import ComentarioArchivado, LikeArchivado
+from .queries import armar_arbol
+
+# Campos del contenido que describen el archivo (no se exportan)
+CAMPOS_ARCHIVO = ('interacciones_archivadas', 'comentarios_archivados', 'likes_archivados')
+
+
+class TipoArchivable(NamedTuple):
+    modelo: str        # app_label.Modelo del contenido
+    comentario: str    # app_label.Modelo de sus comentarios
+    like: str          # app_label.Modelo de sus likes
+    campo_objeto: str  # FK de comentarios y likes al contenido
+
+    def get_model(self):
+        return apps.get_model(self.modelo)
+
+    def get_model_comentario(self):
+        return apps.get_model(self.comentario)
+
+    def get_model_like(self):
+        return apps.get_model(self.like)
+
+
+ARCHIVO_FRIO = {
+    'articles.Articulos': TipoArchivable(
+        'articles.Articulos', 'articles.ComentarioArticulo', 'articles.LikeArticulo', 'articulo',
+    ),
+    'blog.Blog': TipoArchivable('blog.Blog', 'blog.ComentarioBlog', 'blog.LikeBlog', 'blog'),
+}
+# Tabla de comentarios o likes -> tipo archivable al que pertenece
+POR_INTERACCION = {
+    **{tipo.comentario: tipo for tipo in ARCHIVO_FRIO.values()},
+    **{tipo.like: tipo for tipo in ARCHIVO_FRIO.values()},
+}
+
+
+def horizonte(dias=None):
+    """Momento antes del cual el contenido y sus interacciones se consideran fríos."""
+    if dias is None:
+        dias = getattr(settings, 'COLD_ARCHIVE_DAYS', 730)
+    return timezone.now() - timedelta(days=dias)
+
+
+# ============================================================================
+# ARCHIVAR
+# ============================================================================
+
+def candidatos(tipo, limite):
+    """Objetos publicados antes de `limite`, sin cambios desde entonces y con interacciones."""
+    Comentario = tipo.get_model_comentario()
+    Like = tipo.get_model_like()
+    return (
+        tipo.get_model().objects
+        .filter(
+            interacciones_archivadas=False,
+            fecha_publicacion__lt=timezone.localtime(limite).date(),
+            # actualizado_en incluye el último comentario o like (ver signals.py)
+            actualizado_en__lt=limite,
+        )
+        .filter(
+            Exists(Comentario.objects.filter(**{tipo.campo_objeto: OuterRef('pk')}))
+            | Exists(Like.objects.filter(**{tipo.campo_objeto: OuterRef('pk')}))
+        )
+        .order_by('pk')
+    )
+
+
+def archivar(tipo, limite, tamano_lote=200):
+    """
+    Archiva los hilos de los candidatos de `tipo`, `tamano_lote` objetos por
+    transacción.
+
+    Returns:
+        Tupla (objetos, comentarios, likes) archivados.
+    """
+    Comentario = tipo.get_model_comentario()
+    Like = tipo.get_model_like()
+    columna = f'{tipo.campo_objeto}_id'
+    totales = [0, 0, 0]
+
+    while True:
+        with transaction.atomic():
+            objetos = list(candidatos(tipo, limite).only('pk')[:tamano_lote])
+            if not objetos:
+                break
+            ids = [objeto.pk for objeto in objetos]
+            comentarios = Comentario.objects.filter(**{f'{columna}__in': ids})
+            likes = Like.objects.filter(**{f'{columna}__in': ids})
+
+            archivados = ComentarioArchivado.objects.bulk_create([
+                ComentarioArchivado(
+                    tipo_contenido=tipo.modelo,
+                    objeto_id=fila[columna],
+                    original_id=fila['pk'],
+                    parent_original_id=fila['parent_id'],
+                    autor_id=fila['autor_id'],
+                    contenido=fila['contenido'],
+                    nivel=fila['nivel'],
+                    creado_en=fila['creado_en'],
+                )
+                for fila in comentarios.values('pk', columna, 'parent_id', 'autor_id', 'contenido', 'nivel', 'creado_en')
+            ])
+            likes_archivados = LikeArchivado.objects.bulk_create([
+                LikeArchivado(
+                    tipo_contenido=tipo.modelo,
+                    objeto_id=fila[columna],
+                    original_id=fila['pk'],
+                    usuario_id=fila['usuario_id'],
+                    creado_en=fila['creado_en'],
+                )
+                for fila in likes.values('pk', columna, 'usuario_id', 'creado_en')
+            ])
+
+            por_objeto = {pk: [0, 0] for pk in ids}
+            for comentario in archivados:
+                por_objeto[comentario.objeto_id][0] += 1
+            for like in likes_archivados:
+                por_objeto[like.objeto_id][1] += 1
+            for objeto in objetos:
+                objeto.interacciones_archivadas = True
+                objeto.comentarios_archivados, objeto.likes_archivados = por_objeto[objeto.pk]
+            # bulk_update no toca actualizado_en (auto_now solo se aplica en save())
+            tipo.get_model().objects.bulk_update(objetos, CAMPOS_ARCHIVO)
+
+            # Sin señales: el contenido se sigue viendo igual (ver docstring del módulo)
+            comentarios._raw_delete(comentarios.db)
+            likes._raw_delete(likes.db)
+
+        totales[0] += len(objetos)
+        totales[1] += len(archivados)
+        totales[2] += len(likes_archivados)
+    return tuple(totales)
+
+
+# ============================================================================
+# RESTAURAR
+# ============================================================================
+
+def restaurar(objeto):
+    """
+    Devuelve a las tablas normales los comentarios y likes archivados de
+    `objeto` (si los tiene). Se llama antes de escribir en su hilo.
+
+    Returns:
+        True si había algo que restaurar.
+    """
+    from .respaldo import conservar_fechas
+
+    if not getattr(objeto, 'interacciones_archivadas', False):
+        return False
+    tipo = ARCHIVO_FRIO[objeto._meta.label]
+    Comentario = tipo.get_model_comentario()
+    Like = tipo.get_model_like()
+    columna = f'{tipo.campo_objeto}_id'
+
+    with transaction.atomic():
+        # Quita la marca primero: si otra petición ya lo restauró, no hay nada que hacer
+        reclamado = type(objeto).objects.filter(pk=objeto.pk, interacciones_archivadas=True).update(
+            interacciones_archivadas=False, comentarios_archivados=0, likes_archivados=0,
+        )
+        if reclamado:
+            comentarios = ComentarioArchivado.objects.filter(tipo_contenido=tipo.modelo, objeto_id=objeto.pk)
+            likes = LikeArchivado.objects.filter(tipo_contenido=tipo.modelo, objeto_id=objeto.pk)
+
+            # Padres antes que respuestas; se omiten las respuestas cuyo padre ya no existe
+            # (por ejemplo, si se eliminó la cuenta de su autor)
+            restaurados = set()
+            nuevos = []
+            for fila in comentarios.order_by('nivel', 'original_id'):
+                if fila.parent_original_id is not None and fila.parent_original_id not in restaurados:
+                    continue
+                restaurados.add(fila.original_id)
+                nuevos.append(Comentario(
+                    pk=fila.original_id,
+                    parent_id=fila.parent_original_id,
+                    autor_id=fila.autor_id,
+                    contenido=fila.contenido,
+                    nivel=fila.nivel,
+                    creado_en=fila.creado_en,
+                    **{columna: objeto.pk},
+                ))
+            with conservar_fechas(Comentario):
+                Comentario.objects.bulk_create(nuevos)
+            with conservar_fechas(Like):
+                Like.objects.bulk_create([
+                    Like(pk=fila.original_id, usuario_id=fila.usuario_id, creado_en=fila.creado_en, **{columna: objeto.pk})
+                    for fila in likes
+                ])
+            comentarios.delete()
+            likes.delete()
+
+    objeto.interacciones_archivadas = False
+    objeto.comentarios_archivados = objeto.likes_archivados = 0
+    return bool(reclamado)
+
+
+def restaurar_por_id(modelo, pk):
+    """`restaurar` a partir del id (por ejemplo, el de un payload); no consulta nada si no es archivable."""
+    if modelo._meta.label not in ARCHIVO_FRIO or not pk:
+        return False
+    objeto = modelo.objects.filter(pk=pk, interacciones_archivadas=True).only('pk').first()
+    return restaurar(objeto) if objeto is not None else False
+
+
+# ============================================================================
+# LECTURA
+# ============================================================================
+
+def comentarios_de(objeto):
+    """
+    Comentarios archivados de `objeto` como instancias (no guardadas) del
+    modelo de comentarios, con `autor` cargado y del más reciente al más
+    antiguo, como `objeto.comentarios`.
+    """
+    tipo = ARCHIVO_FRIO[objeto._meta.label]
+    filas = (
+        ComentarioArchivado.objects
+        .filter(tipo_contenido=tipo.modelo, objeto_id=objeto.pk)
+        .select_related('autor')
+        .order_by('-creado_en')
+    )
+    return [_comentario(tipo, objeto, fila) for fila in filas]
+
+
+def principales_de(objeto, buscar=None):
+    """
+    Comentarios principales archivados de `objeto`, con el árbol de
+    respuestas armado (`respuestas_cargadas`) y filtrados por `buscar` como
+    un `contenido__icontains`.
+    """
+    principales = armar_arbol(comentarios_de(objeto))
+    if buscar:
+        principales = [comentario for comentario in principales if buscar.lower() in comentario.contenido.lower()]
+    return principales
+
+
+def comentario_archivado(modelo_comentario, pk):
+    """Comentario archivado con id original `pk` (con su objeto y su árbol de respuestas), o None."""
+    tipo = POR_INTERACCION.get(modelo_comentario._meta.label)
+    if tipo is None:
+        return None
+    fila = ComentarioArchivado.objects.filter(tipo_contenido=tipo.modelo, original_id=pk).first()
+    if fila is None:
+        return None
+    objeto = tipo.get_model().objects.get(pk=fila.objeto_id)
+    comentarios = comentarios_de(objeto)
+    armar_arbol(comentarios)
+    return next(comentario for comentario in comentarios if comentario.pk == fila.original_id)
+
+
+def likes_de(objeto):
+    """Likes archivados de `objeto` como instancias del modelo de likes, con `usuario` cargado."""
+    tipo = ARCHIVO_FRIO[objeto._meta.label]
+    Like = tipo.get_model_like()
+    filas = (
+        LikeArchivado.objects
+        .filter(tipo_contenido=tipo.modelo, objeto_id=objeto.pk)
+        .select_related('usuario')
+        .order_by('-creado_en')
+    )
+    likes = []
+    for fila in filas:
+        like = Like(pk=fila.original_id, usuario=fila.usuario, creado_en=fila.creado_en, **{tipo.campo_objeto: objeto})
+        like._state.adding = False
+        likes.append(like)
+    return likes
+
+
+def _comentario(tipo, objeto, fila):
+    comentario = tipo.get_model_comentario()(
+        pk=fila.original_id,
+        parent_id=fila.parent_original_id,
+        autor=fila.autor,
+        contenido=fila.contenido,
+        nivel=fila.nivel,
+        creado_en=fila.creado_en,
+        **{tipo.campo_objeto: objeto},
+    )
+    comentario._state.adding = False
+    return comentario
+
+
+# ============================================================================
+# EXPORTACIÓN
+# ============================================================================
+
+def filas_exportables(modelo, tamano_lote=1000):
+    """
+    Comentarios o likes archivados de la tabla `modelo` (app_label.Modelo)
+    como (pk, campos) en el formato de `respaldo.exportar`: al importarlos
+    quedan en las tablas normales.
+    """
+    tipo = POR_INTERACCION.get(modelo)
+    if tipo is None:
+        return
+    campo_usuario = apps.get_model(settings.AUTH_USER_MODEL).USERNAME_FIELD
+
+    if modelo == tipo.comentario:
+        filas = (
+            ComentarioArchivado.objects.filter(tipo_contenido=tipo.modelo)
+            .order_by('nivel', 'original_id')
+            .values('original_id', 'objeto_id', f'autor__{campo_usuario}', 'contenido', 'parent_original_id',
+                    'creado_en', 'nivel')
+        )
+        for fila in filas.iterator(chunk_size=tamano_lote):
+            yield fila['original_id'], {
+                tipo.campo_objeto: fila['objeto_id'],
+                'autor': fila[f'autor__{campo_usuario}'],
+                'contenido': fila['contenido'],
+                'parent': fila['parent_original_id'],
+                'creado_en': fila['creado_en'],
+                'nivel': fila['nivel'],
+            }
+    else:
+        filas = (
+            LikeArchivado.objects.filter(tipo_contenido=tipo.modelo)
+            .order_by('original_id')
+            .values('original_id', 'objeto_id', f'usuario__{campo_usuario}', 'creado_en')
+        )
+        for fila in filas.iterator(chunk_size=tamano_lote):
+            yield fila['original_id'], {
+                tipo.campo_objeto: fila['objeto_id'],
+                'usuario': fila[f'usuario__{campo_usuario}'],
+                'creado_en': fila['creado_en'],
+            }
@@ -0,0 +1,122 @@
+"""
+Archivo por fechas de artículos, noticias y ediciones.
+
+`ArchivoMensual` guarda cuántos contenidos de cada tipo se publicaron en
+cada mes. El endpoint `archivo` de cada ViewSet lo devuelve agrupado por
+año sin tocar las tablas de contenido:
+
+    [{"anio": 2025, "total": 30, "meses": [{"mes": 10, "nombre": "octubre", "total": 12}, ...]}]
+
+Al guardar o eliminar un contenido se recalculan solo los meses afectados
+(el de antes y el de después del cambio, con un GROUP BY sobre ese rango).
+Las operaciones masivas que no emiten señales (`bulk_create`, `update()`)
+se corrigen con el comando `actualizar_archivo`.
+"""
+
+from itertools import groupby
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .filters import rango_mes
+from .models import ArchivoMensual
+
+# app_label.Modelo -> campo de fecha de publicación
+ARCHIVABLES = {
+    'articles.Articulos': 'fecha_publicacion',
+    'blog.Blog': 'fecha_publicacion',
+    'magazine.Ediciones': 'fecha_publicacion',
+}
+
+NOMBRES_MESES = [
+    'enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio',
+    'julio', 'agosto', 'septiembre', 'octubre', 'noviembre', 'diciembre',
+]
+
+
+def recalcular(contenido, meses=None):
+    """
+    Recalcula los buckets de `contenido`: todos, o solo los `meses`
+    indicados como pares (anio, mes).
+
+    Returns:
+        Cantidad de buckets escritos.
+    """
+    campo = ARCHIVABLES[contenido]
+    Modelo = apps.get_model(contenido)
+    fuente = Modelo.objects.filter(**{f'{campo}__isnull': False})
+    buckets = ArchivoMensual.objects.filter(contenido=contenido)
+
+    if meses is not None:
+        meses = {mes for mes in meses if mes is not None}
+        if not meses:
+            return 0
+        rangos = Q()
+        for anio, mes in meses:
+            desde, hasta = rango_mes(anio, mes)
+            rangos |= Q(**{f'{campo}__gte': desde, f'{campo}__lt': hasta})
+        fuente = fuente.filter(rangos)
+        buckets = buckets.filter(Q(*[Q(anio=anio, mes=mes) for anio, mes in meses], _connector=Q.OR))
+
+    conteos = (
+        fuente.order_by()
+        .values(anio=ExtractYear(campo), mes=ExtractMonth(campo))
+        .annotate(total=Count('pk'))
+    )
+    with transaction.atomic():
+        buckets.delete()
+        creados = ArchivoMensual.objects.bulk_create([
+            ArchivoMensual(contenido=contenido, anio=fila['anio'], mes=fila['mes'], total=fila['total'])
+            for fila in conteos
+        ])
+    return len(creados)
+
+
+def resumen(contenido):
+    """Buckets de `contenido` agrupados por año, del más reciente al más antiguo."""
+    filas = (
+        ArchivoMensual.objects.filter(contenido=contenido, total__gt=0)
+        .order_by('-anio', '-mes')
+        .values_list('anio', 'mes', 'total')
+    )
+    anios = []
+    for anio, grupo in groupby(filas, key=lambda fila: fila[0]):
+        meses = [{'mes': mes, 'nombre': NOMBRES_MESES[mes - 1], 'total': total} for _, mes, total in grupo]
+        anios.append({'anio': anio, 'total': sum(mes['total'] for mes in meses), 'meses': meses})
+    return anios
+
+
+def _mes(modelo, campo, valor):
+    fecha = modelo._meta.get_field(campo).to_python(valor)  # Acepta también "YYYY-MM-DD"
+    return (fecha.year, fecha.month) if fecha else None
+
+
+def conectar_senales():
+    """Recalcula los meses afectados al guardar o eliminar un contenido."""
+    for contenido, campo in ARCHIVABLES.items():
+        modelo = apps.get_model(contenido)
+
+        def antes_de_guardar(sender, instance, raw=False, _campo=campo, **kwargs):
+            # Mes anterior al cambio (una consulta solo si la fecha puede haber cambiado)
+            instance._mes_archivo_anterior = None
+            if instance.pk and not raw:
+                anterior = sender.objects.filter(pk=instance.pk).values_list(_campo, flat=True).first()
+                instance._mes_archivo_anterior = _mes(sender, _campo, anterior)
+
+        def al_guardar(sender, instance, raw=False, _contenido=contenido, _campo=campo, **kwargs):
+            if raw:
+                return
+            anterior = getattr(instance, '_mes_archivo_anterior', None)
+            actual = _mes(sender, _campo, getattr(instance, _campo))
+            if kwargs.get('created') or anterior != actual:
+                recalcular(_contenido, {anterior, actual})
+
+        def al_eliminar(sender, instance, _contenido=contenido, _campo=campo, **kwargs):
+            recalcular(_contenido, {_mes(sender, _campo, getattr(instance, _campo))})
+
+        pre_save.connect(antes_de_guardar, sender=modelo, weak=False, dispatch_uid=f"archivo_{contenido}_pre_save")
+        post_save.connect(al_guardar, sender=modelo, weak=False, dispatch_uid=f"archivo_{contenido}_save")
+        post_delete.connect(al_eliminar, sender=modelo, weak=False, dispatch_uid=f"archivo_{contenido}_delete")
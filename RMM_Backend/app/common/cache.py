@@ -0,0 +1,381 @@
+"""
+Caché de respuestas completas para peticiones anónimas.
+
+Las vistas con `AnonymousCacheMixin` (ver app/common/mixins.py) guardan el
+cuerpo ya renderizado de sus respuestas GET anónimas en la caché
+RESPONSE_CACHE_ALIAS, que por defecto es un `FileBasedCache` en disco
+compartido por todos los workers de gunicorn del servidor.
+
+Invalidación por etiquetas: cada vista declara las etiquetas (modelos
+`app_label.Modelo`) de las que depende su respuesta. Cada etiqueta tiene una
+versión guardada en la misma caché y la clave de cada respuesta incluye las
+versiones vigentes de sus etiquetas. Un `post_save`/`post_delete` (o
+`m2m_changed`) de un modelo etiquetado renueva su versión, con lo que todas
+las respuestas que dependían de él dejan de encontrarse y vencen solas por
+TTL. No hace falta recorrer ni borrar claves.
+
+Los receptores se conectan modelo por modelo (solo los etiquetados) y solo
+mientras RESPONSE_CACHE_ENABLED o SWR_CACHE_ENABLED están activos: un
+receptor de `post_delete` deja a Django sin el borrado rápido de ese modelo
+(tiene que cargar cada fila para emitir la señal).
+
+Las operaciones masivas que no emiten señales (`bulk_create`, `update()`)
+deben llamar a `invalidar_etiquetas` a mano.
+
+El decorador `cache_swr` (stale-while-revalidate) usa la misma caché y las
+mismas etiquetas para acciones costosas, también autenticadas.
+"""
+
+import copy
+import hashlib
+import inspect
+import logging
+import os
+import threading
+import time
+from functools import wraps
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import connections, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.http import urlencode
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+# Etiquetas usadas por alguna vista; se registran al definir la clase
+ETIQUETAS_REGISTRADAS = set()
+# Etiquetas cuyos modelos tienen los receptores de invalidación conectados
+_CONECTADAS = set()
+
+PREFIJO_ETIQUETA = 'respuestas:etiqueta:'
+PREFIJO_RESPUESTA = 'respuestas:v1:'
+PREFIJO_SWR = 'respuestas:swr:'
+
+
+def get_response_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'respuestas')]
+
+
+def registrar_etiquetas(etiquetas):
+    ETIQUETAS_REGISTRADAS.update(etiquetas)
+    if apps.models_ready and cache_activa():
+        _conectar_modelos(etiquetas)
+
+
+def cache_activa():
+    """Si alguna caché que depende de las etiquetas está habilitada."""
+    return getattr(settings, 'RESPONSE_CACHE_ENABLED', False) or getattr(settings, 'SWR_CACHE_ENABLED', False)
+
+
+def versiones_etiquetas(etiquetas):
+    """
+    Versiones vigentes de `etiquetas` (una sola lectura a la caché). Las que
+    no existen se crean.
+    """
+    cache = get_response_cache()
+    claves = {etiqueta: PREFIJO_ETIQUETA + etiqueta for etiqueta in etiquetas}
+    guardadas = cache.get_many(list(claves.values()))
+
+    nuevas = {clave: time.time_ns() for clave in claves.values() if clave not in guardadas}
+    if nuevas:
+        cache.set_many(nuevas, timeout=None)
+        guardadas.update(nuevas)
+
+    return [guardadas[claves[etiqueta]] for etiqueta in etiquetas]
+
+
+def invalidar_etiquetas(*etiquetas):
+    """
+    Renueva la versión de las etiquetas indicadas; las respuestas que
+    dependían de ellas dejan de usarse.
+
+    La versión se renueva al confirmarse la transacción actual: si cambiara
+    antes, una lectura anónima entre el cambio y el COMMIT vería los datos
+    anteriores y los guardaría con la versión nueva hasta que venza el TTL.
+
+    Ejemplo:
+        invalidar_etiquetas('articles.LikeArticulo')
+    """
+    etiquetas = [etiqueta for etiqueta in etiquetas if etiqueta in ETIQUETAS_REGISTRADAS]
+    if not etiquetas:
+        return
+    transaction.on_commit(lambda: _renovar_versiones(etiquetas))
+
+
+def _renovar_versiones(etiquetas):
+    version = time.time_ns()
+    get_response_cache().set_many(
+        {PREFIJO_ETIQUETA + etiqueta: version for etiqueta in etiquetas}, timeout=None
+    )
+
+
+def clave_respuesta(partes, etiquetas, prefijo=PREFIJO_RESPUESTA):
+    """Clave de una respuesta: sus partes (ruta, query, host...) y las versiones de sus etiquetas."""
+    versiones = versiones_etiquetas(etiquetas)
+    texto = '|'.join([*partes, *map(str, versiones)])
+    return prefijo + hashlib.md5(texto.encode()).hexdigest()
+
+
+def query_normalizado(request):
+    """Query string con los parámetros (y sus valores) ordenados."""
+    return urlencode(sorted((clave, sorted(valores)) for clave, valores in request.GET.lists()), doseq=True)
+
+
+def _al_guardar_o_eliminar(sender, **kwargs):
+    invalidar_etiquetas(sender._meta.label)
+
+
+def _al_cambiar_m2m(sender, instance, action, model, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidar_etiquetas(instance._meta.label, model._meta.label)
+
+
+def _intermedias(modelo):
+    """Tablas intermedias de las relaciones M2M del modelo (directas e inversas)."""
+    return {
+        campo.through if campo.auto_created else campo.remote_field.through
+        for campo in modelo._meta.get_fields()
+        if campo.many_to_many
+    }
+
+
+def _conectar_modelos(etiquetas):
+    for etiqueta in set(etiquetas) - _CONECTADAS:
+        modelo = apps.get_model(etiqueta)
+        post_save.connect(_al_guardar_o_eliminar, sender=modelo, weak=False, dispatch_uid="respuestas_save")
+        post_delete.connect(_al_guardar_o_eliminar, sender=modelo, weak=False, dispatch_uid="respuestas_delete")
+        for intermedia in _intermedias(modelo):
+            m2m_changed.connect(_al_cambiar_m2m, sender=intermedia, weak=False, dispatch_uid="respuestas_m2m")
+        _CONECTADAS.add(etiqueta)
+
+
+def _desconectar_modelos():
+    for etiqueta in list(_CONECTADAS):
+        modelo = apps.get_model(etiqueta)
+        post_save.disconnect(sender=modelo, dispatch_uid="respuestas_save")
+        post_delete.disconnect(sender=modelo, dispatch_uid="respuestas_delete")
+        for intermedia in _intermedias(modelo):
+            m2m_changed.disconnect(sender=intermedia, dispatch_uid="respuestas_m2m")
+        _CONECTADAS.discard(etiqueta)
+
+
+def _al_cambiar_ajuste(setting, **kwargs):
+    if setting in ('RESPONSE_CACHE_ENABLED', 'SWR_CACHE_ENABLED'):
+        conectar_senales()
+
+
+def conectar_senales():
+    """
+    Conecta los receptores a cada modelo de `ETIQUETAS_REGISTRADAS` si la
+    caché está activa, o los desconecta si no. Se repite al cambiar
+    RESPONSE_CACHE_ENABLED o SWR_CACHE_ENABLED (`override_settings`).
+    """
+    setting_changed.connect(_al_cambiar_ajuste, weak=False, dispatch_uid="respuestas_ajustes")
+    if cache_activa():
+        _conectar_modelos(ETIQUETAS_REGISTRADAS)
+    else:
+        _desconectar_modelos()
+
+
+# ============================================================================
+# STALE-WHILE-REVALIDATE CON SINGLE-FLIGHT
+# ============================================================================
+
+class Candado:
+    """
+    Candado por clave entre hilos y procesos del mismo servidor: un archivo
+    creado con O_CREAT | O_EXCL en SWR_LOCK_DIR. Si el proceso que lo tenía
+    murió, el archivo vence a los `vencimiento` segundos.
+    """
+
+    def __init__(self, clave):
+        carpeta = settings.SWR_LOCK_DIR
+        os.makedirs(carpeta, exist_ok=True)
+        self.ruta = os.path.join(carpeta, clave.replace(':', '_') + '.lock')
+        self.vencimiento = getattr(settings, 'SWR_LOCK_TIMEOUT', 30)
+
+    def adquirir(self):
+        try:
+            os.close(os.open(self.ruta, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(self.ruta) > self.vencimiento:
+                    os.unlink(self.ruta)  # Candado abandonado
+                    return self.adquirir()
+            except FileNotFoundError:
+                return self.adquirir()
+            return False
+
+    def liberar(self):
+        try:
+            os.unlink(self.ruta)
+        except FileNotFoundError:
+            pass
+
+    def esperar(self, limite):
+        """Espera a que se libere el candado (o `limite` segundos)."""
+        fin = time.monotonic() + limite
+        while os.path.exists(self.ruta) and time.monotonic() < fin:
+            time.sleep(0.05)
+
+
+def cache_swr(fresco=60, obsoleto=600, etiquetas=(), por_usuario=False):
+    """
+    Decorador de acciones GET de vistas DRF: cachea los datos de la
+    respuesta con stale-while-revalidate y single-flight.
+
+    - Hasta `fresco` segundos la entrada se sirve tal cual.
+    - Hasta `fresco + obsoleto` se sirve la entrada vieja mientras un único
+      hilo (de cualquier worker) la recalcula en segundo plano.
+    - Si no hay entrada, las peticiones concurrentes idénticas esperan a que
+      una sola la calcule (single-flight), en lugar de ir todas a la base.
+    - Un cambio en los modelos de `etiquetas` invalida la entrada.
+
+    Se cachean los datos (no los bytes), así que el renderer sigue
+    respetando el `Accept`. Los permisos ya se verificaron antes de llegar a
+    la acción. Con `por_usuario` la clave incluye el usuario.
+
+    La cabecera `X-Cache` indica HIT, STALE o MISS. Se activa con
+    SWR_CACHE_ENABLED.
+
+    Ejemplo:
+        @action(detail=False, methods=['get'])
+        @cache_swr(fresco=60, obsoleto=3600, etiquetas=('magazine.Ediciones',))
+        def last(self, request): ...
+    """
+    def decorador(metodo):
+        registrar_etiquetas(etiquetas)
+
+        @wraps(metodo)
+        def envoltura(self, request, *args, **kwargs):
+            if not getattr(settings, 'SWR_CACHE_ENABLED', False) or request.method not in ('GET', 'HEAD'):
+                return metodo(self, request, *args, **kwargs)
+
+            partes = [request.path, query_normalizado(request), request.get_host()]
+            if por_usuario:
+                partes.append(str(request.user.pk))
+            clave = clave_respuesta(partes, etiquetas, prefijo=PREFIJO_SWR)
+
+            def calcular(vista=self, peticion=request):
+                response = metodo(vista, peticion, *args, **kwargs)
+                if response.status_code == 200:
+                    get_response_cache().set(clave, {
+                        'datos': response.data,
+                        'fresco_hasta': time.time() + fresco,
+                    }, fresco + obsoleto)
+                return response
+
+            def recalculo():
+                # Se copian en este hilo; el de fondo no toca la vista ni la petición en curso
+                vista, peticion = _copiar_vista(self, request, kwargs)
+                return lambda: calcular(vista, peticion)
+
+            return _servir_swr(clave, calcular, recalculo)
+
+        return envoltura
+    return decorador
+
+
+def _servir_swr(clave, calcular, recalculo):
+    cache = get_response_cache()
+    entrada = cache.get(clave)
+
+    if entrada is not None:
+        if time.time() < entrada['fresco_hasta']:
+            return _respuesta_cacheada(entrada, 'HIT')
+        candado = Candado(clave)
+        if candado.adquirir():
+            _refrescar(calcular, recalculo, candado)
+        return _respuesta_cacheada(entrada, 'STALE')
+
+    # Sin entrada: una sola petición calcula, las demás esperan su resultado
+    candado = Candado(clave)
+    if not candado.adquirir():
+        candado.esperar(getattr(settings, 'SWR_LOCK_TIMEOUT', 30))
+        entrada = cache.get(clave)
+        if entrada is not None:
+            return _respuesta_cacheada(entrada, 'HIT')
+        return calcular()  # El cálculo ajeno falló o tardó demasiado
+    try:
+        response = calcular()
+    finally:
+        candado.liberar()
+    response.headers['X-Cache'] = 'MISS'
+    return response
+
+
+def _refrescar(calcular, recalculo, candado):
+    """
+    Recalcula la entrada en un hilo aparte, con una copia de la vista y de la
+    petición, o en línea si SWR_CACHE_BACKGROUND está apagado.
+    """
+    en_segundo_plano = getattr(settings, 'SWR_CACHE_BACKGROUND', True)
+    if en_segundo_plano:
+        try:
+            calcular = recalculo()
+        except Exception:
+            logger.exception("Error al copiar la vista para recalcular una entrada stale-while-revalidate")
+            candado.liberar()
+            return
+
+    def tarea():
+        try:
+            calcular()
+        except Exception:
+            logger.exception("Error al recalcular una entrada stale-while-revalidate")
+        finally:
+            candado.liberar()
+            if en_segundo_plano:
+                connections.close_all()  # Conexiones del hilo
+
+    if en_segundo_plano:
+        threading.Thread(target=tarea, daemon=True).start()
+    else:
+        tarea()
+
+
+def _copiar_vista(vista, request, kwargs):
+    """
+    Instancia nueva de la vista DRF con una copia de la petición.
+
+    La vista original sigue en uso mientras se renderiza y envía la
+    respuesta obsoleta, y guarda estado por petición (paginador, formato,
+    cabeceras). Los atributos privados (cachés como `_paginator`) y los
+    métodos ligados por `as_view()` no se copian.
+    """
+    http = copy.copy(request._request)
+    peticion = Request(
+        http,
+        parsers=request.parsers,
+        authenticators=request.authenticators,
+        negotiator=request.negotiator,
+        parser_context=dict(request.parser_context),
+    )
+    peticion.user = request.user
+    peticion.auth = request.auth
+    for atributo in ('accepted_renderer', 'accepted_media_type', 'version', 'versioning_scheme'):
+        if hasattr(request, atributo):
+            setattr(peticion, atributo, getattr(request, atributo))
+
+    copia = type(vista)()
+    copia.__dict__.update({
+        nombre: valor for nombre, valor in vista.__dict__.items()
+        if not nombre.startswith('_') and not inspect.ismethod(valor)
+    })
+    copia.request = peticion
+    copia.kwargs = dict(kwargs)
+    copia.headers = dict(getattr(vista, 'headers', {}))
+    peticion.parser_context.update(view=copia, kwargs=copia.kwargs)
+    return copia, peticion
+
+
+def _respuesta_cacheada(entrada, estado):
+    response = Response(entrada['datos'])
+    response.headers['X-Cache'] = estado
+    return response
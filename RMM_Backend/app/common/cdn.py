@@ -0,0 +1,203 @@
+"""
+Caché en el CDN (Bunny) de las respuestas públicas.
+
+1. Políticas por endpoint: cada ViewSet con `CDNCacheMixin` asocia sus
+   acciones a una política de `POLITICAS_CDN`, que se traduce en la cabecera
+   `Cache-Control` de las respuestas anónimas.
+
+2. Etiquetas (surrogate keys): la cabecera CDN_TAG_HEADER (`CDN-Tag` en
+   Bunny) nombra los objetos incluidos en la respuesta, por ejemplo
+   `articulos, articulo-12, articulo-15`. La etiqueta de colección
+   (`articulos`) va en todos los listados.
+
+3. Cola de purgas: cuando cambia un contenido (o sus comentarios/likes, o un
+   artículo embebido en una noticia) se encolan sus etiquetas en `PurgaCDN`,
+   sin duplicados pendientes. El comando `procesar_purgas_cdn` (cron cada
+   minuto) las envía en lotes al cliente configurado en CDN_CLIENT.
+
+El cliente es intercambiable: `BunnyCDN` usa la API de Bunny y
+`ClienteCDNFalso` guarda las purgas en memoria (pruebas y desarrollo).
+"""
+
+import logging
+from typing import NamedTuple
+
+import requests
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Politica(NamedTuple):
+    max_age: int                     # Navegador (segundos)
+    s_maxage: int                    # CDN (segundos); se purga por etiquetas
+    stale_while_revalidate: int = 0
+
+    def cache_control(self):
+        directivas = ['public', f'max-age={self.max_age}', f's-maxage={self.s_maxage}']
+        if self.stale_while_revalidate:
+            directivas.append(f'stale-while-revalidate={self.stale_while_revalidate}')
+        return ', '.join(directivas)
+
+
+POLITICAS_CDN = {
+    # Listados: cambian con cada contenido nuevo, like o comentario
+    'listado': Politica(max_age=30, s_maxage=300, stale_while_revalidate=60),
+    # Detalles: el CDN los guarda hasta que se purgan
+    'detalle': Politica(max_age=60, s_maxage=86400, stale_while_revalidate=300),
+    # Datos que casi no cambian (ediciones pasadas, categorías)
+    'estable': Politica(max_age=300, s_maxage=86400, stale_while_revalidate=3600),
+}
+
+NO_CACHEAR = 'private, no-store'
+
+
+class TipoContenido(NamedTuple):
+    etiqueta: str   # Prefijo de la etiqueta de cada objeto: articulo-12
+    coleccion: str  # Etiqueta de los listados
+
+
+# app_label.Modelo -> etiquetas. Los cambios de comentarios y likes llegan
+# como cambios del contenido a través de `common.signals.marcar_modificado`.
+TIPOS_CONTENIDO = {
+    'articles.Articulos': TipoContenido('articulo', 'articulos'),
+    'blog.Blog': TipoContenido('noticia', 'noticias'),
+    'foro.Tema': TipoContenido('tema', 'temas'),
+    'magazine.Ediciones': TipoContenido('edicion', 'ediciones'),
+}
+
+
+def etiquetas_objetos(contenido, pks):
+    """Etiquetas de los objetos `pks` de `contenido` más la de su colección."""
+    tipo = TIPOS_CONTENIDO[contenido]
+    return [tipo.coleccion, *(f"{tipo.etiqueta}-{pk}" for pk in pks)]
+
+
+# ============================================================================
+# CLIENTES
+# ============================================================================
+
+class ClienteCDN:
+    """Interfaz de los clientes de CDN."""
+
+    def purgar_etiquetas(self, etiquetas):
+        raise NotImplementedError
+
+
+class BunnyCDN(ClienteCDN):
+    """
+    Purga por etiqueta con la API de Bunny (una llamada por etiqueta).
+    Requiere BUNNY_API_KEY y BUNNY_PULL_ZONE_ID.
+    """
+    url = "https://api.bunny.net/pullzone/{zona}/purgeCache"
+
+    def __init__(self, api_key=None, zona=None, timeout=10):
+        self.api_key = api_key or settings.BUNNY_API_KEY
+        self.zona = zona or settings.BUNNY_PULL_ZONE_ID
+        self.timeout = timeout
+
+    def purgar_etiquetas(self, etiquetas):
+        with requests.Session() as sesion:
+            sesion.headers.update({'AccessKey': self.api_key, 'Content-Type': 'application/json'})
+            for etiqueta in etiquetas:
+                respuesta = sesion.post(
+                    self.url.format(zona=self.zona), json={'CacheTag': etiqueta}, timeout=self.timeout
+                )
+                respuesta.raise_for_status()
+
+
+class ClienteCDNFalso(ClienteCDN):
+    """Guarda en memoria las etiquetas purgadas."""
+    purgadas = []
+
+    def purgar_etiquetas(self, etiquetas):
+        type(self).purgadas.extend(etiquetas)
+
+    @classmethod
+    def limpiar(cls):
+        cls.purgadas.clear()
+
+
+def get_cliente_cdn():
+    return import_string(settings.CDN_CLIENT)()
+
+
+# ============================================================================
+# COLA DE PURGAS
+# ============================================================================
+
+def encolar_purgas(etiquetas):
+    """
+    Encola las etiquetas al confirmarse la transacción actual. Las que ya
+    están pendientes se ignoran.
+    """
+    if not getattr(settings, 'CDN_PURGE_ENABLED', False):
+        return
+    etiquetas = sorted(set(etiquetas))
+    if not etiquetas:
+        return
+
+    PurgaCDN = apps.get_model('common', 'PurgaCDN')
+    transaction.on_commit(lambda: PurgaCDN.objects.bulk_create(
+        [PurgaCDN(etiqueta=etiqueta) for etiqueta in etiquetas], ignore_conflicts=True
+    ))
+
+
+def encolar_queryset(contenido, queryset):
+    """Encola las etiquetas de los objetos de `queryset` (modelo `contenido`)."""
+    if getattr(settings, 'CDN_PURGE_ENABLED', False) and contenido in TIPOS_CONTENIDO:
+        pks = list(queryset.values_list('pk', flat=True))
+        if pks:
+            encolar_purgas(etiquetas_objetos(contenido, pks))
+
+
+def procesar_cola(tamano_lote=100, max_intentos=5):
+    """
+    Envía al CDN las purgas pendientes, en lotes de `tamano_lote` etiquetas.
+    Si el cliente falla, el lote queda pendiente con un intento más; tras
+    `max_intentos` fallos se abandona (vence por s-maxage): se marca como
+    procesada para que la etiqueta se pueda volver a encolar.
+
+    Returns:
+        Cantidad de etiquetas purgadas.
+    """
+    PurgaCDN = apps.get_model('common', 'PurgaCDN')
+    cliente = get_cliente_cdn()
+    total = 0
+
+    while True:
+        lote = list(
+            PurgaCDN.objects.filter(procesado_en__isnull=True, intentos__lt=max_intentos)
+            .order_by('id')[:tamano_lote]
+        )
+        if not lote:
+            return total
+        ids = [purga.id for purga in lote]
+        try:
+            cliente.purgar_etiquetas([purga.etiqueta for purga in lote])
+        except Exception:
+            logger.exception("Error al purgar %s etiquetas del CDN", len(lote))
+            PurgaCDN.objects.filter(id__in=ids).update(intentos=F('intentos') + 1)
+            # Una pendiente sin reintentos bloquearía la etiqueta (restricción única)
+            PurgaCDN.objects.filter(id__in=ids, intentos__gte=max_intentos).update(procesado_en=timezone.now())
+            return total
+        PurgaCDN.objects.filter(id__in=ids).update(procesado_en=timezone.now())
+        total += len(lote)
+
+
+def conectar_senales():
+    """Encola las etiquetas de los contenidos guardados o eliminados."""
+    for contenido in TIPOS_CONTENIDO:
+        modelo = apps.get_model(contenido)
+
+        def receptor(sender, instance, _contenido=contenido, **kwargs):
+            encolar_purgas(etiquetas_objetos(_contenido, [instance.pk]))
+
+        post_save.connect(receptor, sender=modelo, weak=False, dispatch_uid=f"cdn_{contenido}_save")
+        post_delete.connect(receptor, sender=modelo, weak=False, dispatch_uid=f"cdn_{contenido}_delete")
@@ -0,0 +1,332 @@
+"""
+Eliminación en dos fases de artículos, noticias, temas y usuarios.
+
+Eliminar un artículo o un usuario arrastra en cascada sus comentarios, las
+respuestas, los likes y las filas M2M. Con `delete()` todo eso se borra en
+una sola transacción dentro de la petición, con el lock de escritura de
+SQLite tomado durante segundos.
+
+`eliminar()` hace solo la primera fase, en la petición:
+
+- Marca `eliminado_en`: artículos, noticias y temas desaparecen de
+  inmediato de la API y del admin (su manager por defecto,
+  `VisiblesManager`, los excluye; `todos` los incluye). Un usuario queda
+  desactivado y sus temas, ocultos; sus comentarios y likes en contenido
+  ajeno se ven hasta la purga, y su email sigue ocupado hasta entonces.
+- Encola una `EliminacionPendiente`.
+
+`purgar_pendientes()` hace la segunda: borra las filas dependientes desde
+las hojas hacia el objeto, en lotes de DELETE_PURGE_BATCH_SIZE filas con una
+transacción corta por lote (y una pausa de DELETE_PURGE_PAUSE s entre lotes
+para que pasen las demás escrituras), y al final el objeto con `delete()`.
+Los lotes se borran sin señales; por cada lote se hace a mano lo que harían
+los receptores (`marcar_modificado`, etiquetas de caché y del CDN, índice de
+likes). El progreso queda en `filas_borradas`, y si la purga se corta,
+volver a ejecutarla continúa donde quedó.
+
+La segunda fase la ejecuta el comando `purgar_eliminados` (cron) o, con
+DELETE_PURGE_ASYNC_ENABLED, un hilo en segundo plano del proceso al
+confirmarse la eliminación.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .archivado import ARCHIVO_FRIO
+from .archivo import ARCHIVABLES, recalcular
+from .cache import invalidar_etiquetas
+from .cdn import TIPOS_CONTENIDO, encolar_purgas, encolar_queryset, etiquetas_objetos
+from .likes import TIPOS_LIKE, registrar_like
+from .models import ComentarioArchivado, EliminacionPendiente, LikeArchivado
+from .signals import RELACIONES, marcar_modificado
+
+logger = logging.getLogger(__name__)
+
+# app_label.Modelo con `eliminado_en`
+ELIMINABLES = ('articles.Articulos', 'blog.Blog', 'foro.Tema', 'users.User')
+
+# Filas del archivo frío -> contador del contenido que las resume
+CONTADORES_ARCHIVO = {
+    'common.ComentarioArchivado': 'comentarios_archivados',
+    'common.LikeArchivado': 'likes_archivados',
+}
+
+
+def eliminar(objeto):
+    """
+    Oculta `objeto` y encola la purga de sus filas dependientes.
+
+    Returns:
+        La `EliminacionPendiente` del objeto.
+    """
+    contenido = objeto._meta.label
+    if contenido not in ELIMINABLES:
+        raise ValueError(f"{contenido} no admite eliminación en dos fases")
+
+    ahora = timezone.now()
+    with transaction.atomic():
+        objeto.eliminado_en = ahora
+        campos = ['eliminado_en']
+        if contenido == 'users.User':
+            objeto.is_active = False
+            campos.append('is_active')
+            _ocultar_temas(objeto, ahora)
+        # Las señales invalidan la caché y el CDN y marcan las noticias que lo embeben
+        objeto.save(update_fields=campos)
+
+        if contenido in ARCHIVABLES:
+            campo = ARCHIVABLES[contenido]
+            fecha = objeto._meta.get_field(campo).to_python(getattr(objeto, campo))
+            if fecha:
+                recalcular(contenido, {(fecha.year, fecha.month)})
+
+        pendiente, creada = EliminacionPendiente.objects.get_or_create(
+            contenido=contenido, objeto_id=objeto.pk, terminado_en=None,
+        )
+        if not creada and pendiente.intentos:
+            # Volver a eliminarlo reactiva una purga que agotó sus intentos
+            reintentar(EliminacionPendiente.objects.filter(pk=pendiente.pk))
+            pendiente.refresh_from_db()
+        if getattr(settings, 'DELETE_PURGE_ASYNC_ENABLED', False):
+            transaction.on_commit(lanzar_purga)
+    return pendiente
+
+
+def _ocultar_temas(usuario, ahora):
+    Tema = apps.get_model('foro.Tema')
+    temas = Tema.objects.filter(autor=usuario)
+    encolar_queryset('foro.Tema', temas)
+    if temas.update(eliminado_en=ahora):
+        invalidar_etiquetas('foro.Tema')
+
+
+# ============================================================================
+# PURGA
+# ============================================================================
+
+def purgar_pendientes(tamano_lote=None, pausa=None, max_intentos=5, progreso=None):
+    """
+    Purga las eliminaciones pendientes, de la más antigua a la más reciente.
+    Una que falla suma un intento y se reintenta en la próxima ejecución;
+    tras `max_intentos` queda agotada hasta que se llame a `reintentar`.
+
+    Args:
+        progreso: Función opcional `(pendiente, modelo, filas)` llamada
+            después de cada lote.
+
+    Returns:
+        Lista de las `EliminacionPendiente` terminadas.
+    """
+    if tamano_lote is None:
+        tamano_lote = getattr(settings, 'DELETE_PURGE_BATCH_SIZE', 200)
+    if pausa is None:
+        pausa = getattr(settings, 'DELETE_PURGE_PAUSE', 0)
+
+    terminadas = []
+    vistas = set()
+    while True:
+        # Se vuelve a consultar en cada vuelta: pueden llegar eliminaciones nuevas
+        pendiente = (
+            EliminacionPendiente.objects
+            .filter(terminado_en__isnull=True, intentos__lt=max_intentos)
+            .exclude(pk__in=vistas)
+            .order_by('id')
+            .first()
+        )
+        if pendiente is None:
+            return terminadas
+        vistas.add(pendiente.pk)
+        try:
+            purgar(pendiente, tamano_lote, pausa, progreso)
+        except Exception as error:
+            logger.exception("Error al purgar %s:%s", pendiente.contenido, pendiente.objeto_id)
+            EliminacionPendiente.objects.filter(pk=pendiente.pk).update(
+                intentos=F('intentos') + 1, error=str(error)[:1000],
+            )
+        else:
+            terminadas.append(pendiente)
+
+
+def agotadas(max_intentos=5):
+    """Eliminaciones sin terminar que ya no se reintentan."""
+    return EliminacionPendiente.objects.filter(terminado_en__isnull=True, intentos__gte=max_intentos)
+
+
+def reintentar(pendientes):
+    """
+    Pone a cero los intentos de las eliminaciones sin terminar de
+    `pendientes` para que la próxima purga las vuelva a intentar.
+
+    Returns:
+        Cantidad de eliminaciones reactivadas.
+    """
+    return pendientes.filter(terminado_en__isnull=True).update(intentos=0, error='')
+
+
+def purgar(pendiente, tamano_lote=200, pausa=0, progreso=None):
+    """Purga las filas dependientes de una eliminación pendiente y luego el objeto."""
+    Modelo = apps.get_model(pendiente.contenido)
+    if pendiente.iniciado_en is None:
+        pendiente.iniciado_en = timezone.now()
+        EliminacionPendiente.objects.filter(pk=pendiente.pk).update(iniciado_en=pendiente.iniciado_en)
+
+    def al_borrar(modelo, filas):
+        if not filas:
+            return
+        pendiente.filas_borradas += filas
+        EliminacionPendiente.objects.filter(pk=pendiente.pk).update(filas_borradas=F('filas_borradas') + filas)
+        if progreso is not None:
+            progreso(pendiente, modelo, filas)
+
+    purga = Purga(tamano_lote, pausa, al_borrar)
+    objeto = Modelo._base_manager.filter(pk=pendiente.objeto_id, eliminado_en__isnull=False)
+    if objeto.exists():
+        purga.dependientes(Modelo, [pendiente.objeto_id])
+        if pendiente.contenido in ARCHIVO_FRIO:
+            for Archivado in (ComentarioArchivado, LikeArchivado):
+                purga.filas(Archivado.objects.filter(tipo_contenido=pendiente.contenido, objeto_id=pendiente.objeto_id))
+        # Con señales: caché, CDN, archivo por fechas y exportación
+        with transaction.atomic():
+            borradas, _ = objeto.delete()
+        al_borrar(Modelo, borradas)
+
+    pendiente.terminado_en = timezone.now()
+    EliminacionPendiente.objects.filter(pk=pendiente.pk).update(terminado_en=pendiente.terminado_en, error='')
+
+
+class Purga:
+    """
+    Borrado por lotes de las filas que dependen de un objeto, recorriendo
+    las mismas relaciones que el `Collector` de Django.
+
+    Args:
+        tamano_lote: Filas por transacción.
+        pausa: Segundos de espera entre lotes.
+        al_borrar: Función `(modelo, filas)` llamada después de cada lote.
+    """
+
+    def __init__(self, tamano_lote, pausa, al_borrar):
+        self.tamano_lote = tamano_lote
+        self.pausa = pausa
+        self.al_borrar = al_borrar
+
+    def dependientes(self, modelo, pks):
+        """Borra (o desvincula, con SET_NULL) las filas que apuntan a `pks` de `modelo`."""
+        for relacion in _relaciones(modelo):
+            filas = relacion.related_model._base_manager.filter(**{f"{relacion.field.name}__in": pks})
+            if relacion.on_delete is models.CASCADE:
+                self.filas(filas)
+            elif relacion.on_delete is models.SET_NULL:
+                self.desvincular(filas, relacion.field.name)
+            # PROTECT, SET_DEFAULT, etc. quedan para el `delete()` final
+
+    def filas(self, queryset):
+        """Borra las filas de `queryset` y sus dependientes, lote por lote."""
+        while pks := self._lote(queryset):
+            self.dependientes(queryset.model, pks)
+            self.al_borrar(queryset.model, _borrar_lote(queryset.model, pks))
+            self._esperar()
+
+    def desvincular(self, queryset, campo):
+        while pks := self._lote(queryset):
+            with transaction.atomic():
+                queryset.model._base_manager.filter(pk__in=pks).update(**{campo: None})
+            self._esperar()
+
+    def _lote(self, queryset):
+        return list(queryset.order_by().values_list('pk', flat=True)[:self.tamano_lote])
+
+    def _esperar(self):
+        if self.pausa:
+            time.sleep(self.pausa)
+
+
+def _relaciones(modelo):
+    # Las mismas que recorre el Collector (incluye las ocultas y las tablas M2M)
+    return [
+        campo for campo in modelo._meta.get_fields(include_hidden=True)
+        if campo.auto_created and not campo.concrete and (campo.one_to_one or campo.one_to_many)
+    ]
+
+
+def _borrar_lote(modelo, pks):
+    """
+    Borra las filas `pks` de `modelo` sin señales, y hace por el lote entero
+    lo que harían los receptores de `post_delete` fila por fila.
+
+    Returns:
+        Cantidad de filas borradas.
+    """
+    contenido = modelo._meta.label
+    relaciones = [relacion for relacion in RELACIONES if relacion.modelo == contenido]
+    likes = [(tipo, tipo_like) for tipo, tipo_like in TIPOS_LIKE.items() if tipo_like.modelo == contenido]
+    columnas = {relacion.atributo for relacion in relaciones}
+    for _, tipo_like in likes:
+        columnas.update((tipo_like.columna_objeto, 'usuario_id'))
+    if contenido in CONTADORES_ARCHIVO:
+        columnas.update(('tipo_contenido', 'objeto_id'))
+
+    filas = modelo._base_manager.filter(pk__in=pks)
+    valores = list(filas.values(*columnas)) if columnas else []
+    with transaction.atomic():
+        borradas = filas._raw_delete(filas.db)
+        for relacion in relaciones:
+            marcar_modificado(relacion.contenido, **{
+                f"{relacion.lookup}__in": {fila[relacion.atributo] for fila in valores}
+            })
+        if contenido in CONTADORES_ARCHIVO:
+            _descontar_archivo(CONTADORES_ARCHIVO[contenido], valores)
+
+    invalidar_etiquetas(contenido)
+    if contenido in TIPOS_CONTENIDO:
+        encolar_purgas(etiquetas_objetos(contenido, pks))
+    for tipo, tipo_like in likes:
+        for fila in valores:
+            registrar_like(tipo, fila[tipo_like.columna_objeto], fila['usuario_id'], False)
+    return borradas
+
+
+def _descontar_archivo(contador, valores):
+    # Filas del archivo frío de un usuario eliminado: se descuentan de los conteos del contenido
+    for (tipo_contenido, objeto_id), total in Counter(
+        (fila['tipo_contenido'], fila['objeto_id']) for fila in valores
+    ).items():
+        objetos = apps.get_model(tipo_contenido).objects.filter(pk=objeto_id)
+        objetos.update(**{contador: Greatest(F(contador) - total, 0)})
+        marcar_modificado(tipo_contenido, pk=objeto_id)
+
+
+# ============================================================================
+# PURGA EN SEGUNDO PLANO
+# ============================================================================
+
+_hilo = None
+_hilo_lock = threading.Lock()
+
+
+def lanzar_purga():
+    """Inicia el hilo de purga del proceso, si no está ya en marcha."""
+    global _hilo
+    with _hilo_lock:
+        if _hilo is None or not _hilo.is_alive():
+            _hilo = threading.Thread(target=_purgar_en_segundo_plano, name='purga-eliminados', daemon=True)
+            _hilo.start()
+        return _hilo
+
+
+def _purgar_en_segundo_plano():
+    try:
+        purgar_pendientes()
+    except Exception:
+        logger.exception("Error en la purga de objetos eliminados")
+    finally:
+        connection.close()
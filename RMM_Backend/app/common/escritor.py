@@ -0,0 +1,205 @@
+"""
+Escritor único por proceso para serializar las escrituras en SQLite.
+
+SQLite admite un solo escritor a la vez: con muchos hilos escribiendo
+(comentarios, likes, newsletter, contacto) las transacciones compiten por el
+lock y algunas fallan con "database is locked" al vencer el busy_timeout.
+
+Con WRITE_QUEUE_ENABLED las escrituras cortas se envían a una cola acotada
+que consume un único hilo escritor por proceso:
+
+- Agrupa los trabajos que encuentra en la cola (hasta WRITE_QUEUE_BATCH_SIZE)
+  en una sola transacción, con un savepoint por trabajo: un trabajo que
+  falla no afecta a los demás, y el lote se confirma con un único commit.
+- El resultado (o la excepción) de cada trabajo se entrega a quien lo
+  encoló solo después del commit, así que puede leer lo que escribió.
+- Contrapresión: si la cola está llena durante WRITE_QUEUE_PUT_TIMEOUT
+  segundos la petición responde 503 con Retry-After en lugar de esperar el
+  lock indefinidamente.
+- Si el resultado tarda más de WRITE_QUEUE_RESULT_TIMEOUT segundos, el
+  trabajo que aún no empezó se cancela (503, se puede reintentar); el que ya
+  empezó se termina de escribir y la petición responde 202, sin invitar a
+  repetirla (duplicaría el comentario o revertiría el like).
+
+Dentro de una transacción ya abierta, o desde el propio hilo escritor, la
+escritura se ejecuta en línea (otro hilo no vería la transacción).
+
+Uso:
+    ejecutar_escritura(partial(serializer.save, autor=request.user))
+
+    @action(detail=True, methods=['post'])
+    @escritura_serializada
+    def toggle_like(self, request, pk=None): ...
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import wraps
+from typing import Callable, NamedTuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .routers import marcar_escritura
+
+logger = logging.getLogger(__name__)
+
+
+class ColaEscrituraLlena(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "El servidor está procesando muchas escrituras. Intenta de nuevo en unos segundos."
+    default_code = 'write_queue_full'
+
+
+class EscrituraEnCurso(APIException):
+    status_code = status.HTTP_202_ACCEPTED
+    default_detail = "La escritura se está procesando y se completará en breve. No es necesario repetirla."
+    default_code = 'write_in_progress'
+
+
+class Trabajo(NamedTuple):
+    funcion: Callable
+    agrupable: bool
+    futuro: Future
+
+
+class EscritorUnico:
+    """
+    Hilo escritor con su cola acotada.
+
+    Args:
+        max_cola: Trabajos pendientes como máximo.
+        tamano_lote: Trabajos por transacción como máximo.
+        espera_encolar: Segundos que se espera lugar en la cola.
+        espera_resultado: Segundos que se espera el resultado de un trabajo.
+    """
+
+    def __init__(self, max_cola=1000, tamano_lote=50, espera_encolar=2, espera_resultado=30):
+        self.cola = queue.Queue(maxsize=max_cola)
+        self.tamano_lote = tamano_lote
+        self.espera_encolar = espera_encolar
+        self.espera_resultado = espera_resultado
+        self.trabajos = self.lotes = self.rechazados = 0
+        self.hilo = threading.Thread(target=self._bucle, name='escritor-sqlite', daemon=True)
+        self.hilo.start()
+
+    def es_hilo_escritor(self):
+        return threading.current_thread() is self.hilo
+
+    def ejecutar(self, funcion, agrupable=True):
+        """Encola `funcion` y espera su resultado (o su excepción)."""
+        trabajo = Trabajo(funcion, agrupable, Future())
+        try:
+            self.cola.put(trabajo, timeout=self.espera_encolar)
+        except queue.Full:
+            self.rechazados += 1
+            excepcion = ColaEscrituraLlena()
+            excepcion.wait = self.espera_encolar  # Retry-After
+            raise excepcion
+        try:
+            return trabajo.futuro.result(timeout=self.espera_resultado)
+        except FutureTimeoutError:
+            # Sin empezar se cancela: no se escribirá y se puede reintentar
+            if trabajo.futuro.cancel():
+                raise ColaEscrituraLlena("La escritura está tardando demasiado. Intenta de nuevo.")
+            # Ya empezó: se confirmará igual, reintentar la duplicaría
+            raise EscrituraEnCurso()
+
+    def _bucle(self):
+        while True:
+            lote = [self.cola.get()]
+            siguiente = None
+            while lote[0].agrupable and len(lote) < self.tamano_lote:
+                try:
+                    trabajo = self.cola.get_nowait()
+                except queue.Empty:
+                    break
+                if not trabajo.agrupable:
+                    siguiente = trabajo  # Va solo, después del lote
+                    break
+                lote.append(trabajo)
+
+            self._ejecutar_lote(lote)
+            if siguiente is not None:
+                self._ejecutar_lote([siguiente])
+
+    def _ejecutar_lote(self, lote):
+        # Los cancelados por vencer la espera se descartan sin ejecutarse
+        lote = [trabajo for trabajo in lote if trabajo.futuro.set_running_or_notify_cancel()]
+        if not lote:
+            return
+        resultados = {}
+        try:
+            with transaction.atomic():
+                for indice, trabajo in enumerate(lote):
+                    try:
+                        with transaction.atomic():  # Savepoint por trabajo
+                            resultados[indice] = (True, trabajo.funcion())
+                    except Exception as excepcion:
+                        resultados[indice] = (False, excepcion)
+        except Exception as excepcion:
+            # Falló el commit: ningún trabajo del lote quedó escrito
+            logger.exception("Error al confirmar un lote de %s escrituras", len(lote))
+            resultados = {indice: (False, excepcion) for indice in range(len(lote))}
+        finally:
+            connection.close_if_unusable_or_obsolete()
+
+        self.trabajos += len(lote)
+        self.lotes += 1
+        for indice, trabajo in enumerate(lote):
+            correcto, valor = resultados[indice]
+            if correcto:
+                trabajo.futuro.set_result(valor)
+            else:
+                trabajo.futuro.set_exception(valor)
+
+
+_escritor = None
+_escritor_lock = threading.Lock()
+
+
+def get_escritor():
+    """
+    Devuelve el escritor del proceso, o None si WRITE_QUEUE_ENABLED está apagado.
+    """
+    global _escritor
+    if not getattr(settings, 'WRITE_QUEUE_ENABLED', False):
+        return None
+    if _escritor is None:
+        with _escritor_lock:
+            if _escritor is None:
+                _escritor = EscritorUnico(
+                    max_cola=getattr(settings, 'WRITE_QUEUE_MAX_SIZE', 1000),
+                    tamano_lote=getattr(settings, 'WRITE_QUEUE_BATCH_SIZE', 50),
+                    espera_encolar=getattr(settings, 'WRITE_QUEUE_PUT_TIMEOUT', 2),
+                    espera_resultado=getattr(settings, 'WRITE_QUEUE_RESULT_TIMEOUT', 30),
+                )
+    return _escritor
+
+
+def ejecutar_escritura(funcion, agrupable=True):
+    """
+    Ejecuta `funcion` (sin argumentos) en el hilo escritor, o en línea si la
+    cola está apagada o ya hay una transacción abierta.
+
+    Args:
+        agrupable: False para trabajos largos que deben ir en su propia transacción.
+    """
+    escritor = get_escritor()
+    if escritor is None or connection.in_atomic_block or escritor.es_hilo_escritor():
+        return funcion()
+    # Las lecturas siguientes de la petición deben ver lo escrito
+    marcar_escritura()
+    return escritor.ejecutar(funcion, agrupable)
+
+
+def escritura_serializada(metodo):
+    """Decorador de métodos de vistas: ejecuta el método completo en el hilo escritor."""
+    @wraps(metodo)
+    def envoltura(self, request, *args, **kwargs):
+        return ejecutar_escritura(lambda: metodo(self, request, *args, **kwargs))
+    return envoltura
@@ -0,0 +1,314 @@
+"""
+Exportación incremental de la API pública a archivos JSON estáticos.
+
+Renderiza las respuestas públicas (listados y detalles de artículos,
+noticias, ediciones y categorías del foro) en STATIC_EXPORT_ROOT, con la
+misma estructura de rutas que la API, junto con variantes precomprimidas
+(`.gz` y, si está instalado `brotli`, `.br`) para que nginx las sirva
+directamente:
+
+    <raíz>/api/v1/articles/articulos/index.json        -> /api/v1/articles/articulos/
+    <raíz>/api/v1/articles/articulos/page-2.json       -> /api/v1/articles/articulos/?page=2
+    <raíz>/api/v1/articles/articulos/12/index.json     -> /api/v1/articles/articulos/12/
+
+Ejemplo de nginx con STATIC_EXPORT_ROOT=/srv/rmm/json (gzip_static /
+brotli_static sirven las variantes precomprimidas). Solo se sirve un archivo
+si la consulta está vacía o es exactamente `page=N`; cualquier otro
+parámetro (`search`, `fields`, `expand`, `pagination`...) y las escrituras
+van a Django:
+
+    map $args $exportado {
+        ""                            index.json;
+        "page=1"                      index.json;
+        "~^page=(?<numero>[0-9]+)$"   page-$numero.json;
+        default                       "";
+    }
+
+    location /api/v1/ {
+        root /srv/rmm/json;
+        gzip_static on;
+        error_page 418 = @django;
+        if ($request_method !~ ^(GET|HEAD)$) { return 418; }
+        if ($exportado = "") { return 418; }
+        try_files $uri$exportado @django;
+    }
+
+Incremental: un manifiesto guarda la versión (`actualizado_en`, o la de sus
+artículos embebidos si es posterior) exportada de cada objeto. Solo se vuelven a renderizar los detalles de los objetos que
+cambiaron, se borran los de objetos eliminados y los listados de un tipo se
+regeneran solo si alguno de sus objetos cambió. Los archivos cuyo contenido
+no cambia no se reescriben. Las escrituras son atómicas (`os.replace`).
+
+Lo usan el comando `exportar_json` (cron, que además recoge los cambios de
+likes y comentarios) y, con STATIC_EXPORT_ON_PUBLISH, el guardado de
+contenidos (hook de publicación): una sola exportación por transacción, en
+un hilo en segundo plano del proceso para no demorar la respuesta.
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.test import RequestFactory
+from django.urls import resolve
+
+from .signals import version_de
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MANIFIESTO = '.manifest.json'
+
+
+class Exportable(NamedTuple):
+    modelo: str             # app_label.Modelo
+    listado: str            # URL del listado (se exportan todas sus páginas)
+    detalle: str            # URL del detalle, con {pk}
+    extras: tuple = ()      # Otras URLs que dependen de todos los objetos
+    version: str = None     # Campo de versión; sin él se renderiza siempre
+
+
+EXPORTABLES = [
+    Exportable('articles.Articulos', '/api/v1/articles/articulos/', '/api/v1/articles/articulos/{pk}/',
+               version='actualizado_en'),
+    Exportable('blog.Blog', '/api/v1/noticias/noticias/', '/api/v1/noticias/noticias/{pk}/',
+               version='actualizado_en'),
+    Exportable('magazine.Ediciones', '/api/v1/magazine/editions/', '/api/v1/magazine/editions/{pk}/',
+               extras=('/api/v1/magazine/editions/last/', '/api/v1/magazine/editions/past/'),
+               version='actualizado_en'),
+    Exportable('foro.Categoria_Foro', '/api/v1/foro/categorias/', '/api/v1/foro/categorias/{pk}/'),
+]
+
+
+class Resumen(NamedTuple):
+    renderizados: int
+    escritos: int
+    eliminados: int
+
+
+class Exportador:
+    """
+    Exporta los tipos de `EXPORTABLES` a `destino`.
+
+    Args:
+        destino: Carpeta raíz (por defecto STATIC_EXPORT_ROOT).
+        completo: Ignora el manifiesto y renderiza todo.
+    """
+
+    def __init__(self, destino=None, completo=False):
+        self.destino = Path(destino or settings.STATIC_EXPORT_ROOT)
+        self.completo = completo
+        self.fabrica = RequestFactory()
+        # Las URLs absolutas (imágenes, paginación) se generan con este origen
+        url_base = getattr(settings, 'STATIC_EXPORT_BASE_URL', '') or getattr(settings, 'SITE_URL', '')
+        url_base = urlsplit(url_base if url_base.startswith('http') else 'http://localhost')
+        self.host = url_base.netloc
+        self.secure = url_base.scheme == 'https'
+        self.renderizados = self.escritos = self.eliminados = 0
+
+    def exportar(self, modelos=None):
+        manifiesto = self.leer_manifiesto()
+        for exportable in EXPORTABLES:
+            if modelos is None or exportable.modelo in modelos:
+                manifiesto[exportable.modelo] = self.exportar_tipo(exportable, manifiesto.get(exportable.modelo, {}))
+        self.escribir(self.destino / MANIFIESTO, json.dumps(manifiesto, sort_keys=True).encode(), comprimir=False)
+        return Resumen(self.renderizados, self.escritos, self.eliminados)
+
+    def exportar_tipo(self, exportable, anteriores):
+        Modelo = apps.get_model(exportable.modelo)
+        if exportable.version:
+            actuales = {
+                str(pk): version.isoformat()
+                for pk, version in Modelo.objects.values_list('pk', version_de(exportable.modelo, exportable.version))
+            }
+        else:
+            actuales = {str(pk): None for pk in Modelo.objects.values_list('pk', flat=True)}
+
+        cambiados = [
+            pk for pk, version in actuales.items()
+            if self.completo or version is None or anteriores.get(pk) != version
+        ]
+        eliminados = set(anteriores) - set(actuales)
+
+        for pk in cambiados:
+            self.exportar_url(exportable.detalle.format(pk=pk))
+        for pk in eliminados:
+            self.eliminar_carpeta(exportable.detalle.format(pk=pk))
+
+        if cambiados or eliminados or not (self.destino / exportable.listado.lstrip('/')).exists():
+            self.exportar_listado(exportable.listado)
+            for url in exportable.extras:
+                self.exportar_url(url)
+        return actuales
+
+    def exportar_listado(self, url):
+        """Exporta todas las páginas del listado y borra las que sobran."""
+        carpeta = self.destino / url.lstrip('/')
+        pagina = 1
+        while True:
+            datos = self.exportar_url(url, pagina)
+            if not isinstance(datos, dict) or not datos.get('next'):
+                break
+            pagina += 1
+
+        for sobrante in carpeta.glob('page-*.json'):
+            numero = sobrante.name.split('.')[0].removeprefix('page-')
+            if numero.isdigit() and int(numero) > pagina:
+                self.eliminar_archivo(sobrante)
+
+    def exportar_url(self, url, pagina=1):
+        """Renderiza `url` y escribe su archivo. Devuelve los datos de la respuesta."""
+        parametros = {'page': pagina} if pagina > 1 else {}
+        request = self.fabrica.get(
+            url, parametros, HTTP_HOST=self.host, HTTP_ACCEPT='application/json', secure=self.secure
+        )
+        coincidencia = resolve(url)
+        response = coincidencia.func(request, *coincidencia.args, **coincidencia.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        self.renderizados += 1
+
+        if response.status_code != 200:
+            logger.warning("Exportación: %s respondió %s", url, response.status_code)
+            return None
+
+        nombre = f'page-{pagina}.json' if pagina > 1 else 'index.json'
+        self.escribir(self.destino / url.lstrip('/') / nombre, response.content)
+        return getattr(response, 'data', None)
+
+    # ------------------------------------------------------------------
+    # Archivos
+    # ------------------------------------------------------------------
+
+    def leer_manifiesto(self):
+        if self.completo:
+            return {}
+        try:
+            return json.loads((self.destino / MANIFIESTO).read_bytes())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def escribir(self, ruta, contenido, comprimir=True):
+        """Escribe `ruta` (y sus variantes comprimidas) solo si cambió."""
+        try:
+            if ruta.read_bytes() == contenido:
+                return
+        except FileNotFoundError:
+            pass
+
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        variantes = {ruta: contenido}
+        if comprimir:
+            variantes[ruta.with_name(ruta.name + '.gz')] = gzip.compress(contenido, compresslevel=9, mtime=0)
+            if brotli is not None:
+                variantes[ruta.with_name(ruta.name + '.br')] = brotli.compress(contenido)
+
+        # Primero las comprimidas: nginx nunca ve un .json nuevo con un .gz viejo
+        for destino, datos in sorted(variantes.items(), key=lambda item: item[0] == ruta):
+            descriptor, temporal = tempfile.mkstemp(dir=ruta.parent, prefix='.tmp-')
+            with os.fdopen(descriptor, 'wb') as archivo:
+                archivo.write(datos)
+            os.chmod(temporal, 0o644)
+            os.replace(temporal, destino)
+        self.escritos += 1
+
+    def eliminar_archivo(self, ruta):
+        for variante in (ruta, ruta.with_name(ruta.name + '.gz'), ruta.with_name(ruta.name + '.br')):
+            variante.unlink(missing_ok=True)
+        self.eliminados += 1
+
+    def eliminar_carpeta(self, url):
+        carpeta = self.destino / url.lstrip('/')
+        if carpeta.exists():
+            shutil.rmtree(carpeta)
+            self.eliminados += 1
+
+
+def exportar(modelos=None, destino=None, completo=False):
+    """Exporta (de forma incremental) los tipos indicados, o todos."""
+    return Exportador(destino=destino, completo=completo).exportar(modelos)
+
+
+def conectar_senales():
+    """
+    Hook de publicación: al guardar o eliminar un contenido exportable se
+    exporta cuando se confirma la transacción. Se exportan todos los tipos
+    (de forma incremental) porque un artículo cambia las noticias que lo
+    embeben.
+    """
+    def receptor(sender, **kwargs):
+        if getattr(settings, 'STATIC_EXPORT_ON_PUBLISH', False):
+            _programar_exportacion()
+
+    for exportable in EXPORTABLES:
+        modelo = apps.get_model(exportable.modelo)
+
+        post_save.connect(receptor, sender=modelo, weak=False, dispatch_uid=f"exportacion_{exportable.modelo}_save")
+        post_delete.connect(receptor, sender=modelo, weak=False, dispatch_uid=f"exportacion_{exportable.modelo}_delete")
+
+
+def _programar_exportacion():
+    """Registra `lanzar_exportacion` al confirmar, una sola vez por transacción."""
+    conexion = transaction.get_connection()
+    # Si la transacción (o el savepoint) se revierte, Django descarta la
+    # función pendiente y el próximo guardado la vuelve a registrar
+    if any(funcion is lanzar_exportacion for _, funcion, _ in conexion.run_on_commit):
+        return
+    transaction.on_commit(lanzar_exportacion)
+
+
+# ============================================================================
+# EXPORTACIÓN EN SEGUNDO PLANO
+# ============================================================================
+
+_hilo = None
+_repetir = False
+_hilo_lock = threading.Lock()
+
+
+def lanzar_exportacion():
+    """
+    Inicia el hilo de exportación del proceso. Si ya está en marcha, vuelve
+    a exportar al terminar para incluir los cambios recién confirmados.
+    """
+    global _hilo, _repetir
+    with _hilo_lock:
+        if _hilo is not None:
+            _repetir = True
+        else:
+            _hilo = threading.Thread(target=_exportar_en_segundo_plano, name='exportacion-json', daemon=True)
+            _hilo.start()
+        return _hilo
+
+
+def _exportar_en_segundo_plano():
+    global _hilo, _repetir
+    try:
+        while True:
+            # Un error de exportación no debe afectar a los guardados
+            try:
+                exportar()
+            except Exception:
+                logger.exception("Error en la exportación de JSON estático")
+            with _hilo_lock:
+                if not _repetir:
+                    _hilo = None
+                    return
+                _repetir = False
+    finally:
+        connection.close()
@@ -3,14 +3,35 @@ Filtros personalizados para búsqueda sin acentos usando Unidecode.
 
 Este módulo proporciona un filtro de búsqueda que normaliza
 tanto el término de búsqueda como el contenido, permitiendo
-búsquedas que ignoren acentos y diacríticos.
+búsquedas que ignoren acentos y diacríticos, y el filtro del archivo
+por fechas (?year=&month=).
 """
 
+from datetime import date
+
 from rest_framework import filters
+from rest_framework.exceptions import ValidationError
 from django.db.models import Q
 from unidecode import unidecode
 
 
+def normalizar_busqueda(texto):
+    """
+    Normaliza un texto para búsquedas: sin acentos, en minúsculas y con los
+    espacios colapsados. Se usa tanto para los términos como para las
+    columnas `*_busqueda` que se guardan ya normalizadas.
+    """
+    return " ".join(unidecode(texto or "").lower().split())
+
+
+def rango_mes(anio, mes=None):
+    """Fechas [desde, hasta) de un mes, o del año completo si `mes` es None."""
+    if mes is None:
+        return date(anio, 1, 1), date(anio + 1, 1, 1)
+    hasta = date(anio + 1, 1, 1) if mes == 12 else date(anio, mes + 1, 1)
+    return date(anio, mes, 1), hasta
+
+
 class AccentInsensitiveSearchFilter(filters.SearchFilter):
     """
     Filtro de búsqueda que ignora acentos y diacríticos usando Unidecode.
@@ -59,25 +80,21 @@ class AccentInsensitiveSearchFilter(filters.SearchFilter):
         # Crear lista de IDs que coinciden
         matching_ids = []
         
-        for obj in queryset:
-            match_found = False
-            
+        # Leer solo el pk y los campos de búsqueda (sin instanciar modelos), así
+        # el filtro funciona igual con querysets que usan defer()/only()
+        rows = queryset.order_by().values_list('pk', *search_fields)
+        
+        for pk, *field_values in rows:
             # Revisar cada campo de búsqueda
-            for search_field in search_fields:
-                if match_found:
-                    break
-                
-                # Obtener el valor del campo
-                field_value = self.get_field_value(obj, search_field)
-                
+            for field_value in field_values:
                 if field_value:
                     # Normalizar el valor del campo (remover acentos)
                     normalized_field = unidecode(str(field_value)).lower()
                     
                     # Verificar si el término de búsqueda está en el campo
                     if normalized_search in normalized_field:
-                        matching_ids.append(obj.pk)
-                        match_found = True
+                        matching_ids.append(pk)
+                        break
         
         # Filtrar el queryset por los IDs que coinciden
         if matching_ids:
@@ -111,3 +128,58 @@ class AccentInsensitiveSearchFilter(filters.SearchFilter):
         except (AttributeError, TypeError):
             return None
 
+
+class ArchivoFechaFilter(filters.BaseFilterBackend):
+    """
+    Filtro del archivo por fechas: ?year=2025 y ?year=2025&month=10.
+
+    Filtra el campo `archive_date_field` de la vista con un rango
+    (`>= primer día` y `< primer día del período siguiente`) en lugar de
+    `__year`/`__month`, que en SQLite no pueden usar el índice de la fecha.
+
+    Uso en ViewSet:
+        filter_backends = [AccentInsensitiveSearchFilter, ArchivoFechaFilter]
+        archive_date_field = 'fecha_publicacion'
+    """
+    year_param = 'year'
+    month_param = 'month'
+
+    def filter_queryset(self, request, queryset, view):
+        campo = getattr(view, 'archive_date_field', None)
+        anio = request.query_params.get(self.year_param)
+        mes = request.query_params.get(self.month_param)
+        if not campo or (anio is None and mes is None):
+            return queryset
+        if anio is None:
+            raise ValidationError({self.month_param: "Requiere también el parámetro 'year'."})
+
+        try:
+            anio = int(anio)
+            mes = int(mes) if mes is not None else None
+        except ValueError:
+            raise ValidationError("'year' y 'month' deben ser números.")
+        if not 1 <= anio <= 9998 or (mes is not None and not 1 <= mes <= 12):
+            raise ValidationError("Año o mes fuera de rango.")
+
+        desde, hasta = rango_mes(anio, mes)
+        return queryset.filter(**{f'{campo}__gte': desde, f'{campo}__lt': hasta})
+
+    def get_schema_operation_parameters(self, view):
+        if not getattr(view, 'archive_date_field', None):
+            return []
+        return [
+            {
+                'name': self.year_param,
+                'required': False,
+                'in': 'query',
+                'description': "Año de publicación (archivo por fechas).",
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.month_param,
+                'required': False,
+                'in': 'query',
+                'description': "Mes de publicación (1-12); requiere 'year'.",
+                'schema': {'type': 'integer'},
+            },
+        ]
@@ -0,0 +1,188 @@
+"""
+Análisis de planes de consulta de SQLite para sugerir índices.
+
+`capturar_consultas()` registra el SQL (con sus parámetros) de lo que se
+ejecuta dentro del bloque; `analizar()` pide a SQLite el
+`EXPLAIN QUERY PLAN` de cada consulta y marca:
+
+- SCAN de una tabla sin índice (recorrido completo), y
+- USE TEMP B-TREE (ordenamiento o agrupación en memoria por falta de índice).
+
+Para cada hallazgo propone un índice compuesto: primero las columnas
+comparadas por igualdad en el WHERE, luego las del ORDER BY (o, si no hay,
+las de rango). No se propone un índice si uno existente ya empieza con esas
+columnas (las de igualdad en cualquier orden). Un índice parcial con
+`condition=Q(campo__isnull=True)` cuenta como si empezara con `campo`.
+
+Lo usa el comando `asesor_indices`, que recorre todas las rutas de la API
+con los datos de `sembrar_datos()`.
+"""
+
+import re
+from contextlib import contextmanager
+from typing import NamedTuple
+
+from django.apps import apps
+from django.db import connection
+
+SENTENCIAS_ANALIZABLES = ('SELECT', 'UPDATE', 'DELETE')
+
+# "SCAN tabla", "SCAN tabla USING INDEX x" (SQLite >= 3.36; antes "SCAN TABLE tabla")
+_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(.*)$')
+_TEMP_BTREE = re.compile(r'USE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT|RIGHT PART OF ORDER BY)')
+# "tabla" U0 / "tabla" AS T3
+_ALIAS = re.compile(r'"(\w+)"\s+(?:AS\s+)?([UT]\d+)\b')
+_COLUMNA = r'(?:"(?P<tabla>\w+)"|(?P<alias>[UT]\d+))\."(?P<columna>\w+)"'
+_IGUALDAD = re.compile(_COLUMNA + r'\s*(?:=|IS\s+NULL)')
+_CONJUNTO = re.compile(_COLUMNA + r'\s*IN\s*\(')
+_RANGO = re.compile(_COLUMNA + r'\s*(?:<=?|>=?|BETWEEN\b)')
+_JOIN_ON = re.compile(r'\bON \([^()]*\)')
+_ORDEN = re.compile(r'ORDER BY (.+?)(?:\s+LIMIT\b|\)|$)', re.S)
+
+
+class Hallazgo(NamedTuple):
+    tipo: str          # "scan" o "temp_btree"
+    tabla: str
+    detalle: str       # Línea del plan
+    sugerencia: tuple  # (etiqueta del modelo, campos) o None
+
+
+class Consulta(NamedTuple):
+    sql: str
+    parametros: tuple
+
+
+@contextmanager
+def capturar_consultas(destino):
+    """Agrega a `destino` las consultas SELECT/UPDATE/DELETE ejecutadas en el bloque."""
+
+    def registrar(execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith(SENTENCIAS_ANALIZABLES):
+            destino.append(Consulta(sql, tuple(params or ())))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(registrar):
+        yield destino
+
+
+def plan_de(consulta):
+    """Líneas de detalle del EXPLAIN QUERY PLAN de la consulta."""
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + consulta.sql, consulta.parametros)
+        return [fila[3] for fila in cursor.fetchall()]
+
+
+def analizar(consulta):
+    """Hallazgos del plan de `consulta` (lista vacía si usa índices)."""
+    plan = plan_de(consulta)
+    alias = {nombre: tabla for tabla, nombre in _ALIAS.findall(consulta.sql)}
+    tablas = [linea for linea in plan if linea.startswith(('SCAN', 'SEARCH'))]
+    hallazgos = []
+
+    for linea in plan:
+        scan = _SCAN.match(linea)
+        if scan and 'INDEX' not in scan.group(2) and not scan.group(2).strip().startswith('USING ROWID'):
+            tabla = alias.get(scan.group(1), scan.group(1))
+            if _es_tabla(tabla):
+                hallazgos.append(Hallazgo('scan', tabla, linea, sugerir(consulta.sql, tabla, alias, 'scan')))
+        elif _TEMP_BTREE.search(linea) and tablas:
+            # El ordenamiento corresponde a la primera tabla recorrida de la consulta
+            primera = re.match(r'^(?:SCAN|SEARCH) (?:TABLE )?(\w+)', tablas[0]).group(1)
+            tabla = alias.get(primera, primera)
+            if _es_tabla(tabla):
+                hallazgos.append(Hallazgo('temp_btree', tabla, linea, sugerir(consulta.sql, tabla, alias, 'temp_btree')))
+    return hallazgos
+
+
+def sugerir(sql, tabla, alias, tipo):
+    """
+    Índice compuesto para `tabla` según el SQL: (etiqueta del modelo, campos),
+    o None si no hay columnas útiles o un índice existente ya lo cubre.
+
+    Las condiciones de los JOIN no cuentan (las resuelve el índice de la FK)
+    ni la pk. Una condición `IN (...)` ayuda a buscar pero no evita ordenar
+    los resultados de varios valores, así que en un B-tree temporal con
+    `IN` no se propone nada.
+    """
+    modelo = modelo_de_tabla(tabla)
+    if modelo is None:
+        return None
+    pk = modelo._meta.pk.column
+
+    def columnas(expresion, texto):
+        encontradas = []
+        for coincidencia in expresion.finditer(texto):
+            nombre = coincidencia.group('tabla') or alias.get(coincidencia.group('alias'))
+            columna = coincidencia.group('columna')
+            if nombre == tabla and columna != pk and columna not in encontradas:
+                encontradas.append(columna)
+        return encontradas
+
+    donde = _JOIN_ON.sub('', sql.split(' ORDER BY ')[0])
+    orden = _ORDEN.search(sql)
+    conjuntos = columnas(_CONJUNTO, donde)
+    if tipo == 'temp_btree' and conjuntos:
+        return None
+
+    propuesta = columnas(_IGUALDAD, donde)
+    propuesta += [c for c in conjuntos if c not in propuesta]
+    fijas = len(propuesta)
+    if orden:
+        propuesta += [c for c in columnas(re.compile(_COLUMNA), orden.group(1)) if c not in propuesta]
+    else:
+        propuesta += [c for c in columnas(_RANGO, donde) if c not in propuesta]
+    if not propuesta:
+        return None
+    if any(_cubre(existente, propuesta, fijas) for existente in indices_existentes(modelo)):
+        return None
+
+    por_columna = {campo.column: campo.name for campo in modelo._meta.concrete_fields}
+    return modelo._meta.label, tuple(por_columna.get(columna, columna) for columna in propuesta)
+
+
+def modelo_de_tabla(tabla):
+    for modelo in apps.get_models():
+        if modelo._meta.db_table == tabla:
+            return modelo
+    return None
+
+
+def indices_existentes(modelo):
+    """Columnas de cada índice del modelo (explícitos, únicos, FK y pk)."""
+    opciones = modelo._meta
+    columna = {campo.name: campo.column for campo in opciones.concrete_fields}
+    indices = [[opciones.pk.column]]
+    indices += [
+        [*_columnas_nulas(indice.condition, columna), *(columna[nombre.lstrip('-')] for nombre in indice.fields)]
+        for indice in opciones.indexes
+    ]
+    indices += [[columna[nombre] for nombre in juntos] for juntos in opciones.unique_together]
+    indices += [
+        [columna[nombre] for nombre in restriccion.fields]
+        for restriccion in opciones.constraints if getattr(restriccion, 'fields', None)
+    ]
+    indices += [[campo.column] for campo in opciones.concrete_fields if campo.db_index or campo.unique]
+    return indices
+
+
+def _columnas_nulas(condicion, columna):
+    """Columnas que la condición de un índice parcial fija con `__isnull=True`."""
+    if condicion is None or condicion.negated or condicion.connector != 'AND':
+        return []
+    return [
+        columna[hijo[0].removesuffix('__isnull')]
+        for hijo in condicion.children
+        if isinstance(hijo, tuple) and hijo[0].endswith('__isnull') and hijo[1] is True
+    ]
+
+
+def _cubre(existente, propuesta, fijas):
+    """Si el índice `existente` empieza con `propuesta`: las `fijas` primeras en cualquier orden."""
+    return (
+        set(existente[:fijas]) == set(propuesta[:fijas])
+        and existente[fijas:len(propuesta)] == propuesta[fijas:]
+    )
+
+
+def _es_tabla(nombre):
+    return modelo_de_tabla(nombre) is not None
@@ -0,0 +1,372 @@
+"""
+Registro de los modelos de likes e índice en memoria de "quién dio like".
+
+`TIPOS_LIKE` describe, para cada tipo de contenido, la tabla de likes y la
+columna del objeto. Lo usan los endpoints genéricos de interacciones.
+
+`IndiceLikes` es una caché opcional por proceso con los IDs de usuarios que
+dieron like a cada objeto, guardados como arreglos ordenados de enteros
+(`array('q')`). Se carga de forma perezosa (una sola consulta por lote de
+objetos faltantes) y se parchea con las señales de creación/eliminación de
+likes, de modo que "¿el usuario X dio like a estos 50 objetos?" se responde
+con búsquedas binarias sin tocar la base de datos.
+
+Como es por proceso, los likes registrados en otro worker solo se ven cuando
+vence el TTL de la entrada (LIKER_INDEX_TTL).
+"""
+
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import NamedTuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
+
+from .archivado import ARCHIVO_FRIO, restaurar
+from .cache import invalidar_etiquetas
+from .models import LikeArchivado
+from .signals import marcar_relacionados
+
+
+class TipoLike(NamedTuple):
+    modelo: str        # app_label.Modelo de la tabla de likes
+    campo_objeto: str  # Nombre del FK al objeto de contenido
+    modelo_objeto: str # app_label.Modelo del objeto de contenido
+
+    def get_model(self):
+        return apps.get_model(self.modelo)
+
+    def get_model_objeto(self):
+        return apps.get_model(self.modelo_objeto)
+
+    @property
+    def columna_objeto(self):
+        return f"{self.campo_objeto}_id"
+
+
+TIPOS_LIKE = {
+    'articulo': TipoLike('articles.LikeArticulo', 'articulo', 'articles.Articulos'),
+    'blog': TipoLike('blog.LikeBlog', 'blog', 'blog.Blog'),
+    'tema': TipoLike('foro.LikeTema', 'tema', 'foro.Tema'),
+    'comentario_tema': TipoLike('foro.LikeComentarioTema', 'comentario', 'foro.ComentarioTema'),
+}
+
+
+def _contiene(ids_ordenados, valor):
+    posicion = bisect_left(ids_ordenados, valor)
+    return posicion < len(ids_ordenados) and ids_ordenados[posicion] == valor
+
+
+class IndiceLikes:
+    """
+    Caché LRU por proceso: (tipo, objeto_id) -> array('q') ordenado de usuario_id.
+    """
+
+    def __init__(self, ttl=300, max_objetos=50000):
+        self.ttl = ttl
+        self.max_objetos = max_objetos
+        self._entradas = OrderedDict()  # clave -> (ids_ordenados, cargado_en)
+        self._lock = threading.Lock()
+
+    def usuario_dio_like(self, tipo, usuario_id, objeto_ids):
+        """
+        Indica si `usuario_id` dio like a cada uno de `objeto_ids`.
+
+        Returns:
+            Diccionario {objeto_id: bool}.
+        """
+        objeto_ids = list(dict.fromkeys(objeto_ids))
+        ahora = time.monotonic()
+        resultado = {}
+        faltantes = []
+
+        with self._lock:
+            for objeto_id in objeto_ids:
+                entrada = self._entradas.get((tipo, objeto_id))
+                if entrada is None or ahora - entrada[1] > self.ttl:
+                    faltantes.append(objeto_id)
+                    continue
+                self._entradas.move_to_end((tipo, objeto_id))
+                resultado[objeto_id] = _contiene(entrada[0], usuario_id)
+
+        if faltantes:
+            for objeto_id, ids_ordenados in self._cargar(tipo, faltantes).items():
+                resultado[objeto_id] = _contiene(ids_ordenados, usuario_id)
+
+        return resultado
+
+    def _cargar(self, tipo, objeto_ids):
+        """Carga en una sola consulta los likes de los objetos indicados."""
+        tipo_like = TIPOS_LIKE[tipo]
+        columna = tipo_like.columna_objeto
+        cargados = {objeto_id: array('q') for objeto_id in objeto_ids}
+
+        filas = (
+            tipo_like.get_model().objects
+            .filter(**{f"{columna}__in": objeto_ids})
+            .values_list(columna, 'usuario_id')
+        )
+        archivados = likes_archivados(tipo_like, objeto_ids)
+        if archivados is not None:
+            filas = filas.union(archivados.values_list('objeto_id', 'usuario_id'), all=True)
+        filas = filas.order_by(columna, 'usuario_id')
+        for objeto_id, usuario_id in filas:
+            cargados[objeto_id].append(usuario_id)
+
+        ahora = time.monotonic()
+        with self._lock:
+            for objeto_id, ids_ordenados in cargados.items():
+                self._entradas[(tipo, objeto_id)] = (ids_ordenados, ahora)
+                self._entradas.move_to_end((tipo, objeto_id))
+            while len(self._entradas) > self.max_objetos:
+                self._entradas.popitem(last=False)
+
+        return cargados
+
+    def registrar(self, tipo, objeto_id, usuario_id, liked):
+        """Parchea una entrada ya cargada tras crear o quitar un like."""
+        with self._lock:
+            entrada = self._entradas.get((tipo, objeto_id))
+            if entrada is None:
+                return
+            ids_ordenados = entrada[0]
+            posicion = bisect_left(ids_ordenados, usuario_id)
+            presente = posicion < len(ids_ordenados) and ids_ordenados[posicion] == usuario_id
+            if liked and not presente:
+                ids_ordenados.insert(posicion, usuario_id)
+            elif not liked and presente:
+                ids_ordenados.pop(posicion)
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+
+
+_indice = None
+_indice_lock = threading.Lock()
+
+
+def get_indice_likes():
+    """
+    Devuelve el índice del proceso, o None si LIKER_INDEX_ENABLED está apagado.
+    """
+    global _indice
+    if not getattr(settings, 'LIKER_INDEX_ENABLED', False):
+        return None
+    if _indice is None:
+        with _indice_lock:
+            if _indice is None:
+                _indice = IndiceLikes(
+                    ttl=getattr(settings, 'LIKER_INDEX_TTL', 300),
+                    max_objetos=getattr(settings, 'LIKER_INDEX_MAX_OBJECTS', 50000),
+                )
+    return _indice
+
+
+def usuario_dio_like(tipo, usuario, objeto_ids):
+    """
+    Estado de like del usuario para varios objetos de un mismo tipo.
+
+    Usa el índice en memoria si está habilitado; si no, resuelve todo el lote
+    con una única consulta.
+
+    Returns:
+        Diccionario {objeto_id: bool}.
+    """
+    if not usuario or not usuario.is_authenticated or not objeto_ids:
+        return {objeto_id: False for objeto_id in objeto_ids}
+
+    indice = get_indice_likes()
+    if indice is not None:
+        return indice.usuario_dio_like(tipo, usuario.pk, objeto_ids)
+
+    tipo_like = TIPOS_LIKE[tipo]
+    con_like = (
+        tipo_like.get_model().objects
+        .filter(usuario=usuario, **{f"{tipo_like.columna_objeto}__in": objeto_ids})
+        .values_list(tipo_like.columna_objeto, flat=True)
+    )
+    archivados = likes_archivados(tipo_like, objeto_ids)
+    if archivados is not None:
+        # Misma consulta: UNION con los likes del archivo frío
+        con_like = con_like.union(archivados.filter(usuario=usuario).values_list('objeto_id', flat=True))
+    con_like = set(con_like)
+    return {objeto_id: objeto_id in con_like for objeto_id in objeto_ids}
+
+
+def likes_archivados(tipo_like, objeto_ids):
+    """
+    Queryset de los likes de `objeto_ids` en el archivo frío, o None si el
+    tipo de contenido no se archiva (ver app/common/archivado.py).
+    """
+    if tipo_like.modelo_objeto not in ARCHIVO_FRIO:
+        return None
+    return LikeArchivado.objects.filter(tipo_contenido=tipo_like.modelo_objeto, objeto_id__in=objeto_ids)
+
+
+def registrar_like(tipo, objeto_id, usuario_id, liked):
+    """Parchea el índice del proceso (si está habilitado) tras un cambio de like."""
+    indice = get_indice_likes()
+    if indice is not None:
+        indice.registrar(tipo, objeto_id, usuario_id, liked)
+
+
+def _al_cambiar_ajuste(setting, **kwargs):
+    if setting == 'LIKER_INDEX_ENABLED':
+        conectar_senales()
+
+
+def conectar_senales():
+    """
+    Conecta las señales de los modelos de likes para mantener el índice al
+    día, solo con LIKER_INDEX_ENABLED: sin índice que parchear, el receptor
+    de `post_delete` solo le quitaría a Django el borrado rápido de los likes.
+    Se repite al cambiar el ajuste (`override_settings`).
+    """
+    global _indice
+    setting_changed.connect(_al_cambiar_ajuste, weak=False, dispatch_uid="indice_likes_ajustes")
+    if not getattr(settings, 'LIKER_INDEX_ENABLED', False):
+        for tipo, tipo_like in TIPOS_LIKE.items():
+            post_save.disconnect(sender=tipo_like.get_model(), dispatch_uid=f"indice_likes_save_{tipo}")
+            post_delete.disconnect(sender=tipo_like.get_model(), dispatch_uid=f"indice_likes_delete_{tipo}")
+        _indice = None  # Sin señales quedaría desactualizado
+        return
+
+    for tipo, tipo_like in TIPOS_LIKE.items():
+        modelo = tipo_like.get_model()
+
+        def al_guardar(sender, instance, created, _tipo=tipo, _columna=tipo_like.columna_objeto, **kwargs):
+            if created:
+                registrar_like(_tipo, getattr(instance, _columna), instance.usuario_id, True)
+
+        def al_eliminar(sender, instance, _tipo=tipo, _columna=tipo_like.columna_objeto, **kwargs):
+            registrar_like(_tipo, getattr(instance, _columna), instance.usuario_id, False)
+
+        post_save.connect(al_guardar, sender=modelo, weak=False, dispatch_uid=f"indice_likes_save_{tipo}")
+        post_delete.connect(al_eliminar, sender=modelo, weak=False, dispatch_uid=f"indice_likes_delete_{tipo}")
+
+
+# Estados posibles de cada operación de un lote de reacciones
+APLICADA = 'applied'
+SIN_CAMBIOS = 'noop'
+REEMPLAZADA = 'superseded'
+NO_ENCONTRADO = 'not_found'
+
+
+def aplicar_reacciones(usuario, operaciones):
+    """
+    Aplica un lote de operaciones de like/unlike de forma idempotente.
+
+    Cada operación es un diccionario validado con `index`, `type`, `id`,
+    `action` ("add" | "remove") y `client_ts` opcional. Si hay varias
+    operaciones sobre el mismo objeto gana la más reciente según `client_ts`
+    (las que no lo traen se consideran anteriores, en orden de llegada); las
+    demás quedan como "superseded".
+
+    Todo el lote se aplica en una transacción con un `bulk_create` y un
+    `delete` por tipo de contenido.
+
+    Returns:
+        Tupla (resultados por operación, {tipo: {objeto_id: likes_count}}).
+    """
+    resultados = {}
+    finales = {}
+
+    ordenadas = sorted(
+        operaciones,
+        key=lambda op: (op.get('client_ts') is not None, op.get('client_ts') or 0, op['index'])
+    )
+    for op in ordenadas:
+        clave = (op['type'], op['id'])
+        anterior = finales.get(clave)
+        if anterior is not None:
+            resultados[anterior['index']] = {**_resultado(anterior, REEMPLAZADA), "liked": None}
+        finales[clave] = op
+
+    por_tipo = {}
+    for op in finales.values():
+        por_tipo.setdefault(op['type'], []).append(op)
+
+    conteos = {}
+    agregados = []
+    with transaction.atomic():
+        for tipo, ops in por_tipo.items():
+            tipo_like = TIPOS_LIKE[tipo]
+            Like = tipo_like.get_model()
+            columna = tipo_like.columna_objeto
+            ids = {op['id'] for op in ops}
+
+            Objeto = tipo_like.get_model_objeto()
+            if tipo_like.modelo_objeto in ARCHIVO_FRIO:
+                # Los hilos archivados se restauran antes de leer y cambiar sus likes
+                objetos = list(Objeto.objects.filter(pk__in=ids).only('pk', 'interacciones_archivadas'))
+                for objeto in objetos:
+                    restaurar(objeto)
+                existentes = {objeto.pk for objeto in objetos}
+            else:
+                existentes = set(Objeto.objects.filter(pk__in=ids).values_list('pk', flat=True))
+            con_like = set(
+                Like.objects.filter(usuario=usuario, **{f"{columna}__in": existentes})
+                .values_list(columna, flat=True)
+            )
+
+            por_agregar = []
+            por_quitar = []
+            for op in ops:
+                if op['id'] not in existentes:
+                    resultados[op['index']] = {**_resultado(op, NO_ENCONTRADO), "liked": None}
+                    continue
+                if op['action'] == 'add':
+                    liked = True
+                    estado = SIN_CAMBIOS if op['id'] in con_like else APLICADA
+                    if estado == APLICADA:
+                        por_agregar.append(op['id'])
+                else:
+                    liked = False
+                    estado = APLICADA if op['id'] in con_like else SIN_CAMBIOS
+                    if estado == APLICADA:
+                        por_quitar.append(op['id'])
+                resultados[op['index']] = {**_resultado(op, estado), "liked": liked}
+
+            if por_agregar:
+                Like.objects.bulk_create(
+                    [Like(usuario=usuario, **{columna: objeto_id}) for objeto_id in por_agregar],
+                    ignore_conflicts=True,
+                )
+                agregados.extend((tipo, objeto_id) for objeto_id in por_agregar)
+            if por_quitar:
+                Like.objects.filter(usuario=usuario, **{f"{columna}__in": por_quitar}).delete()
+
+            conteos[tipo] = {objeto_id: 0 for objeto_id in existentes}
+            conteos[tipo].update(
+                Like.objects.filter(**{f"{columna}__in": existentes})
+                .values(columna).annotate(total=Count('pk'))
+                .values_list(columna, 'total')
+            )
+
+    # bulk_create no emite post_save: parchear el índice, las marcas de
+    # modificación y la caché de respuestas a mano
+    for tipo, objeto_id in agregados:
+        registrar_like(tipo, objeto_id, usuario.pk, True)
+    for tipo in {tipo for tipo, _ in agregados}:
+        marcar_relacionados(TIPOS_LIKE[tipo].modelo, [objeto_id for t, objeto_id in agregados if t == tipo])
+        invalidar_etiquetas(TIPOS_LIKE[tipo].modelo)
+
+    return [resultados[op['index']] for op in sorted(operaciones, key=lambda op: op['index'])], conteos
+
+
+def _resultado(op, estado):
+    return {
+        "index": op['index'],
+        "type": op['type'],
+        "id": op['id'],
+        "action": op['action'],
+        "status": estado,
+    }
@@ -0,0 +1,39 @@
+"""
+Comando para reconstruir el archivo por fechas (`ArchivoMensual`).
+
+Las señales mantienen el archivo al día en los guardados normales; este
+comando corrige los cambios hechos con operaciones masivas (importaciones,
+`bulk_create`, `update()`) y sirve para la carga inicial.
+
+Uso:
+    python manage.py actualizar_archivo
+    python manage.py actualizar_archivo --model articles.Articulos
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.common.archivo import ARCHIVABLES, recalcular
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye los conteos por mes del archivo de artículos, noticias y ediciones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            dest='modelos',
+            action='append',
+            help=f'Contenido a reconstruir (se puede repetir). Opciones: {", ".join(ARCHIVABLES)}',
+        )
+
+    def handle(self, *args, **options):
+        modelos = options['modelos'] or list(ARCHIVABLES)
+        desconocidos = set(modelos) - set(ARCHIVABLES)
+        if desconocidos:
+            raise CommandError(f'Contenidos desconocidos: {", ".join(sorted(desconocidos))}')
+
+        for contenido in modelos:
+            buckets = recalcular(contenido)
+            self.stdout.write(f'  {contenido}: {buckets} meses')
+
+        self.stdout.write(self.style.SUCCESS('✅ Archivo por fechas actualizado'))
@@ -0,0 +1,58 @@
+"""
+Comando para mover al archivo frío los comentarios y likes de artículos y
+noticias antiguos (ver app/common/archivado.py).
+
+Se archivan los hilos de los contenidos publicados hace más de `--days` días
+(por defecto COLD_ARCHIVE_DAYS) y sin comentarios ni likes desde entonces.
+Los endpoints los siguen mostrando; comentar o dar like en uno lo restaura.
+
+Uso:
+    python manage.py archivar_interacciones --dry-run
+    python manage.py archivar_interacciones --days 365 --batch-size 500
+    python manage.py archivar_interacciones --model blog.Blog
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.common.archivado import ARCHIVO_FRIO, archivar, candidatos, horizonte
+
+
+class Command(BaseCommand):
+    help = 'Mueve los comentarios y likes de contenidos antiguos al archivo frío'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Antigüedad mínima en días (por defecto COLD_ARCHIVE_DAYS)')
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='modelos',
+            help=f"Contenido a archivar (se puede repetir): {', '.join(ARCHIVO_FRIO)}. Por defecto, todos",
+        )
+        parser.add_argument('--batch-size', type=int, default=200, help='Objetos por transacción (por defecto 200)')
+        parser.add_argument('--dry-run', action='store_true', help='Solo muestra cuántos objetos se archivarían')
+
+    def handle(self, *args, **options):
+        modelos = options['modelos'] or list(ARCHIVO_FRIO)
+        invalidos = set(modelos) - set(ARCHIVO_FRIO)
+        if invalidos:
+            raise CommandError(f"Contenidos no archivables: {', '.join(sorted(invalidos))}")
+        if options['days'] is not None and options['days'] < 1:
+            raise CommandError('--days debe ser mayor que 0')
+
+        limite = horizonte(options['days'])
+        self.stdout.write(f'Horizonte: {limite:%Y-%m-%d %H:%M}')
+
+        for modelo in modelos:
+            tipo = ARCHIVO_FRIO[modelo]
+            if options['dry_run']:
+                self.stdout.write(f'  {modelo}: {candidatos(tipo, limite).count()} objetos por archivar')
+                continue
+
+            inicio = time.monotonic()
+            objetos, comentarios, likes = archivar(tipo, limite, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ {modelo}: {objetos} objetos archivados ({comentarios} comentarios, {likes} likes) '
+                f'en {time.monotonic() - inicio:.2f}s'
+            ))
@@ -0,0 +1,125 @@
+"""
+Comando para revisar los planes de consulta de toda la API y sugerir índices.
+
+Crea una base de prueba temporal (como `manage.py test`), la llena con
+`sembrar_datos()` y recorre las rutas de /api/v1/ del resolver de URLs. Cada
+ruta se llama con las peticiones de sus presupuestos de consultas
+(`PRESUPUESTOS` de app/common/testing.py); las que no tienen ninguna se
+reportan. De cada consulta obtiene el `EXPLAIN QUERY PLAN` y reporta los
+recorridos completos de tablas y los ordenamientos con B-tree temporal,
+con el índice compuesto que los evitaría (ver app/common/indices.py).
+
+Cada ruta se ejecuta dentro de una transacción que se revierte, así que
+todas ven los mismos datos sembrados. La base real no se toca.
+
+Uso:
+    python manage.py asesor_indices
+    python manage.py asesor_indices --url /api/v1/foro/ -v 2
+"""
+
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from rest_framework.test import APIClient
+
+from app.common.indices import analizar, capturar_consultas
+from app.common.testing import RUTAS_EXCLUIDAS, presupuestos_por_ruta, rutas_api, sembrar_datos
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta todas las rutas de la API con datos sembrados y sugiere índices según EXPLAIN QUERY PLAN'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Solo las rutas que contienen este texto')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('El asesor interpreta planes de SQLite; la base por defecto es otra')
+
+        por_ruta = presupuestos_por_ruta()
+        presupuestos = []
+        for ruta in rutas_api():
+            if ruta in RUTAS_EXCLUIDAS:
+                continue
+            if ruta not in por_ruta:
+                self.stdout.write(self.style.WARNING(f'{ruta}: sin presupuesto, no se revisa'))
+                continue
+            presupuestos += [
+                presupuesto for presupuesto in por_ruta[ruta]
+                if not options['url'] or options['url'] in presupuesto.url
+            ]
+        if not presupuestos:
+            raise CommandError('Ninguna ruta coincide con --url')
+
+        setup_test_environment()
+        bases = setup_databases(verbosity=0, interactive=False)
+        try:
+            datos = sembrar_datos()
+            sugerencias = self.recorrer(presupuestos, datos, options['verbosity'])
+        finally:
+            teardown_databases(bases, verbosity=0)
+            teardown_test_environment()
+
+        if not sugerencias:
+            self.stdout.write(self.style.SUCCESS('✅ Ninguna consulta necesita índices nuevos'))
+            return
+
+        self.stdout.write('\nÍndices sugeridos:')
+        for (modelo, campos), rutas in sorted(sugerencias.items(), key=lambda item: -len(item[1])):
+            self.stdout.write(
+                f'  {modelo}: models.Index(fields={list(campos)!r})  # {len(rutas)} ruta(s), p. ej. {sorted(rutas)[0]}'
+            )
+
+    def recorrer(self, presupuestos, datos, verbosidad):
+        sugerencias = defaultdict(set)
+
+        for presupuesto in presupuestos:
+            url = presupuesto.url.format(**datos)
+            ruta = f'{presupuesto.metodo.upper()} {url}'
+            cliente = APIClient()
+            if presupuesto.usuario:
+                cliente.force_authenticate(datos[presupuesto.usuario])
+            cuerpo = _formatear(presupuesto.datos, datos)
+
+            consultas = []
+            with transaction.atomic():
+                with capturar_consultas(consultas):
+                    respuesta = getattr(cliente, presupuesto.metodo)(url, cuerpo, format='json')
+                # Dentro de la transacción: las filas creadas por la ruta siguen visibles
+                hallazgos = [
+                    hallazgo
+                    for consulta in dict.fromkeys(consultas)
+                    for hallazgo in analizar(consulta)
+                ]
+                transaction.set_rollback(True)
+
+            if respuesta.status_code != presupuesto.estado:
+                self.stdout.write(self.style.WARNING(
+                    f'{ruta}: respondió {respuesta.status_code} (se esperaba {presupuesto.estado})'
+                ))
+            if not hallazgos:
+                if verbosidad >= 2:
+                    self.stdout.write(f'{ruta}: {len(consultas)} consultas, sin hallazgos')
+                continue
+
+            self.stdout.write(f'{ruta}: {len(hallazgos)} hallazgo(s)')
+            for hallazgo in hallazgos:
+                if verbosidad >= 2 or hallazgo.sugerencia:
+                    self.stdout.write(f'    {hallazgo.tipo:<10} {hallazgo.tabla}: {hallazgo.detalle}')
+                if hallazgo.sugerencia:
+                    sugerencias[hallazgo.sugerencia].add(ruta)
+
+        return sugerencias
+
+
+def _formatear(valor, datos):
+    """Reemplaza los marcadores de `sembrar_datos()` (como `PresupuestoConsultasMixin.formatear`)."""
+    if isinstance(valor, str):
+        return valor.format(**datos)
+    if isinstance(valor, dict):
+        return {clave: _formatear(item, datos) for clave, item in valor.items()}
+    if isinstance(valor, list):
+        return [_formatear(item, datos) for item in valor]
+    return valor
@@ -0,0 +1,101 @@
+"""
+Comando para comparar `JSONRenderer` de DRF con `ORJSONRenderer`.
+
+Obtiene respuestas reales de la API (con los datos de la base actual) y mide
+cuánto tarda cada renderer en serializarlas. También verifica que ambos
+produzcan exactamente los mismos bytes.
+
+Uso:
+    python manage.py benchmark_json
+    python manage.py benchmark_json --iterations 500
+    python manage.py benchmark_json --url /api/v1/foro/temas/?page_size=20
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from app.articles.models import Articulos
+from app.common.renderers import ORJSONRenderer, orjson
+from app.foro.models import Tema
+
+
+class Command(BaseCommand):
+    help = 'Compara el renderer JSON estándar de DRF con el de orjson sobre respuestas reales'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help='Veces que se renderiza cada respuesta (por defecto 200)',
+        )
+        parser.add_argument(
+            '--url',
+            action='append',
+            dest='urls',
+            help='URL a medir (se puede repetir). Por defecto, las respuestas más pesadas',
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson no está instalado (pip install orjson)')
+
+        cliente = APIClient()
+        admin = get_user_model().objects.filter(is_superuser=True).first()
+        if admin:
+            cliente.force_authenticate(admin)
+
+        host = next((h for h in settings.ALLOWED_HOSTS if h and h != '*' and not h.startswith('.')), 'localhost')
+        urls = options['urls'] or self.urls_por_defecto()
+        iteraciones = options['iterations']
+
+        estandar = JSONRenderer()
+        rapido = ORJSONRenderer()
+
+        self.stdout.write(f"{'URL':<55} {'KB':>7} {'DRF ms':>9} {'orjson ms':>10} {'x':>6}  Igual")
+        for url in urls:
+            respuesta = cliente.get(url, HTTP_HOST=host)
+            if respuesta.status_code != 200 or not hasattr(respuesta, 'data'):
+                self.stdout.write(self.style.WARNING(f'{url:<55} HTTP {respuesta.status_code}, omitida'))
+                continue
+
+            contexto = {'request': respuesta.wsgi_request, 'response': respuesta}
+            datos = respuesta.data
+
+            salida_estandar = estandar.render(datos, 'application/json', contexto)
+            salida_rapida = rapido.render(datos, 'application/json', contexto)
+
+            t_estandar = self.medir(estandar, datos, contexto, iteraciones)
+            t_rapido = self.medir(rapido, datos, contexto, iteraciones)
+
+            self.stdout.write(
+                f'{url:<55} {len(salida_estandar) / 1024:>7.1f} {t_estandar:>9.3f} {t_rapido:>10.3f} '
+                f'{t_estandar / t_rapido:>6.1f}  {"sí" if salida_estandar == salida_rapida else "NO"}'
+            )
+
+    def urls_por_defecto(self):
+        urls = [
+            '/api/v1/noticias/noticias/?page_size=20',
+            '/api/v1/articles/articulos/?page_size=20',
+            '/api/v1/foro/temas/?page_size=20',
+            '/api/v1/users/roles/users/',
+        ]
+        articulo = Articulos.objects.order_by('-id').values_list('id', flat=True).first()
+        if articulo:
+            urls.append(f'/api/v1/articles/articulos/{articulo}/')
+        tema = Tema.objects.order_by('-id').values_list('id', flat=True).first()
+        if tema:
+            urls.append(f'/api/v1/foro/temas/{tema}/')
+        return urls
+
+    def medir(self, renderer, datos, contexto, iteraciones):
+        """Tiempo promedio en milisegundos por renderizado."""
+        inicio = time.perf_counter()
+        for _ in range(iteraciones):
+            renderer.render(datos, 'application/json', contexto)
+        return (time.perf_counter() - inicio) * 1000 / iteraciones
@@ -0,0 +1,161 @@
+"""
+Comando para medir la concurrencia de SQLite con y sin los PRAGMA de
+SQLITE_PRAGMAS (ver app/common/sqlite.py) y el SQLITE_TRANSACTION_MODE de
+las transacciones.
+
+Trabaja sobre copias temporales de la base actual (nunca la modifica). Para
+cada perfil ejecuta durante unos segundos varios hilos lectores (la consulta
+del listado de artículos con conteos de likes y comentarios) mientras otros
+hilos escriben likes y comentarios, y reporta lecturas y escrituras por
+segundo, latencias y errores "database is locked".
+
+Uso:
+    python manage.py benchmark_sqlite
+    python manage.py benchmark_sqlite --seconds 10 --readers 8 --writers 2
+"""
+
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.db.models import Count
+
+from app.articles.models import Articulos, ComentarioArticulo, LikeArticulo
+from app.common.sqlite import PRAGMAS_SQLITE_ORIGINALES, pragmas_de
+
+ALIAS = 'benchmark_sqlite'
+
+
+class Command(BaseCommand):
+    help = 'Mide lecturas concurrentes con escrituras de likes/comentarios, con y sin los PRAGMA de SQLite'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5, help='Duración de cada perfil (por defecto 5)')
+        parser.add_argument('--readers', type=int, default=4, help='Hilos lectores (por defecto 4)')
+        parser.add_argument('--writers', type=int, default=2, help='Hilos escritores (por defecto 2)')
+
+    def handle(self, *args, **options):
+        origen = connections['default']
+        if origen.vendor != 'sqlite':
+            raise CommandError('La base por defecto no es SQLite')
+
+        self.articulos = list(Articulos.objects.values_list('pk', flat=True)[:200])
+        self.usuarios = list(get_user_model().objects.values_list('pk', flat=True)[:500])
+        if not self.articulos or not self.usuarios:
+            raise CommandError('Se necesitan artículos y usuarios en la base para medir')
+
+        # Perfil -> (PRAGMA, transaction_mode de las transacciones de Django)
+        modo = origen.settings_dict.get('OPTIONS', {}).get('transaction_mode') or 'DEFERRED'
+        perfiles = {
+            'SQLite por defecto': (PRAGMAS_SQLITE_ORIGINALES, 'DEFERRED'),
+            'SQLITE_PRAGMAS': (pragmas_de(origen.settings_dict), 'DEFERRED'),
+        }
+        if modo != 'DEFERRED':
+            perfiles[f'SQLITE_PRAGMAS + {modo}'] = (pragmas_de(origen.settings_dict), modo)
+
+        self.stdout.write(
+            f"{'Perfil':<28} {'lect/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'escr/s':>8} {'p95 ms':>8} {'errores':>8}"
+        )
+        carpeta = tempfile.mkdtemp(prefix='rmm_benchmark_')
+        try:
+            for nombre, (pragmas, modo) in perfiles.items():
+                ruta = os.path.join(carpeta, f'{len(os.listdir(carpeta))}.sqlite3')
+                self.copiar_base(origen, ruta, pragmas)
+                resultado = self.medir(origen.settings_dict, ruta, pragmas, modo, options)
+                self.stdout.write(
+                    f"{nombre:<28} {resultado['lecturas_s']:>9.0f} {resultado['lectura_p50']:>8.1f} "
+                    f"{resultado['lectura_p95']:>8.1f} {resultado['escrituras_s']:>8.0f} "
+                    f"{resultado['escritura_p95']:>8.1f} {resultado['errores']:>8}"
+                )
+        finally:
+            shutil.rmtree(carpeta, ignore_errors=True)
+
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark terminado (las copias temporales se eliminaron)'))
+
+    def copiar_base(self, origen, ruta, pragmas):
+        origen.ensure_connection()
+        destino = sqlite3.connect(ruta)
+        try:
+            origen.connection.backup(destino)
+            destino.execute(f"PRAGMA journal_mode = {pragmas.get('journal_mode', 'delete')}")
+        finally:
+            destino.close()
+
+    def medir(self, settings_dict, ruta, pragmas, modo, options):
+        # PRAGMAS completos del perfil: anulan SQLITE_PRAGMAS en la copia
+        connections.settings[ALIAS] = {
+            **settings_dict, 'NAME': ruta, 'PRAGMAS': pragmas,
+            'OPTIONS': {**settings_dict.get('OPTIONS', {}), 'transaction_mode': modo}, 'TEST': {},
+        }
+        fin = time.monotonic() + options['seconds']
+        lecturas, escrituras, errores = [], [], []
+
+        def lector():
+            try:
+                while time.monotonic() < fin:
+                    inicio = time.perf_counter()
+                    try:
+                        list(
+                            Articulos.objects.using(ALIAS)
+                            .annotate(likes_count=Count('likes', distinct=True),
+                                      comentarios_count=Count('comentarios', distinct=True))
+                            .order_by('-fecha_publicacion')
+                            .values('pk', 'titulo_articulo', 'likes_count', 'comentarios_count')[:6]
+                        )
+                        lecturas.append(time.perf_counter() - inicio)
+                    except OperationalError:
+                        errores.append('lectura')
+            finally:
+                connections[ALIAS].close()
+
+        def escritor():
+            # bulk_create no emite señales: nada se escribe fuera de la copia
+            try:
+                while time.monotonic() < fin:
+                    inicio = time.perf_counter()
+                    articulo = random.choice(self.articulos)
+                    usuario = random.choice(self.usuarios)
+                    try:
+                        with transaction.atomic(using=ALIAS):
+                            LikeArticulo.objects.using(ALIAS).bulk_create(
+                                [LikeArticulo(articulo_id=articulo, usuario_id=usuario)], ignore_conflicts=True
+                            )
+                            ComentarioArticulo.objects.using(ALIAS).bulk_create([
+                                ComentarioArticulo(articulo_id=articulo, autor_id=usuario, contenido="Benchmark")
+                            ])
+                        escrituras.append(time.perf_counter() - inicio)
+                    except OperationalError:
+                        errores.append('escritura')
+            finally:
+                connections[ALIAS].close()
+
+        hilos = [threading.Thread(target=lector) for _ in range(options['readers'])]
+        hilos += [threading.Thread(target=escritor) for _ in range(options['writers'])]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        del connections.settings[ALIAS]
+
+        return {
+            'lecturas_s': len(lecturas) / options['seconds'],
+            'lectura_p50': _percentil(lecturas, 50),
+            'lectura_p95': _percentil(lecturas, 95),
+            'escrituras_s': len(escrituras) / options['seconds'],
+            'escritura_p95': _percentil(escrituras, 95),
+            'errores': len(errores),
+        }
+
+
+def _percentil(duraciones, percentil):
+    if len(duraciones) < 2:
+        return duraciones[0] * 1000 if duraciones else 0
+    return statistics.quantiles(duraciones, n=100)[percentil - 1] * 1000
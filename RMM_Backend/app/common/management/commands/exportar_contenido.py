@@ -0,0 +1,58 @@
+"""
+Comando para exportar artículos, noticias, ediciones y sus comentarios y
+likes a un archivo JSONL, en streaming (ver app/common/respaldo.py).
+
+Con extensión `.gz` el archivo se comprime. Sin `--output` se escribe en la
+salida estándar.
+
+Uso:
+    python manage.py exportar_contenido --output contenido.jsonl.gz
+    python manage.py exportar_contenido --model articles.Articulos --model articles.ComentarioArticulo
+"""
+
+import gzip
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.common.respaldo import CONTENIDOS, exportar, velocidad
+
+
+class Command(BaseCommand):
+    help = 'Exporta el contenido (con comentarios y likes) a JSONL en streaming'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Archivo de destino (.jsonl o .jsonl.gz). Por defecto, la salida estándar')
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='modelos',
+            help='Tipo a exportar (app_label.Modelo, se puede repetir). Por defecto, todos',
+        )
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Filas por lectura (por defecto 1000)')
+
+    def handle(self, *args, **options):
+        validos = {tipo.modelo for tipo in CONTENIDOS}
+        invalidos = set(options['modelos'] or ()) - validos
+        if invalidos:
+            raise CommandError(f"Tipos no exportables: {', '.join(sorted(invalidos))}. Válidos: {', '.join(sorted(validos))}")
+
+        ruta = options['output']
+        # El resumen no debe mezclarse con el JSONL cuando se escribe en stdout
+        informe = self.stdout if ruta else self.stderr
+
+        inicio = time.monotonic()
+        if ruta:
+            abrir = gzip.open if ruta.endswith('.gz') else open
+            with abrir(ruta, 'wt', encoding='utf-8') as salida:
+                filas = exportar(salida, options['modelos'], options['chunk_size'])
+        else:
+            filas = exportar(sys.stdout, options['modelos'], options['chunk_size'])
+
+        for modelo, total in filas.items():
+            informe.write(f'  {modelo}: {total} filas')
+        total = sum(filas.values())
+        informe.write(self.style.SUCCESS(
+            f'✅ Exportación: {total} filas en {time.monotonic() - inicio:.2f}s ({velocidad(total, inicio):.0f} filas/s)'
+        ))
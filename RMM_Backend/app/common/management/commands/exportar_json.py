@@ -0,0 +1,54 @@
+"""
+Comando para exportar la API pública a archivos JSON estáticos (con
+variantes .gz/.br) que nginx sirve sin pasar por Django.
+
+Es incremental: solo regenera los archivos de los objetos que cambiaron
+desde la última exportación (ver app/common/exportacion.py). Pensado para
+cron, por ejemplo cada 5 minutos.
+
+Uso:
+    python manage.py exportar_json
+    python manage.py exportar_json --full
+    python manage.py exportar_json --model articles.Articulos --output /srv/rmm/json
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.common.exportacion import EXPORTABLES, exportar
+
+
+class Command(BaseCommand):
+    help = 'Exporta de forma incremental los endpoints públicos a JSON estático'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Ignora el manifiesto y vuelve a renderizar todo',
+        )
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='modelos',
+            help='Tipo a exportar (app_label.Modelo, se puede repetir). Por defecto, todos',
+        )
+        parser.add_argument(
+            '--output',
+            help='Carpeta de destino (por defecto STATIC_EXPORT_ROOT)',
+        )
+
+    def handle(self, *args, **options):
+        validos = {exportable.modelo for exportable in EXPORTABLES}
+        invalidos = set(options['modelos'] or ()) - validos
+        if invalidos:
+            raise CommandError(f"Tipos no exportables: {', '.join(sorted(invalidos))}. Válidos: {', '.join(sorted(validos))}")
+
+        inicio = time.monotonic()
+        resumen = exportar(modelos=options['modelos'], destino=options['output'], completo=options['full'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Exportación: {resumen.renderizados} respuestas renderizadas, {resumen.escritos} archivos '
+            f'escritos, {resumen.eliminados} eliminados en {time.monotonic() - inicio:.2f}s'
+        ))
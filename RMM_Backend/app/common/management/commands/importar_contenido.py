@@ -0,0 +1,69 @@
+"""
+Comando para importar un archivo JSONL de `exportar_contenido` con
+`bulk_create` por lotes y traducción de ids (ver app/common/respaldo.py).
+
+Guarda un checkpoint (por defecto `<archivo>.checkpoint`) después de cada
+lote, con el mapa de ids en `<checkpoint>.mapa`: si la importación se
+interrumpe, volver a ejecutar el mismo comando continúa desde el último lote
+confirmado. Al terminar, ambos archivos se eliminan.
+
+Uso:
+    python manage.py importar_contenido contenido.jsonl.gz
+    python manage.py importar_contenido contenido.jsonl --batch-size 2000 -v 2
+    python manage.py importar_contenido contenido.jsonl --restart
+"""
+
+import gzip
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.common.respaldo import FormatoInvalido, Importador, borrar_checkpoint, velocidad
+
+
+class Command(BaseCommand):
+    help = 'Importa contenido desde JSONL por lotes, con checkpoint para continuar'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Archivo .jsonl o .jsonl.gz de exportar_contenido')
+        parser.add_argument('--batch-size', type=int, default=500, help='Filas por lote (por defecto 500)')
+        parser.add_argument('--checkpoint', help='Archivo de checkpoint (por defecto <archivo>.checkpoint)')
+        parser.add_argument('--restart', action='store_true', help='Ignora el checkpoint y empieza desde el principio')
+
+    def handle(self, *args, **options):
+        ruta = options['archivo']
+        if not os.path.exists(ruta):
+            raise CommandError(f'No existe el archivo {ruta}')
+
+        checkpoint = options['checkpoint'] or f'{ruta}.checkpoint'
+        if options['restart']:
+            borrar_checkpoint(checkpoint)
+
+        inicio = time.monotonic()
+        verbosidad = options['verbosity']
+
+        def al_confirmar(modelo, filas, linea):
+            if verbosidad >= 2:
+                self.stdout.write(f'  {modelo}: lote de {filas} filas (línea {linea}, {velocidad(linea, inicio):.0f} líneas/s)')
+
+        importador = Importador(options['batch_size'], checkpoint, al_confirmar)
+        if importador.linea:
+            self.stdout.write(f'Continuando desde la línea {importador.linea} (checkpoint {checkpoint})')
+
+        abrir = gzip.open if ruta.endswith('.gz') else open
+        try:
+            with abrir(ruta, 'rt', encoding='utf-8') as entrada:
+                importador.importar(entrada)
+        except FormatoInvalido as error:
+            raise CommandError(str(error))
+
+        for modelo in dict.fromkeys([*importador.creados, *importador.omitidos]):
+            omitidos = importador.omitidos[modelo]
+            self.stdout.write(
+                f'  {modelo}: {importador.creados[modelo]} creados' + (f', {omitidos} omitidos' if omitidos else '')
+            )
+        total = sum(importador.creados.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Importación: {total} filas en {time.monotonic() - inicio:.2f}s ({velocidad(total, inicio):.0f} filas/s)'
+        ))
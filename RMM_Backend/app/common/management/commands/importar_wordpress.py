@@ -0,0 +1,75 @@
+"""
+Comando para importar entradas y comentarios de una exportación de
+WordPress (WXR) como artículos y noticias (ver app/common/wordpress.py).
+
+El XML se lee en streaming y se inserta por lotes; volver a ejecutarlo no
+duplica las entradas ya importadas.
+
+Uso:
+    python manage.py importar_wordpress revista.WordPress.2024-01-01.xml
+    python manage.py importar_wordpress export.xml --news-category noticias --news-category actualidad
+    python manage.py importar_wordpress export.xml --uploads /backup/wp-content/uploads --create-users -v 2
+"""
+
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.common.respaldo import velocidad
+from app.common.wordpress import ImportadorWordPress
+
+
+class Command(BaseCommand):
+    help = 'Importa entradas publicadas y comentarios aprobados desde un WXR de WordPress'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Archivo XML exportado desde WordPress (Herramientas > Exportar)')
+        parser.add_argument('--batch-size', type=int, default=200, help='Entradas por lote (por defecto 200)')
+        parser.add_argument(
+            '--news-category',
+            action='append',
+            dest='categorias',
+            help='Slug de categoría cuyas entradas se importan como noticias (se puede repetir). Por defecto, noticias',
+        )
+        parser.add_argument('--uploads', help='Carpeta wp-content/uploads de la que copiar las imágenes')
+        parser.add_argument(
+            '--create-users',
+            action='store_true',
+            help='Crea cuentas inactivas para los comentaristas sin cuenta (si no, sus comentarios se omiten)',
+        )
+
+    def handle(self, *args, **options):
+        if not os.path.isfile(options['archivo']):
+            raise CommandError(f"No existe el archivo {options['archivo']}")
+        if options['uploads'] and not os.path.isdir(options['uploads']):
+            raise CommandError(f"No existe la carpeta {options['uploads']}")
+
+        inicio = time.monotonic()
+        entradas = 0
+
+        def al_confirmar(filas, comentarios):
+            nonlocal entradas
+            entradas += filas
+            if options['verbosity'] >= 2:
+                self.stdout.write(
+                    f'  Lote: {filas} entradas, {comentarios} comentarios ({velocidad(entradas, inicio):.0f} entradas/s)'
+                )
+
+        importador = ImportadorWordPress(
+            tamano_lote=options['batch_size'],
+            categorias_noticias=options['categorias'] or ('noticias',),
+            uploads=options['uploads'],
+            crear_usuarios=options['create_users'],
+            al_confirmar=al_confirmar,
+        )
+        importador.importar(options['archivo'])
+
+        for clave, total in importador.creados.items():
+            self.stdout.write(f'  {clave}: {total} creados')
+        for clave, total in importador.omitidos.items():
+            self.stdout.write(f'  {clave}: {total} omitidos')
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Importación de WordPress: {entradas} entradas leídas en {time.monotonic() - inicio:.2f}s '
+            f'({velocidad(entradas, inicio):.0f} entradas/s)'
+        ))
@@ -0,0 +1,53 @@
+"""
+Comando para enviar al CDN las purgas por etiqueta pendientes.
+
+Pensado para ejecutarse periódicamente (cron / systemd timer), por ejemplo
+cada minuto: todas las etiquetas encoladas desde la ejecución anterior se
+purgan en lotes, una sola vez cada una.
+
+Uso:
+    python manage.py procesar_purgas_cdn
+    python manage.py procesar_purgas_cdn --batch-size 50 --retention-days 3
+"""
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app.common.cdn import procesar_cola
+from app.common.models import PurgaCDN
+
+
+class Command(BaseCommand):
+    help = 'Envía al CDN las purgas por etiqueta pendientes y limpia las ya procesadas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            dest='batch_size',
+            type=int,
+            default=100,
+            help='Cantidad máxima de etiquetas por lote (por defecto 100)',
+        )
+        parser.add_argument(
+            '--retention-days',
+            dest='retention_days',
+            type=int,
+            default=7,
+            help='Días que se conservan las purgas procesadas (por defecto 7)',
+        )
+
+    def handle(self, *args, **options):
+        inicio = time.monotonic()
+        total = procesar_cola(tamano_lote=options['batch_size'])
+
+        limite = timezone.now() - timedelta(days=options['retention_days'])
+        eliminadas, _ = PurgaCDN.objects.filter(procesado_en__lt=limite).delete()
+
+        pendientes = PurgaCDN.objects.filter(procesado_en__isnull=True).count()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Etiquetas purgadas: {total} en {time.monotonic() - inicio:.2f}s '
+            f'(pendientes: {pendientes}, limpiadas: {eliminadas})'
+        ))
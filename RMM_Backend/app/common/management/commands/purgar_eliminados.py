@@ -0,0 +1,71 @@
+"""
+Comando para purgar las filas dependientes de los artículos, noticias,
+temas y usuarios eliminados (ver app/common/eliminacion.py).
+
+Pensado para ejecutarse periódicamente (cron / systemd timer). Cada lote se
+borra en su propia transacción; si se interrumpe, la siguiente ejecución
+continúa donde quedó.
+
+Uso:
+    python manage.py purgar_eliminados
+    python manage.py purgar_eliminados --batch-size 500 --pause 0 -v 2
+    python manage.py purgar_eliminados --retry-failed
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.common.eliminacion import agotadas, purgar_pendientes, reintentar
+from app.common.models import EliminacionPendiente
+
+
+class Command(BaseCommand):
+    help = 'Purga en lotes los comentarios, likes y demás filas de los objetos eliminados'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Filas por lote (por defecto DELETE_PURGE_BATCH_SIZE)')
+        parser.add_argument('--pause', type=float, help='Segundos entre lotes (por defecto DELETE_PURGE_PAUSE)')
+        parser.add_argument(
+            '--max-attempts', type=int, default=5, help='Intentos fallidos tras los que se deja de reintentar (por defecto 5)'
+        )
+        parser.add_argument(
+            '--retry-failed', action='store_true', help='Vuelve a intentar las eliminaciones que agotaron sus intentos'
+        )
+
+    def handle(self, *args, **options):
+        inicio = time.monotonic()
+        verbosidad = options['verbosity']
+
+        if options['retry_failed']:
+            reactivadas = reintentar(agotadas(options['max_attempts']))
+            if reactivadas:
+                self.stdout.write(f'  Eliminaciones reactivadas: {reactivadas}')
+
+        def progreso(pendiente, modelo, filas):
+            if verbosidad >= 2:
+                self.stdout.write(
+                    f'  {pendiente.contenido}:{pendiente.objeto_id} {modelo._meta.label}: {filas} filas '
+                    f'(total {pendiente.filas_borradas})'
+                )
+
+        terminadas = purgar_pendientes(
+            tamano_lote=options['batch_size'],
+            pausa=options['pause'],
+            max_intentos=options['max_attempts'],
+            progreso=progreso,
+        )
+        for pendiente in terminadas:
+            self.stdout.write(f'  {pendiente.contenido}:{pendiente.objeto_id}: {pendiente.filas_borradas} filas borradas')
+
+        fallidas = EliminacionPendiente.objects.filter(terminado_en__isnull=True).exclude(error='').count()
+        filas = sum(pendiente.filas_borradas for pendiente in terminadas)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Eliminaciones purgadas: {len(terminadas)} ({filas} filas) en {time.monotonic() - inicio:.2f}s'
+            + (f' (con errores: {fallidas})' if fallidas else '')
+        ))
+        sin_reintentos = agotadas(options['max_attempts']).count()
+        if sin_reintentos:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️ {sin_reintentos} eliminaciones agotaron sus intentos; usar --retry-failed para reintentarlas'
+            ))
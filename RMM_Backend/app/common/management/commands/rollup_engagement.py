@@ -0,0 +1,44 @@
+"""
+Comando para actualizar los rollups de interacciones (likes y comentarios).
+
+Pensado para ejecutarse periódicamente (cron / systemd timer), por ejemplo
+cada 5 minutos. Cada ejecución procesa solo las filas posteriores a la marca
+de agua de cada tabla fuente.
+
+Uso:
+    python manage.py rollup_engagement
+    python manage.py rollup_engagement --batch-size 2000
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.common.rollups import FUENTES, procesar_fuente
+
+
+class Command(BaseCommand):
+    help = 'Actualiza los rollups por hora/día de likes y comentarios de forma incremental'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            dest='batch_size',
+            type=int,
+            default=5000,
+            help='Cantidad máxima de filas fuente por transacción (por defecto 5000)',
+        )
+
+    def handle(self, *args, **options):
+        inicio = time.monotonic()
+        total = 0
+
+        for fuente in FUENTES:
+            procesadas = procesar_fuente(fuente, tamano_lote=options['batch_size'])
+            total += procesadas
+            if procesadas:
+                self.stdout.write(f'  {fuente.modelo}: {procesadas} filas')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Rollups actualizados: {total} filas en {time.monotonic() - inicio:.2f}s'
+        ))
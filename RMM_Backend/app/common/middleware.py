@@ -0,0 +1,29 @@
+"""
+Middleware propio de la API.
+"""
+
+from django.conf import settings
+
+from .routers import lecturas_en_replica
+
+
+class LecturaEscrituraMiddleware:
+    """
+    Marca las peticiones GET/HEAD/OPTIONS bajo READ_REPLICA_PATHS para que
+    sus lecturas vayan a la réplica (ver app/common/routers.py). Las demás
+    peticiones, y el admin, usan solo la base principal.
+    """
+    METODOS_SEGUROS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (
+            getattr(settings, 'READ_REPLICA_ENABLED', False)
+            and request.method in self.METODOS_SEGUROS
+            and request.path.startswith(tuple(getattr(settings, 'READ_REPLICA_PATHS', ('/api/',))))
+        ):
+            with lecturas_en_replica():
+                return self.get_response(request)
+        return self.get_response(request)
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-18 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarcaAguaRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fuente', models.CharField(max_length=100, unique=True, verbose_name='Fuente')),
+                ('ultimo_id', models.PositiveBigIntegerField(default=0, verbose_name='Último ID procesado')),
+                ('actualizado_en', models.DateTimeField(auto_now=True, verbose_name='Actualizado en')),
+            ],
+            options={
+                'verbose_name': 'Marca de agua de rollup',
+                'verbose_name_plural': 'Marcas de agua de rollups',
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupInteraccion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo_contenido', models.CharField(max_length=30, verbose_name='Tipo de contenido')),
+                ('objeto_id', models.PositiveBigIntegerField(verbose_name='ID del objeto')),
+                ('metrica', models.CharField(choices=[('likes', 'Likes'), ('comentarios', 'Comentarios')], max_length=20, verbose_name='Métrica')),
+                ('granularidad', models.CharField(choices=[('hora', 'Hora'), ('dia', 'Día')], max_length=10, verbose_name='Granularidad')),
+                ('inicio', models.DateTimeField(verbose_name='Inicio del bucket')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Total')),
+            ],
+            options={
+                'verbose_name': 'Rollup de interacciones',
+                'verbose_name_plural': 'Rollups de interacciones',
+                'indexes': [models.Index(fields=['tipo_contenido', 'metrica', 'granularidad', 'inicio'], name='common_roll_tipo_co_2d89ee_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tipo_contenido', 'objeto_id', 'metrica', 'granularidad', 'inicio'), name='rollup_interaccion_bucket_unico')],
+            },
+        ),
+    ]
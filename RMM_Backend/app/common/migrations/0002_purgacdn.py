@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PurgaCDN',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('etiqueta', models.CharField(max_length=100, verbose_name='Etiqueta')),
+                ('creado_en', models.DateTimeField(auto_now_add=True, verbose_name='Creado en')),
+                ('procesado_en', models.DateTimeField(blank=True, null=True, verbose_name='Procesado en')),
+                ('intentos', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos fallidos')),
+            ],
+            options={
+                'verbose_name': 'Purga de CDN',
+                'verbose_name_plural': 'Purgas de CDN',
+                'indexes': [models.Index(fields=['procesado_en', 'id'], name='common_purg_procesa_b054b6_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('procesado_en__isnull', True)), fields=('etiqueta',), name='purga_cdn_etiqueta_pendiente_unica')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:20
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def llenar_archivo(apps, schema_editor):
+    ArchivoMensual = apps.get_model('common', 'ArchivoMensual')
+    for contenido in ('articles.Articulos', 'blog.Blog', 'magazine.Ediciones'):
+        Modelo = apps.get_model(contenido)
+        conteos = (
+            Modelo.objects.filter(fecha_publicacion__isnull=False).order_by()
+            .values(anio=ExtractYear('fecha_publicacion'), mes=ExtractMonth('fecha_publicacion'))
+            .annotate(total=Count('pk'))
+        )
+        ArchivoMensual.objects.bulk_create([
+            ArchivoMensual(contenido=contenido, anio=fila['anio'], mes=fila['mes'], total=fila['total'])
+            for fila in conteos
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0002_purgacdn'),
+        ('articles', '0010_articulos_articles_ar_fecha_p_ef8568_idx'),
+        ('blog', '0012_blog_blog_blog_fecha_p_e76802_idx'),
+        ('magazine', '0005_ediciones_magazine_ed_fecha_p_50fb33_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivoMensual',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contenido', models.CharField(max_length=50, verbose_name='Contenido')),
+                ('anio', models.PositiveSmallIntegerField(verbose_name='Año')),
+                ('mes', models.PositiveSmallIntegerField(verbose_name='Mes')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Total')),
+            ],
+            options={
+                'verbose_name': 'Archivo mensual',
+                'verbose_name_plural': 'Archivo mensual',
+                'constraints': [models.UniqueConstraint(fields=('contenido', 'anio', 'mes'), name='archivo_mensual_mes_unico')],
+            },
+        ),
+        migrations.RunPython(llenar_archivo, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0003_archivomensual'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComentarioArchivado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo_contenido', models.CharField(max_length=50, verbose_name='Tipo de contenido')),
+                ('objeto_id', models.PositiveBigIntegerField(verbose_name='ID del objeto')),
+                ('original_id', models.PositiveBigIntegerField(verbose_name='ID original')),
+                ('parent_original_id', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='ID original del padre')),
+                ('contenido', models.TextField(verbose_name='Contenido del comentario')),
+                ('nivel', models.PositiveSmallIntegerField(default=0, verbose_name='Nivel')),
+                ('creado_en', models.DateTimeField(verbose_name='Creado en')),
+                ('autor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Comentario archivado',
+                'verbose_name_plural': 'Comentarios archivados',
+                'indexes': [models.Index(fields=['tipo_contenido', 'objeto_id'], name='common_come_tipo_co_c64a08_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tipo_contenido', 'original_id'), name='comentario_archivado_original_unico')],
+            },
+        ),
+        migrations.CreateModel(
+            name='LikeArchivado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo_contenido', models.CharField(max_length=50, verbose_name='Tipo de contenido')),
+                ('objeto_id', models.PositiveBigIntegerField(verbose_name='ID del objeto')),
+                ('original_id', models.PositiveBigIntegerField(verbose_name='ID original')),
+                ('creado_en', models.DateTimeField(verbose_name='Creado en')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Like archivado',
+                'verbose_name_plural': 'Likes archivados',
+                'constraints': [models.UniqueConstraint(fields=('tipo_contenido', 'objeto_id', 'usuario'), name='like_archivado_usuario_unico')],
+            },
+        ),
+    ]
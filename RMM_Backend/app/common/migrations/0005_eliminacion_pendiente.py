@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0004_archivo_frio'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EliminacionPendiente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contenido', models.CharField(max_length=50, verbose_name='Contenido')),
+                ('objeto_id', models.PositiveBigIntegerField(verbose_name='ID del objeto')),
+                ('solicitado_en', models.DateTimeField(auto_now_add=True, verbose_name='Solicitado en')),
+                ('iniciado_en', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado en')),
+                ('terminado_en', models.DateTimeField(blank=True, null=True, verbose_name='Terminado en')),
+                ('filas_borradas', models.PositiveIntegerField(default=0, verbose_name='Filas borradas')),
+                ('intentos', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos fallidos')),
+                ('error', models.TextField(blank=True, verbose_name='Último error')),
+            ],
+            options={
+                'verbose_name': 'Eliminación pendiente',
+                'verbose_name_plural': 'Eliminaciones pendientes',
+                'indexes': [models.Index(fields=['terminado_en', 'id'], name='common_elim_termina_23d993_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('terminado_en__isnull', True)), fields=('contenido', 'objeto_id'), name='eliminacion_pendiente_unica')],
+            },
+        ),
+    ]
@@ -0,0 +1,462 @@
+"""
+Mixins compartidos para los ViewSets de la API.
+"""
+
+import hashlib
+from functools import partial
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .archivado import comentario_archivado, comentarios_de, restaurar, restaurar_por_id
+from .cache import clave_respuesta, get_response_cache, query_normalizado, registrar_etiquetas
+from .cdn import NO_CACHEAR, POLITICAS_CDN, TIPOS_CONTENIDO
+from .eliminacion import eliminar
+from .escritor import ejecutar_escritura
+from .filters import normalizar_busqueda
+from .queries import armar_arbol
+from .serializers import optimize_queryset_for_serializer, parse_field_list
+
+
+class SparseFieldsetViewMixin:
+    """
+    Activa `?fields=` / `?expand=` en el serializer principal de la vista y
+    ajusta el queryset a los campos pedidos (ver `SparseFieldsetMixin`).
+
+    El serializer de la vista debe heredar de `SparseFieldsetMixin`.
+
+    Ejemplos:
+    - GET /api/v1/articles/articulos/?fields=id,titulo_articulo,imagen_principal
+    - GET /api/v1/articles/articulos/?expand=contenido
+    - GET /api/v1/foro/temas/12/?fields=id,titulo,autor
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        getattr(serializer, 'child', serializer).sparse_fieldset = True
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request is None or self.request.method not in ('GET', 'HEAD'):
+            return queryset
+
+        serializer_class = self.get_serializer_class()
+        if not hasattr(serializer_class, 'sparse_fieldset'):
+            return queryset
+
+        serializer = serializer_class(context=self.get_serializer_context())
+        serializer.sparse_fieldset = True
+        return optimize_queryset_for_serializer(queryset, serializer)
+
+    def field_requested(self, nombre):
+        """
+        Indica si el campo `nombre` forma parte de la respuesta.
+
+        Sirve para omitir anotaciones costosas (conteos, extractos) cuando el
+        cliente no pidió el campo. Los campos expandibles solo cuentan si
+        vienen en `?expand=`.
+        """
+        if self.request is None or self.request.method not in ('GET', 'HEAD'):
+            return True
+
+        serializer_class = self.get_serializer_class()
+        expandibles = getattr(getattr(serializer_class, 'Meta', None), 'expandable_fields', {})
+        if nombre in expandibles:
+            expand = parse_field_list(self.request, 'expand') or set()
+            if nombre not in expand:
+                return False
+
+        requested = parse_field_list(self.request, 'fields')
+        return requested is None or nombre in requested
+
+
+class FragmentCacheViewMixin:
+    """
+    Activa la caché de fragmentos serializados (ver `FragmentCacheMixin`) en
+    `list` y `retrieve` cuando FRAGMENT_CACHE_ENABLED está activo.
+
+    Los prefetches del queryset se quitan y se pasan al serializer en el
+    contexto (`prefetch_diferido`), que los ejecuta solo para los objetos que
+    no estaban en caché.
+
+    Va antes de `SparseFieldsetViewMixin` en las bases de la vista, para ver
+    también los prefetches que agrega esa optimización.
+    """
+
+    def fragment_cache_enabled(self):
+        return (
+            getattr(settings, 'FRAGMENT_CACHE_ENABLED', False)
+            and self.request is not None
+            and self.request.method in ('GET', 'HEAD')
+            and self.action in ('list', 'retrieve')
+            and hasattr(self.get_serializer_class(), 'fragment_cache')
+        )
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.fragment_cache_enabled() and queryset._prefetch_related_lookups:
+            self._prefetch_diferido = queryset._prefetch_related_lookups
+            queryset = queryset.prefetch_related(None)
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['prefetch_diferido'] = getattr(self, '_prefetch_diferido', ())
+        return context
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.fragment_cache_enabled():
+            getattr(serializer, 'child', serializer).fragment_cache = True
+        return serializer
+
+
+class ConditionalGetMixin:
+    """
+    GET condicional (ETag / Last-Modified / 304) para `list` y `retrieve`.
+
+    La versión se obtiene con una consulta liviana antes de serializar:
+    - Detalle: `actualizado_en` del objeto.
+    - Listado: máximo `actualizado_en` y cantidad de filas del queryset ya
+      filtrado (búsqueda, filtros), de modo que altas, bajas y ediciones
+      cambian la versión.
+
+    El ETag es fuerte: combina esa versión con la URL completa (paginación,
+    `?fields=`, `?expand=`), el host (las URLs de imágenes son absolutas) y el
+    `Accept`, que determinan los bytes de la respuesta. Si coincide con
+    `If-None-Match` (o `If-Modified-Since` no es anterior), se responde 304
+    sin cargar ni serializar nada.
+
+    En los listados `Last-Modified` no refleja las bajas (el máximo no cambia);
+    `If-None-Match` tiene prioridad y sí las detecta por la cantidad de filas.
+    Si hay que responder, el listado reutiliza el queryset ya filtrado y esa
+    cantidad (el paginador no repite el COUNT).
+
+    `actualizado_en` se mantiene al día con las señales de `common.signals`
+    (comentarios y likes). `conditional_version_field` también puede ser una
+    anotación del queryset, como la versión de las noticias que incluye la
+    de sus artículos embebidos (`version_de`).
+    """
+    conditional_version_field = 'actualizado_en'
+
+    def list(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().list(request, *args, **kwargs)
+
+        # Se filtra una sola vez (con ?search= es un recorrido completo): el
+        # mismo queryset da la versión y la respuesta
+        queryset = self.filter_queryset(self.get_queryset())
+        version = queryset.prefetch_related(None).aggregate(
+            ultima=Max(self.conditional_version_field), total=Count('pk'),
+        )
+
+        def listar(request, *args, **kwargs):
+            return self.listar_filtrado(queryset, version['total'])
+
+        return self.respuesta_condicional(request, version['ultima'], version['total'], listar, *args, **kwargs)
+
+    def listar_filtrado(self, queryset, total):
+        """`ListModelMixin.list` sobre un queryset ya filtrado de `total` filas."""
+        paginador = self.paginator
+        if paginador is not None and hasattr(paginador, 'django_paginator_class'):
+            paginador.django_paginator_class = _con_total(paginador.django_paginator_class, total)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().retrieve(request, *args, **kwargs)
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        ultima = (
+            self.filter_queryset(self.get_queryset())
+            .prefetch_related(None)
+            .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+            .values_list(self.conditional_version_field, flat=True)
+            .first()
+        )
+        if ultima is None:
+            # Sin objeto (404) o sin marca: la vista normal decide
+            return super().retrieve(request, *args, **kwargs)
+        return self.respuesta_condicional(request, ultima, 1, super().retrieve, *args, **kwargs)
+
+    def conditional_etag(self, request, ultima, total):
+        partes = [
+            self.get_queryset().model._meta.label,
+            request.get_full_path(),
+            request.get_host(),
+            request.META.get('HTTP_ACCEPT', ''),
+            ultima.isoformat() if ultima else '',
+            str(total),
+        ]
+        return quote_etag(hashlib.md5('|'.join(partes).encode()).hexdigest())
+
+    def respuesta_condicional(self, request, ultima, total, vista, *args, **kwargs):
+        etag = self.conditional_etag(request, ultima, total)
+        last_modified = int(ultima.timestamp()) if ultima else None
+
+        base = HttpResponse()
+        base.headers['ETag'] = etag
+        if last_modified is not None:
+            base.headers['Last-Modified'] = http_date(last_modified)
+
+        condicional = get_conditional_response(request, etag=etag, last_modified=last_modified, response=base)
+        if condicional is not base:
+            return condicional  # 304 Not Modified
+
+        response = vista(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.headers['ETag'] = base.headers['ETag']
+            if 'Last-Modified' in base.headers:
+                response.headers['Last-Modified'] = base.headers['Last-Modified']
+        return response
+
+
+def _con_total(clase, total):
+    """Paginador de Django con `count` ya conocido: sin un segundo COUNT(*)."""
+    def crear(object_list, per_page, *args, **kwargs):
+        paginador = clase(object_list, per_page, *args, **kwargs)
+        paginador.count = total  # cached_property
+        return paginador
+    return crear
+
+
+class AnonymousCacheMixin:
+    """
+    Caché de respuestas completas para GET/HEAD anónimos (sin cabecera
+    Authorization) de las acciones `response_cache_actions`.
+
+    La clave combina la ruta, el query string normalizado (parámetros
+    ordenados), el host, el `Accept` y las versiones de las etiquetas
+    `response_cache_tags` (ver app/common/cache.py). Se guardan el cuerpo ya
+    renderizado y las cabeceras ETag / Last-Modified, de modo que un
+    `If-None-Match` vigente sigue respondiendo 304.
+
+    Se activa con RESPONSE_CACHE_ENABLED. La cabecera `X-Cache` indica HIT o
+    MISS.
+    """
+    response_cache_actions = ('list',)
+    response_cache_tags = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        registrar_etiquetas(cls.response_cache_tags)
+
+    def response_cache_key(self, request):
+        if not getattr(settings, 'RESPONSE_CACHE_ENABLED', False):
+            return None
+        if request.method not in ('GET', 'HEAD') or 'HTTP_AUTHORIZATION' in request.META:
+            return None
+        if self.action_map.get('get') not in self.response_cache_actions:
+            return None
+
+        partes = [
+            request.path,
+            query_normalizado(request),
+            request.get_host(),
+            request.META.get('HTTP_ACCEPT', ''),
+        ]
+        return clave_respuesta(partes, self.response_cache_tags)
+
+    def dispatch(self, request, *args, **kwargs):
+        clave = self.response_cache_key(request)
+        if clave is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        cache = get_response_cache()
+        guardada = cache.get(clave)
+        if guardada is not None:
+            response = HttpResponse(guardada['contenido'], content_type=guardada['content_type'])
+            for cabecera, valor in guardada['cabeceras'].items():
+                response.headers[cabecera] = valor
+            response.headers['X-Cache'] = 'HIT'
+            return get_conditional_response(
+                request,
+                etag=response.headers.get('ETag'),
+                last_modified=parse_http_date_safe(response.headers.get('Last-Modified')),
+                response=response,
+            )
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.render()
+            cabeceras = {
+                cabecera: response.headers[cabecera]
+                for cabecera in ('ETag', 'Last-Modified', 'Vary', 'Allow', 'Cache-Control',
+                                 getattr(settings, 'CDN_TAG_HEADER', 'CDN-Tag'))
+                if cabecera in response.headers
+            }
+            cache.set(clave, {
+                'contenido': response.content,
+                'content_type': response.headers['Content-Type'],
+                'cabeceras': cabeceras,
+            }, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 600))
+            response.headers['X-Cache'] = 'MISS'
+        return response
+
+
+class CDNCacheMixin:
+    """
+    Cabeceras para el caché en el CDN (ver app/common/cdn.py).
+
+    - `cdn_policies`: acción -> nombre de política de `POLITICAS_CDN`. Las
+      respuestas anónimas de esas acciones llevan su `Cache-Control`; las
+      autenticadas, `private, no-store`.
+    - `cdn_content`: modelo (`app_label.Modelo`) de los objetos de la vista;
+      sus IDs van como etiquetas en CDN_TAG_HEADER, más la etiqueta de
+      colección en las acciones que no son de detalle.
+    - `cdn_tag_fields`: campos anidados con objetos de otro modelo, por
+      ejemplo los artículos embebidos en las noticias.
+
+    Se activa con CDN_CACHE_HEADERS_ENABLED.
+    """
+    cdn_policies = {}
+    cdn_content = None
+    cdn_tag_fields = {}
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if not getattr(settings, 'CDN_CACHE_HEADERS_ENABLED', False) or request.method not in ('GET', 'HEAD'):
+            return response
+
+        politica = self.cdn_policies.get(self.action)
+        if politica is None or response.status_code not in (200, 304):
+            return response
+
+        if 'HTTP_AUTHORIZATION' in request.META:
+            response.headers['Cache-Control'] = NO_CACHEAR
+            return response
+
+        response.headers['Cache-Control'] = POLITICAS_CDN[politica].cache_control()
+        if response.status_code == 200:
+            etiquetas = self.cdn_tags(getattr(response, 'data', None))
+            if etiquetas:
+                response.headers[getattr(settings, 'CDN_TAG_HEADER', 'CDN-Tag')] = ','.join(etiquetas)
+        return response
+
+    def cdn_tags(self, data):
+        if isinstance(data, dict) and isinstance(data.get('results'), list):
+            objetos = data['results']
+        elif isinstance(data, list):
+            objetos = data
+        elif isinstance(data, dict):
+            objetos = [data]
+        else:
+            return []
+
+        etiquetas = []
+        if not self.detail:
+            etiquetas.append(TIPOS_CONTENIDO[self.cdn_content].coleccion)
+        etiquetas.extend(self._etiquetas_de(self.cdn_content, objetos))
+        for campo, contenido in self.cdn_tag_fields.items():
+            for objeto in objetos:
+                anidados = objeto.get(campo) if isinstance(objeto, dict) else None
+                if isinstance(anidados, list):
+                    etiquetas.extend(self._etiquetas_de(contenido, anidados))
+        return list(dict.fromkeys(etiquetas))
+
+    @staticmethod
+    def _etiquetas_de(contenido, objetos):
+        prefijo = TIPOS_CONTENIDO[contenido].etiqueta
+        return [f"{prefijo}-{objeto['id']}" for objeto in objetos if isinstance(objeto, dict) and 'id' in objeto]
+
+
+class EscrituraSerializadaMixin:
+    """
+    Envía `perform_create`, `perform_update` y `perform_destroy` al hilo
+    escritor del proceso (ver app/common/escritor.py), donde se agrupan con
+    otras escrituras cortas en una sola transacción.
+
+    La validación del serializer sigue en el hilo de la petición; solo la
+    escritura pasa por la cola. Con WRITE_QUEUE_ENABLED apagado no cambia nada.
+    """
+
+    def perform_create(self, serializer):
+        ejecutar_escritura(partial(super().perform_create, serializer))
+
+    def perform_update(self, serializer):
+        ejecutar_escritura(partial(super().perform_update, serializer))
+
+    def perform_destroy(self, instance):
+        ejecutar_escritura(partial(super().perform_destroy, instance))
+
+
+class EliminacionSuaveMixin:
+    """
+    `destroy` en dos fases (ver app/common/eliminacion.py): el objeto se
+    oculta en la petición y sus comentarios y likes se purgan después, en
+    lotes, fuera de la petición.
+    """
+
+    def perform_destroy(self, instance):
+        eliminar(instance)
+
+
+class HiloArchivadoMixin:
+    """
+    Para los ViewSets de comentarios de contenidos cuyo hilo puede estar en
+    el archivo frío (ver app/common/archivado.py). `campo_contenido` es la
+    FK del comentario al contenido (y el filtro `?articulo=` del listado).
+
+    - Listado filtrado por un contenido archivado: se sirve desde el archivo.
+    - Detalle de un comentario archivado: se sirve desde el archivo; para
+      editarlo o eliminarlo, antes se restaura su hilo.
+    - Comentar en un contenido archivado: antes se restaura su hilo (así el
+      `parent` existe en la tabla).
+    """
+    campo_contenido = None
+
+    def modelo_contenido(self):
+        return self.get_queryset().model._meta.get_field(self.campo_contenido).related_model
+
+    def list(self, request, *args, **kwargs):
+        pk = request.query_params.get(self.campo_contenido, '')
+        objeto = None
+        if pk.isdigit():
+            objeto = self.modelo_contenido().objects.filter(pk=pk, interacciones_archivadas=True).first()
+        if objeto is None:
+            return super().list(request, *args, **kwargs)
+
+        comentarios = comentarios_de(objeto)
+        armar_arbol(comentarios)
+        parent = request.query_params.get('parent')
+        if parent is not None:
+            comentarios = [comentario for comentario in comentarios if str(comentario.parent_id or '') == parent]
+        buscar = normalizar_busqueda(request.query_params.get('search', ''))
+        if buscar:
+            comentarios = [
+                comentario for comentario in comentarios if buscar in normalizar_busqueda(comentario.contenido)
+            ]
+
+        pagina = self.paginate_queryset(comentarios)
+        if pagina is not None:
+            return self.get_paginated_response(self.get_serializer(pagina, many=True).data)
+        return Response(self.get_serializer(comentarios, many=True).data)
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            pk = str(self.kwargs.get(self.lookup_url_kwarg or self.lookup_field, ''))
+            comentario = comentario_archivado(self.get_queryset().model, pk) if pk.isdigit() else None
+            if comentario is None:
+                raise
+        if self.request.method in SAFE_METHODS:
+            self.check_object_permissions(self.request, comentario)
+            return comentario
+        restaurar(getattr(comentario, self.campo_contenido))
+        return super().get_object()
+
+    def create(self, request, *args, **kwargs):
+        restaurar_por_id(self.modelo_contenido(), request.data.get(self.campo_contenido))
+        return super().create(request, *args, **kwargs)
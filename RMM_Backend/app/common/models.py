@@ -1,8 +1,19 @@
+from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 # Create your models here.
 
+class VisiblesManager(models.Manager):
+    """
+    Manager por defecto de los contenidos con eliminación en dos fases: oculta
+    los objetos eliminados que esperan su purga (ver app/common/eliminacion.py).
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(eliminado_en__isnull=True)
+
+
 class TimeStampedModel(models.Model):
     """
     Modelo abstracto que proporciona campos de timestamping automático
@@ -23,3 +34,198 @@ class TimeStampedModel(models.Model):
         abstract = True
         ordering = ['-fecha_creacion']
 
+
+
+class RollupInteraccion(models.Model):
+    """
+    Agregado incremental de interacciones (likes y comentarios) por objeto
+    de contenido, en buckets por hora y por día.
+
+    Lo mantiene el comando `rollup_engagement`; las gráficas del panel se
+    sirven desde esta tabla en lugar de escanear las tablas de likes.
+    """
+    class Granularidad(models.TextChoices):
+        HORA = 'hora', _('Hora')
+        DIA = 'dia', _('Día')
+
+    class Metrica(models.TextChoices):
+        LIKES = 'likes', _('Likes')
+        COMENTARIOS = 'comentarios', _('Comentarios')
+
+    tipo_contenido = models.CharField(_('Tipo de contenido'), max_length=30)
+    objeto_id = models.PositiveBigIntegerField(_('ID del objeto'))
+    metrica = models.CharField(_('Métrica'), max_length=20, choices=Metrica.choices)
+    granularidad = models.CharField(_('Granularidad'), max_length=10, choices=Granularidad.choices)
+    inicio = models.DateTimeField(_('Inicio del bucket'))
+    total = models.PositiveIntegerField(_('Total'), default=0)
+
+    class Meta:
+        verbose_name = _('Rollup de interacciones')
+        verbose_name_plural = _('Rollups de interacciones')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tipo_contenido', 'objeto_id', 'metrica', 'granularidad', 'inicio'],
+                name='rollup_interaccion_bucket_unico',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['tipo_contenido', 'metrica', 'granularidad', 'inicio']),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo_contenido}:{self.objeto_id} {self.metrica} {self.granularidad} {self.inicio:%Y-%m-%d %H:%M} = {self.total}"
+
+
+class MarcaAguaRollup(models.Model):
+    """
+    Último ID procesado por el job de rollups para cada tabla fuente.
+    """
+    fuente = models.CharField(_('Fuente'), max_length=100, unique=True)
+    ultimo_id = models.PositiveBigIntegerField(_('Último ID procesado'), default=0)
+    actualizado_en = models.DateTimeField(_('Actualizado en'), auto_now=True)
+
+    class Meta:
+        verbose_name = _('Marca de agua de rollup')
+        verbose_name_plural = _('Marcas de agua de rollups')
+
+    def __str__(self):
+        return f"{self.fuente} @ {self.ultimo_id}"
+
+
+class PurgaCDN(models.Model):
+    """
+    Etiqueta pendiente de purgar en el CDN (ver app/common/cdn.py).
+
+    Una etiqueta solo puede estar pendiente una vez: los cambios repetidos
+    sobre el mismo contenido antes de procesar la cola se agrupan.
+    """
+    etiqueta = models.CharField(_('Etiqueta'), max_length=100)
+    creado_en = models.DateTimeField(_('Creado en'), auto_now_add=True)
+    procesado_en = models.DateTimeField(_('Procesado en'), null=True, blank=True)
+    intentos = models.PositiveSmallIntegerField(_('Intentos fallidos'), default=0)
+
+    class Meta:
+        verbose_name = _('Purga de CDN')
+        verbose_name_plural = _('Purgas de CDN')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['etiqueta'],
+                condition=models.Q(procesado_en__isnull=True),
+                name='purga_cdn_etiqueta_pendiente_unica',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['procesado_en', 'id']),
+        ]
+
+    def __str__(self):
+        estado = f"procesada {self.procesado_en:%Y-%m-%d %H:%M}" if self.procesado_en else "pendiente"
+        return f"{self.etiqueta} ({estado})"
+
+
+class ArchivoMensual(models.Model):
+    """
+    Cantidad de contenidos publicados por mes, para la navegación del
+    archivo ("2025 › octubre (12)"). La mantienen las señales de guardado y
+    eliminación de cada contenido y el comando `actualizar_archivo` (ver
+    app/common/archivo.py).
+    """
+    contenido = models.CharField(_('Contenido'), max_length=50)  # app_label.Modelo
+    anio = models.PositiveSmallIntegerField(_('Año'))
+    mes = models.PositiveSmallIntegerField(_('Mes'))
+    total = models.PositiveIntegerField(_('Total'), default=0)
+
+    class Meta:
+        verbose_name = _('Archivo mensual')
+        verbose_name_plural = _('Archivo mensual')
+        constraints = [
+            models.UniqueConstraint(fields=['contenido', 'anio', 'mes'], name='archivo_mensual_mes_unico'),
+        ]
+
+    def __str__(self):
+        return f"{self.contenido} {self.anio}-{self.mes:02d} = {self.total}"
+
+
+class ComentarioArchivado(models.Model):
+    """
+    Comentario de un contenido antiguo movido al archivo frío (ver
+    app/common/archivado.py). Conserva su id y el de su padre para que el
+    hilo se pueda servir y restaurar tal cual.
+    """
+    tipo_contenido = models.CharField(_('Tipo de contenido'), max_length=50)  # app_label.Modelo
+    objeto_id = models.PositiveBigIntegerField(_('ID del objeto'))
+    original_id = models.PositiveBigIntegerField(_('ID original'))
+    parent_original_id = models.PositiveBigIntegerField(_('ID original del padre'), null=True, blank=True)
+    autor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    contenido = models.TextField(_('Contenido del comentario'))
+    nivel = models.PositiveSmallIntegerField(_('Nivel'), default=0)
+    creado_en = models.DateTimeField(_('Creado en'))
+
+    class Meta:
+        verbose_name = _('Comentario archivado')
+        verbose_name_plural = _('Comentarios archivados')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tipo_contenido', 'original_id'], name='comentario_archivado_original_unico',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['tipo_contenido', 'objeto_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo_contenido}:{self.objeto_id} comentario {self.original_id}"
+
+
+class LikeArchivado(models.Model):
+    """Like de un contenido antiguo movido al archivo frío (ver app/common/archivado.py)."""
+    tipo_contenido = models.CharField(_('Tipo de contenido'), max_length=50)  # app_label.Modelo
+    objeto_id = models.PositiveBigIntegerField(_('ID del objeto'))
+    original_id = models.PositiveBigIntegerField(_('ID original'))
+    usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    creado_en = models.DateTimeField(_('Creado en'))
+
+    class Meta:
+        verbose_name = _('Like archivado')
+        verbose_name_plural = _('Likes archivados')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tipo_contenido', 'objeto_id', 'usuario'], name='like_archivado_usuario_unico',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo_contenido}:{self.objeto_id} like de {self.usuario_id}"
+
+
+class EliminacionPendiente(models.Model):
+    """
+    Objeto eliminado (ya oculto) cuyas filas dependientes faltan purgar, con
+    el progreso de la purga (ver app/common/eliminacion.py).
+    """
+    contenido = models.CharField(_('Contenido'), max_length=50)  # app_label.Modelo
+    objeto_id = models.PositiveBigIntegerField(_('ID del objeto'))
+    solicitado_en = models.DateTimeField(_('Solicitado en'), auto_now_add=True)
+    iniciado_en = models.DateTimeField(_('Iniciado en'), null=True, blank=True)
+    terminado_en = models.DateTimeField(_('Terminado en'), null=True, blank=True)
+    filas_borradas = models.PositiveIntegerField(_('Filas borradas'), default=0)
+    intentos = models.PositiveSmallIntegerField(_('Intentos fallidos'), default=0)
+    error = models.TextField(_('Último error'), blank=True)
+
+    class Meta:
+        verbose_name = _('Eliminación pendiente')
+        verbose_name_plural = _('Eliminaciones pendientes')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['contenido', 'objeto_id'],
+                condition=models.Q(terminado_en__isnull=True),
+                name='eliminacion_pendiente_unica',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['terminado_en', 'id']),
+        ]
+
+    def __str__(self):
+        estado = f"purgado {self.terminado_en:%Y-%m-%d %H:%M}" if self.terminado_en else "pendiente"
+        return f"{self.contenido}:{self.objeto_id} ({estado}, {self.filas_borradas} filas)"
@@ -0,0 +1,235 @@
+"""
+Paginación de los feeds (artículos, noticias, temas y sus comentarios).
+
+`KeysetPagination` mantiene la paginación por número de página de siempre
+(`?page=2`) y agrega un modo por cursor (keyset) para listados largos o
+scroll infinito:
+
+    GET /api/v1/articles/articulos/?pagination=cursor
+    -> {"next": ".../?cursor=WyIyMDI1LTAxLTA1IiwgMTJd", "previous": null, "results": [...]}
+
+En modo cursor cada página es un
+`WHERE fecha <= :f AND (fecha < :f OR (fecha = :f AND id < :id))
+ORDER BY fecha DESC, id DESC LIMIT n + 1`, sin OFFSET ni COUNT(*): la cota
+simple fuera del OR deja a SQLite buscar por rango en el índice en vez de
+recorrerlo entero. Las filas con clave nula se piden en su propia consulta. La clave es el primer campo del `order_by` del
+queryset más el `id` como desempate (índices compuestos `(campo, id)` en
+los modelos). Los valores nulos van siempre al final en orden descendente
+(y al principio en ascendente), igual en SQLite y PostgreSQL.
+
+Con `?with_count=true` el modo cursor incluye `count`: un total aproximado,
+cacheado PAGINATION_COUNT_CACHE_TIMEOUT segundos por consulta.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist, ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+PREFIJO_TOTAL = 'paginacion:total:'
+
+
+def total_cacheado(queryset):
+    """COUNT(*) de `queryset`, cacheado por su SQL."""
+    try:
+        sql, parametros = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    clave = PREFIJO_TOTAL + hashlib.md5(f"{sql}|{parametros}".encode()).hexdigest()
+    total = cache.get(clave)
+    if total is None:
+        total = queryset.order_by().count()
+        cache.set(clave, total, getattr(settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 60))
+    return total
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Paginación por número de página con un modo por cursor opcional
+    (`?pagination=cursor` o `?cursor=...`).
+    """
+    page_size = 6
+    page_size_query_param = "page_size"
+    max_page_size = 20
+
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    count_query_param = "with_count"
+    invalid_cursor_message = "Cursor inválido."
+
+    modo_cursor = False
+
+    def usa_cursor(self, request):
+        return (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == "cursor"
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Las listas (p. ej. un hilo del archivo frío) se paginan siempre por número
+        self.modo_cursor = self.usa_cursor(request) and isinstance(queryset, QuerySet)
+        if not self.modo_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        tamano = self.get_page_size(request)
+        if not tamano:
+            return None
+
+        campo, descendente = self.clave_orden(queryset)
+        self.campo = campo
+
+        self.total = None
+        if request.query_params.get(self.count_query_param) in ('1', 'true'):
+            self.total = total_cacheado(queryset)
+
+        posicion = self.decodificar_cursor(request, queryset.model)
+        filas = []
+        for filtro, orden in self.tramos(queryset.model, campo, descendente, posicion):
+            filas += queryset.filter(filtro).order_by(*orden)[:tamano + 1 - len(filas)]
+            if len(filas) > tamano:
+                break
+        self.siguiente = None
+        if len(filas) > tamano:
+            filas = filas[:tamano]
+            ultimo = filas[-1]
+            self.siguiente = (getattr(ultimo, campo) if campo != 'pk' else None, ultimo.pk)
+        return filas
+
+    def clave_orden(self, queryset):
+        """Primer campo del `order_by` del queryset y si es descendente."""
+        ordenamiento = queryset.query.order_by or queryset.model._meta.ordering
+        primero = ordenamiento[0] if ordenamiento else '-pk'
+        if not isinstance(primero, str):
+            return 'pk', True
+        descendente = primero.startswith('-')
+        campo = primero.lstrip('-')
+        try:
+            if campo in ('pk', 'id') or queryset.model._meta.get_field(campo).primary_key:
+                return 'pk', descendente
+        except FieldDoesNotExist:
+            return 'pk', True
+        return campo, descendente
+
+    def tramos(self, modelo, campo, descendente, posicion):
+        """
+        Filtros y orden de las filas que siguen a `posicion` (None: desde el
+        principio), tramo por tramo.
+
+        Las filas con la clave no nula y las nulas se piden en consultas
+        separadas: con un OR entre ambas SQLite recorre el índice `(campo, id)`
+        fila por fila desde el principio en lugar de buscar la posición. Cada
+        tramo es un rango del índice, con la cota simple (`campo <= valor`)
+        fuera del OR.
+
+        Returns:
+            Lista de tuplas (Q, order_by) en el orden del feed.
+        """
+        op, signo = ('lt', '-') if descendente else ('gt', '')
+        if campo == 'pk':
+            return [(Q(**{f'pk__{op}': posicion[1]}) if posicion else Q(), [f'{signo}pk'])]
+
+        valor, pk = posicion or (None, None)
+        en_nulos = posicion is not None and valor is None  # El cursor está en el tramo de nulos
+
+        no_nulos = Q(**{f'{campo}__isnull': False})
+        if valor is not None:
+            cota = 'lte' if descendente else 'gte'
+            no_nulos = Q(**{f'{campo}__{cota}': valor}) & (
+                Q(**{f'{campo}__{op}': valor}) | Q(**{campo: valor, f'pk__{op}': pk})
+            )
+        nulos = Q(**{f'{campo}__isnull': True})
+        if en_nulos:
+            nulos &= Q(**{f'pk__{op}': pk})
+
+        tramo_no_nulos = (no_nulos, [f'{signo}{campo}', f'{signo}pk'])
+        tramo_nulos = (nulos, [f'{signo}pk'])
+        if not modelo._meta.get_field(campo).null:
+            return [tramo_no_nulos]
+        # Los nulos van al final en orden descendente y al principio en ascendente
+        if descendente:
+            return [tramo_nulos] if en_nulos else [tramo_no_nulos, tramo_nulos]
+        return [tramo_nulos, tramo_no_nulos] if posicion is None or en_nulos else [tramo_no_nulos]
+
+    # ------------------------------------------------------------------
+    # Cursor
+    # ------------------------------------------------------------------
+
+    def codificar_cursor(self, valor, pk):
+        if hasattr(valor, 'isoformat'):
+            valor = valor.isoformat()
+        texto = json.dumps([valor, pk], separators=(',', ':'))
+        return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+    def decodificar_cursor(self, request, modelo):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            valor, pk = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            if self.campo != 'pk' and valor is not None:
+                valor = modelo._meta.get_field(self.campo).to_python(valor)
+            return valor, int(pk)
+        except (binascii.Error, ValueError, TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    # ------------------------------------------------------------------
+    # Respuesta
+    # ------------------------------------------------------------------
+
+    def get_next_link(self):
+        if not self.modo_cursor:
+            return super().get_next_link()
+        if self.siguiente is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        url = remove_query_param(url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.codificar_cursor(*self.siguiente))
+
+    def get_previous_link(self):
+        if not self.modo_cursor:
+            return super().get_previous_link()
+        return None  # Los feeds por cursor solo avanzan
+
+    def get_paginated_response(self, data):
+        if not self.modo_cursor:
+            return super().get_paginated_response(data)
+        datos = {'next': self.get_next_link(), 'previous': None, 'results': data}
+        if self.total is not None:
+            datos = {'count': self.total, **datos}
+        return Response(datos)
+
+    def get_schema_operation_parameters(self, view):
+        parametros = super().get_schema_operation_parameters(view)
+        return parametros + [
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': "`cursor` para paginar por cursor (keyset), sin COUNT ni OFFSET.",
+                'schema': {'type': 'string', 'enum': ['cursor']},
+            },
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': "Cursor de la página siguiente (tomado de `next`).",
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': "En modo cursor, incluir `count` (total aproximado, cacheado).",
+                'schema': {'type': 'boolean'},
+            },
+        ]
@@ -0,0 +1,134 @@
+"""
+Utilidades de consultas compartidas por las apps de contenido.
+
+Permiten construir las representaciones resumidas de los listados con
+anotaciones calculadas por la base de datos en lugar de consultas por fila.
+"""
+
+import html
+from collections import defaultdict
+
+from django.db.models import Count, F, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce, Substr
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+# Caracteres de HTML que se leen de la base para construir el extracto.
+# El marcado ocupa espacio, por eso se lee bastante más que el largo final.
+EXTRACTO_CARACTERES_SQL = 1200
+EXTRACTO_LONGITUD = 200
+
+
+def contar_relacionados(modelo, campo_fk, **filtros):
+    """
+    Subconsulta correlacionada que cuenta las filas de `modelo` que apuntan
+    al objeto externo mediante `campo_fk`.
+
+    A diferencia de `Count()` sobre la relación inversa, no multiplica filas
+    al combinar varios conteos y solo se evalúa para las filas de la página.
+
+    Uso:
+        Articulos.objects.annotate(likes_count=contar_relacionados(LikeArticulo, 'articulo'))
+    """
+    conteo = (
+        modelo.objects.filter(**{campo_fk: OuterRef('pk')}, **filtros)
+        .order_by()
+        .values(campo_fk)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(conteo, output_field=IntegerField()), 0)
+
+
+def contar_interacciones(modelo, campo_fk, campo_archivados):
+    """
+    `contar_relacionados` más las filas que el objeto externo tiene en el
+    archivo frío (su contador `campo_archivados`, ver app/common/archivado.py).
+
+    Uso:
+        Articulos.objects.annotate(likes_count=contar_interacciones(LikeArticulo, 'articulo', 'likes_archivados'))
+    """
+    return contar_relacionados(modelo, campo_fk) + F(campo_archivados)
+
+
+def inicio_contenido(campo='contenido', longitud=EXTRACTO_CARACTERES_SQL):
+    """Anotación con los primeros caracteres de un campo de texto largo."""
+    return Substr(campo, 1, longitud)
+
+
+def generar_extracto(texto, longitud=EXTRACTO_LONGITUD):
+    """
+    Extracto en texto plano a partir de HTML (o texto) truncado.
+
+    Quita etiquetas, decodifica entidades y normaliza espacios.
+    """
+    if not texto:
+        return ""
+    plano = " ".join(html.unescape(strip_tags(texto)).split())
+    return Truncator(plano).chars(longitud)
+
+
+def prefetch_comentarios(queryset):
+    """
+    Prefetch de todos los comentarios (a cualquier nivel) de los objetos de
+    una página en una sola consulta, en `comentarios_cargados`. Los
+    serializers de contenido arman el árbol en memoria con `armar_arbol`.
+
+    Uso:
+        Articulos.objects.prefetch_related(
+            prefetch_comentarios(ComentarioArticulo.objects.select_related('autor'))
+        )
+    """
+    return Prefetch('comentarios', queryset=queryset, to_attr='comentarios_cargados')
+
+
+def armar_arbol(comentarios):
+    """
+    Arma en memoria el árbol de una lista completa de comentarios (por
+    ejemplo, todos los de un artículo, ya cargados en una consulta).
+
+    A cada comentario le asigna `respuestas_cargadas` con sus hijos directos,
+    en el mismo orden de la lista; los serializers de comentarios lo usan en
+    lugar de consultar `respuestas`.
+
+    Returns:
+        Los comentarios principales (sin parent).
+    """
+    hijos = defaultdict(list)
+    for comentario in comentarios:
+        hijos[comentario.parent_id].append(comentario)
+    for comentario in comentarios:
+        comentario.respuestas_cargadas = hijos.get(comentario.pk, [])
+    return hijos.get(None, [])
+
+
+def cargar_respuestas(comentarios, respuestas):
+    """
+    Carga las respuestas de `comentarios` a cualquier profundidad, un nivel
+    por consulta (`parent_id__in` con los IDs del nivel anterior): a lo sumo
+    MAX_DEPTH consultas y solo las filas que cuelgan de `comentarios`.
+
+    `respuestas` es el queryset base de las respuestas (con sus
+    `select_related` y anotaciones). A cada comentario del árbol se le asigna
+    `respuestas_cargadas`.
+
+    Returns:
+        Lista con todos los comentarios del árbol (los de entrada y sus respuestas).
+    """
+    max_nivel = getattr(respuestas.model, 'MAX_DEPTH', None)
+    nodos = []
+    nivel = list(comentarios)
+    while nivel:
+        for comentario in nivel:
+            comentario.respuestas_cargadas = []
+        nodos.extend(nivel)
+        padres = {
+            comentario.pk: comentario for comentario in nivel
+            if max_nivel is None or comentario.nivel < max_nivel
+        }
+        if not padres:
+            break
+        nivel = list(respuestas.filter(parent_id__in=padres))
+        for respuesta in nivel:
+            padres[respuesta.parent_id].respuestas_cargadas.append(respuesta)
+    return nodos
@@ -0,0 +1,447 @@
+"""
+Exportación e importación en streaming del contenido en JSONL.
+
+Para migrar o restaurar artículos, noticias, ediciones y sus comentarios y
+likes sin cargar todo en memoria (como `dumpdata`/`loaddata`). El archivo
+tiene una cabecera y una línea por objeto, en el orden de `CONTENIDOS`
+(primero los objetos referenciados):
+
+    {"formato": "rmm-contenido", "version": 1}
+    {"modelo": "articles.Articulos", "pk": 12, "campos": {"titulo_articulo": "...", ...}}
+    {"modelo": "articles.ComentarioArticulo", "pk": 40, "campos": {"articulo": 12, "autor": "ana@rmm.pe", ...}}
+
+- Exportar: `.iterator(chunk_size=...)` por modelo; los usuarios van por
+  email (las cuentas no se exportan), las imágenes por su ruta en el storage
+  (los archivos se copian aparte).
+- Importar: `bulk_create` por lotes con ids nuevos. Las FK a otros
+  contenidos, los `parent` de los comentarios y los M2M se traducen con el
+  mapa id viejo -> id nuevo. Los objetos cuyo usuario no existe en el
+  destino (o cuya referencia se omitió) se omiten y se cuentan.
+- Checkpoint: después de confirmar cada lote se añaden sus ids nuevos al
+  registro del mapa (`<checkpoint>.mapa`, una línea JSON por lote, sólo se
+  agrega al final) y se guarda el checkpoint, que sólo tiene la última línea
+  confirmada, los contadores y el largo del registro. Guardarlo cuesta lo
+  mismo en el primer lote que en el último; si la importación se
+  interrumpe, la siguiente ejecución relee el registro hasta ese largo y
+  continúa desde ahí sin duplicar nada.
+
+`bulk_create` no emite señales: al terminar, `tras_bulk_create` reconstruye
+el archivo por fechas, invalida las etiquetas de caché de los modelos
+importados y purga del CDN los listados de sus contenidos.
+Las fechas (`creado_en`, `actualizado_en`) se conservan.
+
+Lo usan los comandos `exportar_contenido` e `importar_contenido`.
+"""
+
+import datetime
+import json
+import os
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import NamedTuple
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.db.models.fields.files import FieldFile
+
+from .archivado import CAMPOS_ARCHIVO, filas_exportables
+
+FORMATO = 'rmm-contenido'
+VERSION = 1
+
+
+class TipoContenido(NamedTuple):
+    modelo: str                        # app_label.Modelo
+    usuarios: tuple = ()               # FK a usuarios, exportadas por email
+    orden: tuple = ('pk',)             # Los comentarios padre antes que sus respuestas
+    unico: tuple = ()                  # Campos únicos: los duplicados se omiten (solo tipos que nadie referencia)
+
+
+CONTENIDOS = [
+    TipoContenido('articles.Articulos'),
+    TipoContenido('blog.Blog'),
+    TipoContenido('magazine.Ediciones', unico=('numero_edicion',)),
+    TipoContenido('articles.ComentarioArticulo', usuarios=('autor',), orden=('nivel', 'pk')),
+    TipoContenido('articles.LikeArticulo', usuarios=('usuario',), unico=('articulo', 'usuario')),
+    TipoContenido('blog.ComentarioBlog', usuarios=('autor',), orden=('nivel', 'pk')),
+    TipoContenido('blog.LikeBlog', usuarios=('usuario',), unico=('blog', 'usuario')),
+]
+TIPOS = {tipo.modelo: tipo for tipo in CONTENIDOS}
+
+
+class FormatoInvalido(Exception):
+    pass
+
+
+class _Codificador(DjangoJSONEncoder):
+    """Fechas con microsegundos (DjangoJSONEncoder los trunca a milisegundos)."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+# ============================================================================
+# EXPORTACIÓN
+# ============================================================================
+
+def exportar(salida, modelos=None, tamano_lote=1000):
+    """
+    Escribe el contenido en `salida` (archivo de texto) como JSONL.
+
+    Returns:
+        Diccionario modelo -> filas exportadas.
+    """
+    tipos = [tipo for tipo in CONTENIDOS if modelos is None or tipo.modelo in modelos]
+    salida.write(json.dumps({'formato': FORMATO, 'version': VERSION}) + '\n')
+    filas = Counter()
+
+    for tipo in tipos:
+        Modelo = apps.get_model(tipo.modelo)
+        campo_usuario = get_user_model().USERNAME_FIELD
+        queryset = Modelo.objects.order_by(*tipo.orden).annotate(**{
+            f'_usuario_{campo}': F(f'{campo}__{campo_usuario}') for campo in tipo.usuarios
+        })
+        muchos = [campo.name for campo in Modelo._meta.many_to_many]
+        if muchos:
+            # Con chunk_size, iterator() hace el prefetch por bloque
+            queryset = queryset.prefetch_related(*muchos)
+
+        for objeto in queryset.iterator(chunk_size=tamano_lote):
+            linea = {'modelo': tipo.modelo, 'pk': objeto.pk, 'campos': _campos(objeto, tipo, muchos)}
+            salida.write(json.dumps(linea, cls=_Codificador, ensure_ascii=False) + '\n')
+            filas[tipo.modelo] += 1
+        # Los comentarios y likes del archivo frío se exportan como filas normales
+        for pk, campos in filas_exportables(tipo.modelo, tamano_lote):
+            linea = {'modelo': tipo.modelo, 'pk': pk, 'campos': campos}
+            salida.write(json.dumps(linea, cls=_Codificador, ensure_ascii=False) + '\n')
+            filas[tipo.modelo] += 1
+
+    return filas
+
+
+def _campos(objeto, tipo, muchos):
+    campos = {}
+    for campo in objeto._meta.concrete_fields:
+        if campo.primary_key or campo.name in CAMPOS_ARCHIVO:
+            continue
+        if campo.name in tipo.usuarios:
+            valor = getattr(objeto, f'_usuario_{campo.name}')
+        elif campo.is_relation:
+            valor = getattr(objeto, campo.attname)
+        else:
+            valor = campo.value_from_object(objeto)
+            if isinstance(valor, FieldFile):
+                valor = valor.name or None
+        campos[campo.name] = valor
+    for nombre in muchos:
+        campos[nombre] = [relacionado.pk for relacionado in getattr(objeto, nombre).all()]
+    return campos
+
+
+# ============================================================================
+# IMPORTACIÓN
+# ============================================================================
+
+class Importador:
+    """
+    Importa un archivo JSONL de `exportar()` por lotes de `tamano_lote`.
+
+    Args:
+        checkpoint: Ruta del archivo de checkpoint. Si existe, se continúa
+            desde la última línea confirmada. El mapa de ids va aparte, en
+            `archivo_mapa(checkpoint)`.
+        al_confirmar: Función opcional llamada tras cada lote con
+            (modelo, filas del lote, líneas leídas).
+    """
+
+    def __init__(self, tamano_lote=500, checkpoint=None, al_confirmar=None):
+        self.tamano_lote = tamano_lote
+        self.checkpoint = checkpoint
+        self.al_confirmar = al_confirmar
+        self.linea = 0                     # Última línea confirmada
+        self.mapa = defaultdict(dict)      # modelo -> {pk viejo (str): pk nuevo}
+        self.creados = Counter()
+        self.omitidos = Counter()
+        self.usuarios = {}                 # email -> pk
+        self.leer_checkpoint()
+
+    def importar(self, entrada):
+        """Importa las líneas de `entrada`. Devuelve `self` con los contadores."""
+        lote, pks_lote, modelo = [], set(), None
+        for numero, texto in enumerate(entrada, 1):
+            if numero == 1:
+                self.validar_cabecera(texto)
+                continue
+            if numero <= self.linea or not texto.strip():
+                continue
+            registro = json.loads(texto)
+            if registro['modelo'] not in TIPOS:
+                raise FormatoInvalido(f"Línea {numero}: modelo desconocido {registro['modelo']}")
+
+            if lote and (
+                registro['modelo'] != modelo
+                or len(lote) >= self.tamano_lote
+                or self.padre_en_lote(registro, pks_lote)
+            ):
+                self.confirmar(modelo, lote)
+                lote, pks_lote = [], set()
+            modelo = registro['modelo']
+            lote.append((numero, registro))
+            pks_lote.add(str(registro['pk']))
+
+        if lote:
+            self.confirmar(modelo, lote)
+        self.finalizar()
+        return self
+
+    def validar_cabecera(self, texto):
+        try:
+            cabecera = json.loads(texto)
+        except ValueError:
+            cabecera = None
+        if not isinstance(cabecera, dict) or cabecera.get('formato') != FORMATO:
+            raise FormatoInvalido('El archivo no es una exportación de contenido (falta la cabecera)')
+        if cabecera.get('version') != VERSION:
+            raise FormatoInvalido(f"Versión de formato no soportada: {cabecera.get('version')}")
+
+    def padre_en_lote(self, registro, pks_lote):
+        """Un comentario cuyo padre aún no tiene id nuevo obliga a confirmar el lote."""
+        Modelo = apps.get_model(registro['modelo'])
+        return any(
+            str(registro['campos'].get(campo.name)) in pks_lote
+            for campo in Modelo._meta.concrete_fields
+            if campo.is_relation and campo.related_model is Modelo
+        )
+
+    def confirmar(self, modelo, lote):
+        tipo = TIPOS[modelo]
+        Modelo = apps.get_model(modelo)
+        self.resolver_usuarios(tipo, lote)
+
+        objetos, origenes, relaciones = [], [], []
+        for _, registro in lote:
+            objeto, muchos = self.construir(Modelo, tipo, registro['campos'])
+            if objeto is None:
+                self.omitidos[modelo] += 1
+                continue
+            objetos.append(objeto)
+            origenes.append(str(registro['pk']))
+            relaciones.append(muchos)
+
+        with transaction.atomic(), conservar_fechas(Modelo):
+            if tipo.unico:
+                # Los duplicados (likes o ediciones ya existentes) se omiten y no tienen id nuevo
+                objetos = self.sin_duplicados(Modelo, tipo.unico, objetos)
+                Modelo.objects.bulk_create(objetos, ignore_conflicts=True)
+                creados, nuevos = len(objetos), {}
+            else:
+                objetos = Modelo.objects.bulk_create(objetos)
+                creados = len(objetos)
+                nuevos = {origen: objeto.pk for origen, objeto in zip(origenes, objetos)}
+                self.crear_relaciones(Modelo, objetos, relaciones)
+
+        # Después del commit: el checkpoint nunca apunta a un lote no confirmado
+        self.mapa[modelo].update(nuevos)
+        self.creados[modelo] += creados
+        self.linea = lote[-1][0]
+        self.guardar_checkpoint(modelo, nuevos)
+        if self.al_confirmar:
+            self.al_confirmar(modelo, creados, self.linea)
+
+    def sin_duplicados(self, Modelo, unico, objetos):
+        """
+        Quita de `objetos` los que repiten los campos `unico` de una fila
+        existente o de otro objeto del lote. Consulta solo las filas que
+        coinciden con los valores del lote, en lugar de contar la tabla.
+        """
+        columnas = [Modelo._meta.get_field(campo).attname for campo in unico]
+
+        def clave(objeto):
+            return tuple(getattr(objeto, columna) for columna in columnas)
+
+        existentes = set(
+            Modelo.objects.filter(**{
+                f'{columna}__in': {getattr(objeto, columna) for objeto in objetos} for columna in columnas
+            }).values_list(*columnas)
+        ) if objetos else set()
+
+        unicos = []
+        for objeto in objetos:
+            if clave(objeto) not in existentes:
+                existentes.add(clave(objeto))
+                unicos.append(objeto)
+        return unicos
+
+    def resolver_usuarios(self, tipo, lote):
+        if not tipo.usuarios:
+            return
+        User = get_user_model()
+        faltantes = {
+            registro['campos'].get(campo) for _, registro in lote for campo in tipo.usuarios
+        } - set(self.usuarios) - {None}
+        if faltantes:
+            self.usuarios.update(
+                User.objects.filter(**{f'{User.USERNAME_FIELD}__in': faltantes})
+                .values_list(User.USERNAME_FIELD, 'pk')
+            )
+
+    def construir(self, Modelo, tipo, campos):
+        """Instancia sin guardar con las referencias traducidas, o None si falta alguna."""
+        valores, muchos = {}, {}
+        for campo in Modelo._meta.concrete_fields:
+            if campo.primary_key or campo.name not in campos:
+                continue
+            valor = campos[campo.name]
+            if campo.name in tipo.usuarios:
+                valor = self.usuarios.get(valor)
+                if valor is None:
+                    return None, None
+            elif campo.is_relation and campo.related_model._meta.label in TIPOS and valor is not None:
+                valor = self.mapa[campo.related_model._meta.label].get(str(valor))
+                if valor is None:
+                    return None, None
+            valores[campo.attname] = valor
+
+        for campo in Modelo._meta.many_to_many:
+            destino = self.mapa[campo.related_model._meta.label]
+            muchos[campo] = [destino[str(pk)] for pk in campos.get(campo.name, []) if str(pk) in destino]
+        return Modelo(**valores), muchos
+
+    def crear_relaciones(self, Modelo, creados, relaciones):
+        for campo in Modelo._meta.many_to_many:
+            Intermedia = campo.remote_field.through
+            origen, destino = f'{campo.m2m_field_name()}_id', f'{campo.m2m_reverse_field_name()}_id'
+            Intermedia.objects.bulk_create([
+                Intermedia(**{origen: objeto.pk, destino: pk})
+                for objeto, muchos in zip(creados, relaciones)
+                for pk in muchos[campo]
+            ], ignore_conflicts=True)
+
+    def finalizar(self):
+        """Lo que harían las señales que `bulk_create` no emite (ver `tras_bulk_create`)."""
+        tras_bulk_create(*(modelo for modelo, total in self.creados.items() if total))
+        if self.checkpoint:
+            borrar_checkpoint(self.checkpoint)
+
+    # ------------------------------------------------------------------
+    # Checkpoint
+    # ------------------------------------------------------------------
+
+    def leer_checkpoint(self):
+        if not self.checkpoint:
+            return
+        try:
+            with open(self.checkpoint, encoding='utf-8') as archivo:
+                estado = json.load(archivo)
+        except FileNotFoundError:
+            # Un registro sin checkpoint es de un primer lote que no llegó a anotarse
+            borrar_checkpoint(self.checkpoint)
+            return
+        self.linea = estado['linea']
+        self.creados.update(estado['creados'])
+        self.omitidos.update(estado['omitidos'])
+
+        # Sólo lo que el checkpoint confirma: una línea escrita después (el
+        # proceso murió entre el registro y el checkpoint) se descarta
+        with open(archivo_mapa(self.checkpoint), 'r+b') as registro:
+            for linea in registro.read(estado['mapa']).splitlines():
+                entrada = json.loads(linea)
+                self.mapa[entrada['modelo']].update(entrada['pks'])
+            registro.truncate(estado['mapa'])
+
+    def guardar_checkpoint(self, modelo, nuevos):
+        if not self.checkpoint:
+            return
+        with open(archivo_mapa(self.checkpoint), 'ab') as registro:
+            if nuevos:
+                registro.write(json.dumps({'modelo': modelo, 'pks': nuevos}).encode() + b'\n')
+                registro.flush()
+                os.fsync(registro.fileno())
+            largo = registro.tell()
+
+        estado = {'linea': self.linea, 'creados': self.creados, 'omitidos': self.omitidos, 'mapa': largo}
+        carpeta = os.path.dirname(os.path.abspath(self.checkpoint))
+        descriptor, temporal = tempfile.mkstemp(dir=carpeta, prefix='.tmp-')
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+            json.dump(estado, archivo)
+        os.replace(temporal, self.checkpoint)
+
+
+def archivo_mapa(checkpoint):
+    """Registro del mapa de ids que acompaña a `checkpoint`."""
+    return f'{checkpoint}.mapa'
+
+
+def borrar_checkpoint(checkpoint):
+    """Borra el checkpoint y su registro del mapa de ids, si existen."""
+    for ruta in (checkpoint, archivo_mapa(checkpoint)):
+        try:
+            os.unlink(ruta)
+        except FileNotFoundError:
+            pass
+
+
+@contextmanager
+def conservar_fechas(Modelo):
+    """
+    Desactiva auto_now/auto_now_add en el bloque para que `bulk_create`
+    guarde las fechas del archivo. Afecta a todo el proceso: solo para
+    comandos, nunca dentro de una petición.
+    """
+    campos = [
+        (campo, campo.auto_now, campo.auto_now_add)
+        for campo in Modelo._meta.concrete_fields
+        if getattr(campo, 'auto_now', False) or getattr(campo, 'auto_now_add', False)
+    ]
+    for campo, _, _ in campos:
+        campo.auto_now = campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo, auto_now, auto_now_add in campos:
+            campo.auto_now, campo.auto_now_add = auto_now, auto_now_add
+
+
+def tras_bulk_create(*modelos):
+    """
+    Lo que harían las señales de guardado con las filas que `bulk_create`
+    creó en `modelos` (labels `app_label.Modelo`): reconstruye el archivo por
+    fechas, invalida sus etiquetas de caché y encola la purga del CDN de los
+    listados de sus contenidos (o de los contenidos de los que cuelgan, para
+    comentarios y likes).
+
+    Las importaciones solo cuelgan comentarios y likes de contenidos creados
+    en la misma carga, que el CDN todavía no guarda: basta con los listados.
+
+    Ejemplo:
+        tras_bulk_create('articles.Articulos', 'articles.ComentarioArticulo')
+    """
+    from .archivo import ARCHIVABLES, recalcular as recalcular_archivo
+    from .cache import invalidar_etiquetas
+    from .cdn import TIPOS_CONTENIDO, encolar_purgas, etiquetas_objetos
+    from .signals import RELACIONES
+
+    contenidos = set()
+    for modelo in modelos:
+        if modelo in ARCHIVABLES:
+            recalcular_archivo(modelo)
+        contenidos.add(modelo)
+        contenidos.update(relacion.contenido for relacion in RELACIONES if relacion.modelo == modelo)
+    invalidar_etiquetas(*modelos)
+    encolar_purgas([
+        etiqueta
+        for contenido in contenidos if contenido in TIPOS_CONTENIDO
+        for etiqueta in etiquetas_objetos(contenido, [])
+    ])
+
+
+def velocidad(filas, inicio):
+    """Filas por segundo desde `inicio` (time.monotonic())."""
+    return filas / max(time.monotonic() - inicio, 1e-6)
@@ -0,0 +1,169 @@
+"""
+Rollups incrementales de interacciones (likes y comentarios).
+
+Cada tabla fuente se procesa a partir de su marca de agua (último ID ya
+agregado), de modo que cada ejecución del job solo lee las filas nuevas.
+Los conteos se agrupan en la base de datos por bucket de hora y de día y se
+suman a los buckets existentes en `RollupInteraccion`.
+
+Los rollups cuentan eventos: un like que luego se quita sigue contando en el
+bucket en que se creó.
+"""
+
+from typing import NamedTuple
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDay, TruncHour
+
+from .models import MarcaAguaRollup, RollupInteraccion
+
+
+class FuenteRollup(NamedTuple):
+    modelo: str           # app_label.Modelo de la tabla de eventos
+    tipo_contenido: str   # Tipo de contenido al que se atribuye el evento
+    campo_objeto: str     # Columna con el ID del objeto de contenido
+    metrica: str          # RollupInteraccion.Metrica
+
+
+FUENTES = [
+    FuenteRollup('articles.LikeArticulo', 'articulo', 'articulo_id', RollupInteraccion.Metrica.LIKES),
+    FuenteRollup('articles.ComentarioArticulo', 'articulo', 'articulo_id', RollupInteraccion.Metrica.COMENTARIOS),
+    FuenteRollup('blog.LikeBlog', 'blog', 'blog_id', RollupInteraccion.Metrica.LIKES),
+    FuenteRollup('blog.ComentarioBlog', 'blog', 'blog_id', RollupInteraccion.Metrica.COMENTARIOS),
+    FuenteRollup('foro.LikeTema', 'tema', 'tema_id', RollupInteraccion.Metrica.LIKES),
+    FuenteRollup('foro.ComentarioTema', 'tema', 'tema_id', RollupInteraccion.Metrica.COMENTARIOS),
+    FuenteRollup('foro.LikeComentarioTema', 'comentario_tema', 'comentario_id', RollupInteraccion.Metrica.LIKES),
+]
+
+TIPOS_CONTENIDO = sorted({fuente.tipo_contenido for fuente in FUENTES})
+
+TRUNCADORES = {
+    RollupInteraccion.Granularidad.HORA: TruncHour,
+    RollupInteraccion.Granularidad.DIA: TruncDay,
+}
+
+
+def procesar_fuente(fuente, tamano_lote=5000):
+    """
+    Agrega las filas nuevas de una fuente en lotes de `tamano_lote` IDs.
+
+    Cada lote se aplica en su propia transacción junto con el avance de la
+    marca de agua, así que una ejecución interrumpida no duplica conteos.
+
+    Returns:
+        Cantidad de filas fuente procesadas.
+    """
+    Modelo = apps.get_model(fuente.modelo)
+    procesadas = 0
+
+    while True:
+        with transaction.atomic():
+            marca, _ = MarcaAguaRollup.objects.select_for_update().get_or_create(fuente=fuente.modelo)
+            pendientes = Modelo.objects.filter(pk__gt=marca.ultimo_id)
+
+            # Límite superior del lote: el ID número `tamano_lote` o el máximo existente
+            tope = (
+                pendientes.order_by('pk').values_list('pk', flat=True)[tamano_lote - 1:tamano_lote].first()
+                or pendientes.aggregate(tope=Max('pk'))['tope']
+            )
+            if tope is None:
+                return procesadas
+
+            lote = pendientes.filter(pk__lte=tope)
+            for granularidad, truncador in TRUNCADORES.items():
+                filas = (
+                    lote.annotate(inicio=truncador('creado_en'))
+                    .values(fuente.campo_objeto, 'inicio')
+                    .annotate(total=Count('pk'))
+                    .order_by()
+                )
+                _acumular(fuente, granularidad, filas)
+
+            procesadas += lote.count()
+            marca.ultimo_id = tope
+            marca.save(update_fields=['ultimo_id', 'actualizado_en'])
+
+
+def _acumular(fuente, granularidad, filas):
+    """Suma los conteos agrupados a los buckets existentes o crea los que faltan."""
+    conteos = {
+        (fila[fuente.campo_objeto], fila['inicio']): fila['total']
+        for fila in filas
+    }
+    if not conteos:
+        return
+
+    existentes = {
+        (bucket.objeto_id, bucket.inicio): bucket
+        for bucket in RollupInteraccion.objects.filter(
+            tipo_contenido=fuente.tipo_contenido,
+            metrica=fuente.metrica,
+            granularidad=granularidad,
+            objeto_id__in={objeto_id for objeto_id, _ in conteos},
+            inicio__in={inicio for _, inicio in conteos},
+        )
+    }
+
+    nuevos = []
+    actualizados = []
+    for (objeto_id, inicio), total in conteos.items():
+        bucket = existentes.get((objeto_id, inicio))
+        if bucket:
+            bucket.total += total
+            actualizados.append(bucket)
+        else:
+            nuevos.append(RollupInteraccion(
+                tipo_contenido=fuente.tipo_contenido,
+                objeto_id=objeto_id,
+                metrica=fuente.metrica,
+                granularidad=granularidad,
+                inicio=inicio,
+                total=total,
+            ))
+
+    RollupInteraccion.objects.bulk_update(actualizados, ['total'], batch_size=500)
+    RollupInteraccion.objects.bulk_create(nuevos, batch_size=500)
+
+
+def actualizar_rollups(tamano_lote=5000):
+    """
+    Procesa todas las fuentes registradas.
+
+    Returns:
+        Diccionario {fuente: filas procesadas}.
+    """
+    return {
+        fuente.modelo: procesar_fuente(fuente, tamano_lote=tamano_lote)
+        for fuente in FUENTES
+    }
+
+
+def serie_interacciones(tipo_contenido, metrica, granularidad, desde, hasta, objeto_ids=None):
+    """
+    Serie temporal de una métrica a partir de los rollups.
+
+    La suma por bucket (de uno, varios o todos los objetos del tipo) se
+    resuelve con un único GROUP BY en la base de datos.
+
+    Returns:
+        Lista de tuplas (inicio, total) ordenada por inicio, solo con los
+        buckets que tienen datos.
+    """
+    buckets = RollupInteraccion.objects.filter(
+        tipo_contenido=tipo_contenido,
+        metrica=metrica,
+        granularidad=granularidad,
+        inicio__gte=desde,
+        inicio__lt=hasta,
+    )
+    if objeto_ids:
+        buckets = buckets.filter(objeto_id__in=objeto_ids)
+
+    return list(
+        buckets.values('inicio')
+        .annotate(suma=Sum('total'))
+        .order_by('inicio')
+        .values_list('inicio', 'suma')
+    )
@@ -0,0 +1,81 @@
+"""
+Enrutamiento de lecturas y escrituras entre la base principal y la réplica.
+
+Las peticiones de solo lectura marcadas por `LecturaEscrituraMiddleware`
+(ver app/common/middleware.py) leen del alias ALIAS_LECTURA. Todo lo demás
+va a `default`:
+
+- Las escrituras siempre van a la principal.
+- Después de la primera escritura de la petición, sus lecturas también
+  (read-after-write: la réplica podría no tener aún lo escrito).
+- Dentro de `transaction.atomic()` sobre la principal se lee de la principal,
+  para ver los cambios de la propia transacción.
+
+Si el alias de lectura no está configurado (READ_REPLICA_ENABLED apagado) el
+router deja todo en `default`. Fuera de una petición marcada (comandos,
+hilos de fondo, tareas) también.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+ALIAS_LECTURA = 'lectura'
+
+# Estado de la petición actual: None (no usar la réplica) o {'escribio': bool}
+_estado = ContextVar('enrutamiento_lectura', default=None)
+
+
+@contextmanager
+def lecturas_en_replica():
+    """Envía a la réplica las lecturas del bloque, hasta que haya una escritura."""
+    token = _estado.set({'escribio': False})
+    try:
+        yield
+    finally:
+        _estado.reset(token)
+
+
+def replica_disponible():
+    return ALIAS_LECTURA in connections.settings
+
+
+def marcar_escritura():
+    """
+    Registra una escritura de la petición hecha fuera de su contexto (por
+    ejemplo en el hilo escritor de app/common/escritor.py).
+    """
+    estado = _estado.get()
+    if estado is not None:
+        estado['escribio'] = True
+
+
+class LecturaEscrituraRouter:
+
+    def db_for_read(self, model, **hints):
+        estado = _estado.get()
+        if (
+            estado is None
+            or estado['escribio']
+            or not replica_disponible()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return ALIAS_LECTURA
+
+    def db_for_write(self, model, **hints):
+        estado = _estado.get()
+        if estado is not None:
+            estado['escribio'] = True
+        # Explícito: sin esto Django escribiría en la base de la que se leyó la instancia
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # La réplica contiene los mismos datos que la principal
+        return {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, ALIAS_LECTURA, None}
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == ALIAS_LECTURA:
+            return False
+        return None
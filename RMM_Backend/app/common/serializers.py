@@ -0,0 +1,345 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import prefetch_related_objects
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+
+from .likes import TIPOS_LIKE
+from .models import RollupInteraccion
+from .queries import cargar_respuestas
+from .rollups import TIPOS_CONTENIDO
+
+
+def parse_field_list(request, param):
+    """
+    Lee una lista separada por comas de los query params (`?fields=a,b`).
+
+    Returns:
+        Conjunto de nombres, o None si el parámetro no vino o está vacío.
+    """
+    if request is None:
+        return None
+    valor = request.query_params.get(param)
+    if not valor:
+        return None
+    nombres = {nombre.strip() for nombre in valor.split(',') if nombre.strip()}
+    return nombres or None
+
+
+class SparseFieldsetMixin:
+    """
+    Mixin para ModelSerializer con soporte de `?fields=` y `?expand=`.
+
+    - `?fields=id,titulo_articulo`: devuelve solo los campos indicados.
+    - `?expand=comentarios`: agrega campos opcionales declarados en
+      `Meta.expandable_fields` (nombre -> callable que crea el campo).
+
+    Solo aplica al serializer principal de la vista (lo marca
+    `SparseFieldsetViewMixin.get_serializer`) y en métodos de lectura; los
+    serializers anidados o creados a mano dentro de un SerializerMethodField
+    no se ven afectados.
+
+    Además, `Meta.field_dependencies` (nombre -> lista de columnas del modelo)
+    indica qué columnas necesitan los campos que no corresponden a un campo
+    del modelo (SerializerMethodField, propiedades, anotaciones), para poder
+    aplicar `only()` en el queryset. Si un campo pedido no está declarado,
+    no se usa `only()`.
+
+    Ejemplo:
+        class ArticuloListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+            class Meta:
+                model = Articulos
+                fields = ["id", "titulo_articulo", "extracto"]
+                expandable_fields = {"contenido": lambda: serializers.CharField(read_only=True)}
+                field_dependencies = {"extracto": []}
+    """
+    sparse_fieldset = False
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if not self.sparse_fieldset or request is None or request.method not in ('GET', 'HEAD'):
+            return fields
+
+        expand = parse_field_list(request, 'expand') or set()
+        for nombre, crear_campo in getattr(self.Meta, 'expandable_fields', {}).items():
+            if nombre in expand:
+                fields[nombre] = crear_campo()
+
+        requested = parse_field_list(request, 'fields')
+        if requested:
+            fields = type(fields)((nombre, campo) for nombre, campo in fields.items() if nombre in requested)
+        return fields
+
+
+class ArbolComentariosListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer para comentarios con respuestas anidadas.
+
+    Si los comentarios no traen su árbol ya armado (`respuestas_cargadas`),
+    carga solo las respuestas que cuelgan de ellos, una consulta por nivel
+    (ver `cargar_respuestas`), en lugar de una consulta por comentario y
+    nivel o de todos los comentarios de sus objetos de contenido.
+
+    El serializer hijo puede definir `anotar(queryset)` para agregar
+    anotaciones (conteos) a la consulta de respuestas.
+    """
+
+    def to_representation(self, data):
+        comentarios = list(data.all() if isinstance(data, BaseManager) else data)
+        if comentarios and not hasattr(comentarios[0], 'respuestas_cargadas'):
+            respuestas = self.child.Meta.model.objects.select_related('autor')
+            anotar = getattr(self.child, 'anotar', None)
+            if anotar is not None:
+                respuestas = anotar(respuestas)
+            cargar_respuestas(comentarios, respuestas)
+        return super().to_representation(comentarios)
+
+
+def get_fragment_cache():
+    return caches[getattr(settings, 'FRAGMENT_CACHE_ALIAS', 'default')]
+
+
+class FragmentCacheListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer que arma la lista a partir de fragmentos en caché: un
+    `get_many` para toda la página y solo se serializan los faltantes, que
+    luego se guardan con un `set_many`.
+
+    Los prefetches diferidos por la vista (`prefetch_diferido` en el
+    contexto) se ejecutan solo sobre los objetos faltantes.
+    """
+
+    def to_representation(self, data):
+        child = self.child
+        if not getattr(child, 'fragment_cache', False):
+            return super().to_representation(data)
+
+        objetos = list(data.all() if isinstance(data, BaseManager) else data)
+        variante = child.fragment_variant()
+        claves = [child.fragment_key(objeto, variante) for objeto in objetos]
+
+        cache = get_fragment_cache()
+        fragmentos = cache.get_many(claves)
+        faltantes = [(clave, objeto) for clave, objeto in zip(claves, objetos) if clave not in fragmentos]
+        if faltantes:
+            prefetch_related_objects([objeto for _, objeto in faltantes], *child.context.get('prefetch_diferido', ()))
+            nuevos = {clave: child.serialize_fragment(objeto) for clave, objeto in faltantes}
+            cache.set_many(nuevos, timeout=getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 3600))
+            fragmentos.update(nuevos)
+
+        return [fragmentos[clave] for clave in claves]
+
+
+class FragmentCacheMixin:
+    """
+    Mixin para ModelSerializer con caché de la representación de cada objeto.
+
+    La clave combina modelo, pk, variante (serializer, campos incluidos con
+    `?fields=`/`?expand=` y host, por las URLs absolutas de imágenes) y la
+    marca `actualizado_en` del objeto, que mantiene `app/common/signals.py`
+    (o la anotación que indique `fragment_version_field`).
+    Un cambio en el objeto produce una clave nueva; las viejas vencen solas
+    (FRAGMENT_CACHE_TIMEOUT).
+
+    Solo aplica al serializer principal de la vista (lo marca
+    `FragmentCacheViewMixin`) y cuando FRAGMENT_CACHE_ENABLED está activo.
+    Para listas, declarar `Meta.list_serializer_class = FragmentCacheListSerializer`.
+    """
+    fragment_cache = False
+    fragment_version_field = 'actualizado_en'
+
+    def fragment_variant(self):
+        if not hasattr(self, '_fragment_variant'):
+            request = self.context.get('request')
+            firma = '|'.join([
+                f"{type(self).__module__}.{type(self).__qualname__}",
+                ','.join(self.fields),
+                request.build_absolute_uri('/') if request is not None else '',
+            ])
+            self._fragment_variant = hashlib.md5(firma.encode()).hexdigest()
+        return self._fragment_variant
+
+    def fragment_key(self, instance, variante=None):
+        marca = getattr(instance, self.fragment_version_field)
+        return "fragmento:%s:%s:%s:%s" % (
+            instance._meta.label_lower,
+            instance.pk,
+            variante or self.fragment_variant(),
+            marca.timestamp() if marca else 0,
+        )
+
+    def serialize_fragment(self, instance):
+        """Serializa sin pasar por la caché."""
+        return super().to_representation(instance)
+
+    def to_representation(self, instance):
+        if not self.fragment_cache:
+            return super().to_representation(instance)
+
+        cache = get_fragment_cache()
+        clave = self.fragment_key(instance)
+        fragmento = cache.get(clave)
+        if fragmento is None:
+            prefetch_related_objects([instance], *self.context.get('prefetch_diferido', ()))
+            fragmento = self.serialize_fragment(instance)
+            cache.set(clave, fragmento, timeout=getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 3600))
+        return fragmento
+
+
+def optimize_queryset_for_serializer(queryset, serializer):
+    """
+    Ajusta el queryset a los campos que realmente va a devolver `serializer`.
+
+    - `select_related` para campos anidados sobre un FK directo.
+    - `prefetch_related` para campos anidados `many=True` sobre una relación
+      inversa o ManyToMany.
+    - `only()` con las columnas necesarias cuando todos los campos se pueden
+      resolver (campos del modelo o `Meta.field_dependencies`).
+    """
+    model = queryset.model
+    dependencias = getattr(serializer.Meta, 'field_dependencies', {})
+    columnas = {model._meta.pk.name}
+    usar_only = True
+    select = []
+    prefetch = []
+
+    for nombre, campo in serializer.fields.items():
+        if campo.write_only:
+            continue
+        if nombre in dependencias:
+            columnas.update(dependencias[nombre])
+            continue
+
+        fuente = campo.source.split('.')[0] if campo.source else nombre
+        try:
+            campo_modelo = model._meta.get_field(fuente)
+        except FieldDoesNotExist:
+            usar_only = False
+            continue
+
+        anidado = isinstance(campo, (serializers.BaseSerializer, serializers.ListSerializer))
+        if campo_modelo.many_to_many or campo_modelo.one_to_many:
+            if anidado:
+                prefetch.append(fuente)
+        else:
+            if not campo_modelo.concrete:
+                usar_only = False
+                continue
+            columnas.add(fuente)
+            if anidado and campo_modelo.is_relation:
+                select.append(fuente)
+
+    # La marca de versión de la caché de fragmentos siempre hace falta
+    version = getattr(serializer, 'fragment_version_field', None)
+    if version and version not in queryset.query.annotations:
+        columnas.add(version)
+
+    # Los select_related que ya trae el queryset exigen que el FK no esté diferido
+    if isinstance(queryset.query.select_related, dict):
+        columnas.update(queryset.query.select_related)
+    elif queryset.query.select_related:
+        usar_only = False
+
+    # No repetir prefetches que la vista ya declaró con un queryset propio (Prefetch)
+    ya_prefetch = {getattr(lookup, 'prefetch_to', lookup) for lookup in queryset._prefetch_related_lookups}
+    prefetch = [lookup for lookup in prefetch if lookup not in ya_prefetch]
+
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if usar_only:
+        queryset = queryset.only(*columnas)
+    return queryset
+
+
+class SerieInteraccionesQuerySerializer(serializers.Serializer):
+    """
+    Parámetros de consulta para la serie temporal de interacciones.
+    """
+    tipo = serializers.ChoiceField(choices=TIPOS_CONTENIDO)
+    ids = serializers.CharField(
+        required=False,
+        help_text="IDs de objetos separados por coma. Vacío = todos los objetos del tipo."
+    )
+    metrica = serializers.ChoiceField(choices=RollupInteraccion.Metrica.choices, default=RollupInteraccion.Metrica.LIKES)
+    granularidad = serializers.ChoiceField(choices=RollupInteraccion.Granularidad.choices, default=RollupInteraccion.Granularidad.DIA)
+    desde = serializers.DateField()
+    hasta = serializers.DateField(help_text="Fecha final inclusive.")
+
+    MAX_DIAS = 366
+
+    def validate_ids(self, value):
+        try:
+            return [int(valor) for valor in value.split(',') if valor.strip()]
+        except ValueError:
+            raise serializers.ValidationError("Los IDs deben ser números separados por coma.")
+
+    def validate(self, attrs):
+        if attrs['hasta'] < attrs['desde']:
+            raise serializers.ValidationError({'hasta': "Debe ser posterior o igual a 'desde'."})
+        if (attrs['hasta'] - attrs['desde']).days > self.MAX_DIAS:
+            raise serializers.ValidationError({'hasta': f"El rango máximo es de {self.MAX_DIAS} días."})
+        return attrs
+
+
+class ArchivoMesSerializer(serializers.Serializer):
+    mes = serializers.IntegerField()
+    nombre = serializers.CharField()
+    total = serializers.IntegerField()
+
+
+class ArchivoAnioSerializer(serializers.Serializer):
+    """
+    Año del archivo por fechas con sus meses (ver app/common/archivo.py).
+    """
+    anio = serializers.IntegerField()
+    total = serializers.IntegerField()
+    meses = ArchivoMesSerializer(many=True)
+
+
+class EstadoLikesQuerySerializer(serializers.Serializer):
+    """
+    Parámetros de consulta para el estado de likes del usuario autenticado.
+    """
+    tipo = serializers.ChoiceField(choices=sorted(TIPOS_LIKE))
+    ids = serializers.CharField(help_text="IDs de objetos separados por coma (máximo 100).")
+
+    MAX_IDS = 100
+
+    def validate_ids(self, value):
+        try:
+            ids = [int(valor) for valor in value.split(',') if valor.strip()]
+        except ValueError:
+            raise serializers.ValidationError("Los IDs deben ser números separados por coma.")
+        if not ids:
+            raise serializers.ValidationError("Debe indicar al menos un ID.")
+        if len(ids) > self.MAX_IDS:
+            raise serializers.ValidationError(f"Se permiten como máximo {self.MAX_IDS} IDs por consulta.")
+        return ids
+
+
+class OperacionReaccionSerializer(serializers.Serializer):
+    """
+    Una operación de like/unlike encolada por el cliente sin conexión.
+    """
+    type = serializers.ChoiceField(choices=sorted(TIPOS_LIKE))
+    id = serializers.IntegerField(min_value=1)
+    action = serializers.ChoiceField(choices=["add", "remove"])
+    client_ts = serializers.DateTimeField(required=False, allow_null=True)
+
+
+class LoteReaccionesSerializer(serializers.Serializer):
+    """
+    Lote de operaciones de reacciones a aplicar en una sola transacción.
+    """
+    operaciones = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=200,
+        help_text="Lista de operaciones {type, id, action, client_ts} (máximo 200)."
+    )
@@ -0,0 +1,140 @@
+"""
+Marca de última modificación del contenido publicado.
+
+`actualizado_en` de Articulos, Blog, Tema y Ediciones representa el último
+cambio de su representación en la API, no solo de sus propias columnas: un
+comentario o un like nuevo cambia el árbol de comentarios y los conteos que
+devuelve el detalle. Esta marca es la que usan la caché de fragmentos
+serializados (`FragmentCacheMixin`) y el GET condicional para invalidar; al
+marcar también se encolan las purgas del CDN de esos contenidos (ver `cdn`).
+
+Solo se marca el contenido directo. Los que embeben otros contenidos (las
+noticias y sus artículos relacionados, ver `EMBEBIDOS`) calculan su versión
+al leer con `version_de`: un like en un artículo no reescribe cada noticia
+que lo incluye, y el CDN ya etiqueta esas respuestas con los artículos.
+
+Las marcas se actualizan con `update()` (sin volver a disparar señales).
+Las operaciones masivas que no emiten señales (`bulk_create`) deben llamar
+a `marcar_modificado` a mano.
+"""
+
+from typing import NamedTuple
+
+from django.apps import apps
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.utils import timezone
+
+from .cdn import encolar_queryset
+
+
+class Relacion(NamedTuple):
+    modelo: str     # app_label.Modelo que cambia
+    contenido: str  # app_label.Modelo con `actualizado_en` a marcar
+    lookup: str     # Filtro sobre `contenido`...
+    atributo: str   # ...con el valor de este atributo de la instancia que cambia
+
+
+RELACIONES = [
+    Relacion('articles.ComentarioArticulo', 'articles.Articulos', 'pk', 'articulo_id'),
+    Relacion('articles.LikeArticulo', 'articles.Articulos', 'pk', 'articulo_id'),
+    Relacion('blog.ComentarioBlog', 'blog.Blog', 'pk', 'blog_id'),
+    Relacion('blog.LikeBlog', 'blog.Blog', 'pk', 'blog_id'),
+    Relacion('foro.ComentarioTema', 'foro.Tema', 'pk', 'tema_id'),
+    Relacion('foro.LikeTema', 'foro.Tema', 'pk', 'tema_id'),
+    Relacion('foro.LikeComentarioTema', 'foro.Tema', 'comentarios', 'comentario_id'),
+    # Las noticias embeben sus artículos relacionados: solo al borrarlos (su
+    # versión incluye la de los artículos, ver `version_de`)
+    Relacion('articles.Articulos', 'blog.Blog', 'articulos', 'pk'),
+]
+
+# Contenidos que embeben otros en su representación -> campo de la relación
+EMBEBIDOS = {
+    'blog.Blog': 'articulos',
+}
+
+
+def marcar_modificado(contenido, **filtro):
+    """
+    Actualiza `actualizado_en` de los objetos de `contenido` que cumplen
+    `filtro`. Los contenidos que los embeben no se tocan (ver `version_de`).
+
+    Ejemplo:
+        marcar_modificado('articles.Articulos', pk__in=[1, 2])
+    """
+    Contenido = apps.get_model(contenido)
+    objetos = Contenido.objects.filter(**filtro)
+    objetos.update(actualizado_en=timezone.now())
+    encolar_queryset(contenido, objetos)
+
+
+def version_de(contenido, campo='actualizado_en'):
+    """
+    Expresión con la versión de la representación de cada objeto de
+    `contenido`: su `campo`, o el de sus contenidos embebidos si es posterior.
+
+    Ejemplo:
+        Blog.objects.annotate(version=version_de('blog.Blog'))
+    """
+    relacion = EMBEBIDOS.get(contenido)
+    if relacion is None:
+        return F(campo)
+    m2m = apps.get_model(contenido)._meta.get_field(relacion)
+    embebidos = (
+        m2m.related_model._base_manager
+        .filter(**{m2m.related_query_name(): OuterRef('pk')})
+        .order_by(f'-{campo}')
+        .values(campo)[:1]
+    )
+    return Greatest(campo, Coalesce(Subquery(embebidos), campo))
+
+
+def marcar_relacionados(modelo, valores):
+    """
+    Marca los contenidos afectados por cambios masivos en filas de `modelo`,
+    dados los valores de su atributo de relación (por ejemplo, los
+    `articulo_id` de los likes creados con `bulk_create`).
+    """
+    valores = list(valores)
+    if not valores:
+        return
+    for relacion in RELACIONES:
+        if relacion.modelo == modelo:
+            marcar_modificado(relacion.contenido, **{f"{relacion.lookup}__in": valores})
+
+
+def _al_cambiar_articulos_de_blog(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        marcar_modificado('blog.Blog', pk=instance.pk)
+    elif action == 'pre_clear':
+        marcar_modificado('blog.Blog', articulos=instance.pk)
+    elif pk_set:
+        marcar_modificado('blog.Blog', pk__in=pk_set)
+
+
+def conectar_senales():
+    """Conecta las señales que mantienen al día `actualizado_en`."""
+    for relacion in RELACIONES:
+        modelo = apps.get_model(relacion.modelo)
+
+        def receptor(sender, instance, _relacion=relacion, **kwargs):
+            marcar_modificado(_relacion.contenido, **{_relacion.lookup: getattr(instance, _relacion.atributo)})
+
+        uid = f"marca_{relacion.modelo}_{relacion.contenido}"
+        if relacion.atributo == 'pk':
+            # Contenido embebido: sus cambios ya cuentan en `version_de`; al
+            # borrarlo sale de la relación (las filas M2M ya no existen en post_delete)
+            pre_delete.connect(receptor, sender=modelo, weak=False, dispatch_uid=f"{uid}_delete")
+        else:
+            post_save.connect(receptor, sender=modelo, weak=False, dispatch_uid=f"{uid}_save")
+            post_delete.connect(receptor, sender=modelo, weak=False, dispatch_uid=f"{uid}_delete")
+
+    m2m_changed.connect(
+        _al_cambiar_articulos_de_blog,
+        sender=apps.get_model('blog.Blog').articulos.through,
+        weak=False,
+        dispatch_uid="marca_blog_articulos",
+    )
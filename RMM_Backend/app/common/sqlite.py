@@ -0,0 +1,85 @@
+"""
+Configuración de las conexiones SQLite.
+
+Por defecto SQLite usa journal de rollback: cada escritura bloquea a los
+lectores y, sin `busy_timeout`, las peticiones concurrentes fallan con
+"database is locked". Al abrir cada conexión (`connection_created`) se
+aplican los PRAGMA de SQLITE_PRAGMAS:
+
+- journal_mode=WAL: los lectores no esperan a los escritores (y viceversa).
+- synchronous=NORMAL: con WAL es seguro ante caídas del proceso; solo un
+  corte de energía puede perder las últimas transacciones confirmadas.
+- busy_timeout: milisegundos que una escritura espera el lock antes de fallar.
+- mmap_size, cache_size y temp_store: lecturas desde memoria.
+
+SQLITE_PRAGMAS se configura por entorno (variables SQLITE_*) y cada base
+puede sobrescribir valores con la clave `PRAGMAS` de su entrada en
+DATABASES:
+
+    DATABASES = {'default': {..., 'PRAGMAS': {'mmap_size': 0}}}
+
+Un valor None omite ese PRAGMA en la base.
+
+El modo de las transacciones (BEGIN IMMEDIATE por defecto) va aparte, en
+la clave OPTIONS['transaction_mode'] de DATABASES (SQLITE_TRANSACTION_MODE).
+
+El comando `benchmark_sqlite` compara el rendimiento con y sin estos ajustes.
+"""
+
+import logging
+import re
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+# Valores por defecto de SQLite, para comparar en el benchmark
+PRAGMAS_SQLITE_ORIGINALES = {
+    'journal_mode': 'delete',
+    'synchronous': 'full',
+    'busy_timeout': 0,
+    'mmap_size': 0,
+    'cache_size': -2000,
+    'temp_store': 'default',
+}
+
+_NOMBRE_VALIDO = re.compile(r'^[a-z_]+$')
+_VALOR_VALIDO = re.compile(r'^-?\w+$')
+
+
+def pragmas_de(settings_dict):
+    """PRAGMA a aplicar para una base: SQLITE_PRAGMAS más los de su `PRAGMAS`."""
+    return {**getattr(settings, 'SQLITE_PRAGMAS', {}), **settings_dict.get('PRAGMAS', {})}
+
+
+def aplicar_pragmas(conexion, pragmas):
+    """
+    Ejecuta los PRAGMA sobre una conexión DB-API de sqlite3.
+
+    `journal_mode` va primero: cambiarlo después de otros PRAGMA no tiene
+    efecto sobre ellos, pero sí requiere que no haya transacción abierta.
+    """
+    cursor = conexion.cursor()
+    try:
+        for nombre in sorted(pragmas, key=lambda nombre: nombre != 'journal_mode'):
+            if pragmas[nombre] is None:
+                continue  # Anulado por la base (p. ej. journal_mode en una conexión de solo lectura)
+            valor = str(pragmas[nombre])
+            if not _NOMBRE_VALIDO.match(nombre) or not _VALOR_VALIDO.match(valor):
+                raise ValueError(f"PRAGMA inválido: {nombre}={valor}")
+            cursor.execute(f"PRAGMA {nombre} = {valor}")
+    finally:
+        cursor.close()
+
+
+def configurar_conexion(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = pragmas_de(connection.settings_dict)
+    if pragmas:
+        aplicar_pragmas(connection.connection, pragmas)
+
+
+def conectar_senales():
+    connection_created.connect(configurar_conexion, weak=False, dispatch_uid="sqlite_pragmas")
@@ -0,0 +1,421 @@
+"""
+Utilidades para las pruebas de la API.
+
+- `crear_usuario()`, `crear_articulo()` y `crear_edicion()` crean las filas
+  sueltas que usan los tests de cada app.
+- `sembrar_datos()` crea un conjunto de datos realista: usuarios con los tres
+  roles, artículos, noticias y temas con hilos de comentarios hasta el nivel
+  máximo (5) y cientos de likes, ediciones, categorías y rollups.
+- `PRESUPUESTOS` fija, por app, las peticiones de cada ruta de la API con
+  su máximo de consultas SQL; `rutas_api()` recorre el resolver de URLs.
+- `PresupuestoConsultasMixin` verifica que cada endpoint responda con un
+  máximo de consultas SQL y dentro de un presupuesto de tiempo.
+
+Los presupuestos de consultas se fijan con los datos sembrados: una página
+tiene varias filas y cada comentario tiene varias respuestas, así que
+cualquier consulta por fila (N+1) los supera.
+
+Uso:
+    class ArticulosPresupuestoTests(PresupuestoConsultasMixin, TestCase):
+        presupuestos = PRESUPUESTOS['articles']
+"""
+
+import os
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import NamedTuple
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, resolve
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app.articles.models import Articulos, ComentarioArticulo, LikeArticulo
+from app.blog.models import Blog, ComentarioBlog, LikeBlog
+from app.common.archivo import ARCHIVABLES, recalcular as recalcular_archivo
+from app.common.rollups import actualizar_rollups
+from app.foro.models import Categoria_Foro, ComentarioTema, LikeComentarioTema, LikeTema, Tema
+from app.magazine.models import Ediciones
+
+User = get_user_model()
+
+# Tamaños del conjunto de datos sembrado
+USUARIOS = 60
+ARTICULOS = 10
+NOTICIAS = 8
+TEMAS = 12
+EDICIONES = 12
+RAICES_POR_HILO = 2     # Comentarios principales por objeto
+RESPUESTAS_POR_NIVEL = 2  # Respuestas de cada comentario, hasta el nivel 5
+
+# Presupuesto de tiempo por defecto (ms). PRESUPUESTO_TIEMPO_FACTOR permite
+# relajarlo en máquinas lentas (por ejemplo, CI compartido).
+TIEMPO_MS = 1000
+FACTOR_TIEMPO = float(os.environ.get('PRESUPUESTO_TIEMPO_FACTOR', '1'))
+
+CLAVE = "Clave-segura-123"  # Contraseña de "admin" y "superusuario"
+
+CONTENIDO_HTML = "<p>La <strong>minería</strong> moderna combina sensores, datos y automatización.</p>" * 20
+
+
+class Presupuesto(NamedTuple):
+    url: str                  # Con marcadores de `sembrar_datos()`, p. ej. {articulo}
+    consultas: int            # Máximo de consultas SQL
+    usuario: str = None       # None (anónimo), "lector", "admin" o "superusuario"
+    metodo: str = 'get'
+    datos: dict = None        # Cuerpo JSON para métodos de escritura
+    estado: int = 200
+    ms: int = TIEMPO_MS
+
+
+# Presupuestos de consultas SQL por app y endpoint con los datos de
+# `sembrar_datos()` (los árboles de comentarios cuestan una consulta por nivel
+# de respuestas). Los usan los tests de cada app y `manage.py asesor_indices`.
+PRESUPUESTOS = {
+    'articles': [
+        Presupuesto("/api/v1/articles/", 0, usuario="lector"),
+        Presupuesto("/api/v1/articles/articulos/", 3),
+        Presupuesto("/api/v1/articles/articulos/?search=mineria", 5),
+        Presupuesto("/api/v1/articles/articulos/?pagination=cursor", 2),
+        Presupuesto("/api/v1/articles/articulos/?year=2025&month=1", 3),
+        Presupuesto("/api/v1/articles/articulos/archivo/", 1),
+        Presupuesto("/api/v1/articles/articulos/?expand=contenido,comentarios", 4, ms=3000),
+        Presupuesto("/api/v1/articles/articulos/?fields=id,titulo_articulo", 3),
+        Presupuesto("/api/v1/articles/articulos/{articulo}/", 4),
+        Presupuesto("/api/v1/articles/articulos/{articulo}/comentarios/", 8),
+        Presupuesto("/api/v1/articles/articulos/{articulo}/likes_list/", 2),
+        Presupuesto("/api/v1/articles/articulos/{articulo}/toggle_like/", 6, usuario="admin", metodo="post",
+                    datos={"action": "add"}),
+        Presupuesto("/api/v1/articles/comentarios/", 4),
+        Presupuesto("/api/v1/articles/comentarios/?articulo={articulo}", 5),
+        Presupuesto("/api/v1/articles/comentarios/{comentario_articulo}/", 8),
+        Presupuesto("/api/v1/articles/comentarios/{comentario_articulo}/children/", 7),
+        Presupuesto("/api/v1/articles/comentarios/", 7, usuario="lector", metodo="post", estado=201,
+                    datos={"articulo": "{articulo}", "contenido": "Muy buen artículo", "parent": "{comentario_articulo}"}),
+    ],
+    'blog': [
+        Presupuesto("/api/v1/noticias/", 0, usuario="lector"),
+        Presupuesto("/api/v1/noticias/noticias/", 4),
+        Presupuesto("/api/v1/noticias/noticias/?search=noticia", 6),
+        Presupuesto("/api/v1/noticias/noticias/?pagination=cursor", 3),
+        Presupuesto("/api/v1/noticias/noticias/archivo/", 1),
+        Presupuesto("/api/v1/noticias/noticias/?expand=contenido,comentarios", 5, ms=3000),
+        Presupuesto("/api/v1/noticias/noticias/?fields=id,titulo_blog", 3),
+        Presupuesto("/api/v1/noticias/noticias/{noticia}/", 5),
+        Presupuesto("/api/v1/noticias/noticias/{noticia}/articulos/", 4),
+        # Obsoleto: serializa cada artículo completo con su árbol de comentarios
+        Presupuesto("/api/v1/noticias/noticias/{noticia}/articulos_management/", 6, usuario="admin", ms=4000),
+        Presupuesto("/api/v1/noticias/noticias/{noticia}/articulos_picker/", 4, usuario="admin"),
+        Presupuesto("/api/v1/noticias/noticias/{noticia}/articulos_picker/?search=mineria", 4, usuario="admin"),
+        Presupuesto("/api/v1/noticias/noticias/{noticia}/comentarios/", 8),
+        Presupuesto("/api/v1/noticias/noticias/{noticia}/likes_list/", 2),
+        Presupuesto("/api/v1/noticias/noticias/{noticia}/toggle_like/", 6, usuario="admin", metodo="post",
+                    datos={"action": "add"}),
+        Presupuesto("/api/v1/noticias/noticias/{noticia}/manage_articulos/", 11, usuario="admin", metodo="post",
+                    datos={"action": "set", "articulos_ids": ["{articulo}"]}),
+        Presupuesto("/api/v1/noticias/comentarios/", 4),
+        Presupuesto("/api/v1/noticias/comentarios/?blog={noticia}", 5),
+        Presupuesto("/api/v1/noticias/comentarios/{comentario_blog}/", 8),
+        Presupuesto("/api/v1/noticias/comentarios/{comentario_blog}/children/", 7),
+        Presupuesto("/api/v1/noticias/comentarios/", 5, usuario="lector", metodo="post", estado=201,
+                    datos={"blog": "{noticia}", "contenido": "Interesante", "parent": ""}),
+    ],
+    'foro': [
+        Presupuesto("/api/v1/foro/", 0, usuario="lector"),
+        Presupuesto("/api/v1/foro/temas/", 3),
+        Presupuesto("/api/v1/foro/temas/?search=tema", 3),
+        Presupuesto("/api/v1/foro/temas/?pagination=cursor", 2),
+        Presupuesto("/api/v1/foro/temas/?categoria_foro={categoria}", 5),
+        Presupuesto("/api/v1/foro/temas/?expand=contenido,comentarios", 4, ms=3000),
+        Presupuesto("/api/v1/foro/temas/{tema}/", 4),
+        Presupuesto("/api/v1/foro/temas/{tema}/comentarios/", 8),
+        Presupuesto("/api/v1/foro/temas/{tema}/likes_list/", 2),
+        Presupuesto("/api/v1/foro/temas/{tema}/toggle_like/", 6, usuario="lector", metodo="post",
+                    datos={"action": "remove"}),
+        Presupuesto("/api/v1/foro/temas/", 5, usuario="lector", metodo="post", estado=201,
+                    datos={"titulo": "Nuevo tema", "contenido": "¿Qué opinan?", "categoria_foro_id": "{categoria}"}),
+        Presupuesto("/api/v1/foro/comentarios/", 4),
+        Presupuesto("/api/v1/foro/comentarios/?tema={tema}", 5),
+        Presupuesto("/api/v1/foro/comentarios/{comentario_tema}/", 10),
+        Presupuesto("/api/v1/foro/comentarios/{comentario_tema}/likes_list/", 4),
+        Presupuesto("/api/v1/foro/comentarios/{comentario_tema}/toggle_like/", 6, usuario="lector", metodo="post",
+                    datos={"action": "remove"}),
+        Presupuesto("/api/v1/foro/comentarios/", 7, usuario="lector", metodo="post", estado=201,
+                    datos={"tema": "{tema}", "contenido": "Coincido", "parent": "{comentario_tema}"}),
+        Presupuesto("/api/v1/foro/categorias/", 2),
+        Presupuesto("/api/v1/foro/categorias/{categoria}/", 1),
+    ],
+    'magazine': [
+        Presupuesto("/api/v1/magazine/", 0, usuario="lector"),
+        Presupuesto("/api/v1/magazine/editions/", 3),
+        Presupuesto("/api/v1/magazine/editions/?search=edicion", 5),
+        Presupuesto("/api/v1/magazine/editions/last/", 1),
+        Presupuesto("/api/v1/magazine/editions/past/", 2),
+        Presupuesto("/api/v1/magazine/editions/past/?year=2024&month=3", 2),
+        Presupuesto("/api/v1/magazine/editions/archivo/", 1),
+        Presupuesto("/api/v1/magazine/editions/{edicion}/", 2),
+        Presupuesto("/api/v1/magazine/newsletters/", 1, metodo="post", estado=201,
+                    datos={"correo_electronico": "suscriptor@example.com"}),
+        Presupuesto("/api/v1/magazine/contacts/", 1, metodo="post", estado=201,
+                    datos={"nombre_contacto": "Ana", "correo_electronico": "ana@example.com", "telefono_contacto": 999111222,
+                           "sitio_web_contacto": "https://example.com", "mensaje_contacto": "Hola"}),
+    ],
+    'users': [
+        Presupuesto("/api/v1/users/profile", 0, usuario="lector"),
+        Presupuesto("/api/v1/users/roles/users/", 2, usuario="superusuario"),
+        Presupuesto("/api/v1/users/roles/users/?search=lector", 4, usuario="superusuario"),
+        Presupuesto("/api/v1/users/roles/assign/", 2, usuario="superusuario", metodo="post",
+                    datos={"user_id": "{id_lector}", "role": "ADMIN"}),
+        Presupuesto("/api/v1/users/auth/login", 2, metodo="post",
+                    datos={"email": "admin@example.com", "password": CLAVE}),
+        Presupuesto("/api/v1/users/auth/login-admin", 4, metodo="post",
+                    datos={"email": "admin@example.com", "password": CLAVE}),
+        Presupuesto("/api/v1/users/auth/registro-inicial", 5, metodo="post", estado=201,
+                    datos={"email": "nuevo@example.com", "password": CLAVE, "confirm_password": CLAVE}),
+        Presupuesto("/api/v1/users/auth/request-password-reset/", 1, metodo="post",
+                    datos={"email": "admin@example.com"}),
+    ],
+    'common': [
+        Presupuesto("/api/v1/interacciones/estadisticas/?tipo=articulo&desde={hace_30_dias}&hasta={hoy}", 1,
+                    usuario="admin"),
+        Presupuesto("/api/v1/interacciones/likes/estado/?tipo=articulo&ids={ids_articulos}", 1, usuario="lector"),
+        Presupuesto("/api/v1/interacciones/reacciones/lote/", 19, usuario="lector", metodo="post",
+                    datos={"operaciones": [
+                        {"type": "articulo", "id": "{articulo}", "action": "remove"},
+                        {"type": "tema", "id": "{tema}", "action": "remove"},
+                        {"type": "blog", "id": "{noticia}", "action": "add"},
+                    ]}),
+    ],
+}
+
+# Rutas de la API sin presupuesto, con el motivo
+RUTAS_EXCLUIDAS = {
+    "api/v1/users/auth/logout": "Requiere un refresh token emitido por login; sin consultas de lectura",
+    "api/v1/users/auth/reset-password-confirm/": "Requiere el token enviado por correo",
+}
+
+
+def rutas_api(resolver=None, prefijo=""):
+    """Recorre el resolver de URLs y devuelve las rutas de /api/v1/ (como `ResolverMatch.route`)."""
+    resolver = resolver or get_resolver()
+    for patron in resolver.url_patterns:
+        ruta = prefijo + str(patron.pattern).removeprefix("^")
+        if isinstance(patron, URLResolver):
+            yield from rutas_api(patron, ruta)
+        elif ruta.startswith("api/v1/") and "format" not in ruta:
+            yield ruta
+
+
+def ruta_de(presupuesto):
+    """Ruta del resolver a la que corresponde la URL del presupuesto (cualquier ID sirve)."""
+    return resolve(presupuesto.url.split("?")[0].format_map(defaultdict(lambda: 1))).route
+
+
+def presupuestos_por_ruta():
+    """Agrupa todos los presupuestos por su ruta del resolver."""
+    por_ruta = defaultdict(list)
+    for presupuestos in PRESUPUESTOS.values():
+        for presupuesto in presupuestos:
+            por_ruta[ruta_de(presupuesto)].append(presupuesto)
+    return por_ruta
+
+
+def crear_usuario(usuario_unico="lector", **campos):
+    """Usuario `<usuario_unico>@example.com` con la contraseña `CLAVE`."""
+    return User.objects.create_user(
+        email=f"{usuario_unico}@example.com", password=CLAVE, usuario_unico=usuario_unico, **campos,
+    )
+
+
+def crear_articulo(titulo_articulo="Artículo", fecha_publicacion="2025-01-01", **campos):
+    """Artículo publicado; `campos` agrega contenido, imágenes, etc."""
+    return Articulos.objects.create(titulo_articulo=titulo_articulo, fecha_publicacion=fecha_publicacion, **campos)
+
+
+def crear_edicion(numero_edicion=1, fecha_publicacion="2025-01-01", **campos):
+    """Edición `numero_edicion` de la revista, con imagen."""
+    campos = {"titulo_edicion": f"Edición {numero_edicion}", "imagen": "e.jpg", **campos}
+    return Ediciones.objects.create(numero_edicion=numero_edicion, fecha_publicacion=fecha_publicacion, **campos)
+
+
+def _hilo(Modelo, campo, objetos, autores):
+    """
+    Crea para cada objeto `RAICES_POR_HILO` comentarios principales con
+    `RESPUESTAS_POR_NIVEL` respuestas por comentario hasta el nivel máximo.
+    """
+    nivel_actual = Modelo.objects.bulk_create([
+        Modelo(**{campo: objeto}, autor=autores[(objeto.pk + i) % len(autores)],
+               contenido=f"Comentario {i} sobre {objeto.pk}", nivel=0)
+        for objeto in objetos
+        for i in range(RAICES_POR_HILO)
+    ])
+    todos = list(nivel_actual)
+    for nivel in range(1, Modelo.MAX_DEPTH + 1):
+        nivel_actual = Modelo.objects.bulk_create([
+            Modelo(**{campo: getattr(padre, campo)}, autor=autores[(padre.pk + i) % len(autores)],
+                   parent=padre, contenido=f"Respuesta {i} a {padre.pk}", nivel=nivel)
+            for padre in nivel_actual
+            for i in range(RESPUESTAS_POR_NIVEL)
+        ])
+        todos.extend(nivel_actual)
+    return todos
+
+
+def sembrar_datos():
+    """
+    Crea el conjunto de datos de prueba.
+
+    Returns:
+        Diccionario con los usuarios ("lector", "admin", "superusuario") y
+        los IDs que usan los marcadores de las URLs de los presupuestos.
+    """
+    lectores = User.objects.bulk_create([
+        User(email=f"lector{i}@example.com", usuario_unico=f"lector{i}", first_name=f"Lector{i}")
+        for i in range(USUARIOS)
+    ])
+    admin = User.objects.create_user(
+        email="admin@example.com", password=CLAVE, usuario_unico="admin",
+        role=User.Roles.ADMIN, is_staff=True,
+    )
+    superusuario = User.objects.create_superuser(
+        email="root@example.com", password=CLAVE, usuario_unico="root",
+    )
+
+    articulos = Articulos.objects.bulk_create([
+        Articulos(titulo_articulo=f"Artículo de minería {i}", titulo_busqueda=f"articulo de mineria {i}",
+                  contenido=CONTENIDO_HTML, imagen_principal=f"RMM/Articulos-ImagenPrincipal/{i}.jpg",
+                  fecha_publicacion=date(2025, 1, 1) + timedelta(days=i))
+        for i in range(ARTICULOS)
+    ])
+    noticias = Blog.objects.bulk_create([
+        Blog(titulo_blog=f"Noticia {i}", contenido=CONTENIDO_HTML,
+             imagen_principal=f"RMM/Noticias-ImagenPrincipal/{i}.jpg",
+             fecha_publicacion=date(2025, 1, 1) + timedelta(days=i))
+        for i in range(NOTICIAS)
+    ])
+    for i, noticia in enumerate(noticias):
+        noticia.articulos.set(articulos[i % 3:i % 3 + 4])
+
+    categorias = Categoria_Foro.objects.bulk_create([
+        Categoria_Foro(nombre_categoria=nombre, slug=nombre.lower())
+        for nombre in ("Seguridad", "Tecnología", "Medio ambiente")
+    ])
+    temas = Tema.objects.bulk_create([
+        Tema(titulo=f"Tema {i}", contenido=CONTENIDO_HTML, autor=lectores[i],
+             categoria_foro=categorias[i % len(categorias)])
+        for i in range(TEMAS)
+    ])
+
+    Ediciones.objects.bulk_create([
+        Ediciones(numero_edicion=i + 1, titulo_edicion=f"Edición {i + 1}", contenido="Resumen de la edición",
+                  imagen=f"RMM/Ediciones/{i}.jpg", fecha_publicacion=date(2024, 1, 1) + timedelta(days=30 * i))
+        for i in range(EDICIONES)
+    ])
+
+    comentarios_articulo = _hilo(ComentarioArticulo, "articulo", articulos, lectores)
+    comentarios_blog = _hilo(ComentarioBlog, "blog", noticias, lectores)
+    comentarios_tema = _hilo(ComentarioTema, "tema", temas, lectores)
+
+    # Cientos de likes: cada lector da like a la mayoría de los objetos
+    LikeArticulo.objects.bulk_create([
+        LikeArticulo(articulo=articulo, usuario=lector)
+        for articulo in articulos for lector in lectores[:50]
+    ])
+    LikeBlog.objects.bulk_create([
+        LikeBlog(blog=noticia, usuario=lector)
+        for noticia in noticias for lector in lectores[:40]
+    ])
+    LikeTema.objects.bulk_create([
+        LikeTema(tema=tema, usuario=lector)
+        for tema in temas for lector in lectores[:30]
+    ])
+    LikeComentarioTema.objects.bulk_create([
+        LikeComentarioTema(comentario=comentario, usuario=lector)
+        for comentario in comentarios_tema[::3] for lector in lectores[:10]
+    ])
+
+    actualizar_rollups()
+    for contenido in ARCHIVABLES:
+        recalcular_archivo(contenido)
+
+    return {
+        "lector": lectores[0],
+        "admin": admin,
+        "superusuario": superusuario,
+        "articulo": articulos[0].pk,
+        "noticia": noticias[0].pk,
+        "tema": temas[0].pk,
+        "categoria": categorias[0].pk,
+        "edicion": Ediciones.objects.order_by("pk").values_list("pk", flat=True).first(),
+        "comentario_articulo": comentarios_articulo[0].pk,
+        "comentario_blog": comentarios_blog[0].pk,
+        "comentario_tema": comentarios_tema[0].pk,
+        "id_lector": lectores[0].pk,
+        "ids_articulos": ",".join(str(articulo.pk) for articulo in articulos),
+        "hoy": timezone.localdate().isoformat(),
+        "hace_30_dias": (timezone.localdate() - timedelta(days=30)).isoformat(),
+    }
+
+
+class PresupuestoConsultasMixin:
+    """
+    Mixin para TestCase: siembra los datos una vez por clase y verifica la
+    lista `presupuestos` (instancias de `Presupuesto`).
+    """
+    presupuestos = []
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.datos = sembrar_datos()
+
+    def formatear(self, valor):
+        """Reemplaza los marcadores de `sembrar_datos()` en URLs y cuerpos."""
+        if isinstance(valor, str):
+            return valor.format(**self.datos)
+        if isinstance(valor, dict):
+            return {clave: self.formatear(item) for clave, item in valor.items()}
+        if isinstance(valor, list):
+            return [self.formatear(item) for item in valor]
+        return valor
+
+    def cliente(self, usuario=None):
+        cliente = APIClient()
+        if usuario:
+            cliente.force_authenticate(self.datos[usuario])
+        return cliente
+
+    def assertPresupuesto(self, presupuesto):
+        url = self.formatear(presupuesto.url)
+        cliente = self.cliente(presupuesto.usuario)
+        llamar = getattr(cliente, presupuesto.metodo)
+
+        if presupuesto.metodo == 'get':
+            llamar(url)  # Calentamiento: caches de URLs, serializers, etc.
+
+        inicio = time.perf_counter()
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = llamar(url, self.formatear(presupuesto.datos), format='json')
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+
+        self.assertEqual(
+            respuesta.status_code, presupuesto.estado,
+            f"{presupuesto.metodo.upper()} {url}: {getattr(respuesta, 'data', respuesta.content)!r}"
+        )
+        self.assertLessEqual(
+            len(consultas), presupuesto.consultas,
+            f"{presupuesto.metodo.upper()} {url} hizo {len(consultas)} consultas "
+            f"(presupuesto {presupuesto.consultas}):\n" + "\n".join(q['sql'] for q in consultas.captured_queries)
+        )
+        self.assertLessEqual(
+            duracion_ms, presupuesto.ms * FACTOR_TIEMPO,
+            f"{presupuesto.metodo.upper()} {url} tardó {duracion_ms:.0f} ms (presupuesto {presupuesto.ms} ms)"
+        )
+
+    def test_presupuestos(self):
+        for presupuesto in self.presupuestos:
+            with self.subTest(metodo=presupuesto.metodo, url=presupuesto.url, usuario=presupuesto.usuario):
+                self.assertPresupuesto(presupuesto)
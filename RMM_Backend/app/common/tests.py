@@ -1,3 +1,1414 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+import zoneinfo
+from collections import Counter
+from contextlib import closing
+from datetime import date, datetime, time as time_, timezone as dt_timezone
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db.models import F
+from django.db import connection, connections, transaction
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import permissions
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+
+from app.articles.models import Articulos, ComentarioArticulo, LikeArticulo
+from app.blog.models import Blog
+from app.foro.models import Tema
+from app.magazine.models import Newsletter
+from app.common import archivado
+from app.common.eliminacion import eliminar, purgar_pendientes
+from app.common.cache import Candado, cache_swr, versiones_etiquetas
+from app.common.cdn import ClienteCDNFalso, encolar_purgas, procesar_cola
+from app.common.escritor import ColaEscrituraLlena, EscritorUnico, EscrituraEnCurso, get_escritor
+from app.common.exportacion import exportar, lanzar_exportacion
+from app.common.filters import AccentInsensitiveSearchFilter
+from app.common import respaldo
+from app.common.indices import analizar, capturar_consultas
+from app.common.likes import IndiceLikes, get_indice_likes, usuario_dio_like
+from app.common.middleware import LecturaEscrituraMiddleware
+from app.common.models import (
+    ArchivoMensual, ComentarioArchivado, EliminacionPendiente, MarcaAguaRollup, PurgaCDN, RollupInteraccion,
+)
+from app.common.renderers import ORJSONParser, ORJSONRenderer
+from app.common.rollups import actualizar_rollups
+from app.common.routers import LecturaEscrituraRouter, lecturas_en_replica
+from app.common.sqlite import aplicar_pragmas, pragmas_de
+from app.common.testing import (
+    PRESUPUESTOS, RUTAS_EXCLUIDAS, PresupuestoConsultasMixin, crear_articulo, crear_edicion, crear_usuario,
+    presupuestos_por_ruta, rutas_api,
+)
+from app.common.wordpress import ImportadorWordPress
+from config.settings.base import base_de_lectura
+
+class InteraccionesPresupuestoTests(PresupuestoConsultasMixin, TestCase):
+    presupuestos = PRESUPUESTOS['common']
+
+
+class CoberturaPresupuestosTests(SimpleTestCase):
+    """
+    Cada ruta de /api/v1/ debe tener al menos un presupuesto o figurar en
+    RUTAS_EXCLUIDAS: un endpoint nuevo sin presupuesto hace fallar la suite.
+    """
+
+    def test_todas_las_rutas_tienen_presupuesto(self):
+        faltantes = set(rutas_api()) - set(presupuestos_por_ruta()) - set(RUTAS_EXCLUIDAS)
+        self.assertFalse(faltantes, f"Rutas sin presupuesto de consultas: {sorted(faltantes)}")
+
+
+class ConditionalGetTests(TestCase):
+    """ETag / Last-Modified de `ConditionalGetMixin`."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.articulo = crear_articulo(contenido="<p>Contenido</p>", imagen_principal="a.jpg")
+        cls.lector = crear_usuario()
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_304_sin_serializar(self):
+        for url in ("/api/v1/articles/articulos/", f"/api/v1/articles/articulos/{self.articulo.pk}/"):
+            with self.subTest(url=url):
+                respuesta = self.client.get(url)
+                self.assertIn("ETag", respuesta.headers)
+                self.assertIn("Last-Modified", respuesta.headers)
+
+                with self.assertNumQueries(1):
+                    respuesta = self.client.get(url, HTTP_IF_NONE_MATCH=respuesta.headers["ETag"])
+                self.assertEqual(respuesta.status_code, 304)
+                self.assertEqual(respuesta.content, b"")
+
+    def test_el_listado_filtra_y_cuenta_una_sola_vez(self):
+        buscar = AccentInsensitiveSearchFilter.filter_queryset
+        with mock.patch.object(
+            AccentInsensitiveSearchFilter, "filter_queryset", autospec=True, side_effect=buscar,
+        ) as filtro, CaptureQueriesContext(connections["default"]) as consultas:
+            respuesta = self.client.get("/api/v1/articles/articulos/?search=articulo&page=1")
+        self.assertEqual(respuesta.json()["count"], 1)
+        self.assertEqual(filtro.call_count, 1)
+        # El total sale de la versión: el paginador no hace su propio COUNT(*)
+        self.assertFalse([consulta for consulta in consultas if consulta["sql"].startswith("SELECT COUNT(*)")])
+
+    def test_etag_depende_de_la_url(self):
+        url = f"/api/v1/articles/articulos/{self.articulo.pk}/"
+        self.assertNotEqual(
+            self.client.get(url).headers["ETag"],
+            self.client.get(url + "?fields=id").headers["ETag"],
+        )
+
+    def test_like_cambia_el_etag(self):
+        url = f"/api/v1/articles/articulos/{self.articulo.pk}/"
+        etag = self.client.get(url).headers["ETag"]
+
+        LikeArticulo.objects.create(articulo=self.articulo, usuario=self.lector)
+
+        respuesta = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotEqual(respuesta.headers["ETag"], etag)
+
+
+@override_settings(
+    RESPONSE_CACHE_ENABLED=True,
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'respuestas': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'pruebas'},
+    },
+)
+class AnonymousCacheTests(TestCase):
+    """Caché de respuestas anónimas de `AnonymousCacheMixin`."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.articulo = crear_articulo(contenido="<p>Contenido</p>", imagen_principal="a.jpg")
+        cls.edicion = crear_edicion(contenido="Resumen")
+        cls.lector = crear_usuario()
+
+    def setUp(self):
+        caches['respuestas'].clear()
+        self.client = APIClient()
+
+    def test_hit_sin_consultas_con_query_normalizado(self):
+        respuesta = self.client.get("/api/v1/articles/articulos/?page=1&page_size=3")
+        self.assertEqual(respuesta.headers["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            cacheada = self.client.get("/api/v1/articles/articulos/?page_size=3&page=1")
+        self.assertEqual(cacheada.headers["X-Cache"], "HIT")
+        self.assertEqual(cacheada.content, respuesta.content)
+
+        with self.assertNumQueries(0):
+            no_modificada = self.client.get(
+                "/api/v1/articles/articulos/?page=1&page_size=3", HTTP_IF_NONE_MATCH=respuesta.headers["ETag"]
+            )
+        self.assertEqual(no_modificada.status_code, 304)
+
+    def test_post_save_y_post_delete_invalidan(self):
+        url = "/api/v1/articles/articulos/"
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            like = LikeArticulo.objects.create(articulo=self.articulo, usuario=self.lector)
+        self.assertEqual(self.client.get(url).headers["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(url).headers["X-Cache"], "HIT")
+        with self.captureOnCommitCallbacks(execute=True):
+            like.delete()
+        self.assertEqual(self.client.get(url).headers["X-Cache"], "MISS")
+
+    def test_la_version_cambia_al_confirmar(self):
+        url = "/api/v1/articles/articulos/"
+        self.client.get(url)
+        version = versiones_etiquetas(["articles.LikeArticulo"])
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                LikeArticulo.objects.create(articulo=self.articulo, usuario=self.lector)
+                # Antes del COMMIT una lectura anónima sigue usando (y guardando) la versión anterior
+                self.assertEqual(versiones_etiquetas(["articles.LikeArticulo"]), version)
+                self.assertEqual(self.client.get(url).headers["X-Cache"], "HIT")
+        self.assertNotEqual(versiones_etiquetas(["articles.LikeArticulo"]), version)
+        self.assertEqual(self.client.get(url).headers["X-Cache"], "MISS")
+
+    def test_etiquetas_ajenas_no_invalidan(self):
+        self.client.get("/api/v1/magazine/editions/last/")
+        with self.captureOnCommitCallbacks(execute=True):
+            LikeArticulo.objects.create(articulo=self.articulo, usuario=self.lector)
+        self.assertEqual(self.client.get("/api/v1/magazine/editions/last/").headers["X-Cache"], "HIT")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.edicion.save()
+        self.assertEqual(self.client.get("/api/v1/magazine/editions/last/").headers["X-Cache"], "MISS")
+
+    def test_sin_cache_no_hay_receptores(self):
+        with mock.patch("app.common.cache.invalidar_etiquetas") as invalidar:
+            with self.settings(RESPONSE_CACHE_ENABLED=False, SWR_CACHE_ENABLED=False):
+                self.edicion.save()
+                Newsletter.objects.create(correo_electronico="lector@example.com")
+            invalidar.assert_not_called()
+
+            self.edicion.save()
+            Newsletter.objects.create(correo_electronico="otro@example.com")  # Sin etiqueta: sin receptor
+        invalidar.assert_called_once_with("magazine.Ediciones")
+
+    def test_peticiones_autenticadas_no_usan_cache(self):
+        self.client.force_authenticate(self.lector)
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer token")
+        respuesta = self.client.get("/api/v1/articles/articulos/")
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotIn("X-Cache", respuesta.headers)
+
+
+@override_settings(FRAGMENT_CACHE_ENABLED=True)
+class FragmentCacheTests(TestCase):
+    """Los fragmentos en caché se renuevan cuando cambia el contenido (likes y comentarios incluidos)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.articulo = crear_articulo("Original")
+        cls.lector = crear_usuario()
+
+    def setUp(self):
+        caches["default"].clear()
+        self.client = APIClient()
+
+    def detalle_articulo(self):
+        return self.client.get(f"/api/v1/articles/articulos/{self.articulo.pk}/").json()
+
+    def cambiar_titulo_sin_senales(self, titulo):
+        # update() no toca `actualizado_en`: solo se ve si el fragmento se renovó
+        Articulos.objects.filter(pk=self.articulo.pk).update(titulo_articulo=titulo)
+
+    def test_like_y_comentario_renuevan_el_fragmento(self):
+        self.assertEqual(self.detalle_articulo()["likes_count"], 0)
+        self.cambiar_titulo_sin_senales("Cacheado")
+        self.assertEqual(self.detalle_articulo()["titulo_articulo"], "Original")
+
+        LikeArticulo.objects.create(articulo=self.articulo, usuario=self.lector)
+        detalle = self.detalle_articulo()
+        self.assertEqual((detalle["titulo_articulo"], detalle["likes_count"]), ("Cacheado", 1))
+
+        ComentarioArticulo.objects.create(articulo=self.articulo, autor=self.lector, contenido="Hola")
+        self.assertEqual([comentario["contenido"] for comentario in self.detalle_articulo()["comentarios"]], ["Hola"])
+
+
+
+@override_settings(LIKER_INDEX_ENABLED=True)
+class IndiceLikesTests(TestCase):
+    """Desalojo LRU/TTL del índice de likes y su actualización por señales."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.articulos = [crear_articulo(f"Artículo {numero}") for numero in range(3)]
+        cls.lector = crear_usuario()
+        LikeArticulo.objects.create(articulo=cls.articulos[0], usuario=cls.lector)
+
+    def setUp(self):
+        get_indice_likes().limpiar()
+
+    def consultar(self, indice, articulo, consultas):
+        with self.assertNumQueries(consultas):
+            return indice.usuario_dio_like("articulo", self.lector.pk, [articulo.pk])[articulo.pk]
+
+    def test_desaloja_la_entrada_menos_usada(self):
+        indice = IndiceLikes(max_objetos=2)
+        primero, segundo, tercero = self.articulos
+        self.assertTrue(self.consultar(indice, primero, 1))
+        self.assertFalse(self.consultar(indice, segundo, 1))
+        self.assertTrue(self.consultar(indice, primero, 0))  # Pasa a ser la más reciente
+
+        self.consultar(indice, tercero, 1)
+        self.assertTrue(self.consultar(indice, primero, 0))
+        self.assertFalse(self.consultar(indice, segundo, 1))  # Desalojada
+
+    def test_recarga_las_entradas_vencidas(self):
+        indice = IndiceLikes(ttl=300)
+        articulo = self.articulos[0]
+        with mock.patch("app.common.likes.time.monotonic", return_value=1000):
+            self.consultar(indice, articulo, 1)
+        with mock.patch("app.common.likes.time.monotonic", return_value=1300):
+            self.consultar(indice, articulo, 0)
+        LikeArticulo.objects.filter(articulo=articulo).delete()  # Como si lo quitara otro worker
+        with mock.patch("app.common.likes.time.monotonic", return_value=1301):
+            self.assertFalse(self.consultar(indice, articulo, 1))
+
+    def test_las_senales_parchean_las_entradas_cargadas(self):
+        articulo = self.articulos[1]
+        self.assertEqual(usuario_dio_like("articulo", self.lector, [articulo.pk]), {articulo.pk: False})
+
+        like = LikeArticulo.objects.create(articulo=articulo, usuario=self.lector)
+        with self.assertNumQueries(0):
+            self.assertEqual(usuario_dio_like("articulo", self.lector, [articulo.pk]), {articulo.pk: True})
+
+        like.delete()
+        with self.assertNumQueries(0):
+            self.assertEqual(usuario_dio_like("articulo", self.lector, [articulo.pk]), {articulo.pk: False})
+
+    def test_sin_indice_no_hay_receptores(self):
+        with mock.patch("app.common.likes.registrar_like") as registrar:
+            with self.settings(LIKER_INDEX_ENABLED=False):
+                LikeArticulo.objects.create(articulo=self.articulos[1], usuario=self.lector)
+            registrar.assert_not_called()
+            LikeArticulo.objects.create(articulo=self.articulos[2], usuario=self.lector)
+        registrar.assert_called_once_with("articulo", self.articulos[2].pk, self.lector.pk, True)
+
+    def test_las_senales_ignoran_lo_no_cargado(self):
+        articulo = self.articulos[2]
+        LikeArticulo.objects.create(articulo=articulo, usuario=self.lector)
+        with self.assertNumQueries(1):
+            self.assertEqual(usuario_dio_like("articulo", self.lector, [articulo.pk]), {articulo.pk: True})
+
+
+class LoteReaccionesTests(TestCase):
+    """Semántica del lote de likes/unlikes sin conexión (`aplicar_reacciones`)."""
+
+    url = "/api/v1/interacciones/reacciones/lote/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.articulo = crear_articulo()
+        cls.lector = crear_usuario()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.lector)
+
+    def enviar(self, *operaciones):
+        return self.client.post(self.url, {"operaciones": list(operaciones)}, format="json").json()
+
+    def estados(self, respuesta):
+        return [resultado["status"] for resultado in respuesta["resultados"]]
+
+    def test_gana_la_operacion_mas_reciente_segun_client_ts(self):
+        respuesta = self.enviar(
+            {"type": "articulo", "id": self.articulo.pk, "action": "add", "client_ts": "2025-10-20T10:00:00Z"},
+            {"type": "articulo", "id": self.articulo.pk, "action": "remove", "client_ts": "2025-10-20T09:00:00Z"},
+            {"type": "articulo", "id": self.articulo.pk, "action": "remove"},  # Sin client_ts: anterior
+        )
+        self.assertEqual(self.estados(respuesta), ["applied", "superseded", "superseded"])
+        self.assertEqual(respuesta["likes_count"]["articulo"], {str(self.articulo.pk): 1})
+
+    def test_repetir_el_lote_no_cambia_nada(self):
+        operaciones = [
+            {"type": "articulo", "id": self.articulo.pk, "action": "add"},
+            {"type": "articulo", "id": 999999, "action": "add"},
+        ]
+        self.assertEqual(self.estados(self.enviar(*operaciones)), ["applied", "not_found"])
+        repetido = self.enviar(*operaciones)
+        self.assertEqual(self.estados(repetido), ["noop", "not_found"])
+        self.assertEqual(repetido["likes_count"]["articulo"], {str(self.articulo.pk): 1})
+        self.assertEqual(LikeArticulo.objects.count(), 1)
+
+    def test_quitar_un_like_inexistente_es_noop(self):
+        respuesta = self.enviar({"type": "articulo", "id": self.articulo.pk, "action": "remove"})
+        self.assertEqual(respuesta["resultados"][0]["status"], "noop")
+        self.assertFalse(respuesta["resultados"][0]["liked"])
+
+    def test_like_duplicado_concurrente_se_ignora(self):
+        bulk_create = LikeArticulo.objects.bulk_create
+
+        def con_like_concurrente(objetos, **kwargs):
+            # Otro request crea el mismo like entre la lectura y la inserción
+            LikeArticulo.objects.create(articulo=self.articulo, usuario=self.lector)
+            return bulk_create(objetos, **kwargs)
+
+        with mock.patch.object(LikeArticulo.objects, "bulk_create", side_effect=con_like_concurrente):
+            respuesta = self.enviar({"type": "articulo", "id": self.articulo.pk, "action": "add"})
+
+        self.assertEqual(respuesta["resultados"][0]["status"], "applied")
+        self.assertEqual(LikeArticulo.objects.count(), 1)
+
+    @override_settings(LIKER_INDEX_ENABLED=True)
+    def test_reaplica_lo_que_bulk_create_no_emite(self):
+        indice = get_indice_likes()
+        indice.limpiar()
+        self.assertEqual(usuario_dio_like("articulo", self.lector, [self.articulo.pk]), {self.articulo.pk: False})
+        antes = Articulos.objects.get(pk=self.articulo.pk).actualizado_en
+        version = versiones_etiquetas(["articles.LikeArticulo"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enviar({"type": "articulo", "id": self.articulo.pk, "action": "add"})
+
+        with self.assertNumQueries(0):
+            self.assertEqual(usuario_dio_like("articulo", self.lector, [self.articulo.pk]), {self.articulo.pk: True})
+        self.assertGreater(Articulos.objects.get(pk=self.articulo.pk).actualizado_en, antes)
+        self.assertNotEqual(versiones_etiquetas(["articles.LikeArticulo"]), version)
+        indice.limpiar()
+
+
+class RollupInteraccionesTests(TestCase):
+    """Marca de agua, idempotencia y totales de `actualizar_rollups`."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.articulo = crear_articulo()
+        cls.otro = crear_articulo("Otro", fecha_publicacion="2025-01-02")
+        cls.lectores = [
+            crear_usuario(f"lector{numero}")
+            for numero in range(3)
+        ]
+        # Dos eventos en la misma hora, otra hora del mismo día y el día siguiente (hora local)
+        cls.momentos = [
+            timezone.make_aware(datetime(2025, 10, 20, 9, 15)),
+            timezone.make_aware(datetime(2025, 10, 20, 9, 45)),
+            timezone.make_aware(datetime(2025, 10, 20, 23, 30)),
+            timezone.make_aware(datetime(2025, 10, 21, 0, 10)),
+        ]
+
+    def comentar(self, articulo, momento):
+        comentario = ComentarioArticulo.objects.create(articulo=articulo, autor=self.lectores[0], contenido="Hola")
+        ComentarioArticulo.objects.filter(pk=comentario.pk).update(creado_en=momento)
+
+    def dar_like(self, articulo, usuario, momento):
+        like = LikeArticulo.objects.create(articulo=articulo, usuario=usuario)
+        LikeArticulo.objects.filter(pk=like.pk).update(creado_en=momento)
+
+    def buckets(self, metrica, granularidad):
+        return {
+            (objeto_id, inicio): total
+            for objeto_id, inicio, total in RollupInteraccion.objects.filter(
+                tipo_contenido="articulo", metrica=metrica, granularidad=granularidad,
+            ).values_list("objeto_id", "inicio", "total")
+        }
+
+    def esperados(self, Modelo, granularidad):
+        """Los buckets recalculados en Python desde la tabla de eventos."""
+        totales = Counter()
+        for objeto_id, creado_en in Modelo.objects.values_list("articulo_id", "creado_en"):
+            inicio = timezone.localtime(creado_en).replace(minute=0, second=0, microsecond=0)
+            if granularidad == RollupInteraccion.Granularidad.DIA:
+                inicio = inicio.replace(hour=0)
+            totales[objeto_id, inicio] += 1
+        return dict(totales)
+
+    def assertCoincideConLasTablas(self):
+        for Modelo, metrica in (
+            (LikeArticulo, RollupInteraccion.Metrica.LIKES),
+            (ComentarioArticulo, RollupInteraccion.Metrica.COMENTARIOS),
+        ):
+            for granularidad in RollupInteraccion.Granularidad:
+                with self.subTest(metrica=metrica, granularidad=granularidad):
+                    self.assertEqual(self.buckets(metrica, granularidad), self.esperados(Modelo, granularidad))
+
+    def test_totales_marca_de_agua_e_idempotencia(self):
+        for momento in self.momentos:
+            self.comentar(self.articulo, momento)
+        self.comentar(self.otro, self.momentos[0])
+        for usuario, momento in zip(self.lectores, self.momentos):
+            self.dar_like(self.articulo, usuario, momento)
+
+        # Lotes de 2 filas: los buckets de una misma hora se completan entre lotes
+        procesadas = actualizar_rollups(tamano_lote=2)
+        self.assertEqual(procesadas["articles.ComentarioArticulo"], 5)
+        self.assertEqual(procesadas["articles.LikeArticulo"], 3)
+        self.assertCoincideConLasTablas()
+        self.assertEqual(
+            self.buckets(RollupInteraccion.Metrica.COMENTARIOS, RollupInteraccion.Granularidad.DIA)[
+                self.articulo.pk, timezone.localtime(self.momentos[0]).replace(hour=0, minute=0)
+            ],
+            3,
+        )
+        marca = MarcaAguaRollup.objects.get(fuente="articles.ComentarioArticulo")
+        self.assertEqual(marca.ultimo_id, ComentarioArticulo.objects.latest("pk").pk)
+
+        # Sin filas nuevas no se suma nada
+        procesadas = actualizar_rollups()
+        self.assertEqual(set(procesadas.values()), {0})
+        self.assertCoincideConLasTablas()
+
+        # Solo las filas posteriores a la marca de agua
+        self.comentar(self.articulo, self.momentos[3])
+        self.assertEqual(actualizar_rollups()["articles.ComentarioArticulo"], 1)
+        self.assertCoincideConLasTablas()
+        self.assertEqual(
+            MarcaAguaRollup.objects.get(fuente="articles.ComentarioArticulo").ultimo_id,
+            ComentarioArticulo.objects.latest("pk").pk,
+        )
+
+    def test_un_like_quitado_sigue_contando(self):
+        self.dar_like(self.articulo, self.lectores[0], self.momentos[0])
+        actualizar_rollups()
+        LikeArticulo.objects.all().delete()
+        self.assertEqual(actualizar_rollups()["articles.LikeArticulo"], 0)
+        self.assertEqual(
+            sum(self.buckets(RollupInteraccion.Metrica.LIKES, RollupInteraccion.Granularidad.HORA).values()), 1,
+        )
+
+
+class VistaCostosa(APIView):
+    """Vista de prueba para `cache_swr`: cuenta sus cálculos."""
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    calculos = 0
+    demora = 0
+    ultimo_calculo = None  # (vista, petición)
+
+    @cache_swr(fresco=60, obsoleto=600)
+    def get(self, request):
+        type(self).calculos += 1
+        type(self).ultimo_calculo = (self, request)
+        time.sleep(self.demora)
+        return Response({"calculo": self.calculos})
+
+
+class ArchivoFechasTests(TestCase):
+    """Tabla de resumen del archivo por fechas y filtro ?year=&month=."""
+
+    def crear(self, fecha):
+        return crear_articulo(contenido="<p>Contenido</p>", fecha_publicacion=fecha)
+
+    def meses(self):
+        return list(ArchivoMensual.objects.filter(contenido="articles.Articulos")
+                    .order_by("anio", "mes").values_list("anio", "mes", "total"))
+
+    def test_senales_mantienen_los_buckets(self):
+        primero = self.crear("2025-10-03")
+        self.crear("2025-10-20")
+        self.crear("2024-12-31")
+        self.assertEqual(self.meses(), [(2024, 12, 1), (2025, 10, 2)])
+
+        primero.fecha_publicacion = "2025-11-01"
+        primero.save()
+        self.assertEqual(self.meses(), [(2024, 12, 1), (2025, 10, 1), (2025, 11, 1)])
+
+        primero.delete()
+        self.assertEqual(self.meses(), [(2024, 12, 1), (2025, 10, 1)])
+
+        respuesta = APIClient().get("/api/v1/articles/articulos/archivo/")
+        self.assertEqual(respuesta.data, [
+            {"anio": 2025, "total": 1, "meses": [{"mes": 10, "nombre": "octubre", "total": 1}]},
+            {"anio": 2024, "total": 1, "meses": [{"mes": 12, "nombre": "diciembre", "total": 1}]},
+        ])
+
+    def test_filtro_por_anio_y_mes(self):
+        octubre = self.crear("2025-10-31")
+        self.crear("2025-11-01")
+        self.crear("2024-10-15")
+        client = APIClient()
+
+        respuesta = client.get("/api/v1/articles/articulos/?year=2025&month=10&fields=id")
+        self.assertEqual([item["id"] for item in respuesta.data["results"]], [octubre.pk])
+        self.assertEqual(client.get("/api/v1/articles/articulos/?year=2025").data["count"], 2)
+        self.assertEqual(client.get("/api/v1/articles/articulos/?month=10").status_code, 400)
+        self.assertEqual(client.get("/api/v1/articles/articulos/?year=2025&month=13").status_code, 400)
+
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """`ORJSONRenderer`/`ORJSONParser` producen lo mismo que los de DRF."""
+
+    def setUp(self):
+        self.rapido = ORJSONRenderer()
+        self.estandar = JSONRenderer()
+
+    def assertMismaSalida(self, datos):
+        self.assertEqual(self.rapido.render(datos), self.estandar.render(datos))
+
+    def test_fechas_y_horas(self):
+        lima = zoneinfo.ZoneInfo("America/Lima")
+        self.assertMismaSalida({
+            "utc": datetime(2025, 10, 20, 9, 15, 30, tzinfo=dt_timezone.utc),
+            "micro": datetime(2025, 10, 20, 9, 15, 30, 123456, tzinfo=dt_timezone.utc),
+            "lima": datetime(2025, 10, 20, 9, 15, 30, 500000, tzinfo=lima),
+            "naive": datetime(2025, 10, 20, 9, 15, 30, 999),
+            "fecha": date(2025, 10, 20),
+            "hora": time_(9, 15, 30, 250000),
+        })
+
+    def test_decimal_uuid_y_textos_perezosos(self):
+        self.assertMismaSalida({
+            "precio": Decimal("10.50"),
+            "entero": Decimal("3"),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "perezoso": gettext_lazy("Lector"),
+            "lista": [Decimal("0.1"), gettext_lazy("Día")],
+            1: "clave numérica",
+            "unicode": "Ñandú \u2028 \u2029 😀",  # DRF escapa los separadores de línea de JavaScript
+        })
+
+    def test_archivos_como_url(self):
+        articulo = Articulos(imagen_principal="RMM/a b.jpg")
+        self.assertEqual(
+            self.rapido.render({"imagen": articulo.imagen_principal, "banner": articulo.banner}),
+            self.estandar.render({"imagen": articulo.imagen_principal.url, "banner": None}),
+        )
+        request = RequestFactory().get("/")
+        self.assertEqual(
+            self.rapido.render({"imagen": articulo.imagen_principal}, renderer_context={"request": request}),
+            self.estandar.render({"imagen": request.build_absolute_uri(articulo.imagen_principal.url)}),
+        )
+
+    def test_con_sangria_usa_el_renderer_estandar(self):
+        datos = {"titulo": "Artículo", "precio": Decimal("1.5")}
+        contexto = {"indent": 4}
+        self.assertEqual(
+            self.rapido.render(datos, "application/json", contexto),
+            self.estandar.render(datos, "application/json", contexto),
+        )
+
+    def test_parser(self):
+        cuerpo = '{"titulo": "Ñandú", "ids": [1, 2.5, null, true], "anidado": {"a": "\\u2028"}}'.encode()
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(cuerpo)),
+            JSONParser().parse(io.BytesIO(cuerpo)),
+        )
+        for parser in (ORJSONParser(), JSONParser()):
+            with self.subTest(parser=type(parser).__name__), self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(b'{"titulo": '))
+
+
+class PragmasSQLiteTests(SimpleTestCase):
+    """PRAGMA aplicados a cada conexión SQLite (app/common/sqlite.py)."""
+
+    def test_aplica_pragmas_y_rechaza_valores_invalidos(self):
+        ruta = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), "db.sqlite3")
+        conexion = self.enterContext(closing(sqlite3.connect(ruta)))
+        aplicar_pragmas(conexion, {"busy_timeout": 2500, "synchronous": "normal", "journal_mode": "wal"})
+
+        self.assertEqual(conexion.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(conexion.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+        self.assertEqual(conexion.execute("PRAGMA busy_timeout").fetchone()[0], 2500)
+        with self.assertRaises(ValueError):
+            aplicar_pragmas(conexion, {"cache_size": "1; DROP TABLE x"})
+
+    @override_settings(SQLITE_PRAGMAS={"busy_timeout": 5000, "mmap_size": 1024})
+    def test_pragmas_por_base(self):
+        self.assertEqual(pragmas_de({"PRAGMAS": {"mmap_size": 0}}), {"busy_timeout": 5000, "mmap_size": 0})
+
+    def test_transacciones_immediate_salvo_en_la_replica(self):
+        principal = connections["default"].settings_dict
+        self.assertEqual(principal["OPTIONS"]["transaction_mode"], settings.SQLITE_TRANSACTION_MODE)
+        self.assertEqual(settings.SQLITE_TRANSACTION_MODE, "IMMEDIATE")
+        self.assertEqual(base_de_lectura(principal)["OPTIONS"]["transaction_mode"], "DEFERRED")
+
+
+@mock.patch("app.common.routers.replica_disponible", return_value=True)
+class LecturaEscrituraRouterTests(SimpleTestCase):
+    """Enrutamiento de lecturas a la réplica y read-after-write."""
+
+    def setUp(self):
+        self.router = LecturaEscrituraRouter()
+
+    def test_fuera_de_una_peticion_todo_va_a_la_principal(self, _):
+        self.assertEqual(self.router.db_for_read(Articulos), "default")
+
+    def test_lecturas_a_la_replica_hasta_la_primera_escritura(self, _):
+        with lecturas_en_replica():
+            self.assertEqual(self.router.db_for_read(Articulos), "lectura")
+            self.assertEqual(self.router.db_for_write(LikeArticulo), "default")
+            self.assertEqual(self.router.db_for_read(Articulos), "default")
+        self.assertFalse(self.router.allow_migrate("lectura", "articles"))
+
+    def test_dentro_de_una_transaccion_lee_la_principal(self, _):
+        with lecturas_en_replica(), mock.patch.object(connections["default"], "in_atomic_block", True):
+            self.assertEqual(self.router.db_for_read(Articulos), "default")
+
+    @override_settings(READ_REPLICA_ENABLED=True)
+    def test_middleware_solo_marca_lecturas_de_la_api(self, _):
+        destinos = []
+        middleware = LecturaEscrituraMiddleware(
+            lambda request: destinos.append(self.router.db_for_read(Articulos))
+        )
+        fabrica = RequestFactory()
+        middleware(fabrica.get("/api/v1/articles/articulos/"))
+        middleware(fabrica.post("/api/v1/articles/articulos/"))
+        middleware(fabrica.get("/admin/"))
+        self.assertEqual(destinos, ["lectura", "default", "default"])
+
+
+
+class EscritorUnicoTests(TransactionTestCase):
+    """Cola de escrituras: lotes, errores aislados y contrapresión (fuera de una transacción)."""
+
+    def bloquear(self, escritor):
+        """Ocupa el hilo escritor hasta que se libere el evento devuelto."""
+        empezo, liberar = threading.Event(), threading.Event()
+
+        def trabajo():
+            empezo.set()
+            liberar.wait(5)
+
+        def ocupar():
+            try:
+                escritor.ejecutar(trabajo)
+            except EscrituraEnCurso:
+                pass  # Con una espera_resultado corta vence el propio bloqueo
+
+        hilo = threading.Thread(target=ocupar)
+        hilo.start()
+        empezo.wait(5)
+        return liberar, hilo
+
+    def test_agrupa_escrituras_concurrentes_en_lotes(self):
+        escritor = EscritorUnico(tamano_lote=50)
+        liberar, bloqueo = self.bloquear(escritor)
+        errores = []
+
+        def crear(indice):
+            try:
+                escritor.ejecutar(lambda: Newsletter.objects.create(correo_electronico=f"lector{indice}@rmm.pe"))
+            except Exception as excepcion:
+                errores.append(excepcion)
+
+        hilos = [threading.Thread(target=crear, args=(indice,)) for indice in range(20)]
+        for hilo in hilos:
+            hilo.start()
+        while escritor.cola.qsize() < 20:
+            time.sleep(0.01)
+        liberar.set()
+        for hilo in [bloqueo, *hilos]:
+            hilo.join(5)
+
+        self.assertEqual(errores, [])
+        self.assertEqual(Newsletter.objects.count(), 20)
+        self.assertEqual(escritor.trabajos, 21)
+        self.assertEqual(escritor.lotes, 2)
+
+    def test_un_error_no_revierte_el_resto_del_lote(self):
+        escritor = EscritorUnico()
+
+        def fallar():
+            Newsletter.objects.create(correo_electronico="revertido@rmm.pe")
+            raise ValueError("falla")
+
+        with self.assertRaises(ValueError):
+            escritor.ejecutar(fallar)
+        creado = escritor.ejecutar(lambda: Newsletter.objects.create(correo_electronico="ok@rmm.pe"))
+
+        self.assertEqual(list(Newsletter.objects.values_list("pk", flat=True)), [creado.pk])
+
+    def test_cola_llena_responde_503(self):
+        escritor = EscritorUnico(max_cola=1, espera_encolar=0.05)
+        liberar, bloqueo = self.bloquear(escritor)
+        en_cola = threading.Thread(target=escritor.ejecutar, args=(lambda: None,))
+        en_cola.start()
+        while escritor.cola.qsize() < 1:
+            time.sleep(0.01)
+
+        with self.assertRaises(ColaEscrituraLlena) as contexto:
+            escritor.ejecutar(lambda: None)
+        self.assertEqual(contexto.exception.status_code, 503)
+        self.assertEqual(escritor.rechazados, 1)
+
+        liberar.set()
+        bloqueo.join(5)
+        en_cola.join(5)
+
+    def test_espera_vencida_cancela_o_no_invita_a_reintentar(self):
+        escritor = EscritorUnico(espera_resultado=0.05)
+        liberar, bloqueo = self.bloquear(escritor)
+        with self.assertRaises(ColaEscrituraLlena):
+            escritor.ejecutar(lambda: Newsletter.objects.create(correo_electronico="cancelado@rmm.pe"))
+        liberar.set()
+        bloqueo.join(5)
+
+        def lenta():
+            time.sleep(0.2)
+            return Newsletter.objects.create(correo_electronico="lento@rmm.pe")
+
+        with self.assertRaises(EscrituraEnCurso) as contexto:
+            escritor.ejecutar(lenta)
+        self.assertEqual(contexto.exception.status_code, 202)
+        escritor.espera_resultado = 5
+        escritor.ejecutar(lambda: None, agrupable=False)  # Espera a que termine la lenta
+
+        self.assertEqual(list(Newsletter.objects.values_list("correo_electronico", flat=True)), ["lento@rmm.pe"])
+
+    @override_settings(WRITE_QUEUE_ENABLED=True)
+    def test_vistas_escriben_por_la_cola(self):
+        trabajos = get_escritor().trabajos
+        respuesta = APIClient().post(
+            "/api/v1/magazine/newsletters/", {"correo_electronico": "cola@rmm.pe"}, format="json"
+        )
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertTrue(Newsletter.objects.filter(correo_electronico="cola@rmm.pe").exists())
+        self.assertEqual(get_escritor().trabajos, trabajos + 1)
+
+
+class AsesorIndicesTests(TestCase):
+    """Hallazgos de EXPLAIN QUERY PLAN y los índices propuestos."""
+
+    def hallazgos(self, queryset):
+        consultas = []
+        with capturar_consultas(consultas):
+            list(queryset)
+        return [hallazgo for consulta in consultas for hallazgo in analizar(consulta)]
+
+    def test_recorrido_completo_propone_indice(self):
+        hallazgos = self.hallazgos(Newsletter.objects.filter(correo_electronico="a@rmm.pe"))
+        self.assertEqual([hallazgo.tipo for hallazgo in hallazgos], ["scan"])
+        self.assertEqual(hallazgos[0].sugerencia, ("magazine.Newsletter", ("correo_electronico",)))
+
+    def test_consulta_cubierta_por_indice_compuesto(self):
+        self.assertEqual(self.hallazgos(Tema.objects.filter(categoria_foro=1).order_by("-creado_en")), [])
+
+    def test_indice_parcial_de_los_visibles(self):
+        # VisiblesManager agrega eliminado_en IS NULL: lo cubre la condición del índice parcial
+        self.assertEqual(self.hallazgos(Articulos.objects.order_by("-fecha_publicacion", "-id")[:5]), [])
+        hallazgos = self.hallazgos(Articulos.todos.order_by("-fecha_publicacion", "-id")[:5])
+        self.assertEqual(hallazgos[0].sugerencia, ("articles.Articulos", ("fecha_publicacion",)))
+
+class KeysetPaginationTests(TestCase):
+    """Modo cursor de `KeysetPagination` (empates y fechas nulas incluidos)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        fechas = ["2025-01-03", "2025-01-02", "2025-01-02", "2025-01-02", None, None, "2025-01-01"]
+        Articulos.objects.bulk_create([
+            Articulos(titulo_articulo=f"Artículo {i}", contenido="<p>Contenido</p>", fecha_publicacion=fecha)
+            for i, fecha in enumerate(fechas)
+        ])
+
+    def test_recorre_el_feed_sin_repetir_ni_saltar(self):
+        client = APIClient()
+        url = "/api/v1/articles/articulos/?pagination=cursor&page_size=2&fields=id"
+        vistos = []
+        while url:
+            respuesta = client.get(url)
+            self.assertEqual(respuesta.status_code, 200)
+            self.assertNotIn("count", respuesta.data)
+            vistos.extend(item["id"] for item in respuesta.data["results"])
+            url = respuesta.data["next"]
+
+        esperados = list(
+            Articulos.objects.order_by(F("fecha_publicacion").desc(nulls_last=True), "-pk")
+            .values_list("pk", flat=True)
+        )
+        self.assertEqual(vistos, esperados)
+
+    def test_total_opcional_y_cursor_invalido(self):
+        client = APIClient()
+        respuesta = client.get("/api/v1/articles/articulos/?pagination=cursor&with_count=true")
+        self.assertEqual(respuesta.data["count"], 7)
+        self.assertEqual(client.get("/api/v1/articles/articulos/?cursor=no-es-un-cursor").status_code, 404)
+
+    def test_la_pagina_siguiente_busca_por_rango_en_el_indice(self):
+        client = APIClient()
+        primera = client.get("/api/v1/articles/articulos/?pagination=cursor&page_size=2&fields=id")
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertEqual(client.get(primera.data["next"]).status_code, 200)
+        pagina = next(
+            c["sql"] for c in consultas.captured_queries
+            if c["sql"].startswith("SELECT") and '"fecha_publicacion" <' in c["sql"]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {pagina}")
+            plan = " ".join(str(fila[-1]) for fila in cursor.fetchall())
+        self.assertIn("SEARCH", plan)
+        self.assertIn("(fecha_publicacion<?)", plan)
+        self.assertNotIn("MULTI-INDEX OR", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+@override_settings(
+    SWR_CACHE_ENABLED=True,
+    SWR_CACHE_BACKGROUND=False,
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'respuestas': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'swr'},
+    },
+)
+class StaleWhileRevalidateTests(SimpleTestCase):
+    """Decorador `cache_swr`: entradas obsoletas y single-flight."""
+
+    def setUp(self):
+        caches['respuestas'].clear()
+        VistaCostosa.calculos = 0
+        VistaCostosa.demora = 0
+        self.vista = VistaCostosa.as_view()
+        self.fabrica = APIRequestFactory()
+        self.enterContext(override_settings(SWR_LOCK_DIR=self.enterContext(tempfile.TemporaryDirectory())))
+
+    def pedir(self):
+        return self.vista(self.fabrica.get("/costosa/?b=2&a=1"))
+
+    def test_miss_y_hit(self):
+        self.assertEqual(self.pedir().headers["X-Cache"], "MISS")
+        respuesta = self.pedir()
+        self.assertEqual(respuesta.headers["X-Cache"], "HIT")
+        self.assertEqual(respuesta.data, {"calculo": 1})
+        self.assertEqual(VistaCostosa.calculos, 1)
+
+    def test_entrada_obsoleta_se_sirve_y_se_recalcula(self):
+        self.pedir()
+        with mock.patch("app.common.cache.time.time", return_value=time.time() + 120):
+            obsoleta = self.pedir()
+        self.assertEqual(obsoleta.headers["X-Cache"], "STALE")
+        self.assertEqual(obsoleta.data, {"calculo": 1})
+        self.assertEqual(VistaCostosa.calculos, 2)
+        self.assertEqual(self.pedir().data, {"calculo": 2})
+
+    def test_un_solo_recalculo_por_entrada_obsoleta(self):
+        self.pedir()
+        # Otro worker ya tiene el candado: se sirve la entrada sin recalcular
+        with mock.patch("app.common.cache.time.time", return_value=time.time() + 120), \
+                mock.patch.object(Candado, "adquirir", return_value=False):
+            self.assertEqual(self.pedir().headers["X-Cache"], "STALE")
+        self.assertEqual(VistaCostosa.calculos, 1)
+
+    def test_misses_concurrentes_se_agrupan(self):
+        VistaCostosa.demora = 0.3
+        estados = []
+        hilos = [threading.Thread(target=lambda: estados.append(self.pedir().headers["X-Cache"])) for _ in range(5)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(VistaCostosa.calculos, 1)
+        self.assertEqual(sorted(estados), ["HIT"] * 4 + ["MISS"])
+
+    @override_settings(SWR_CACHE_BACKGROUND=True)
+    def test_el_recalculo_en_segundo_plano_usa_su_propia_vista(self):
+        self.pedir()
+        with mock.patch("app.common.cache.time.time", return_value=time.time() + 120), \
+                mock.patch("app.common.cache.threading.Thread") as Hilo:
+            obsoleta = self.pedir()
+        self.assertEqual(obsoleta.headers["X-Cache"], "STALE")
+
+        # El hilo corre después de enviar la respuesta, con otra vista y otra petición
+        Hilo.call_args.kwargs["target"]()
+        vista, peticion = VistaCostosa.ultimo_calculo
+        self.assertIsNot(vista, obsoleta.renderer_context["view"])
+        self.assertIsNot(peticion, obsoleta.renderer_context["request"])
+        self.assertIsNot(peticion._request, obsoleta.renderer_context["request"]._request)
+        self.assertIs(vista.request, peticion)
+        self.assertEqual(peticion.query_params.dict(), {"a": "1", "b": "2"})
+        self.assertEqual(self.pedir().data, {"calculo": 2})
+
+
+@override_settings(
+    CDN_CACHE_HEADERS_ENABLED=True,
+    CDN_PURGE_ENABLED=True,
+    CDN_CLIENT='app.common.cdn.ClienteCDNFalso',
+)
+class CDNTests(TestCase):
+    """Cabeceras de CDN (`CDNCacheMixin`) y cola de purgas por etiqueta."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.articulo = crear_articulo(contenido="<p>Contenido</p>", imagen_principal="a.jpg")
+        cls.lector = crear_usuario()
+
+    def setUp(self):
+        ClienteCDNFalso.limpiar()
+        self.client = APIClient()
+
+    def test_cabeceras_por_politica(self):
+        listado = self.client.get("/api/v1/articles/articulos/")
+        self.assertIn("s-maxage=300", listado.headers["Cache-Control"])
+        self.assertEqual(listado.headers["CDN-Tag"], f"articulos,articulo-{self.articulo.pk}")
+
+        detalle = self.client.get(f"/api/v1/articles/articulos/{self.articulo.pk}/")
+        self.assertIn("s-maxage=86400", detalle.headers["Cache-Control"])
+        self.assertEqual(detalle.headers["CDN-Tag"], f"articulo-{self.articulo.pk}")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer token")
+        self.client.force_authenticate(self.lector)
+        privada = self.client.get("/api/v1/articles/articulos/")
+        self.assertEqual(privada.headers["Cache-Control"], "private, no-store")
+        self.assertNotIn("CDN-Tag", privada.headers)
+
+    def test_cambios_encolan_etiquetas_sin_duplicados(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            LikeArticulo.objects.create(articulo=self.articulo, usuario=self.lector)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.articulo.save()
+
+        pendientes = PurgaCDN.objects.filter(procesado_en__isnull=True)
+        self.assertCountEqual(
+            pendientes.values_list("etiqueta", flat=True), ["articulos", f"articulo-{self.articulo.pk}"]
+        )
+
+        call_command("procesar_purgas_cdn", stdout=open(os.devnull, "w"))
+        self.assertCountEqual(ClienteCDNFalso.purgadas, ["articulos", f"articulo-{self.articulo.pk}"])
+        self.assertFalse(pendientes.exists())
+
+    def test_purga_abandonada_no_bloquea_la_etiqueta(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            encolar_purgas(["articulos"])
+        with mock.patch.object(ClienteCDNFalso, "purgar_etiquetas", side_effect=RuntimeError("CDN caído")), \
+                self.assertLogs("app.common.cdn", "ERROR"):
+            for _ in range(5):
+                procesar_cola()
+        abandonada = PurgaCDN.objects.get()
+        self.assertEqual(abandonada.intentos, 5)
+        self.assertIsNotNone(abandonada.procesado_en)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            encolar_purgas(["articulos"])
+        self.assertEqual(procesar_cola(), 1)
+        self.assertEqual(ClienteCDNFalso.purgadas, ["articulos"])
+
+
+@override_settings(STATIC_EXPORT_BASE_URL="http://testserver")
+class ExportacionJSONTests(TestCase):
+    """Exportación incremental a JSON estático."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.articulos = [
+            crear_articulo(f"Artículo {i}", contenido="<p>Contenido</p>", imagen_principal="a.jpg")
+            for i in range(8)
+        ]
+        cls.lector = crear_usuario()
+
+    def setUp(self):
+        self.destino = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.raiz = self.destino / "api/v1/articles/articulos"
+
+    def test_exporta_listados_detalles_y_comprimidos(self):
+        exportar(modelos=["articles.Articulos"], destino=self.destino)
+
+        articulo = self.articulos[0]
+        detalle = self.raiz / str(articulo.pk) / "index.json"
+        self.assertEqual(detalle.read_bytes(), self.client.get(f"/api/v1/articles/articulos/{articulo.pk}/").content)
+        self.assertEqual(gzip.decompress((self.raiz / "index.json.gz").read_bytes()), (self.raiz / "index.json").read_bytes())
+        self.assertTrue((self.raiz / "page-2.json").exists())  # 6 artículos por página
+
+    def test_solo_regenera_lo_que_cambio(self):
+        exportar(modelos=["articles.Articulos"], destino=self.destino)
+        self.assertEqual(exportar(modelos=["articles.Articulos"], destino=self.destino).renderizados, 0)
+
+        LikeArticulo.objects.create(articulo=self.articulos[0], usuario=self.lector)
+        resumen = exportar(modelos=["articles.Articulos"], destino=self.destino)
+        self.assertEqual(resumen.renderizados, 3)  # El detalle y las dos páginas del listado
+
+        eliminado = self.articulos[1].pk
+        Articulos.objects.filter(pk__in=[eliminado, self.articulos[2].pk]).delete()
+        exportar(modelos=["articles.Articulos"], destino=self.destino)
+        self.assertFalse((self.raiz / str(eliminado)).exists())
+        self.assertFalse((self.raiz / "page-2.json").exists())  # Quedan 6: una sola página
+
+    @override_settings(STATIC_EXPORT_ON_PUBLISH=True)
+    def test_publicar_exporta_una_vez_por_transaccion(self):
+        with self.captureOnCommitCallbacks() as pendientes:
+            # La exportación registrada en un savepoint revertido se descarta con él
+            try:
+                with transaction.atomic():
+                    self.articulos[0].save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            for articulo in self.articulos[1:5]:
+                articulo.save()
+            self.articulos[5].delete()
+        self.assertEqual([funcion for funcion in pendientes if funcion is lanzar_exportacion], [lanzar_exportacion])
+
+    def test_la_exportacion_corre_en_segundo_plano_y_se_repite(self):
+        liberar = threading.Event()
+        with mock.patch("app.common.exportacion.exportar", side_effect=lambda: liberar.wait(5)) as exportar_:
+            hilo = lanzar_exportacion()
+            self.assertIsNot(hilo, threading.current_thread())
+            self.assertIs(lanzar_exportacion(), hilo)  # En marcha: se repite al terminar
+            self.assertIs(lanzar_exportacion(), hilo)
+            liberar.set()
+            hilo.join(5)
+        self.assertFalse(hilo.is_alive())
+        self.assertEqual(exportar_.call_count, 2)
+
+
+class RespaldoJSONLTests(TestCase):
+    """Exportación e importación de contenido en JSONL con traducción de ids y checkpoint."""
+
+    def setUp(self):
+        self.lector = crear_usuario()
+        self.articulos = [
+            crear_articulo(f"Artículo {i}", "2025-01-0%d" % (i + 1), contenido="<p>Contenido</p>")
+            for i in range(3)
+        ]
+        noticia = Blog.objects.create(titulo_blog="Noticia", contenido="<p>Noticia</p>")
+        noticia.articulos.set(self.articulos[:2])
+        raiz = ComentarioArticulo.objects.create(articulo=self.articulos[0], autor=self.lector, contenido="Raíz")
+        ComentarioArticulo.objects.create(articulo=self.articulos[0], autor=self.lector, contenido="Respuesta",
+                                          parent=raiz)
+        LikeArticulo.objects.create(articulo=self.articulos[0], usuario=self.lector)
+        self.creado_en = raiz.creado_en
+
+        self.archivo = io.StringIO()
+        respaldo.exportar(self.archivo)
+        Articulos.objects.all().delete()
+        Blog.objects.all().delete()
+
+    def lineas(self):
+        return io.StringIO(self.archivo.getvalue())
+
+    def test_importa_con_ids_y_relaciones_traducidas(self):
+        importador = respaldo.Importador(tamano_lote=2).importar(self.lineas())
+
+        self.assertEqual(importador.creados["articles.Articulos"], 3)
+        respuesta = ComentarioArticulo.objects.get(contenido="Respuesta")
+        self.assertEqual(respuesta.parent.contenido, "Raíz")
+        self.assertEqual(respuesta.parent.creado_en, self.creado_en)
+        self.assertEqual(respuesta.articulo.titulo_articulo, "Artículo 0")
+        self.assertEqual(
+            sorted(Blog.objects.get().articulos.values_list("titulo_articulo", flat=True)),
+            ["Artículo 0", "Artículo 1"],
+        )
+        self.assertTrue(LikeArticulo.objects.filter(usuario=self.lector, articulo=respuesta.articulo).exists())
+        self.assertEqual(ArchivoMensual.objects.get(contenido="articles.Articulos").total, 3)
+
+    def test_omite_duplicados_sin_contar_la_tabla(self):
+        crear_edicion(7)
+        articulo = crear_articulo("Con like")
+        LikeArticulo.objects.create(articulo=articulo, usuario=self.lector)
+        archivo = io.StringIO()
+        respaldo.exportar(archivo, ["magazine.Ediciones", "articles.Articulos", "articles.LikeArticulo"])
+        like = next(linea for linea in archivo.getvalue().splitlines() if '"articles.LikeArticulo"' in linea)
+        repetido = json.loads(like)
+        repetido["pk"] += 1000
+        Articulos.objects.all().delete()
+
+        with CaptureQueriesContext(connections["default"]) as consultas:
+            importador = respaldo.Importador().importar(io.StringIO(archivo.getvalue() + json.dumps(repetido) + "\n"))
+
+        self.assertEqual(importador.creados["magazine.Ediciones"], 0)  # Ya existía
+        self.assertEqual(importador.creados["articles.LikeArticulo"], 1)  # Repetido en el lote
+        self.assertEqual(LikeArticulo.objects.count(), 1)
+        self.assertFalse([consulta for consulta in consultas if consulta["sql"].startswith("SELECT COUNT(*)")])
+
+    def test_continua_desde_el_checkpoint(self):
+        checkpoint = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), "importacion.checkpoint")
+        confirmar = respaldo.Importador.confirmar
+        lotes = []
+
+        def interrumpir(importador, modelo, lote):
+            if len(lotes) == 2:
+                raise RuntimeError("Interrumpido")
+            lotes.append(modelo)
+            confirmar(importador, modelo, lote)
+
+        with mock.patch.object(respaldo.Importador, "confirmar", interrumpir), self.assertRaises(RuntimeError):
+            respaldo.Importador(tamano_lote=2, checkpoint=checkpoint).importar(self.lineas())
+        self.assertEqual(Articulos.objects.count(), 3)
+
+        # El checkpoint sólo guarda la línea y el largo del registro; los ids van en el registro
+        with open(checkpoint, encoding="utf-8") as archivo:
+            estado = json.load(archivo)
+        with open(respaldo.archivo_mapa(checkpoint), "ab") as registro:
+            self.assertEqual(registro.tell(), estado["mapa"])
+            registro.write(b'{"modelo": "articles.Articulos", "pks": {"999": 1}}\n')  # Lote no anotado
+
+        importador = respaldo.Importador(tamano_lote=2, checkpoint=checkpoint)
+        self.assertGreater(importador.linea, 1)
+        self.assertEqual(len(importador.mapa["articles.Articulos"]), 3)
+        self.assertNotIn("999", importador.mapa["articles.Articulos"])
+        importador.importar(self.lineas())
+
+        self.assertEqual(Articulos.objects.count(), 3)
+        self.assertEqual(ComentarioArticulo.objects.count(), 2)
+        self.assertEqual(Blog.objects.get().articulos.count(), 2)
+        self.assertFalse(os.path.exists(checkpoint))
+        self.assertFalse(os.path.exists(respaldo.archivo_mapa(checkpoint)))
+
+
+WXR = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:excerpt="http://wordpress.org/export/1.2/excerpt/"
+     xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:dc="http://purl.org/dc/elements/1.1/"
+     xmlns:wp="http://wordpress.org/export/1.2/">
+<channel>
+  <title>Revista</title>
+  <item>
+    <title>portada</title>
+    <wp:post_id>10</wp:post_id>
+    <wp:post_type>attachment</wp:post_type>
+    <wp:attachment_url>https://revista.pe/wp-content/uploads/2019/05/portada.jpg</wp:attachment_url>
+  </item>
+  <item>
+    <title>Nueva planta en Arequipa</title>
+    <content:encoded><![CDATA[Primer párrafo [caption id="1"]pie[/caption]
+
+Segundo párrafo <img src="https://revista.pe/wp-content/uploads/2019/05/foto.png" />]]></content:encoded>
+    <wp:post_id>11</wp:post_id>
+    <wp:post_date>2019-05-02 09:00:00</wp:post_date>
+    <wp:post_date_gmt>2019-05-02 14:00:00</wp:post_date_gmt>
+    <wp:status>publish</wp:status>
+    <wp:post_type>post</wp:post_type>
+    <category domain="category" nicename="noticias"><![CDATA[Noticias]]></category>
+    <wp:postmeta><wp:meta_key>_thumbnail_id</wp:meta_key><wp:meta_value>10</wp:meta_value></wp:postmeta>
+  </item>
+  <item>
+    <title>Geometalurgia &amp; procesos</title>
+    <content:encoded><![CDATA[<p>Análisis</p>]]></content:encoded>
+    <wp:post_id>12</wp:post_id>
+    <wp:post_date_gmt>2018-03-01 12:00:00</wp:post_date_gmt>
+    <wp:status>publish</wp:status>
+    <wp:post_type>post</wp:post_type>
+    <category domain="category" nicename="tecnica"><![CDATA[Técnica]]></category>
+    <wp:comment>
+      <wp:comment_id>1</wp:comment_id>
+      <wp:comment_author_email>Lector@example.com</wp:comment_author_email>
+      <wp:comment_date_gmt>2018-03-02 10:00:00</wp:comment_date_gmt>
+      <wp:comment_content>Muy bueno</wp:comment_content>
+      <wp:comment_approved>1</wp:comment_approved>
+      <wp:comment_parent>0</wp:comment_parent>
+    </wp:comment>
+    <wp:comment>
+      <wp:comment_id>2</wp:comment_id>
+      <wp:comment_author_email>lector@example.com</wp:comment_author_email>
+      <wp:comment_date_gmt>2018-03-03 10:00:00</wp:comment_date_gmt>
+      <wp:comment_content>Gracias</wp:comment_content>
+      <wp:comment_approved>1</wp:comment_approved>
+      <wp:comment_parent>1</wp:comment_parent>
+    </wp:comment>
+    <wp:comment>
+      <wp:comment_id>3</wp:comment_id>
+      <wp:comment_author_email>spam@example.com</wp:comment_author_email>
+      <wp:comment_content>Spam</wp:comment_content>
+      <wp:comment_approved>spam</wp:comment_approved>
+      <wp:comment_parent>0</wp:comment_parent>
+    </wp:comment>
+  </item>
+  <item>
+    <title>Borrador</title>
+    <wp:post_id>13</wp:post_id>
+    <wp:status>draft</wp:status>
+    <wp:post_type>post</wp:post_type>
+  </item>
+</channel>
+</rss>
+"""
+
+
+class WordPressWXRTests(TestCase):
+    """Importación de entradas y comentarios desde un WXR de WordPress."""
+
+    def setUp(self):
+        self.lector = crear_usuario()
+        carpeta = self.enterContext(tempfile.TemporaryDirectory())
+        self.ruta = os.path.join(carpeta, "revista.xml")
+        Path(self.ruta).write_text(WXR, encoding="utf-8")
+
+    def test_importa_noticias_articulos_y_comentarios(self):
+        importador = ImportadorWordPress(tamano_lote=1).importar(self.ruta)
+
+        noticia = Blog.objects.get()
+        self.assertEqual(noticia.titulo_blog, "Nueva planta en Arequipa")
+        self.assertEqual(noticia.imagen_principal.name, "RMM/wordpress/2019/05/portada.jpg")
+        self.assertIn("<p>Primer párrafo pie</p>", noticia.contenido)
+        self.assertIn("RMM/wordpress/2019/05/foto.png", noticia.contenido)
+        self.assertNotIn("wp-content", noticia.contenido)
+
+        articulo = Articulos.objects.get()
+        self.assertEqual(articulo.titulo_articulo, "Geometalurgia & procesos")
+        self.assertEqual(str(articulo.fecha_publicacion), "2018-03-01")
+        respuesta = ComentarioArticulo.objects.get(contenido="Gracias")
+        self.assertEqual(respuesta.parent.contenido, "Muy bueno")
+        self.assertEqual((respuesta.nivel, respuesta.autor), (1, self.lector))
+        self.assertEqual(respuesta.creado_en.isoformat(), "2018-03-03T10:00:00+00:00")
+        self.assertEqual(ComentarioArticulo.objects.count(), 2)
+        self.assertEqual(importador.omitidos["borradores"], 1)
+
+    def test_reimportar_no_duplica(self):
+        ImportadorWordPress().importar(self.ruta)
+        importador = ImportadorWordPress().importar(self.ruta)
+
+        self.assertEqual(importador.omitidos["duplicados"], 2)
+        self.assertEqual((Articulos.objects.count(), Blog.objects.count()), (1, 1))
+        self.assertEqual(ComentarioArticulo.objects.count(), 2)
+
+    @override_settings(CDN_PURGE_ENABLED=True)
+    def test_hace_lo_que_harian_las_senales(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ImportadorWordPress().importar(self.ruta)
+
+        self.assertEqual(set(PurgaCDN.objects.values_list("etiqueta", flat=True)), {"articulos", "noticias"})
+        self.assertEqual(
+            list(ArchivoMensual.objects.order_by("contenido").values_list("contenido", "anio", "mes", "total")),
+            [("articles.Articulos", 2018, 3, 1), ("blog.Blog", 2019, 5, 1)],
+        )
+
+
+class ArchivoFrioTests(TestCase):
+    """Comentarios y likes de contenido antiguo en el archivo frío, transparentes para la API."""
+
+    def setUp(self):
+        self.lector = crear_usuario()
+        self.articulo = crear_articulo("Antiguo", fecha_publicacion="2020-01-10")
+        raiz = ComentarioArticulo.objects.create(articulo=self.articulo, autor=self.lector, contenido="Raíz")
+        self.respuesta = ComentarioArticulo.objects.create(
+            articulo=self.articulo, autor=self.lector, contenido="Respuesta", parent=raiz,
+        )
+        LikeArticulo.objects.create(articulo=self.articulo, usuario=self.lector)
+        # Sin interacciones desde 2020
+        Articulos.objects.filter(pk=self.articulo.pk).update(actualizado_en="2020-02-01T00:00:00Z")
+
+        self.resultado = archivado.archivar(archivado.ARCHIVO_FRIO["articles.Articulos"], archivado.horizonte(365))
+        self.articulo.refresh_from_db()
+        self.client = APIClient()
+
+    def test_archiva_el_hilo_con_sus_conteos(self):
+        self.assertEqual(self.resultado, (1, 2, 1))
+        self.assertFalse(ComentarioArticulo.objects.exists())
+        self.assertFalse(LikeArticulo.objects.exists())
+        self.assertEqual(
+            (self.articulo.interacciones_archivadas, self.articulo.comentarios_archivados, self.articulo.likes_archivados),
+            (True, 2, 1),
+        )
+        self.assertEqual(str(self.articulo.actualizado_en.date()), "2020-02-01")
+
+    def test_los_endpoints_leen_del_archivo(self):
+        detalle = self.client.get(f"/api/v1/articles/articulos/{self.articulo.pk}/").json()
+        self.assertEqual(detalle["likes_count"], 1)
+        self.assertEqual(detalle["comentarios"][0]["respuestas"][0]["id"], self.respuesta.pk)
+
+        listado = self.client.get("/api/v1/articles/articulos/").json()["results"][0]
+        self.assertEqual((listado["comentarios_count"], listado["likes_count"]), (2, 1))
+
+        comentarios = self.client.get(f"/api/v1/articles/comentarios/?articulo={self.articulo.pk}").json()
+        self.assertEqual(comentarios["count"], 2)
+        hijos = self.client.get(f"/api/v1/articles/comentarios/{self.respuesta.parent_id}/children/").json()
+        self.assertEqual([hijo["id"] for hijo in hijos["results"]], [self.respuesta.pk])
+
+        self.client.force_authenticate(self.lector)
+        likes = self.client.get(f"/api/v1/articles/articulos/{self.articulo.pk}/likes_list/").json()
+        self.assertEqual((likes["total_likes"], likes["user_liked"]), (1, True))
+        estado = self.client.get(f"/api/v1/interacciones/likes/estado/?tipo=articulo&ids={self.articulo.pk}").json()
+        self.assertEqual(estado["liked"], {str(self.articulo.pk): True})
+
+    def test_escribir_restaura_el_hilo(self):
+        self.client.force_authenticate(self.lector)
+        respuesta = self.client.post(
+            "/api/v1/articles/comentarios/",
+            {"articulo": self.articulo.pk, "contenido": "Otra respuesta", "parent": self.respuesta.pk},
+            format="json",
+        )
+
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertEqual(respuesta.json()["nivel"], 2)
+        self.assertEqual(ComentarioArticulo.objects.count(), 3)
+        self.assertEqual(ComentarioArticulo.objects.get(pk=self.respuesta.pk).creado_en, self.respuesta.creado_en)
+        self.assertFalse(ComentarioArchivado.objects.exists())
+        self.assertFalse(Articulos.objects.get(pk=self.articulo.pk).interacciones_archivadas)
+
+        lote = self.client.post(
+            "/api/v1/interacciones/reacciones/lote/",
+            {"operaciones": [{"type": "articulo", "id": self.articulo.pk, "action": "remove"}]},
+            format="json",
+        ).json()
+        self.assertEqual(lote["resultados"][0]["status"], "applied")
+        self.assertEqual(lote["likes_count"]["articulo"], {str(self.articulo.pk): 0})
+
+    def test_la_exportacion_incluye_lo_archivado(self):
+        salida = io.StringIO()
+        filas = respaldo.exportar(salida, ["articles.ComentarioArticulo", "articles.LikeArticulo"])
+        self.assertEqual((filas["articles.ComentarioArticulo"], filas["articles.LikeArticulo"]), (2, 1))
+
+
+class EliminacionDosFasesTests(TestCase):
+    """Eliminar oculta al instante; la purga borra las filas dependientes en lotes."""
+
+    def setUp(self):
+        self.admin = crear_usuario("admin", role="ADMIN", is_staff=True)
+        self.lector = crear_usuario()
+        self.articulo = crear_articulo("Eliminable", fecha_publicacion="2025-03-10")
+        raiz = ComentarioArticulo.objects.create(articulo=self.articulo, autor=self.lector, contenido="Raíz")
+        ComentarioArticulo.objects.create(articulo=self.articulo, autor=self.lector, contenido="Respuesta", parent=raiz)
+        LikeArticulo.objects.create(articulo=self.articulo, usuario=self.lector)
+        self.blog = Blog.objects.create(titulo_blog="Noticia", fecha_publicacion="2025-03-11")
+        self.blog.articulos.add(self.articulo)
+        self.client = APIClient()
+
+    def test_eliminar_articulo_oculta_y_la_purga_borra_en_lotes(self):
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.delete(f"/api/v1/articles/articulos/{self.articulo.pk}/").status_code, 204)
+
+        self.assertEqual(self.client.get(f"/api/v1/articles/articulos/{self.articulo.pk}/").status_code, 404)
+        self.assertEqual(self.client.get("/api/v1/articles/comentarios/").json()["count"], 0)
+        self.assertFalse(self.blog.articulos.exists())
+        self.assertEqual(ArchivoMensual.objects.filter(contenido="articles.Articulos").count(), 0)
+        self.assertEqual(ComentarioArticulo.objects.count(), 2)  # Aún sin purgar
+
+        salida = io.StringIO()
+        call_command("purgar_eliminados", "--batch-size", "1", "--pause", "0", "-v", "2", stdout=salida)
+
+        self.assertFalse(Articulos.todos.exists())
+        self.assertFalse(ComentarioArticulo.objects.exists())
+        self.assertFalse(LikeArticulo.objects.exists())
+        self.assertFalse(Blog.articulos.through.objects.exists())
+        pendiente = EliminacionPendiente.objects.get()
+        self.assertIsNotNone(pendiente.terminado_en)
+        self.assertEqual(pendiente.filas_borradas, 5)  # 2 comentarios, 1 like, 1 fila M2M y el artículo
+        self.assertIn("articles.ComentarioArticulo: 1 filas", salida.getvalue())
+
+    def test_purga_agotada_se_reintenta(self):
+        pendiente = eliminar(self.articulo)
+        with mock.patch("app.common.eliminacion.purgar", side_effect=RuntimeError("disco lleno")) as purgar, \
+                self.assertLogs("app.common.eliminacion", "ERROR"):
+            for _ in range(6):
+                purgar_pendientes(max_intentos=5)
+        self.assertEqual(purgar.call_count, 5)
+        pendiente.refresh_from_db()
+        self.assertEqual((pendiente.intentos, pendiente.error, pendiente.terminado_en), (5, "disco lleno", None))
+
+        salida = io.StringIO()
+        call_command("purgar_eliminados", stdout=salida)
+        self.assertIn("1 eliminaciones agotaron sus intentos", salida.getvalue())
+        self.assertTrue(Articulos.todos.filter(pk=self.articulo.pk).exists())
+
+        # Volver a eliminarlo devuelve la misma eliminación, reactivada
+        self.assertEqual(eliminar(Articulos.todos.get(pk=self.articulo.pk)).intentos, 0)
+        self.assertEqual(EliminacionPendiente.objects.get().pk, pendiente.pk)
+
+        EliminacionPendiente.objects.update(intentos=5)
+        call_command("purgar_eliminados", "--retry-failed", stdout=io.StringIO())
+        pendiente.refresh_from_db()
+        self.assertIsNotNone(pendiente.terminado_en)
+        self.assertEqual(pendiente.error, "")
+        self.assertFalse(Articulos.todos.exists())
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import EstadoLikesView, LoteReaccionesView, SerieInteraccionesView
+
+urlpatterns = [
+    path("estadisticas/", SerieInteraccionesView.as_view(), name="serie-interacciones"),
+    path("likes/estado/", EstadoLikesView.as_view(), name="estado-likes"),
+    path("reacciones/lote/", LoteReaccionesView.as_view(), name="lote-reacciones"),
+]
@@ -1,3 +1,206 @@
-from django.shortcuts import render
+from datetime import datetime, time, timedelta
 
-# Create your views here.
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .cache import cache_swr
+from .escritor import ejecutar_escritura
+from .likes import aplicar_reacciones, usuario_dio_like
+from .models import RollupInteraccion
+from .permissions import CanLike, IsAdminOrSuperusuario
+from .rollups import serie_interacciones
+from .serializers import (
+    EstadoLikesQuerySerializer, LoteReaccionesSerializer,
+    OperacionReaccionSerializer, SerieInteraccionesQuerySerializer
+)
+
+
+# ==========================
+# ESTADÍSTICAS DE INTERACCIONES
+# ==========================
+@extend_schema(
+    tags=["Estadísticas"],
+    parameters=[SerieInteraccionesQuerySerializer],
+    responses={200: OpenApiTypes.OBJECT},
+    description="Serie temporal de likes o comentarios por hora/día servida desde los rollups."
+)
+class SerieInteraccionesView(APIView):
+    """
+    Serie temporal de interacciones para las gráficas del panel.
+
+    Lee exclusivamente de la tabla de rollups (actualizada por el comando
+    `rollup_engagement`), nunca de las tablas de likes/comentarios. Con
+    SWR_CACHE_ENABLED la serie se cachea con stale-while-revalidate.
+
+    Parámetros:
+    - tipo: articulo | blog | tema | comentario_tema
+    - ids: IDs separados por coma (opcional, vacío = todos)
+    - metrica: likes | comentarios
+    - granularidad: hora | dia
+    - desde / hasta: YYYY-MM-DD (ambos inclusive)
+
+    Ejemplo:
+    - GET /api/v1/interacciones/estadisticas/?tipo=articulo&ids=5&metrica=likes&granularidad=dia&desde=2025-10-01&hasta=2025-10-07
+    """
+    permission_classes = [IsAdminOrSuperusuario]
+
+    @cache_swr(fresco=60, obsoleto=600)
+    def get(self, request):
+        query = SerieInteraccionesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        tz = timezone.get_current_timezone()
+        desde = datetime.combine(params['desde'], time.min, tzinfo=tz)
+        hasta = datetime.combine(params['hasta'] + timedelta(days=1), time.min, tzinfo=tz)
+
+        totales = dict(serie_interacciones(
+            tipo_contenido=params['tipo'],
+            metrica=params['metrica'],
+            granularidad=params['granularidad'],
+            desde=desde,
+            hasta=hasta,
+            objeto_ids=params.get('ids'),
+        ))
+
+        # Rellenar con ceros los buckets sin datos para que la gráfica sea continua
+        paso = timedelta(hours=1) if params['granularidad'] == RollupInteraccion.Granularidad.HORA else timedelta(days=1)
+        serie = []
+        inicio = desde
+        while inicio < hasta:
+            serie.append({"inicio": inicio, "total": totales.get(inicio, 0)})
+            inicio = (inicio + paso).astimezone(tz)
+
+        return Response(
+            {
+                "tipo": params['tipo'],
+                "ids": params.get('ids', []),
+                "metrica": params['metrica'],
+                "granularidad": params['granularidad'],
+                "desde": params['desde'],
+                "hasta": params['hasta'],
+                "total": sum(totales.values()),
+                "serie": serie,
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+# ==========================
+# ESTADO DE LIKES
+# ==========================
+@extend_schema(
+    tags=["Interacciones - Likes"],
+    parameters=[EstadoLikesQuerySerializer],
+    responses={200: OpenApiTypes.OBJECT},
+    description="Indica si el usuario autenticado dio like a cada uno de varios objetos."
+)
+class EstadoLikesView(APIView):
+    """
+    Estado de "me gusta" del usuario autenticado para un lote de objetos.
+
+    Permite al frontend pintar los corazones de un feed o de un árbol de
+    comentarios con una sola petición en lugar de un `likes_list` por objeto.
+
+    Ejemplo:
+    - GET /api/v1/interacciones/likes/estado/?tipo=comentario_tema&ids=10,11,12
+
+    Respuesta:
+    {
+        "tipo": "comentario_tema",
+        "liked": {"10": true, "11": false, "12": false}
+    }
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        query = EstadoLikesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        estado = usuario_dio_like(params['tipo'], request.user, params['ids'])
+        return Response(
+            {
+                "tipo": params['tipo'],
+                "liked": {str(objeto_id): liked for objeto_id, liked in estado.items()},
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+# ==========================
+# REACCIONES EN LOTE
+# ==========================
+@extend_schema(
+    tags=["Interacciones - Likes"],
+    request=LoteReaccionesSerializer,
+    responses={200: OpenApiTypes.OBJECT},
+    description="Aplica en una sola transacción las reacciones encoladas por la app sin conexión."
+)
+class LoteReaccionesView(APIView):
+    """
+    Endpoint de sincronización para likes/unlikes hechos sin conexión.
+
+    Reemplaza la reproducción secuencial de `toggle_like`: todas las
+    operaciones se aplican en una transacción, de forma idempotente (repetir
+    el mismo lote no cambia nada) y con inserciones/eliminaciones masivas.
+
+    Payload:
+    {
+        "operaciones": [
+            {"type": "articulo", "id": 5, "action": "add", "client_ts": "2025-10-20T10:15:00-05:00"},
+            {"type": "comentario_tema", "id": 42, "action": "remove"}
+        ]
+    }
+
+    Estados por operación:
+    - applied: el like se creó o eliminó
+    - noop: el estado ya era el pedido
+    - superseded: otra operación posterior sobre el mismo objeto la reemplazó
+    - not_found: el objeto no existe
+    - invalid: la operación no es válida (ver "errors")
+
+    La respuesta incluye `likes_count` final de cada objeto afectado.
+    """
+    permission_classes = [CanLike]
+
+    def post(self, request):
+        lote = LoteReaccionesSerializer(data=request.data)
+        lote.is_valid(raise_exception=True)
+
+        validas = []
+        invalidas = []
+        for index, datos in enumerate(lote.validated_data['operaciones']):
+            operacion = OperacionReaccionSerializer(data=datos)
+            if operacion.is_valid():
+                validas.append({"index": index, **operacion.validated_data})
+            else:
+                invalidas.append({
+                    "index": index,
+                    "type": datos.get("type"),
+                    "id": datos.get("id"),
+                    "action": datos.get("action"),
+                    "status": "invalid",
+                    "liked": None,
+                    "errors": operacion.errors,
+                })
+
+        resultados, conteos = ejecutar_escritura(lambda: aplicar_reacciones(request.user, validas))
+        resultados = sorted(resultados + invalidas, key=lambda resultado: resultado["index"])
+
+        return Response(
+            {
+                "usuario": request.user.id,
+                "resultados": resultados,
+                "likes_count": {
+                    tipo: {str(objeto_id): total for objeto_id, total in totales.items()}
+                    for tipo, totales in conteos.items()
+                },
+                "aplicadas": sum(1 for resultado in resultados if resultado["status"] == "applied"),
+            },
+            status=status.HTTP_200_OK
+        )
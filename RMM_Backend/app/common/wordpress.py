@@ -0,0 +1,375 @@
+"""
+Importación de contenido histórico desde una exportación de WordPress (WXR).
+
+El XML se lee con `iterparse` ítem por ítem (cada `<item>` se descarta
+después de procesarlo), así que la memoria no crece con el tamaño del
+archivo. Se recorre dos veces:
+
+1. Adjuntos (`wp:post_type = attachment`): id -> URL, para resolver las
+   imágenes destacadas (`_thumbnail_id`).
+2. Entradas publicadas (`post`): las de alguna categoría de noticias van a
+   `Blog` y el resto a `Articulos`, con sus comentarios aprobados como
+   hilos (`parent`, `nivel` hasta MAX_DEPTH).
+
+Las entradas y sus comentarios se insertan con `bulk_create` por lotes.
+Una entrada con el mismo título y fecha que una existente se omite, así que
+volver a ejecutar la importación no duplica nada.
+
+Medios: las URLs de `wp-content/uploads/` (imagen destacada y las del HTML)
+se reescriben a CARPETA_MEDIOS en el storage, conservando la estructura
+año/mes. Si se indica la carpeta `uploads` de WordPress, los archivos se
+copian al storage.
+
+Los comentaristas se buscan por email. Sin `crear_usuarios` se omiten los
+comentarios de emails sin cuenta; con él se crean cuentas inactivas sin
+contraseña.
+
+Lo usa el comando `importar_wordpress`.
+"""
+
+import html
+import os
+import re
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+from typing import NamedTuple
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from app.articles.models import Articulos, ComentarioArticulo
+from app.blog.models import Blog, ComentarioBlog
+
+from .filters import normalizar_busqueda
+from .respaldo import conservar_fechas, tras_bulk_create
+
+try:
+    from defusedxml.ElementTree import iterparse
+except ImportError:  # pragma: no cover - dependencia opcional
+    from xml.etree.ElementTree import iterparse
+
+CARPETA_MEDIOS = 'RMM/wordpress'
+
+_UPLOADS = re.compile(r'https?://[^\s"\'<>()]+?/wp-content/uploads/([^\s"\'<>()?#]+)')
+_SHORTCODE = re.compile(r'\[/?[a-z_]+(?:\s[^\]]*)?\]')
+_BLOQUE = re.compile(r'^\s*<(?:p|div|h[1-6]|ul|ol|li|blockquote|table|figure|pre|iframe|hr|img)\b', re.I)
+
+# Espacios de nombres de WXR 1.0-1.2 -> prefijo
+_PREFIJOS = (
+    ('http://wordpress.org/export/', '/excerpt/', 'excerpt'),
+    ('http://wordpress.org/export/', '', 'wp'),
+    ('http://purl.org/rss/1.0/modules/content/', '', 'content'),
+    ('http://purl.org/dc/elements/1.1/', '', 'dc'),
+)
+
+
+class Destino(NamedTuple):
+    Modelo: type            # Modelo de las entradas
+    campo_titulo: str
+    Comentario: type        # Modelo de sus comentarios
+    campo_objeto: str       # FK del comentario a la entrada
+
+
+DESTINOS = {
+    'articulo': Destino(Articulos, 'titulo_articulo', ComentarioArticulo, 'articulo'),
+    'noticia': Destino(Blog, 'titulo_blog', ComentarioBlog, 'blog'),
+}
+
+
+# ============================================================================
+# LECTURA DEL XML
+# ============================================================================
+
+def _clave(etiqueta):
+    """'{http://wordpress.org/export/1.2/}post_id' -> 'wp:post_id'."""
+    if not etiqueta.startswith('{'):
+        return etiqueta
+    espacio, nombre = etiqueta[1:].split('}', 1)
+    for inicio, fin, prefijo in _PREFIJOS:
+        if espacio.startswith(inicio) and espacio.endswith(fin):
+            return f'{prefijo}:{nombre}'
+    return nombre
+
+
+def _hijos(elemento):
+    return {_clave(hijo.tag): hijo.text or '' for hijo in elemento}
+
+
+def leer_items(ruta):
+    """Genera un diccionario por `<item>` del WXR, en memoria constante."""
+    canal = None
+    for evento, elemento in iterparse(ruta, events=('start', 'end')):
+        if evento == 'start':
+            if elemento.tag == 'channel':
+                canal = elemento
+            continue
+        if elemento.tag != 'item':
+            continue
+
+        item = {'categorias': [], 'meta': {}, 'comentarios': []}
+        for hijo in elemento:
+            clave = _clave(hijo.tag)
+            if clave == 'category':
+                if hijo.get('domain') == 'category':
+                    item['categorias'].append(hijo.get('nicename') or normalizar_busqueda(hijo.text))
+            elif clave == 'wp:postmeta':
+                meta = _hijos(hijo)
+                item['meta'][meta.get('wp:meta_key')] = meta.get('wp:meta_value', '')
+            elif clave == 'wp:comment':
+                item['comentarios'].append(_hijos(hijo))
+            else:
+                item[clave] = hijo.text or ''
+        yield item
+
+        # Libera el ítem ya procesado (y los anteriores que cuelgan del canal)
+        elemento.clear()
+        if canal is not None:
+            canal.clear()
+
+
+# ============================================================================
+# IMPORTACIÓN
+# ============================================================================
+
+class ImportadorWordPress:
+    """
+    Importa las entradas publicadas de un WXR.
+
+    Args:
+        tamano_lote: Entradas por `bulk_create`.
+        categorias_noticias: Slugs de categorías cuyas entradas son noticias.
+        uploads: Carpeta `wp-content/uploads` de la que copiar los medios.
+        crear_usuarios: Crea cuentas inactivas para los comentaristas sin cuenta.
+        al_confirmar: Función opcional llamada tras cada lote con (entradas, comentarios).
+    """
+
+    def __init__(self, tamano_lote=200, categorias_noticias=('noticias',), uploads=None,
+                 crear_usuarios=False, al_confirmar=None):
+        self.tamano_lote = tamano_lote
+        self.categorias_noticias = set(categorias_noticias)
+        self.uploads = uploads
+        self.crear_usuarios = crear_usuarios
+        self.al_confirmar = al_confirmar
+        self.adjuntos = {}      # id del adjunto -> URL
+        self.usuarios = {}      # email -> pk (o None si no existe)
+        self.creados = Counter()
+        self.omitidos = Counter()
+
+    def importar(self, ruta):
+        for item in leer_items(ruta):
+            if item.get('wp:post_type') == 'attachment' and item.get('wp:attachment_url'):
+                self.adjuntos[item.get('wp:post_id')] = item['wp:attachment_url']
+
+        lote = []
+        for item in leer_items(ruta):
+            if item.get('wp:post_type') != 'post':
+                continue
+            if item.get('wp:status') != 'publish':
+                self.omitidos['borradores'] += 1
+                continue
+            lote.append(item)
+            if len(lote) >= self.tamano_lote:
+                self.confirmar(lote)
+                lote = []
+        if lote:
+            self.confirmar(lote)
+
+        self.finalizar()
+        return self
+
+    def confirmar(self, items):
+        por_destino = {clave: [] for clave in DESTINOS}
+        for item in items:
+            tipo = 'noticia' if self.categorias_noticias & set(item['categorias']) else 'articulo'
+            por_destino[tipo].append(item)
+
+        comentarios = 0
+        for tipo, grupo in por_destino.items():
+            if grupo:
+                comentarios += self.confirmar_destino(DESTINOS[tipo], tipo, grupo)
+        if self.al_confirmar:
+            self.al_confirmar(len(items), comentarios)
+
+    def confirmar_destino(self, destino, tipo, items):
+        titulo = destino.campo_titulo
+        existentes = set(
+            destino.Modelo.objects
+            .filter(**{f'{titulo}__in': [_titulo(item) for item in items]})
+            .values_list(titulo, 'fecha_publicacion')
+        )
+        nuevos = []
+        for item in items:
+            clave = (_titulo(item), _publicado(item))
+            if clave in existentes:
+                self.omitidos['duplicados'] += 1
+                continue
+            existentes.add(clave)
+            nuevos.append(item)
+        if not nuevos:
+            return 0
+
+        self.resolver_usuarios(nuevos)
+        with transaction.atomic():
+            with conservar_fechas(destino.Modelo):
+                objetos = destino.Modelo.objects.bulk_create([self.entrada(destino, item) for item in nuevos])
+            comentarios = self.crear_comentarios(destino, zip(nuevos, objetos))
+        self.creados[tipo] += len(objetos)
+        self.creados['comentarios'] += comentarios
+        return comentarios
+
+    def entrada(self, destino, item):
+        miniatura = self.adjuntos.get(item['meta'].get('_thumbnail_id'))
+        campos = {
+            destino.campo_titulo: _titulo(item),
+            'contenido': self.contenido(item.get('content:encoded', '')),
+            'imagen_principal': self.medio(miniatura) if miniatura else None,
+            'fecha_publicacion': _publicado(item),
+            'actualizado_en': _fecha(
+                item, 'wp:post_modified_gmt', 'wp:post_modified', _fecha(item, 'wp:post_date_gmt', 'wp:post_date')
+            ),
+        }
+        if destino.Modelo is Articulos:
+            # bulk_create no llama a save()
+            campos['titulo_busqueda'] = normalizar_busqueda(campos['titulo_articulo'])[:200]
+        return destino.Modelo(**campos)
+
+    def crear_comentarios(self, destino, pares):
+        """Crea los hilos de comentarios aprobados de las entradas, nivel por nivel."""
+        Comentario = destino.Comentario
+        por_nivel = [[] for _ in range(Comentario.MAX_DEPTH + 1)]
+
+        for item, objeto in pares:
+            aprobados = {
+                comentario['wp:comment_id']: comentario
+                for comentario in item['comentarios'] if _aprobado(comentario)
+            }
+            padres, niveles = {}, {}
+            for wp_id, comentario in sorted(aprobados.items(), key=lambda par: int(par[0] or 0)):
+                autor = self.usuarios.get(comentario.get('wp:comment_author_email', '').strip().lower())
+                if autor is None:
+                    self.omitidos['comentarios_sin_usuario'] += 1
+                    continue
+                # Si el padre se omitió, o ya está en el nivel máximo, responde a su ancestro
+                padre = _padre(comentario)
+                while padre and (padre not in niveles or niveles[padre] >= Comentario.MAX_DEPTH):
+                    padre = padres[padre] if padre in niveles else _padre(aprobados.get(padre, {}))
+                nivel = niveles[padre] + 1 if padre else 0
+                padres[wp_id], niveles[wp_id] = padre, nivel
+                por_nivel[nivel].append((objeto, wp_id, padre, Comentario(**{
+                    destino.campo_objeto: objeto,
+                    'autor_id': autor,
+                    'contenido': _sin_shortcodes(html.unescape(comentario.get('wp:comment_content', ''))).strip(),
+                    'nivel': nivel,
+                    'creado_en': _fecha(comentario, 'wp:comment_date_gmt', 'wp:comment_date'),
+                })))
+
+        creados = {}
+        total = 0
+        with conservar_fechas(Comentario):
+            for nivel in por_nivel:
+                for objeto, _, padre, comentario in nivel:
+                    if padre:
+                        comentario.parent = creados[(objeto.pk, padre)]
+                Comentario.objects.bulk_create([comentario for *_, comentario in nivel])
+                creados.update({(objeto.pk, wp_id): comentario for objeto, wp_id, _, comentario in nivel})
+                total += len(nivel)
+        return total
+
+    def resolver_usuarios(self, items):
+        User = get_user_model()
+        emails = {
+            comentario.get('wp:comment_author_email', '').strip().lower()
+            for item in items for comentario in item['comentarios'] if _aprobado(comentario)
+        } - set(self.usuarios) - {''}
+        if not emails:
+            return
+        encontrados = dict(User.objects.filter(email__in=emails).values_list('email', 'pk'))
+        for email in emails:
+            if email not in encontrados and self.crear_usuarios:
+                usuario = User(email=email, is_active=False)
+                usuario.usuario_unico = usuario.generar_usuario_unico()
+                usuario.set_unusable_password()
+                usuario.save()
+                encontrados[email] = usuario.pk
+                self.creados['usuarios'] += 1
+            self.usuarios[email] = encontrados.get(email)
+
+    # ------------------------------------------------------------------
+    # Medios y HTML
+    # ------------------------------------------------------------------
+
+    def medio(self, url):
+        """Ruta en el storage para una URL de `wp-content/uploads/` (copiando el archivo si se puede)."""
+        coincidencia = _UPLOADS.match(url)
+        relativa = coincidencia.group(1) if coincidencia else os.path.basename(url)
+        destino = f'{CARPETA_MEDIOS}/{relativa}'
+        if self.uploads and not default_storage.exists(destino):
+            origen = os.path.join(self.uploads, *relativa.split('/'))
+            if os.path.isfile(origen):
+                with open(origen, 'rb') as archivo:
+                    default_storage.save(destino, File(archivo))
+                self.creados['medios'] += 1
+            else:
+                self.omitidos['medios_faltantes'] += 1
+        return destino
+
+    def contenido(self, texto):
+        """HTML de WordPress sin shortcodes, con párrafos y medios locales."""
+        texto = _parrafos(_sin_shortcodes(texto))
+        return _UPLOADS.sub(lambda coincidencia: default_storage.url(self.medio(coincidencia.group(0))), texto)
+
+    def finalizar(self):
+        """Lo que harían las señales que `bulk_create` no emite (ver `tras_bulk_create`)."""
+        tras_bulk_create(*(
+            modelo._meta.label
+            for tipo, destino in DESTINOS.items() if self.creados[tipo]
+            for modelo in (destino.Modelo, destino.Comentario)
+        ))
+
+
+def _aprobado(comentario):
+    """Comentario aprobado (ni pendiente, ni spam, ni pingback)."""
+    return (
+        comentario.get('wp:comment_approved') == '1'
+        and comentario.get('wp:comment_type', '') in ('', 'comment')
+    )
+
+
+def _padre(comentario):
+    padre = comentario.get('wp:comment_parent', '0')
+    return None if padre in ('', '0') else padre
+
+
+def _publicado(item):
+    """Fecha de publicación (local) de una entrada."""
+    return timezone.localtime(_fecha(item, 'wp:post_date_gmt', 'wp:post_date')).date()
+
+
+def _titulo(item):
+    return html.unescape(item.get('title', '')).strip()[:200]
+
+
+def _fecha(datos, campo_gmt, campo_local, defecto=None):
+    """Fecha de WordPress como datetime aware ('0000-00-00 ...' si no tiene)."""
+    for campo, zona in ((campo_gmt, dt_timezone.utc), (campo_local, timezone.get_current_timezone())):
+        valor = datos.get(campo, '')
+        if valor and not valor.startswith('0000'):
+            return datetime.strptime(valor.strip(), '%Y-%m-%d %H:%M:%S').replace(tzinfo=zona)
+    return defecto or timezone.now()
+
+
+def _sin_shortcodes(texto):
+    """Quita las etiquetas [caption], [gallery]... y conserva su contenido."""
+    return _SHORTCODE.sub('', texto)
+
+
+def _parrafos(texto):
+    """Equivalente mínimo de `wpautop`: los bloques separados por línea en blanco van en <p>."""
+    bloques = [bloque.strip() for bloque in re.split(r'\n\s*\n', texto.replace('\r\n', '\n'))]
+    return '\n'.join(
+        bloque if _BLOQUE.match(bloque) else f"<p>{bloque.replace(chr(10), '<br />')}</p>"
+        for bloque in bloques if bloque
+    )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foro', '0004_remove_tema_imagen'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tema',
+            index=models.Index(fields=['creado_en', 'id'], name='foro_tema_creado__da3491_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foro', '0005_tema_foro_tema_creado__da3491_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comentariotema',
+            name='foro_coment_tema_id_688c8e_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comentariotema',
+            index=models.Index(fields=['tema', 'parent', 'creado_en'], name='foro_coment_tema_id_d4e1d8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comentariotema',
+            index=models.Index(fields=['parent', 'creado_en'], name='foro_coment_parent__e42c7c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='likecomentariotema',
+            index=models.Index(fields=['usuario', 'creado_en'], name='foro_likeco_usuario_be6fff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='liketema',
+            index=models.Index(fields=['usuario', 'creado_en'], name='foro_likete_usuario_478294_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tema',
+            index=models.Index(fields=['categoria_foro', 'creado_en'], name='foro_tema_categor_8d87a5_idx'),
+        ),
+    ]
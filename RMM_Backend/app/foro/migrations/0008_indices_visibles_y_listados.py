@@ -0,0 +1,47 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foro', '0007_eliminacion_suave'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='tema',
+            name='foro_tema_creado__da3491_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tema',
+            name='foro_tema_categor_8d87a5_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comentariotema',
+            index=models.Index(fields=['tema', 'creado_en'], name='foro_coment_tema_id_5b2dca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comentariotema',
+            index=models.Index(fields=['creado_en'], name='foro_coment_creado__21f81c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='likecomentariotema',
+            index=models.Index(fields=['comentario', 'creado_en'], name='foro_likeco_comenta_e570f0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='liketema',
+            index=models.Index(fields=['tema', 'creado_en'], name='foro_likete_tema_id_c291e8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tema',
+            index=models.Index(condition=models.Q(('eliminado_en__isnull', True)), fields=['creado_en', 'id'], name='temas_feed_visibles'),
+        ),
+        migrations.AddIndex(
+            model_name='tema',
+            index=models.Index(condition=models.Q(('eliminado_en__isnull', True)), fields=['categoria_foro', 'creado_en'], name='temas_categoria_visibles'),
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from django.utils.text import slugify
 from django.core.exceptions import ValidationError
+from app.common.models import VisiblesManager
 
 User = settings.AUTH_USER_MODEL
 
@@ -28,11 +30,28 @@ class Tema(models.Model):
     )
     creado_en = models.DateTimeField(auto_now_add=True)
     actualizado_en = models.DateTimeField(auto_now=True)
+    # Eliminado y oculto; sus comentarios y likes esperan la purga (ver app/common/eliminacion.py)
+    eliminado_en = models.DateTimeField("Eliminado en", null=True, blank=True, editable=False)
+
+    objects = VisiblesManager()
+    todos = models.Manager()  # Incluye los eliminados
 
     class Meta:
         ordering = ["-creado_en"]
         verbose_name = "Tema de Foro"
         verbose_name_plural = "Temas de Foro"
+        indexes = [
+            # Paginación por cursor del feed (ver app/common/pagination.py) y feed
+            # filtrado por categoría (?categoria_foro=), solo de los visibles:
+            # VisiblesManager siempre filtra eliminado_en IS NULL
+            models.Index(
+                fields=["creado_en", "id"], condition=Q(eliminado_en__isnull=True), name="temas_feed_visibles",
+            ),
+            models.Index(
+                fields=["categoria_foro", "creado_en"], condition=Q(eliminado_en__isnull=True),
+                name="temas_categoria_visibles",
+            ),
+        ]
 
     def __str__(self):
         return self.titulo
@@ -79,8 +98,13 @@ class ComentarioTema(models.Model):
     class Meta:
         ordering = ["-creado_en"]
         indexes = [
-            models.Index(fields=["tema", "parent"]),
+            # Comentarios principales por fecha y respuestas por fecha (ver asesor_indices)
+            models.Index(fields=["tema", "parent", "creado_en"]),
             models.Index(fields=["tema", "nivel"]),
+            models.Index(fields=["parent", "creado_en"]),
+            # Hilo completo por fecha y listado general (más recientes primero)
+            models.Index(fields=["tema", "creado_en"]),
+            models.Index(fields=["creado_en"]),
         ]
 
     def clean(self):
@@ -113,6 +137,12 @@ class LikeTema(models.Model):
 
     class Meta:
         unique_together = ("tema", "usuario")
+        indexes = [
+            # Actividad reciente de cada usuario
+            models.Index(fields=["usuario", "creado_en"]),
+            # Lista de likes del objeto por fecha (likes_list)
+            models.Index(fields=["tema", "creado_en"]),
+        ]
         verbose_name = "Like de Tema"
         verbose_name_plural = "Likes de Temas"
 
@@ -135,6 +165,12 @@ class LikeComentarioTema(models.Model):
 
     class Meta:
         unique_together = ("comentario", "usuario")
+        indexes = [
+            # Actividad reciente de cada usuario
+            models.Index(fields=["usuario", "creado_en"]),
+            # Lista de likes del objeto por fecha (likes_list)
+            models.Index(fields=["comentario", "creado_en"]),
+        ]
         verbose_name = "Like de Comentario de Foro"
         verbose_name_plural = "Likes de Comentarios de Foro"
 
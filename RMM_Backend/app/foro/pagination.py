@@ -1,7 +1,7 @@
 # app/foro/pagination.py
-from rest_framework.pagination import PageNumberPagination
+from app.common.pagination import KeysetPagination
 
-class TemasPagination(PageNumberPagination):
+class TemasPagination(KeysetPagination):
     page_size = 6                 # 8 temas por página
     page_size_query_param = "page_size"
     max_page_size = 20
\ No newline at end of file
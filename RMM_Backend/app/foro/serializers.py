@@ -1,6 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import Tema, ComentarioTema, LikeTema, LikeComentarioTema, Categoria_Foro
+from app.common.queries import armar_arbol, contar_relacionados, generar_extracto
+from app.common.serializers import (
+    SparseFieldsetMixin, FragmentCacheMixin, FragmentCacheListSerializer, ArbolComentariosListSerializer
+)
 
 User = get_user_model()
 
@@ -11,7 +15,7 @@ class AutorForoSerializer(serializers.ModelSerializer):
         fields = ["id", "email", "usuario_unico"]
 
 
-class CategoriaForoSerializer(serializers.ModelSerializer):
+class CategoriaForoSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer para mostrar categorías de foros"""
     class Meta:
         model = Categoria_Foro
@@ -51,7 +55,7 @@ class LikeComentarioTemaSerializer(serializers.ModelSerializer):
         read_only_fields = ["usuario", "creado_en"]
 
 
-class ComentarioTemaSerializer(serializers.ModelSerializer):
+class ComentarioTemaSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     autor = AutorForoSerializer(read_only=True)
     respuestas = serializers.SerializerMethodField()
     likes_count = serializers.SerializerMethodField()
@@ -68,34 +72,59 @@ class ComentarioTemaSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ComentarioTema
+        list_serializer_class = ArbolComentariosListSerializer
         fields = [
             "id", "tema", "autor", "contenido", "parent", "nivel",
             "creado_en", "respuestas", "likes_count"
         ]
         read_only_fields = ["autor", "nivel", "creado_en", "respuestas", "likes_count"]
+        field_dependencies = {"respuestas": [], "likes_count": []}
 
     def validate_parent(self, value):
         if value and value.nivel >= ComentarioTema.MAX_DEPTH:
             raise serializers.ValidationError(f"No se puede responder a un comentario de nivel {ComentarioTema.MAX_DEPTH}.")
         return value
 
+    @staticmethod
+    def anotar(queryset):
+        """Agrega `likes_count` a la consulta de comentarios (ver get_likes_count)."""
+        return queryset.annotate(likes_count=contar_relacionados(LikeComentarioTema, "comentario"))
+
     def get_respuestas(self, obj):
+        respuestas = getattr(obj, "respuestas_cargadas", None)
+        if respuestas is None:
+            respuestas = obj.respuestas.all()
         return ComentarioTemaSerializer(
-            obj.respuestas.all().order_by("-creado_en"),
+            respuestas,
             many=True,
             context=self.context
         ).data
     
     def get_likes_count(self, obj):
         """Cantidad total de 'me gusta' en este comentario"""
-        return obj.likes.count()
+        likes_count = getattr(obj, "likes_count", None)
+        if likes_count is None:
+            likes_count = obj.likes.count()
+        return likes_count
     
     def create(self, validated_data):
         validated_data["autor"] = self.context["request"].user
         return super().create(validated_data)
 
 
-class TemaSerializer(serializers.ModelSerializer):
+def serializar_comentarios(tema, context):
+    """
+    Árbol de comentarios de un tema (detalle y `?expand=comentarios` del
+    listado): los principales con sus respuestas anidadas.
+    """
+    # Todos los comentarios en una consulta (o del prefetch `comentarios_cargados`)
+    comentarios = getattr(tema, "comentarios_cargados", None)
+    if comentarios is None:
+        comentarios = list(ComentarioTemaSerializer.anotar(tema.comentarios.select_related("autor")))
+    return ComentarioTemaSerializer(armar_arbol(comentarios), many=True, context=context).data
+
+
+class TemaSerializer(FragmentCacheMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     autor = AutorForoSerializer(read_only=True)
     comentarios = serializers.SerializerMethodField()
     likes_count = serializers.SerializerMethodField()
@@ -111,6 +140,7 @@ class TemaSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Tema
+        list_serializer_class = FragmentCacheListSerializer
         fields = [
             "id", "titulo", "contenido", "autor",
             "categoria_foro", "categoria_foro_id",
@@ -118,15 +148,48 @@ class TemaSerializer(serializers.ModelSerializer):
             "comentarios", "likes_count"
         ]
         read_only_fields = ["autor", "creado_en", "actualizado_en"]
+        field_dependencies = {"comentarios": [], "likes_count": []}
 
 
     def get_comentarios(self, obj):
-        comentarios_principales = obj.comentarios.filter(parent__isnull=True)
-        return ComentarioTemaSerializer(
-            comentarios_principales,
-            many=True,
-            context=self.context
-        ).data
+        return serializar_comentarios(obj, self.context)
 
     def get_likes_count(self, obj):
         return obj.likes.count()
+
+
+class TemaListSerializer(FragmentCacheMixin, SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Representación resumida de temas para el listado del foro.
+
+    Sin el contenido completo ni el árbol de comentarios: extracto y conteos
+    anotados por el queryset (ver `TemaViewSet.get_queryset`).
+    El detalle usa `TemaSerializer`.
+
+    Ambos se pueden pedir con `?expand=contenido,comentarios`.
+    """
+    autor = AutorForoSerializer(read_only=True)
+    categoria_foro = CategoriaForoSerializer(read_only=True)
+    extracto = serializers.SerializerMethodField()
+    comentarios_count = serializers.IntegerField(read_only=True)
+    likes_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Tema
+        list_serializer_class = FragmentCacheListSerializer
+        fields = [
+            "id", "titulo", "extracto", "autor", "categoria_foro",
+            "creado_en", "actualizado_en",
+            "comentarios_count", "likes_count"
+        ]
+        expandable_fields = {
+            "contenido": lambda: serializers.CharField(read_only=True),
+            "comentarios": lambda: serializers.SerializerMethodField(),
+        }
+        field_dependencies = {"extracto": [], "comentarios_count": [], "likes_count": [], "comentarios": []}
+
+    def get_extracto(self, obj):
+        return generar_extracto(getattr(obj, "inicio_contenido", ""))
+
+    def get_comentarios(self, obj):
+        return serializar_comentarios(obj, self.context)
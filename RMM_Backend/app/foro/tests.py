@@ -1,3 +1,7 @@
 from django.test import TestCase
 
-# Create your tests here.
+from app.common.testing import PRESUPUESTOS, PresupuestoConsultasMixin
+
+
+class ForoPresupuestoTests(PresupuestoConsultasMixin, TestCase):
+    presupuestos = PRESUPUESTOS['foro']
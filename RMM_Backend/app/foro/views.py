@@ -7,10 +7,16 @@ from drf_spectacular.utils import extend_schema
 
 from .models import Tema, ComentarioTema, LikeTema, LikeComentarioTema, Categoria_Foro
 from .serializers import (
-    TemaSerializer, ComentarioTemaSerializer,
+    TemaSerializer, TemaListSerializer, ComentarioTemaSerializer,
     LikeTemaSerializer, LikeComentarioTemaSerializer, CategoriaForoSerializer
 )
 from .pagination import TemasPagination
+from app.common.escritor import escritura_serializada
+from app.common.mixins import (
+    CDNCacheMixin, ConditionalGetMixin, EliminacionSuaveMixin, EscrituraSerializadaMixin, FragmentCacheViewMixin,
+    SparseFieldsetViewMixin,
+)
+from app.common.queries import contar_relacionados, inicio_contenido, prefetch_comentarios
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -27,7 +33,10 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
     tags=["Foro - Temas"],
     description="Endpoints para consultar y crear temas en el foro con paginación y búsqueda."
 )
-class TemaViewSet(viewsets.ModelViewSet):
+class TemaViewSet(
+    CDNCacheMixin, ConditionalGetMixin, EliminacionSuaveMixin, FragmentCacheViewMixin, SparseFieldsetViewMixin,
+    viewsets.ModelViewSet,
+):
     """
     ViewSet para listar, crear, actualizar y eliminar temas del foro.
     
@@ -37,16 +46,53 @@ class TemaViewSet(viewsets.ModelViewSet):
     - Solo el autor puede editar/eliminar su propio tema
     - Sistema de likes para temas
     - Fomenta la participación activa y diversidad de contenido
+
+    📋 El listado usa una representación resumida (extracto, conteos de
+    comentarios y likes, sin árbol de comentarios); el detalle trae todo.
+    🧩 Campos a medida: ?fields=id,titulo,autor y ?expand=contenido,comentarios
+    🔁 GET condicional: ETag / Last-Modified; con If-None-Match vigente responde 304
+    🌐 CDN: Cache-Control y CDN-Tag en list/retrieve (CDN_CACHE_HEADERS_ENABLED)
+    📄 Paginación por cursor sin COUNT(*): ?pagination=cursor y luego el `next` (?cursor=...)
+    🗑️ DELETE oculta el tema al instante; sus comentarios y likes se purgan en segundo plano
     """
     queryset = Tema.objects.all().order_by("-creado_en")
     serializer_class = TemaSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     pagination_class = TemasPagination
 
+    # Caché en el CDN (ver CDNCacheMixin)
+    cdn_policies = {"list": "listado", "retrieve": "detalle"}
+    cdn_content = "foro.Tema"
+
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ["categoria_foro"]
     search_fields = ["titulo", "contenido"]
 
+    def get_serializer_class(self):
+        if self.action == "list":
+            return TemaListSerializer
+        return TemaSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method in ("GET", "HEAD") and self.field_requested("comentarios"):
+            # Todos los comentarios de la página en una consulta; el árbol se arma en memoria
+            queryset = queryset.prefetch_related(
+                prefetch_comentarios(ComentarioTemaSerializer.anotar(ComentarioTema.objects.select_related("autor")))
+            )
+        if self.action == "list":
+            # Listado: sin el contenido completo y con conteos calculados en la misma consulta.
+            # Solo se anota lo que la respuesta va a incluir (?fields= / ?expand=)
+            if not self.field_requested("contenido"):
+                queryset = queryset.defer("contenido")
+            if self.field_requested("extracto"):
+                queryset = queryset.annotate(inicio_contenido=inicio_contenido())
+            if self.field_requested("comentarios_count"):
+                queryset = queryset.annotate(comentarios_count=contar_relacionados(ComentarioTema, "tema"))
+            if self.field_requested("likes_count"):
+                queryset = queryset.annotate(likes_count=contar_relacionados(LikeTema, "tema"))
+        return queryset
+
     def perform_create(self, serializer):
         """
         Crear tema asociado al usuario autenticado.
@@ -61,6 +107,7 @@ class TemaViewSet(viewsets.ModelViewSet):
         description="Dar o quitar 'me gusta' a un tema del foro."
     )
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    @escritura_serializada
     def toggle_like(self, request, pk=None):
         """
         Acción para dar o quitar 'like' a un tema del foro.
@@ -245,10 +292,10 @@ class TemaViewSet(viewsets.ModelViewSet):
         tema = get_object_or_404(Tema, pk=pk)
         
         # Obtener comentarios principales del tema
-        comentarios = ComentarioTema.objects.filter(
+        comentarios = ComentarioTemaSerializer.anotar(ComentarioTema.objects.filter(
             tema=tema, 
             parent__isnull=True
-        ).select_related('autor').order_by('-creado_en')
+        ).select_related('autor')).order_by('-creado_en')
         
         # Aplicar búsqueda si se proporciona
         search = request.query_params.get('search')
@@ -275,7 +322,7 @@ class TemaViewSet(viewsets.ModelViewSet):
     tags=["Foro - Comentarios"],
     description="Endpoints para consultar y crear comentarios en temas del foro."
 )
-class ComentarioTemaViewSet(viewsets.ModelViewSet):
+class ComentarioTemaViewSet(EscrituraSerializadaMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     ViewSet para listar, crear, actualizar y eliminar comentarios de temas del foro.
     
@@ -329,11 +376,10 @@ class ComentarioTemaViewSet(viewsets.ModelViewSet):
         Filtra comentarios principales y permite filtrado por tema.
         Optimiza las consultas con select_related para el autor.
         """
-        queryset = ComentarioTema.objects.all().select_related('autor', 'tema').prefetch_related(
-            'respuestas__autor',
-            'respuestas__respuestas__autor',
-            'respuestas__respuestas__respuestas__autor',
-            'respuestas__respuestas__respuestas__respuestas__autor'
+        # Las respuestas anidadas se cargan una consulta por nivel (ArbolComentariosListSerializer)
+        # Sin los comentarios de temas eliminados que esperan su purga
+        queryset = ComentarioTemaSerializer.anotar(
+            ComentarioTema.objects.filter(tema__eliminado_en__isnull=True).select_related('autor', 'tema')
         ).order_by('-creado_en')
         
         # Filtrar por tema si se proporciona el parámetro
@@ -357,6 +403,7 @@ class ComentarioTemaViewSet(viewsets.ModelViewSet):
         description="Dar o quitar 'me gusta' a un comentario específico del foro."
     )
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    @escritura_serializada
     def toggle_like(self, request, pk=None):
         """
         Acción para dar o quitar 'like' a un comentario específico del foro.
@@ -526,7 +573,7 @@ class ComentarioTemaViewSet(viewsets.ModelViewSet):
     tags=["Foro - Categorías"],
     description="Endpoints para listar categorías disponibles del foro."
 )
-class CategoriaForoViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoriaForoViewSet(SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Categoria_Foro.objects.all().order_by("nombre_categoria")
     serializer_class = CategoriaForoSerializer
     permission_classes = [permissions.AllowAny]
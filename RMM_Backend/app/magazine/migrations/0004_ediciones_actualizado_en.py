@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:05
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('magazine', '0003_alter_contacto_options_alter_newsletter_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ediciones',
+            name='actualizado_en',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Actualizado en'),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('magazine', '0004_ediciones_actualizado_en'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ediciones',
+            index=models.Index(fields=['fecha_publicacion', 'numero_edicion'], name='magazine_ed_fecha_p_50fb33_idx'),
+        ),
+    ]
@@ -9,11 +9,16 @@ class Ediciones(models.Model):
     imagen = models.ImageField("Imagen", upload_to="RMM/Ediciones/")
     fecha_publicacion = models.DateField("Fecha de publicación")
     url_impresa = models.URLField("Versión impresa (URL)", blank=True, null=True)
+    actualizado_en = models.DateTimeField("Actualizado en", auto_now=True)
 
     class Meta:
         verbose_name = "Edición"
         verbose_name_plural = "Ediciones"
         ordering = ["-fecha_publicacion", "-numero_edicion"]
+        indexes = [
+            # Filtro ?year=&month= del archivo por fechas
+            models.Index(fields=["fecha_publicacion", "numero_edicion"]),
+        ]
 
     def __str__(self):
         return f"Edición {self.numero_edicion} - {self.titulo_edicion}"
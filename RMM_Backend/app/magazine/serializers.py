@@ -1,10 +1,13 @@
 from rest_framework import serializers
 from .models import Ediciones, Newsletter, Contacto
+from app.common.serializers import SparseFieldsetMixin, FragmentCacheMixin, FragmentCacheListSerializer
 
-class EdicionesSerializer(serializers.ModelSerializer):
+class EdicionesSerializer(FragmentCacheMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Ediciones
-        fields = "__all__"
+        list_serializer_class = FragmentCacheListSerializer
+        # `actualizado_en` es la marca interna de la caché (ver app/common/signals.py)
+        exclude = ["actualizado_en"]
 
 
 class NewsletterSerializer(serializers.ModelSerializer):
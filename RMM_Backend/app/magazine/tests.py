@@ -1,3 +1,28 @@
-from django.test import TestCase
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from app.common.testing import PRESUPUESTOS, PresupuestoConsultasMixin, crear_edicion
+
+
+class RevistaPresupuestoTests(PresupuestoConsultasMixin, TestCase):
+    presupuestos = PRESUPUESTOS['magazine']
+
+
+class EdicionesTests(TestCase):
+    """Última edición y ediciones pasadas."""
+
+    def test_ediciones_pasadas_excluyen_la_ultima(self):
+        for numero, fecha in enumerate(["2025-01-01", "2025-02-01", "2025-03-01"], start=1):
+            crear_edicion(numero, fecha)
+        client = APIClient()
+        pasadas = client.get("/api/v1/magazine/editions/past/").data
+        self.assertEqual([edicion["numero_edicion"] for edicion in pasadas["results"]], [2, 1])
+        filtradas = client.get("/api/v1/magazine/editions/past/?year=2025&month=1").data
+        self.assertEqual([edicion["numero_edicion"] for edicion in filtradas["results"]], [1])
+
+    @override_settings(FRAGMENT_CACHE_ENABLED=True)
+    def test_la_edicion_no_expone_la_marca(self):
+        caches["default"].clear()
+        crear_edicion(contenido="Resumen")
+        self.assertNotIn("actualizado_en", APIClient().get("/api/v1/magazine/editions/last/").json())
@@ -6,8 +6,15 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 from .models import Ediciones, Newsletter, Contacto
 from .serializers import EdicionesSerializer, NewsletterSerializer, ContactSerializer
 from .pagination import WeeklyEditionPagination
-from app.common.filters import AccentInsensitiveSearchFilter
+from app.common.archivo import resumen as resumen_archivo
+from app.common.cache import cache_swr
+from app.common.filters import AccentInsensitiveSearchFilter, ArchivoFechaFilter
+from app.common.mixins import (
+    AnonymousCacheMixin, CDNCacheMixin, ConditionalGetMixin, EscrituraSerializadaMixin, FragmentCacheViewMixin,
+    SparseFieldsetViewMixin,
+)
 from app.common.permissions import CanManageContent
+from app.common.serializers import ArchivoAnioSerializer
 
 # ----------------------------
 # 📌 EDICIONES
@@ -16,7 +23,10 @@ from app.common.permissions import CanManageContent
     tags=["Ediciones"],
     description="Endpoints para consultar las ediciones de la revista con búsqueda sin acentos."
 )
-class EdicionesViewSet(viewsets.ModelViewSet):
+class EdicionesViewSet(
+    AnonymousCacheMixin, CDNCacheMixin, ConditionalGetMixin, FragmentCacheViewMixin, SparseFieldsetViewMixin,
+    viewsets.ModelViewSet,
+):
     """
     ViewSet para gestionar ediciones de la revista.
     
@@ -27,6 +37,11 @@ class EdicionesViewSet(viewsets.ModelViewSet):
       - Buscar "minería" encontrará "mineria" y "minería"
     - 📄 Paginación: Configurable por página
     - 📅 Filtro por fecha: ?fecha_publicacion=YYYY-MM-DD
+    - 🔁 GET condicional: ETag / Last-Modified; con If-None-Match vigente responde 304
+    - ⚡ Caché de respuestas anónimas de list/last/past (RESPONSE_CACHE_ENABLED)
+    - ♻️ last/past con stale-while-revalidate para todos los usuarios (SWR_CACHE_ENABLED)
+    - 🌐 CDN: Cache-Control y CDN-Tag por acción (CDN_CACHE_HEADERS_ENABLED)
+    - 🗓️ Archivo por fechas: GET archivo/ (conteos por año y mes) y ?year=2025&month=10
     
     Ejemplos de uso:
     - GET /api/v1/magazine/editions/?search=mineria (encuentra "minería")
@@ -39,34 +54,61 @@ class EdicionesViewSet(viewsets.ModelViewSet):
     permission_classes = [CanManageContent]  # Lectura: Todos | Escritura: Admin/Superusuario
     pagination_class = WeeklyEditionPagination
 
+    # Caché de respuestas anónimas (ver AnonymousCacheMixin)
+    response_cache_actions = ('list', 'last', 'past')
+    response_cache_tags = ('magazine.Ediciones',)
+
+    # Caché en el CDN (ver CDNCacheMixin)
+    cdn_policies = {
+        'list': 'listado', 'retrieve': 'detalle', 'last': 'listado', 'past': 'estable', 'archivo': 'listado',
+    }
+    cdn_content = 'magazine.Ediciones'
+
     # 👇 Importante: activar búsqueda sin acentos y filtros
-    filter_backends = [AccentInsensitiveSearchFilter, DjangoFilterBackend]
+    filter_backends = [AccentInsensitiveSearchFilter, DjangoFilterBackend, ArchivoFechaFilter]
     search_fields = ['titulo_edicion', 'contenido']
     filterset_fields = ['fecha_publicacion']
+    archive_date_field = 'fecha_publicacion'
 
     @extend_schema(
         summary="Obtener la última edición",
         description="Devuelve la edición más reciente publicada."
     )
     @action(detail=False, methods=['get'])
+    @cache_swr(fresco=60, obsoleto=3600, etiquetas=('magazine.Ediciones',))
     def last(self, request):
-        edicion = Ediciones.objects.order_by('-fecha_publicacion').first()
+        edicion = Ediciones.objects.order_by('-fecha_publicacion', '-numero_edicion').first()
         if not edicion:
             return Response({"detail": "No hay ediciones"})
         return Response(self.get_serializer(edicion).data)
 
     @extend_schema(
         summary="Obtener ediciones pasadas",
-        description="Devuelve todas las ediciones semanales anteriores a la última publicada, con paginación de 5 en 5."
+        description=(
+            "Devuelve todas las ediciones semanales anteriores a la última publicada, con paginación "
+            "de 5 en 5. Admite los filtros de búsqueda y de archivo (?year=&month=)."
+        )
     )
     @action(detail=False, methods=['get'])
+    @cache_swr(fresco=60, obsoleto=3600, etiquetas=('magazine.Ediciones',))
     def past(self, request):
-        ediciones = Ediciones.objects.order_by('-fecha_publicacion')[1:]
+        # Excluir la última por ID en lugar de recortar con [1:]: así el conteo
+        # y cada página son consultas simples sobre el índice de la fecha
+        ultima = Ediciones.objects.order_by('-fecha_publicacion', '-numero_edicion').values_list('pk', flat=True)[:1]
+        ediciones = self.filter_queryset(self.get_queryset()).exclude(pk__in=ultima)
         page = self.paginate_queryset(ediciones)
         if page is not None:
             return self.get_paginated_response(self.get_serializer(page, many=True).data)
         return Response(self.get_serializer(ediciones, many=True).data)
 
+    @extend_schema(
+        summary="Archivo por fechas",
+        description="Cantidad de ediciones publicadas por año y mes, desde la tabla de resumen.",
+        responses=ArchivoAnioSerializer(many=True),
+    )
+    @action(detail=False, methods=['get'])
+    def archivo(self, request):
+        return Response(resumen_archivo('magazine.Ediciones'))
 
 # ----------------------------
 # 📌 NEWSLETTER
@@ -75,7 +117,8 @@ class EdicionesViewSet(viewsets.ModelViewSet):
     tags=["Newsletter"],
     description="Endpoints para crear y consultar el newsletter."
 )
-class NewsletterViewSet(mixins.CreateModelMixin,
+class NewsletterViewSet(EscrituraSerializadaMixin,
+                        mixins.CreateModelMixin,
                         viewsets.GenericViewSet):
     queryset = Newsletter.objects.all()
     serializer_class = NewsletterSerializer
@@ -90,7 +133,8 @@ class NewsletterViewSet(mixins.CreateModelMixin,
     tags=["Contacto"],
     description="Endpoints para crear y consultar el contacto."
 )
-class ContactViewSet(mixins.CreateModelMixin,
+class ContactViewSet(EscrituraSerializadaMixin,
+                     mixins.CreateModelMixin,
                      viewsets.GenericViewSet):
     queryset = Contacto.objects.all()
     serializer_class = ContactSerializer
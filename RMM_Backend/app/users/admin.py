@@ -1,9 +1,10 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from app.common.admin import EliminacionSuaveAdminMixin
 from .models import User    
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(EliminacionSuaveAdminMixin, BaseUserAdmin):
     model = User
     list_display = ("id", "email", "first_name", "last_name", "is_active", "fecha_creacion")
     list_filter = ("is_active", "is_staff", "perfil_completo", "genero", "pais")
@@ -26,3 +27,7 @@ class UserAdmin(BaseUserAdmin):
     )
     search_fields = ("email", "first_name", "last_name", "usuario_unico")
     filter_horizontal = ("groups", "user_permissions")
+
+    def get_queryset(self, request):
+        # Las cuentas eliminadas esperan la purga de sus datos (ver app/common/eliminacion.py)
+        return super().get_queryset(request).filter(eliminado_en__isnull=True)
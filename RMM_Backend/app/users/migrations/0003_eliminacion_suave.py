@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_user_role'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='eliminado_en',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Cuenta desactivada a la espera de la purga de sus datos (ver app/common/eliminacion.py)', null=True, verbose_name='Eliminado en'),
+        ),
+    ]
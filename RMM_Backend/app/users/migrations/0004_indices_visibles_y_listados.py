@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0003_eliminacion_suave'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('eliminado_en__isnull', True)), fields=['fecha_creacion', 'id'], name='users_activos'),
+        ),
+    ]
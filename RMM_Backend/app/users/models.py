@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models import Q
 from app.common.models import TimeStampedModel
 from datetime import date
 from django.utils.translation import gettext_lazy as _
@@ -74,6 +75,13 @@ class User(AbstractUser, TimeStampedModel):
         default=False,
         help_text=_('Indica si el usuario completó su perfil')
     )
+    eliminado_en = models.DateTimeField(
+        _('Eliminado en'),
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Cuenta desactivada a la espera de la purga de sus datos (ver app/common/eliminacion.py)')
+    )
 
     # Usuario público único
     usuario_unico = models.CharField(
@@ -95,6 +103,12 @@ class User(AbstractUser, TimeStampedModel):
         verbose_name = 'Usuario'
         verbose_name_plural = 'Usuarios'
         ordering = ['-fecha_creacion']
+        indexes = [
+            # Listado de usuarios activos (los eliminados esperan su purga)
+            models.Index(
+                fields=['fecha_creacion', 'id'], condition=Q(eliminado_en__isnull=True), name='users_activos',
+            ),
+        ]
 
     def __str__(self):
         return self.email
@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from app.common.serializers import SparseFieldsetMixin
 
 User = get_user_model()
 
@@ -114,7 +115,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 # ============================================================================
 # SERIALIZER PARA EL PERFIL COMPLETO DEL USUARIO
 # ============================================================================
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer para ver y actualizar el perfil completo del usuario.
     """
@@ -176,6 +177,7 @@ class UserSerializer(serializers.ModelSerializer):
             }
         }
         read_only_fields = ['email', 'edad', 'fecha_creacion', 'fecha_actualizacion', 'perfil_completo', 'role']
+        field_dependencies = {'edad': ['fecha_nacimiento'], 'usuario_unico_sugerido': ['usuario_unico']}
 
     def update(self, instance, validated_data):
         """
@@ -1,3 +1,46 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from app.articles.models import Articulos, ComentarioArticulo, LikeArticulo
+from app.common.eliminacion import eliminar, purgar_pendientes
+from app.common.testing import PRESUPUESTOS, PresupuestoConsultasMixin, crear_articulo, crear_usuario
+from app.foro.models import ComentarioTema, LikeComentarioTema, Tema
+
+
+# Hash rápido: el presupuesto de tiempo mide la vista, no PBKDF2
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class UsuariosPresupuestoTests(PresupuestoConsultasMixin, TestCase):
+    presupuestos = PRESUPUESTOS['users']
+
+
+class EliminarUsuarioTests(TestCase):
+    """Eliminación en dos fases de una cuenta (ver app/common/eliminacion.py)."""
+
+    def setUp(self):
+        self.admin = crear_usuario("admin", role="ADMIN", is_staff=True)
+        self.lector = crear_usuario()
+        self.articulo = crear_articulo("Comentado")
+        raiz = ComentarioArticulo.objects.create(articulo=self.articulo, autor=self.lector, contenido="Raíz")
+        ComentarioArticulo.objects.create(articulo=self.articulo, autor=self.lector, contenido="Respuesta", parent=raiz)
+        LikeArticulo.objects.create(articulo=self.articulo, usuario=self.lector)
+        self.client = APIClient()
+
+    def test_eliminar_usuario_lo_desactiva_y_la_purga_borra_sus_datos(self):
+        tema = Tema.objects.create(titulo="Tema", contenido="Contenido", autor=self.lector)
+        comentario = ComentarioTema.objects.create(tema=tema, autor=self.admin, contenido="Comentario")
+        LikeComentarioTema.objects.create(comentario=comentario, usuario=self.admin)
+
+        eliminar(self.lector)
+        self.lector.refresh_from_db()
+        self.assertFalse(self.lector.is_active)
+        self.assertFalse(Tema.objects.exists())
+        self.assertEqual(self.client.get(f"/api/v1/foro/temas/{tema.pk}/").status_code, 404)
+
+        self.assertEqual(len(purgar_pendientes(tamano_lote=2, pausa=0)), 1)
+
+        self.assertFalse(get_user_model().objects.filter(pk=self.lector.pk).exists())
+        self.assertFalse(Tema.todos.exists())
+        self.assertFalse(ComentarioTema.objects.exists())
+        self.assertFalse(ComentarioArticulo.objects.exists())
+        self.assertTrue(Articulos.objects.filter(pk=self.articulo.pk).exists())
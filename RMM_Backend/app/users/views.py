@@ -17,6 +17,7 @@ from .models import User
 from app.common.permissions import IsSuperusuario
 from .pagination import UsersPagination
 from app.common.filters import AccentInsensitiveSearchFilter
+from app.common.mixins import SparseFieldsetViewMixin
 
 
 # ============================================================================
@@ -504,7 +505,7 @@ class AssignRoleView(APIView):
         200: UserSerializer(many=True)
     }
 )
-class ListUsersWithRolesView(generics.ListAPIView):
+class ListUsersWithRolesView(SparseFieldsetViewMixin, generics.ListAPIView):
     """
     Vista para listar todos los usuarios con sus roles.
     Solo accesible para superusuarios.
@@ -526,7 +527,8 @@ class ListUsersWithRolesView(generics.ListAPIView):
     - GET /api/v1/users/roles/users/?search=admin@example.com
     - GET /api/v1/users/roles/users/?page=2&page_size=20
     """
-    queryset = User.objects.all().order_by('-fecha_creacion')
+    # Las cuentas eliminadas (a la espera de su purga) no se listan
+    queryset = User.objects.filter(eliminado_en__isnull=True).order_by('-fecha_creacion')
     serializer_class = UserSerializer
     permission_classes = [IsSuperusuario]
     pagination_class = UsersPagination
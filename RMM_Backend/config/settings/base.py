@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from decouple import config
 from datetime import timedelta
@@ -49,6 +50,7 @@ AUTH_USER_MODEL = 'users.User'
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'app.common.middleware.LecturaEscrituraMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -77,14 +79,83 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# PRAGMA de cada conexión SQLite (ver app/common/sqlite.py). Cada base puede
+# sobrescribirlos con la clave 'PRAGMAS' de su entrada en DATABASES.
+SQLITE_PRAGMAS = {
+    'journal_mode': config('SQLITE_JOURNAL_MODE', default='wal'),
+    'synchronous': config('SQLITE_SYNCHRONOUS', default='normal'),
+    'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int),  # ms
+    'mmap_size': config('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int),  # bytes
+    'cache_size': config('SQLITE_CACHE_SIZE', default=-20000, cast=int),  # negativo = KiB
+    'temp_store': config('SQLITE_TEMP_STORE', default='memory'),
+}
+
+# Modo de las transacciones de Django en SQLite (OPTIONS 'transaction_mode',
+# Django 5.1+). Con IMMEDIATE cada atomic() toma el lock de escritura al
+# empezar y espera busy_timeout si está ocupado; con el DEFERRED de SQLite
+# una transacción que lee y luego escribe falla con "database is locked" sin
+# esperar cuando otra escribió entre medias.
+SQLITE_TRANSACTION_MODE = config('SQLITE_TRANSACTION_MODE', default='IMMEDIATE')
+
 # Database
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {'transaction_mode': SQLITE_TRANSACTION_MODE},
     }
 }
 
+# Réplica de lectura (ver app/common/routers.py): las lecturas de las
+# peticiones GET/HEAD/OPTIONS bajo READ_REPLICA_PATHS van al alias 'lectura'.
+# En SQLite es una segunda conexión a la misma base abierta con mode=ro (en
+# WAL no espera al escritor); en otros motores, el host de READ_REPLICA_HOST.
+READ_REPLICA_ENABLED = config('READ_REPLICA_ENABLED', default=False, cast=bool)
+READ_REPLICA_HOST = config('READ_REPLICA_HOST', default='')
+READ_REPLICA_PATHS = ('/api/',)
+DATABASE_ROUTERS = ['app.common.routers.LecturaEscrituraRouter']
+
+
+def base_de_lectura(principal):
+    """Entrada de DATABASES para el alias de solo lectura de `principal`."""
+    if principal['ENGINE'] == 'django.db.backends.sqlite3':
+        return {
+            **principal,
+            'NAME': f"file:{Path(principal['NAME']).as_posix()}?mode=ro",  # Django abre SQLite con uri=True
+            'PRAGMAS': {'journal_mode': None, 'query_only': 1},
+            'OPTIONS': {**principal.get('OPTIONS', {}), 'transaction_mode': 'DEFERRED'},  # solo lee
+            'TEST': {'MIRROR': 'default'},
+        }
+    return {**principal, 'HOST': READ_REPLICA_HOST or principal.get('HOST', ''), 'TEST': {'MIRROR': 'default'}}
+
+
+if READ_REPLICA_ENABLED:
+    DATABASES['lectura'] = base_de_lectura(DATABASES['default'])
+
+# Escritor único por proceso (ver app/common/escritor.py): comentarios,
+# likes, newsletter y contacto se escriben desde un solo hilo, agrupados en
+# lotes de hasta WRITE_QUEUE_BATCH_SIZE por transacción. Con la cola llena
+# durante WRITE_QUEUE_PUT_TIMEOUT s la petición responde 503.
+WRITE_QUEUE_ENABLED = config('WRITE_QUEUE_ENABLED', default=False, cast=bool)
+WRITE_QUEUE_MAX_SIZE = config('WRITE_QUEUE_MAX_SIZE', default=1000, cast=int)
+WRITE_QUEUE_BATCH_SIZE = config('WRITE_QUEUE_BATCH_SIZE', default=50, cast=int)
+WRITE_QUEUE_PUT_TIMEOUT = config('WRITE_QUEUE_PUT_TIMEOUT', default=2, cast=float)  # segundos
+WRITE_QUEUE_RESULT_TIMEOUT = config('WRITE_QUEUE_RESULT_TIMEOUT', default=30, cast=float)  # segundos
+
+# Archivo frío (ver app/common/archivado.py): `archivar_interacciones` mueve
+# los comentarios y likes de los artículos y noticias publicados hace más de
+# COLD_ARCHIVE_DAYS días, y sin interacciones desde entonces, a tablas compactas.
+COLD_ARCHIVE_DAYS = config('COLD_ARCHIVE_DAYS', default=730, cast=int)
+
+# Eliminación en dos fases (ver app/common/eliminacion.py): los artículos,
+# noticias, temas y usuarios eliminados se ocultan al instante y sus filas
+# dependientes se purgan en lotes de DELETE_PURGE_BATCH_SIZE, con una pausa de
+# DELETE_PURGE_PAUSE s entre lotes. La purga la hace `purgar_eliminados` o,
+# con DELETE_PURGE_ASYNC_ENABLED, un hilo del proceso al eliminar.
+DELETE_PURGE_ASYNC_ENABLED = config('DELETE_PURGE_ASYNC_ENABLED', default=False, cast=bool)
+DELETE_PURGE_BATCH_SIZE = config('DELETE_PURGE_BATCH_SIZE', default=200, cast=int)
+DELETE_PURGE_PAUSE = config('DELETE_PURGE_PAUSE', default=0.05, cast=float)  # segundos
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -137,6 +208,19 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 5,
 }
 
+# Renderer/parser JSON con orjson (ver app/common/renderers.py)
+FAST_JSON_RENDERER = config('FAST_JSON_RENDERER', default=False, cast=bool)
+if FAST_JSON_RENDERER:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'app.common.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = [
+        'app.common.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ]
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=24),
@@ -208,6 +292,62 @@ CORS_ALLOWED_HEADERS = [
 
 
 
+# Índice en memoria de likes por proceso (ver app/common/likes.py)
+LIKER_INDEX_ENABLED = config('LIKER_INDEX_ENABLED', default=False, cast=bool)
+LIKER_INDEX_TTL = config('LIKER_INDEX_TTL', default=300, cast=int)  # segundos
+LIKER_INDEX_MAX_OBJECTS = config('LIKER_INDEX_MAX_OBJECTS', default=50000, cast=int)
+
+# Caché de fragmentos serializados de artículos, noticias, temas y ediciones
+# (ver FragmentCacheMixin en app/common/serializers.py)
+FRAGMENT_CACHE_ENABLED = config('FRAGMENT_CACHE_ENABLED', default=False, cast=bool)
+FRAGMENT_CACHE_ALIAS = config('FRAGMENT_CACHE_ALIAS', default='default')
+FRAGMENT_CACHE_TIMEOUT = config('FRAGMENT_CACHE_TIMEOUT', default=3600, cast=int)  # segundos
+
+# Total aproximado (cacheado) de la paginación por cursor con ?with_count=true
+# (ver app/common/pagination.py)
+PAGINATION_COUNT_CACHE_TIMEOUT = config('PAGINATION_COUNT_CACHE_TIMEOUT', default=60, cast=int)  # segundos
+
+# Caché de respuestas GET anónimas (ver app/common/cache.py). FileBasedCache
+# en disco local: la comparten todos los workers de gunicorn del servidor.
+RESPONSE_CACHE_ENABLED = config('RESPONSE_CACHE_ENABLED', default=False, cast=bool)
+RESPONSE_CACHE_ALIAS = 'respuestas'
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=600, cast=int)  # segundos
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'respuestas': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('RESPONSE_CACHE_DIR', default=os.path.join(tempfile.gettempdir(), 'rmm_respuestas')),
+        'TIMEOUT': RESPONSE_CACHE_TIMEOUT,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+# Stale-while-revalidate con single-flight para acciones costosas (ver
+# cache_swr en app/common/cache.py). Los candados son archivos en SWR_LOCK_DIR,
+# compartidos por los workers del servidor; vencen a los SWR_LOCK_TIMEOUT s.
+SWR_CACHE_ENABLED = config('SWR_CACHE_ENABLED', default=False, cast=bool)
+SWR_CACHE_BACKGROUND = config('SWR_CACHE_BACKGROUND', default=True, cast=bool)
+SWR_LOCK_DIR = config('SWR_LOCK_DIR', default=os.path.join(tempfile.gettempdir(), 'rmm_swr_locks'))
+SWR_LOCK_TIMEOUT = config('SWR_LOCK_TIMEOUT', default=30, cast=int)  # segundos
+
+# CDN (Bunny): cabeceras Cache-Control / CDN-Tag y cola de purgas por
+# etiqueta (ver app/common/cdn.py y el comando procesar_purgas_cdn)
+CDN_CACHE_HEADERS_ENABLED = config('CDN_CACHE_HEADERS_ENABLED', default=False, cast=bool)
+CDN_TAG_HEADER = config('CDN_TAG_HEADER', default='CDN-Tag')
+CDN_PURGE_ENABLED = config('CDN_PURGE_ENABLED', default=False, cast=bool)
+CDN_CLIENT = config('CDN_CLIENT', default='app.common.cdn.BunnyCDN')
+BUNNY_API_KEY = config('BUNNY_API_KEY', default='')
+BUNNY_PULL_ZONE_ID = config('BUNNY_PULL_ZONE_ID', default='')
+
+# Exportación de la API pública a JSON estático (ver app/common/exportacion.py
+# y el comando exportar_json). Sin STATIC_EXPORT_BASE_URL se usa SITE_URL.
+STATIC_EXPORT_ROOT = config('STATIC_EXPORT_ROOT', default=str(BASE_DIR / 'export_json'))
+STATIC_EXPORT_BASE_URL = config('STATIC_EXPORT_BASE_URL', default='')
+STATIC_EXPORT_ON_PUBLISH = config('STATIC_EXPORT_ON_PUBLISH', default=False, cast=bool)
+
 # CKEditor Configuration
 CKEDITOR_UPLOAD_PATH = "uploads/"
 CKEDITOR_CONFIGS = {
@@ -15,8 +15,11 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {"transaction_mode": SQLITE_TRANSACTION_MODE},
     }
 }
+if READ_REPLICA_ENABLED:
+    DATABASES["lectura"] = base_de_lectura(DATABASES["default"])
 
 # CORS / CSRF
 CORDS_ALLOW_ALL_ORIGINS = True
@@ -33,6 +33,7 @@ urlpatterns = [
     path("api/v1/foro/", include("app.foro.urls")),
     path("api/v1/articles/", include("app.articles.urls")),
     path("api/v1/noticias/", include("app.blog.urls")),
+    path("api/v1/interacciones/", include("app.common.urls")),
 ]
 
 # Servir archivos media en desarrollo